@@ -2,16 +2,14 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
-# Django imports
-from django.utils import timezone
-from django.db.models import Q
-
 # Third party imports
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 
 # Module imports
-from kardon.db.models import APIToken
+from kardon.bgtasks.api_token_task import track_api_token_last_used
+from kardon.db.models import User
+from kardon.utils.api_token import get_api_token
 
 
 class APIKeyAuthentication(authentication.BaseAuthentication):
@@ -27,19 +25,17 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
         return request.headers.get(self.auth_header_name)
 
     def validate_api_token(self, token):
-        try:
-            api_token = APIToken.objects.get(
-                Q(Q(expired_at__gt=timezone.now()) | Q(expired_at__isnull=True)),
-                token=token,
-                is_active=True,
-            )
-        except APIToken.DoesNotExist:
+        api_token = get_api_token(token)
+        if api_token is None:
+            raise AuthenticationFailed("Given API token is not valid")
+
+        user = User.objects.filter(pk=api_token["user_id"]).first()
+        if user is None:
             raise AuthenticationFailed("Given API token is not valid")
 
-        # save api token last used
-        api_token.last_used = timezone.now()
-        api_token.save(update_fields=["last_used"])
-        return (api_token.user, api_token.token)
+        # The last use is buffered and written in bulk off the request path
+        track_api_token_last_used(api_token["id"])
+        return (user, token)
 
     def authenticate(self, request):
         token = self.get_api_token(request=request)
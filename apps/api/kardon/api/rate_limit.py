@@ -3,56 +3,58 @@
 # See the LICENSE file for details.
 
 # python imports
+import hashlib
 import os
+import time
+from functools import lru_cache
 
 # Third party imports
 from rest_framework.throttling import SimpleRateThrottle
 
+# Module imports
+from kardon.settings.redis import redis_instance
+from kardon.utils.exception_logger import log_exception
 
-class ApiKeyRateThrottle(SimpleRateThrottle):
-    scope = "api_key"
-    rate = os.environ.get("API_KEY_RATE_LIMIT", "60/minute")
-
-    def get_cache_key(self, request, view):
-        # Retrieve the API key from the request header
-        api_key = request.headers.get("X-Api-Key")
-        if not api_key:
-            return None  # Allow the request if there's no API key
-
-        # Use the API key as part of the cache key
-        return f"{self.scope}:{api_key}"
-
-    def allow_request(self, request, view):
-        allowed = super().allow_request(request, view)
+# Generic cell rate algorithm, the key holds the theoretical arrival time of
+# the next request. Every request moves it one emission interval forward and
+# is allowed while it stays within the period of the rate. The redis clock is
+# used so every worker shares the same time.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
 
-        if allowed:
-            now = self.timer()
-            # Calculate the remaining limit and reset time
-            history = self.cache.get(self.key, [])
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
 
-            # Remove old histories
-            while history and history[-1] <= now - self.duration:
-                history.pop()
+local new_tat = tat + interval
+local retry_after = new_tat - period - now
+if retry_after > 0 then
+    return {0, 0, tostring(tat - now), tostring(retry_after)}
+end
 
-            # Calculate the requests
-            num_requests = len(history)
+redis.call("SET", KEYS[1], tostring(new_tat), "PX", math.ceil((new_tat - now) * 1000))
+local remaining = math.floor((period - (new_tat - now)) / interval)
+return {1, remaining, tostring(new_tat - now), "0"}
+"""
 
-            # Check available requests
-            available = self.num_requests - num_requests
 
-            # Unix timestamp for when the rate limit will reset
-            reset_time = int(now + self.duration)
+@lru_cache(maxsize=1)
+def get_gcra_script():
+    """Register the throttle script on a redis client kept for the process"""
+    return redis_instance().register_script(GCRA_SCRIPT)
 
-            # Add headers
-            request.META["X-RateLimit-Remaining"] = max(0, available)
-            request.META["X-RateLimit-Reset"] = reset_time
 
-        return allowed
+class RedisRateThrottle(SimpleRateThrottle):
+    """
+    Throttle the API keys with a single atomic script call per request
+    instead of the request history kept by SimpleRateThrottle
+    """
 
-
-class ServiceTokenRateThrottle(SimpleRateThrottle):
-    scope = "service_token"
-    rate = "300/minute"
+    retry_after = None
 
     def get_cache_key(self, request, view):
         # Retrieve the API key from the request header
@@ -60,32 +62,44 @@ class ServiceTokenRateThrottle(SimpleRateThrottle):
         if not api_key:
             return None  # Allow the request if there's no API key
 
-        # Use the API key as part of the cache key
-        return f"{self.scope}:{api_key}"
+        # Use a hash of the API key to keep the secret out of the keys
+        return f"throttle:{self.scope}:{hashlib.sha256(api_key.encode()).hexdigest()}"
 
     def allow_request(self, request, view):
-        allowed = super().allow_request(request, view)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            allowed, remaining, reset_after, retry_after = get_gcra_script()(
+                keys=[self.key], args=[self.duration / self.num_requests, self.duration]
+            )
+        except Exception as e:
+            # Requests are let through while redis is unreachable
+            log_exception(e)
+            return True
 
-        if allowed:
-            now = self.timer()
-            # Calculate the remaining limit and reset time
-            history = self.cache.get(self.key, [])
+        self.retry_after = float(retry_after)
 
-            # Remove old histories
-            while history and history[-1] <= now - self.duration:
-                history.pop()
+        # Add headers
+        request.META["X-RateLimit-Remaining"] = max(0, int(remaining))
+        # Unix timestamp for when the full limit is available again
+        request.META["X-RateLimit-Reset"] = int(time.time() + float(reset_after))
 
-            # Calculate the requests
-            num_requests = len(history)
+        return bool(allowed)
 
-            # Check available requests
-            available = self.num_requests - num_requests
+    def wait(self):
+        return self.retry_after
 
-            # Unix timestamp for when the rate limit will reset
-            reset_time = int(now + self.duration)
 
-            # Add headers
-            request.META["X-RateLimit-Remaining"] = max(0, available)
-            request.META["X-RateLimit-Reset"] = reset_time
+class ApiKeyRateThrottle(RedisRateThrottle):
+    scope = "api_key"
+    rate = os.environ.get("API_KEY_RATE_LIMIT", "60/minute")
+
 
-        return allowed
+class ServiceTokenRateThrottle(RedisRateThrottle):
+    scope = "service_token"
+    rate = "300/minute"
@@ -22,9 +22,9 @@ from rest_framework.exceptions import APIException
 from rest_framework.generics import GenericAPIView
 
 # Module imports
-from kardon.db.models.api import APIToken
 from kardon.api.middleware.api_authentication import APIKeyAuthentication
 from kardon.api.rate_limit import ApiKeyRateThrottle, ServiceTokenRateThrottle
+from kardon.utils.api_token import get_api_token
 from kardon.utils.exception_logger import log_exception
 from kardon.utils.paginator import BasePaginator
 from kardon.utils.core.mixins import ReadReplicaControlMixin
@@ -64,9 +64,9 @@ class BaseAPIView(TimezoneMixin, GenericAPIView, ReadReplicaControlMixin, BasePa
         api_key = self.request.headers.get("X-Api-Key")
 
         if api_key:
-            service_token = APIToken.objects.filter(token=api_key, is_service=True).first()
+            api_token = get_api_token(api_key)
 
-            if service_token:
+            if api_token and api_token["is_service"]:
                 throttle_classes.append(ServiceTokenRateThrottle())
                 return throttle_classes
 
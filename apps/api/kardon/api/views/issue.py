@@ -5,7 +5,6 @@
 # Python imports
 import json
 import uuid
-import re
 
 # Django imports
 from django.core.serializers.json import DjangoJSONEncoder
@@ -59,7 +58,7 @@ from kardon.app.permissions import (
     ProjectLitePermission,
     ProjectMemberPermission,
 )
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import issue_activity, queue_bulk_issue_activity
 from kardon.db.models import (
     Issue,
     IssueActivity,
@@ -76,7 +75,10 @@ from kardon.settings.storage import S3Storage
 from kardon.bgtasks.storage_metadata_task import get_asset_object_metadata
 from .base import BaseAPIView
 from kardon.utils.host import base_host
-from kardon.bgtasks.webhook_task import model_activity
+from kardon.utils.bulk_issue import bulk_create_issues
+from kardon.utils.issue_search import search_issues
+from kardon.utils.membership import get_member_project_ids
+from kardon.bgtasks.webhook_task import bulk_model_activity, model_activity
 from kardon.app.permissions import ROLE
 from kardon.utils.openapi import (
     work_item_docs,
@@ -146,6 +148,9 @@ from kardon.utils.openapi import (
 )
 from kardon.bgtasks.work_item_link_task import crawl_work_item_link_title
 
+# Largest list of work items created by a single request
+MAX_BULK_ISSUES = 100
+
 
 def user_has_issue_permission(user_id, project_id, issue=None, allowed_roles=None, allow_creator=True):
     if allow_creator and issue is not None and user_id == issue.created_by_id:
@@ -416,9 +421,13 @@ class IssueListCreateAPIEndpoint(BaseAPIView):
 
         Create a new work item in the specified project with the provided details.
         Supports external ID tracking for integration purposes.
+        A list of work items is created in bulk.
         """
         project = Project.objects.get(pk=project_id)
 
+        if isinstance(request.data, list):
+            return self.create_bulk(request, slug, project)
+
         serializer = IssueSerializer(
             data=request.data,
             context={
@@ -484,6 +493,95 @@ class IssueListCreateAPIEndpoint(BaseAPIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def create_bulk(self, request, slug, project):
+        """Create the work items of a list payload with a single sequence reservation and bulk inserts"""
+        if not request.data or len(request.data) > MAX_BULK_ISSUES:
+            return Response(
+                {"error": f"Between 1 and {MAX_BULK_ISSUES} work items can be created at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = IssueSerializer(
+            data=request.data,
+            many=True,
+            context={
+                "project_id": project.id,
+                "workspace_id": project.workspace_id,
+                "default_assignee_id": project.default_assignee_id,
+            },
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        external_ids = Q()
+        external_keys = set()
+        for item in request.data:
+            if item.get("external_id") and item.get("external_source"):
+                external_key = (str(item["external_source"]), str(item["external_id"]))
+                if external_key in external_keys:
+                    return Response(
+                        {
+                            "error": "Work items of the payload repeat the same external id and external source",
+                            "external_source": external_key[0],
+                            "external_id": external_key[1],
+                        },
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                external_keys.add(external_key)
+                external_ids |= Q(external_source=item["external_source"], external_id=item["external_id"])
+        if external_ids:
+            existing_ids = list(
+                Issue.objects.filter(external_ids, workspace__slug=slug, project_id=project.id).values_list(
+                    "id", flat=True
+                )
+            )
+            if existing_ids:
+                return Response(
+                    {
+                        "error": "Issues with the same external id and external source already exist",
+                        "ids": [str(issue_id) for issue_id in existing_ids],
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+        issues = bulk_create_issues(
+            project,
+            [
+                {
+                    **{key: value for key, value in data.items() if key != "created_by"},
+                    "created_by_id": item.get("created_by", request.user.id),
+                    "created_at": item.get("created_at"),
+                }
+                for data, item in zip(serializer.validated_data, request.data)
+            ],
+            created_by_id=request.user.id,
+        )
+
+        # Track and send the model activity of every issue with a few bulk messages
+        queue_bulk_issue_activity(
+            type="issue.activity.created",
+            issue_deltas=[
+                {
+                    "issue_id": str(issue.id),
+                    "requested_data": json.dumps(item, cls=DjangoJSONEncoder),
+                    "current_instance": None,
+                }
+                for issue, item in zip(issues, request.data)
+            ],
+            actor_id=str(request.user.id),
+            project_id=str(project.id),
+            epoch=int(timezone.now().timestamp()),
+        )
+        bulk_model_activity.delay(
+            model_name="issue",
+            model_ids=[str(issue.id) for issue in issues],
+            actor_id=request.user.id,
+            slug=slug,
+            origin=base_host(request=request, is_app=True),
+        )
+
+        return Response(IssueSerializer(issues, many=True).data, status=status.HTTP_201_CREATED)
+
 
 class IssueDetailAPIEndpoint(BaseAPIView):
     """Issue Detail Endpoint"""
@@ -2184,23 +2282,9 @@ class IssueSearchEndpoint(BaseAPIView):
         if not query:
             return Response({"issues": []}, status=status.HTTP_200_OK)
 
-        # Build search query
-        fields = ["name", "sequence_id", "project__identifier"]
-        q = Q()
-        for field in fields:
-            if field == "sequence_id":
-                # Match whole integers only (exclude decimal numbers)
-                sequences = re.findall(r"\b\d+\b", query)
-                for sequence_id in sequences:
-                    q |= Q(**{"sequence_id": sequence_id})
-            else:
-                q |= Q(**{f"{field}__icontains": query})
-
         # Filter issues
         issues = Issue.issue_objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
+            project_id__in=get_member_project_ids(request, slug),
             project__archived_at__isnull=True,
             workspace__slug=slug,
         )
@@ -2209,8 +2293,11 @@ class IssueSearchEndpoint(BaseAPIView):
         if workspace_search == "false" and project_id:
             issues = issues.filter(project_id=project_id)
 
+        # Search and rank the issues
+        issues = search_issues(query, issues, slug=slug)
+
         # Get results
-        issue_results = issues.distinct().values(
+        issue_results = issues.values(
             "name",
             "id",
             "sequence_id",
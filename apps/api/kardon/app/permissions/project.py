@@ -6,8 +6,13 @@
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 # Module import
-from kardon.db.models import ProjectMember, WorkspaceMember
 from kardon.db.models.project import ROLE
+from kardon.utils.membership import (
+    get_project_role,
+    get_project_role_by_identifier,
+    get_workspace_role,
+    is_project_member_in_workspace,
+)
 
 
 class ProjectBasePermission(BasePermission):
@@ -17,40 +22,20 @@ class ProjectBasePermission(BasePermission):
 
         ## Safe Methods -> Handle the filtering logic in queryset
         if request.method in SAFE_METHODS:
-            return WorkspaceMember.objects.filter(
-                workspace__slug=view.workspace_slug, member=request.user, is_active=True
-            ).exists()
+            return get_workspace_role(request, view.workspace_slug) is not None
 
         ## Only workspace owners or admins can create the projects
         if request.method == "POST":
-            return WorkspaceMember.objects.filter(
-                workspace__slug=view.workspace_slug,
-                member=request.user,
-                role__in=[ROLE.ADMIN.value, ROLE.MEMBER.value],
-                is_active=True,
-            ).exists()
-
-        project_member_qs = ProjectMember.objects.filter(
-            workspace__slug=view.workspace_slug,
-            member=request.user,
-            project_id=view.project_id,
-            is_active=True,
-        )
+            return get_workspace_role(request, view.workspace_slug) in [ROLE.ADMIN.value, ROLE.MEMBER.value]
+
+        project_role = get_project_role(request, view.workspace_slug, view.project_id)
 
         ## Only project admins or workspace admin who is part of the project can access
 
-        if project_member_qs.filter(role=ROLE.ADMIN.value).exists():
+        if project_role == ROLE.ADMIN.value:
             return True
         else:
-            return (
-                project_member_qs.exists()
-                and WorkspaceMember.objects.filter(
-                    member=request.user,
-                    workspace__slug=view.workspace_slug,
-                    role=ROLE.ADMIN.value,
-                    is_active=True,
-                ).exists()
-            )
+            return project_role is not None and get_workspace_role(request, view.workspace_slug) == ROLE.ADMIN.value
 
 
 class ProjectMemberPermission(BasePermission):
@@ -60,26 +45,16 @@ class ProjectMemberPermission(BasePermission):
 
         ## Safe Methods -> Handle the filtering logic in queryset
         if request.method in SAFE_METHODS:
-            return ProjectMember.objects.filter(
-                workspace__slug=view.workspace_slug, member=request.user, is_active=True
-            ).exists()
+            return is_project_member_in_workspace(request, view.workspace_slug)
         ## Only workspace owners or admins can create the projects
         if request.method == "POST":
-            return WorkspaceMember.objects.filter(
-                workspace__slug=view.workspace_slug,
-                member=request.user,
-                role__in=[ROLE.ADMIN.value, ROLE.MEMBER.value],
-                is_active=True,
-            ).exists()
+            return get_workspace_role(request, view.workspace_slug) in [ROLE.ADMIN.value, ROLE.MEMBER.value]
 
         ## Only Project Admins can update project attributes
-        return ProjectMember.objects.filter(
-            workspace__slug=view.workspace_slug,
-            member=request.user,
-            role__in=[ROLE.ADMIN.value, ROLE.MEMBER.value],
-            project_id=view.project_id,
-            is_active=True,
-        ).exists()
+        return get_project_role(request, view.workspace_slug, view.project_id) in [
+            ROLE.ADMIN.value,
+            ROLE.MEMBER.value,
+        ]
 
 
 class ProjectEntityPermission(BasePermission):
@@ -90,30 +65,17 @@ class ProjectEntityPermission(BasePermission):
         # Handle requests based on project__identifier
         if hasattr(view, "project_identifier") and view.project_identifier:
             if request.method in SAFE_METHODS:
-                return ProjectMember.objects.filter(
-                    workspace__slug=view.workspace_slug,
-                    member=request.user,
-                    project__identifier=view.project_identifier,
-                    is_active=True,
-                ).exists()
+                return get_project_role_by_identifier(request, view.workspace_slug, view.project_identifier) is not None
 
         ## Safe Methods -> Handle the filtering logic in queryset
         if request.method in SAFE_METHODS:
-            return ProjectMember.objects.filter(
-                workspace__slug=view.workspace_slug,
-                member=request.user,
-                project_id=view.project_id,
-                is_active=True,
-            ).exists()
+            return get_project_role(request, view.workspace_slug, view.project_id) is not None
 
         ## Only project members or admins can create and edit the project attributes
-        return ProjectMember.objects.filter(
-            workspace__slug=view.workspace_slug,
-            member=request.user,
-            role__in=[ROLE.ADMIN.value, ROLE.MEMBER.value],
-            project_id=view.project_id,
-            is_active=True,
-        ).exists()
+        return get_project_role(request, view.workspace_slug, view.project_id) in [
+            ROLE.ADMIN.value,
+            ROLE.MEMBER.value,
+        ]
 
 
 class ProjectAdminPermission(BasePermission):
@@ -121,13 +83,7 @@ class ProjectAdminPermission(BasePermission):
         if request.user.is_anonymous:
             return False
 
-        return ProjectMember.objects.filter(
-            workspace__slug=view.workspace_slug,
-            member=request.user,
-            role=ROLE.ADMIN.value,
-            project_id=view.project_id,
-            is_active=True,
-        ).exists()
+        return get_project_role(request, view.workspace_slug, view.project_id) == ROLE.ADMIN.value
 
 
 class ProjectLitePermission(BasePermission):
@@ -135,9 +91,4 @@ class ProjectLitePermission(BasePermission):
         if request.user.is_anonymous:
             return False
 
-        return ProjectMember.objects.filter(
-            workspace__slug=view.workspace_slug,
-            member=request.user,
-            project_id=view.project_id,
-            is_active=True,
-        ).exists()
+        return get_project_role(request, view.workspace_slug, view.project_id) is not None
@@ -18,6 +18,7 @@ from kardon.db.models import (
     DeployBoard,
     ProjectPublicMember,
     IssueSequence,
+    IssueSequenceCounter,
 )
 from kardon.utils.content_validator import (
     validate_html_content,
@@ -122,7 +123,12 @@ class ProjectListSerializer(DynamicBaseSerializer):
 
     def get_next_work_item_sequence(self, obj):
         """Get the next sequence ID that will be assigned to a new issue"""
-        max_sequence = IssueSequence.objects.filter(project_id=obj.id).aggregate(max_seq=Max("sequence"))["max_seq"]
+        max_sequence = (
+            IssueSequenceCounter.objects.filter(project_id=obj.id).values_list("last_sequence", flat=True).first()
+        )
+        if max_sequence is None:
+            # The counter is created with the first issue reserving a sequence
+            max_sequence = IssueSequence.objects.filter(project_id=obj.id).aggregate(max_seq=Max("sequence"))["max_seq"]
         return (max_sequence + 1) if max_sequence else 1
 
     class Meta:
@@ -56,6 +56,11 @@ urlpatterns = [
         IssuePaginatedViewSet.as_view({"get": "list"}),
         name="project-issues-paginated",
     ),
+    path(
+        "workspaces/<str:slug>/projects/<uuid:project_id>/v2/issues/sync/",
+        IssuePaginatedViewSet.as_view({"get": "sync"}),
+        name="project-issues-sync",
+    ),
     path(
         "workspaces/<str:slug>/projects/<uuid:project_id>/issues/<uuid:pk>/",
         IssueViewSet.as_view(
@@ -242,6 +247,16 @@ urlpatterns = [
         IssueRelationViewSet.as_view({"post": "remove_relation"}),
         name="issue-relation",
     ),
+    path(
+        "workspaces/<str:slug>/projects/<uuid:project_id>/issues/<uuid:issue_id>/issue-relation/graph/",
+        IssueRelationViewSet.as_view({"get": "graph"}),
+        name="issue-relation-graph",
+    ),
+    path(
+        "workspaces/<str:slug>/projects/<uuid:project_id>/issues/<uuid:issue_id>/issue-relation/critical-path/",
+        IssueRelationViewSet.as_view({"get": "critical_path"}),
+        name="issue-relation-critical-path",
+    ),
     ## End Issue Relation
     path(
         "workspaces/<str:slug>/projects/<uuid:project_id>/deleted-issues/",
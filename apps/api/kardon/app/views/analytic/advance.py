@@ -11,6 +11,7 @@ from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from kardon.app.views.base import BaseAPIView
 from kardon.app.permissions import ROLE, allow_permission
+from kardon.bgtasks.analytics_rollup_task import ensure_analytics_rollup
 from kardon.db.models import (
     WorkspaceMember,
     Project,
@@ -22,6 +23,14 @@ from kardon.db.models import (
     Workspace,
     ProjectMember,
 )
+from kardon.utils.analytics_rollup import (
+    ROLLUP_BASE_AXES,
+    get_analytics_project_ids,
+    get_work_item_aggregates,
+    rollup_monthly_completion,
+    rollup_work_items_stats,
+    state_group_rollup,
+)
 from kardon.utils.build_chart import build_analytics_chart
 from kardon.utils.date_utils import (
     get_analytics_filters,
@@ -91,6 +100,10 @@ class AdvanceAnalyticsEndpoint(AdvanceAnalyticsBaseView):
         }
 
     def get_work_items_stats(self) -> Dict[str, Dict[str, int]]:
+        project_ids = get_analytics_project_ids(self.filters["project_filters"])
+        if ensure_analytics_rollup(project_ids, [ROLLUP_BASE_AXES]):
+            return rollup_work_items_stats(project_ids, self.filters["analytics_date_range"])
+
         base_queryset = Issue.issue_objects.filter(**self.filters["base_filters"])
 
         return {
@@ -142,6 +155,17 @@ class AdvanceAnalyticsStatsEndpoint(AdvanceAnalyticsBaseView):
         )
 
     def get_work_items_stats(self) -> Dict[str, Dict[str, int]]:
+        project_ids = get_analytics_project_ids(self.filters["project_filters"])
+        if ensure_analytics_rollup(project_ids, [ROLLUP_BASE_AXES]):
+            aggregates = get_work_item_aggregates()
+            aggregates.pop("total_work_items")
+            return (
+                state_group_rollup(project_ids)
+                .values("project_id", "project__name")
+                .annotate(**aggregates)
+                .order_by("project_id")
+            )
+
         base_queryset = Issue.issue_objects.filter(**self.filters["base_filters"])
         return (
             base_queryset.values("project_id", "project__name")
@@ -215,31 +239,33 @@ class AdvanceAnalyticsChartEndpoint(AdvanceAnalyticsBaseView):
         ]
 
     def work_item_completion_chart(self) -> Dict[str, Any]:
-        # Get the base queryset
-        queryset = (
-            Issue.issue_objects.filter(**self.filters["base_filters"])
-            .select_related("workspace", "state", "parent")
-            .prefetch_related("assignees", "labels", "issue_module__module", "issue_cycle__cycle")
-        )
-
         workspace = Workspace.objects.get(slug=self._workspace_slug)
         start_date = workspace.created_at.date().replace(day=1)
 
-        # Apply date range filter if available
-        if self.filters["chart_period_range"]:
-            start_date, end_date = self.filters["chart_period_range"]
-            queryset = queryset.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
+        project_ids = get_analytics_project_ids(self.filters["project_filters"])
+        if ensure_analytics_rollup(project_ids, [ROLLUP_BASE_AXES]):
+            monthly_stats = rollup_monthly_completion(project_ids, self.filters["chart_period_range"])
+            if self.filters["chart_period_range"]:
+                start_date, end_date = self.filters["chart_period_range"]
+        else:
+            # Get the base queryset
+            queryset = Issue.issue_objects.filter(**self.filters["base_filters"])
 
-        # Annotate by month and count
-        monthly_stats = (
-            queryset.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(
-                created_count=Count("id"),
-                completed_count=Count("id", filter=Q(state__group="completed")),
+            # Apply date range filter if available
+            if self.filters["chart_period_range"]:
+                start_date, end_date = self.filters["chart_period_range"]
+                queryset = queryset.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
+
+            # Annotate by month and count
+            monthly_stats = (
+                queryset.annotate(month=TruncMonth("created_at"))
+                .values("month")
+                .annotate(
+                    created_count=Count("id"),
+                    completed_count=Count("id", filter=Q(state__group="completed")),
+                )
+                .order_by("month")
             )
-            .order_by("month")
-        )
 
         # Create dictionary of month -> counts
         stats_dict = {
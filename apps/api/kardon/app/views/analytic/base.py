@@ -19,6 +19,7 @@ from kardon.app.permissions import WorkSpaceAdminPermission
 from kardon.app.serializers import AnalyticViewSerializer
 from kardon.app.views.base import BaseAPIView, BaseViewSet
 from kardon.bgtasks.analytic_plot_export import analytic_export_task
+from kardon.bgtasks.analytics_rollup_task import ensure_analytics_rollup
 from kardon.db.models import (
     AnalyticView,
     Issue,
@@ -30,6 +31,13 @@ from kardon.db.models import (
 )
 
 from kardon.utils.analytics_plot import build_graph_plot
+from kardon.utils.analytics_rollup import (
+    ROLLUP_BASE_AXES,
+    get_rollup_details,
+    get_rollup_project_ids,
+    rollup_graph_plot,
+    rollup_total,
+)
 from kardon.utils.issue_filters import issue_filters
 from kardon.app.permissions import allow_permission, ROLE
 
@@ -75,6 +83,21 @@ class AnalyticsEndpoint(BaseAPIView):
         # Additional filters that need to be applied
         filters = issue_filters(request.GET, "GET")
 
+        # Answer from the rollup when it keeps the axes for every project the filters select
+        project_ids = get_rollup_project_ids(slug, filters)
+        if project_ids is not None and ensure_analytics_rollup(
+            project_ids, [(x_axis, segment or ""), ROLLUP_BASE_AXES]
+        ):
+            distribution = rollup_graph_plot(project_ids, x_axis=x_axis, y_axis=y_axis, segment=segment)
+            return Response(
+                {
+                    "total": rollup_total(project_ids),
+                    "distribution": distribution,
+                    "extras": get_rollup_details(distribution, x_axis=x_axis, segment=segment),
+                },
+                status=status.HTTP_200_OK,
+            )
+
         # Get the issues for the workspace with the additional filters applied
         queryset = Issue.issue_objects.filter(workspace__slug=slug, **filters)
 
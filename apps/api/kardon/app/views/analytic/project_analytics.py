@@ -12,6 +12,7 @@ from django.utils import timezone
 from datetime import timedelta
 from kardon.app.views.base import BaseAPIView
 from kardon.app.permissions import ROLE, allow_permission
+from kardon.bgtasks.analytics_rollup_task import ensure_analytics_rollup
 from kardon.db.models import (
     Project,
     Issue,
@@ -23,6 +24,12 @@ from kardon.db.models import (
 from django.db import models
 from django.db.models import F, Case, When, Value
 from django.db.models.functions import Concat
+from kardon.utils.analytics_rollup import (
+    ROLLUP_BASE_AXES,
+    get_analytics_project_ids,
+    rollup_monthly_completion,
+    rollup_work_items_stats,
+)
 from kardon.utils.build_chart import build_analytics_chart
 from kardon.utils.date_utils import (
     get_analytics_filters,
@@ -71,6 +78,10 @@ class ProjectAdvanceAnalyticsEndpoint(ProjectAdvanceAnalyticsBaseView):
             )
             base_queryset = Issue.issue_objects.filter(id__in=module_issues)
         else:
+            project_ids = get_analytics_project_ids({**self.filters["project_filters"], "id": project_id})
+            if ensure_analytics_rollup(project_ids, [ROLLUP_BASE_AXES]):
+                return rollup_work_items_stats(project_ids, self.filters["analytics_date_range"])
+
             base_queryset = Issue.issue_objects.filter(**self.filters["base_filters"], project_id=project_id)
 
         return {
@@ -257,21 +268,27 @@ class ProjectAdvanceAnalyticsChartEndpoint(ProjectAdvanceAnalyticsBaseView):
                 )
                 current_date += timedelta(days=1)
         else:
-            # Apply date range filter if available
-            if self.filters["chart_period_range"]:
-                start_date, end_date = self.filters["chart_period_range"]
-                queryset = queryset.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
-
-            # Annotate by month and count
-            monthly_stats = (
-                queryset.annotate(month=TruncMonth("created_at"))
-                .values("month")
-                .annotate(
-                    created_count=Count("id"),
-                    completed_count=Count("id", filter=Q(state__group="completed")),
+            project_ids = get_analytics_project_ids({**self.filters["project_filters"], "id": project_id})
+            if ensure_analytics_rollup(project_ids, [ROLLUP_BASE_AXES]):
+                monthly_stats = rollup_monthly_completion(project_ids, self.filters["chart_period_range"])
+                if self.filters["chart_period_range"]:
+                    start_date, end_date = self.filters["chart_period_range"]
+            else:
+                # Apply date range filter if available
+                if self.filters["chart_period_range"]:
+                    start_date, end_date = self.filters["chart_period_range"]
+                    queryset = queryset.filter(created_at__date__gte=start_date, created_at__date__lte=end_date)
+
+                # Annotate by month and count
+                monthly_stats = (
+                    queryset.annotate(month=TruncMonth("created_at"))
+                    .values("month")
+                    .annotate(
+                        created_count=Count("id"),
+                        completed_count=Count("id", filter=Q(state__group="completed")),
+                    )
+                    .order_by("month")
                 )
-                .order_by("month")
-            )
 
             # Create dictionary of month -> counts
             stats_dict = {
@@ -53,9 +53,11 @@ from kardon.db.models import (
     UserRecentVisit,
 )
 from kardon.utils.analytics_plot import burndown_plot
-from kardon.bgtasks.recent_visited_task import recent_visited_task
+from kardon.bgtasks.recent_visited_task import record_recent_visit
+from kardon.utils.recent_visit import remove_recent_visits
 from kardon.utils.host import base_host
 from kardon.utils.cycle_transfer_issues import transfer_cycle_issues
+from kardon.utils.progress import get_cycle_progress
 from .. import BaseAPIView, BaseViewSet
 from kardon.bgtasks.webhook_task import model_activity
 from kardon.utils.timezone_converter import convert_to_utc, user_timezone_converter
@@ -465,7 +467,7 @@ class CycleViewSet(BaseViewSet):
         datetime_fields = ["start_date", "end_date"]
         data = user_timezone_converter(data, datetime_fields, project_timezone)
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             entity_name="cycle",
             entity_identifier=pk,
@@ -507,6 +509,8 @@ class CycleViewSet(BaseViewSet):
             entity_identifier=pk,
             project_id=project_id,
         ).delete()
+        # Drop it from the recent visits not flushed yet
+        remove_recent_visits(slug, "cycle", pk, project_id)
         # Delete the cycle from recent visits
         UserRecentVisit.objects.filter(
             project_id=project_id,
@@ -661,123 +665,33 @@ class CycleProgressEndpoint(BaseAPIView):
         cycle = Cycle.objects.filter(workspace__slug=slug, project_id=project_id, id=cycle_id).first()
         if not cycle:
             return Response({"error": "Cycle not found"}, status=status.HTTP_404_NOT_FOUND)
-        aggregate_estimates = (
-            Issue.issue_objects.filter(
-                estimate_point__estimate__type="points",
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-            )
-            .annotate(value_as_float=Cast("estimate_point__value", FloatField()))
-            .aggregate(
-                backlog_estimate_point=Sum(
-                    Case(
-                        When(state__group="backlog", then="value_as_float"),
-                        default=Value(0),
-                        output_field=FloatField(),
-                    )
-                ),
-                unstarted_estimate_point=Sum(
-                    Case(
-                        When(state__group="unstarted", then="value_as_float"),
-                        default=Value(0),
-                        output_field=FloatField(),
-                    )
-                ),
-                started_estimate_point=Sum(
-                    Case(
-                        When(state__group="started", then="value_as_float"),
-                        default=Value(0),
-                        output_field=FloatField(),
-                    )
-                ),
-                cancelled_estimate_point=Sum(
-                    Case(
-                        When(state__group="cancelled", then="value_as_float"),
-                        default=Value(0),
-                        output_field=FloatField(),
-                    )
-                ),
-                completed_estimate_points=Sum(
-                    Case(
-                        When(state__group="completed", then="value_as_float"),
-                        default=Value(0),
-                        output_field=FloatField(),
-                    )
-                ),
-                total_estimate_points=Sum("value_as_float", default=Value(0), output_field=FloatField()),
-            )
-        )
+        progress = get_cycle_progress(cycle_id)
+        # The issue counts of a cycle whose issues were transferred are frozen at the transfer
         if cycle.progress_snapshot:
-            backlog_issues = cycle.progress_snapshot.get("backlog_issues", 0)
-            unstarted_issues = cycle.progress_snapshot.get("unstarted_issues", 0)
-            started_issues = cycle.progress_snapshot.get("started_issues", 0)
-            cancelled_issues = cycle.progress_snapshot.get("cancelled_issues", 0)
-            completed_issues = cycle.progress_snapshot.get("completed_issues", 0)
-            total_issues = cycle.progress_snapshot.get("total_issues", 0)
-        else:
-            backlog_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-                state__group="backlog",
-            ).count()
-
-            unstarted_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-                state__group="unstarted",
-            ).count()
-
-            started_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-                state__group="started",
-            ).count()
-
-            cancelled_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-                state__group="cancelled",
-            ).count()
-
-            completed_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-                state__group="completed",
-            ).count()
-
-            total_issues = Issue.issue_objects.filter(
-                issue_cycle__cycle_id=cycle_id,
-                issue_cycle__deleted_at__isnull=True,
-                workspace__slug=slug,
-                project_id=project_id,
-            ).count()
+            for field in [
+                "backlog_issues",
+                "unstarted_issues",
+                "started_issues",
+                "cancelled_issues",
+                "completed_issues",
+                "total_issues",
+            ]:
+                progress[field] = cycle.progress_snapshot.get(field, 0)
 
         return Response(
             {
-                "backlog_estimate_points": aggregate_estimates["backlog_estimate_point"] or 0,
-                "unstarted_estimate_points": aggregate_estimates["unstarted_estimate_point"] or 0,
-                "started_estimate_points": aggregate_estimates["started_estimate_point"] or 0,
-                "cancelled_estimate_points": aggregate_estimates["cancelled_estimate_point"] or 0,
-                "completed_estimate_points": aggregate_estimates["completed_estimate_points"] or 0,
-                "total_estimate_points": aggregate_estimates["total_estimate_points"],
-                "backlog_issues": backlog_issues,
-                "total_issues": total_issues,
-                "completed_issues": completed_issues,
-                "cancelled_issues": cancelled_issues,
-                "started_issues": started_issues,
-                "unstarted_issues": unstarted_issues,
+                "backlog_estimate_points": progress["backlog_estimate_points"],
+                "unstarted_estimate_points": progress["unstarted_estimate_points"],
+                "started_estimate_points": progress["started_estimate_points"],
+                "cancelled_estimate_points": progress["cancelled_estimate_points"],
+                "completed_estimate_points": progress["completed_estimate_points"],
+                "total_estimate_points": progress["total_estimate_points"],
+                "backlog_issues": progress["backlog_issues"],
+                "total_issues": progress["total_issues"],
+                "completed_issues": progress["completed_issues"],
+                "cancelled_issues": progress["cancelled_issues"],
+                "started_issues": progress["started_issues"],
+                "unstarted_issues": progress["unstarted_issues"],
             },
             status=status.HTTP_200_OK,
         )
@@ -787,22 +701,7 @@ class CycleAnalyticsEndpoint(BaseAPIView):
     @allow_permission([ROLE.ADMIN, ROLE.MEMBER, ROLE.GUEST])
     def get(self, request, slug, project_id, cycle_id):
         analytic_type = request.GET.get("type", "issues")
-        cycle = (
-            Cycle.objects.filter(workspace__slug=slug, project_id=project_id, id=cycle_id)
-            .annotate(
-                total_issues=Count(
-                    "issue_cycle__issue__id",
-                    distinct=True,
-                    filter=Q(
-                        issue_cycle__issue__archived_at__isnull=True,
-                        issue_cycle__issue__is_draft=False,
-                        issue_cycle__issue__deleted_at__isnull=True,
-                        issue_cycle__deleted_at__isnull=True,
-                    ),
-                )
-            )
-            .first()
-        )
+        cycle = Cycle.objects.filter(workspace__slug=slug, project_id=project_id, id=cycle_id).first()
 
         if not cycle.start_date or not cycle.end_date:
             return Response(
@@ -23,7 +23,7 @@ from kardon.app.serializers import (
     EstimateReadSerializer,
 )
 from kardon.utils.cache import invalidate_cache
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import queue_bulk_issue_activity
 
 
 def generate_random_name(length=10):
@@ -189,43 +189,31 @@ class EstimatePointEndpoint(BaseViewSet):
             estimate_id=estimate_id, project_id=project_id, workspace__slug=slug
         )
         # update all the issues with the new estimate
-        if new_estimate_id:
-            issues = Issue.objects.filter(
-                project_id=project_id,
-                workspace__slug=slug,
-                estimate_point_id=estimate_point_id,
-            )
-            for issue in issues:
-                issue_activity.delay(
-                    type="issue.activity.updated",
-                    requested_data=json.dumps({"estimate_point": (str(new_estimate_id) if new_estimate_id else None)}),
-                    actor_id=str(request.user.id),
-                    issue_id=issue.id,
-                    project_id=str(project_id),
-                    current_instance=json.dumps(
-                        {"estimate_point": (str(issue.estimate_point_id) if issue.estimate_point_id else None)}
+        issues = Issue.objects.filter(
+            project_id=project_id,
+            workspace__slug=slug,
+            estimate_point_id=estimate_point_id,
+        )
+        queue_bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=[
+                {
+                    "issue_id": str(issue.id),
+                    "requested_data": json.dumps(
+                        {"estimate_point": (str(new_estimate_id) if new_estimate_id else None)}
                     ),
-                    epoch=int(timezone.now().timestamp()),
-                )
-                issues.update(estimate_point_id=new_estimate_id)
-        else:
-            issues = Issue.objects.filter(
-                project_id=project_id,
-                workspace__slug=slug,
-                estimate_point_id=estimate_point_id,
-            )
-            for issue in issues:
-                issue_activity.delay(
-                    type="issue.activity.updated",
-                    requested_data=json.dumps({"estimate_point": None}),
-                    actor_id=str(request.user.id),
-                    issue_id=issue.id,
-                    project_id=str(project_id),
-                    current_instance=json.dumps(
+                    "current_instance": json.dumps(
                         {"estimate_point": (str(issue.estimate_point_id) if issue.estimate_point_id else None)}
                     ),
-                    epoch=int(timezone.now().timestamp()),
-                )
+                }
+                for issue in issues
+            ],
+            actor_id=str(request.user.id),
+            project_id=str(project_id),
+            epoch=int(timezone.now().timestamp()),
+        )
+        if new_estimate_id:
+            issues.update(estimate_point_id=new_estimate_id)
 
         # delete the estimate point
         old_estimate_point = EstimatePoint.objects.filter(pk=estimate_point_id).first()
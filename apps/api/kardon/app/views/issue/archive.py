@@ -23,7 +23,7 @@ from kardon.app.serializers import (
     IssueSerializer,
     IssueDetailSerializer,
 )
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import issue_activity, queue_bulk_issue_activity
 from kardon.db.models import (
     Issue,
     FileAsset,
@@ -316,6 +316,7 @@ class BulkArchiveIssuesEndpoint(BaseAPIView):
             "state"
         )
         bulk_archive_issues = []
+        issue_deltas = []
         for issue in issues:
             if issue.state.group not in ["completed", "cancelled"]:
                 return Response(
@@ -325,19 +326,24 @@ class BulkArchiveIssuesEndpoint(BaseAPIView):
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            issue_activity.delay(
-                type="issue.activity.updated",
-                requested_data=json.dumps({"archived_at": str(timezone.now().date()), "automation": False}),
-                actor_id=str(request.user.id),
-                issue_id=str(issue.id),
-                project_id=str(project_id),
-                current_instance=json.dumps(IssueSerializer(issue).data, cls=DjangoJSONEncoder),
-                epoch=int(timezone.now().timestamp()),
-                notification=True,
-                origin=base_host(request=request, is_app=True),
+            issue_deltas.append(
+                {
+                    "issue_id": str(issue.id),
+                    "requested_data": json.dumps({"archived_at": str(timezone.now().date()), "automation": False}),
+                    "current_instance": json.dumps(IssueSerializer(issue).data, cls=DjangoJSONEncoder),
+                }
             )
             issue.archived_at = timezone.now().date()
             bulk_archive_issues.append(issue)
         Issue.objects.bulk_update(bulk_archive_issues, ["archived_at"])
+        queue_bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=issue_deltas,
+            actor_id=str(request.user.id),
+            project_id=str(project_id),
+            epoch=int(timezone.now().timestamp()),
+            notification=True,
+            origin=base_host(request=request, is_app=True),
+        )
 
         return Response({"archived_at": str(timezone.now().date())}, status=status.HTTP_200_OK)
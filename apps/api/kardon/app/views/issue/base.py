@@ -40,9 +40,9 @@ from kardon.app.serializers import (
     IssueSerializer,
     ProjectUserPropertySerializer,
 )
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import issue_activity, queue_bulk_issue_activity
 from kardon.bgtasks.issue_description_version_task import issue_description_version_task
-from kardon.bgtasks.recent_visited_task import recent_visited_task
+from kardon.bgtasks.recent_visited_task import record_recent_visit
 from kardon.bgtasks.webhook_task import model_activity
 from kardon.db.models import (
     CycleIssue,
@@ -50,6 +50,7 @@ from kardon.db.models import (
     IntakeIssue,
     Issue,
     IssueAssignee,
+    IssueChange,
     IssueLabel,
     IssueLink,
     IssueReaction,
@@ -58,11 +59,10 @@ from kardon.db.models import (
     ProjectUserProperty,
     ModuleIssue,
     Project,
-    ProjectMember,
     UserRecentVisit,
 )
 from kardon.utils.filters import ComplexFilterBackend, IssueFilterSet
-from kardon.utils.global_paginator import paginate
+from kardon.utils.global_paginator import PAGINATOR_MAX_LIMIT, paginate
 from kardon.utils.grouper import (
     issue_group_values,
     issue_on_results,
@@ -70,8 +70,10 @@ from kardon.utils.grouper import (
 )
 from kardon.utils.host import base_host
 from kardon.utils.issue_filters import issue_filters
+from kardon.utils.membership import get_project_role
 from kardon.utils.order_queryset import order_issue_queryset
 from kardon.utils.paginator import GroupedOffsetPaginator, SubGroupedOffsetPaginator
+from kardon.utils.recent_visit import remove_recent_visits
 from kardon.utils.timezone_converter import user_timezone_converter
 
 from .. import BaseAPIView, BaseViewSet
@@ -148,7 +150,7 @@ class IssueListEndpoint(BaseAPIView):
         # issue queryset
         issue_queryset = issue_queryset_grouper(queryset=issue_queryset, group_by=group_by, sub_group_by=sub_group_by)
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             project_id=project_id,
             entity_name="project",
@@ -287,23 +289,14 @@ class IssueViewSet(BaseViewSet):
         # issue queryset
         issue_queryset = issue_queryset_grouper(queryset=issue_queryset, group_by=group_by, sub_group_by=sub_group_by)
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             project_id=project_id,
             entity_name="project",
             entity_identifier=project_id,
             user_id=request.user.id,
         )
-        if (
-            ProjectMember.objects.filter(
-                workspace__slug=slug,
-                project_id=project_id,
-                member=request.user,
-                role=5,
-                is_active=True,
-            ).exists()
-            and not project.guest_view_all_features
-        ):
+        if get_project_role(request, slug, project_id) == ROLE.GUEST.value and not project.guest_view_all_features:
             issue_queryset = issue_queryset.filter(created_by=request.user)
             filtered_issue_queryset = filtered_issue_queryset.filter(created_by=request.user)
 
@@ -585,13 +578,7 @@ class IssueViewSet(BaseViewSet):
         """
 
         if (
-            ProjectMember.objects.filter(
-                workspace__slug=slug,
-                project_id=project_id,
-                member=request.user,
-                role=5,
-                is_active=True,
-            ).exists()
+            get_project_role(request, slug, project_id) == ROLE.GUEST.value
             and not project.guest_view_all_features
             and not issue.created_by == request.user
         ):
@@ -600,7 +587,7 @@ class IssueViewSet(BaseViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             entity_name="issue",
             entity_identifier=pk,
@@ -705,6 +692,8 @@ class IssueViewSet(BaseViewSet):
         issue = Issue.objects.get(workspace__slug=slug, project_id=project_id, pk=pk)
 
         issue.delete()
+        # Drop it from the recent visits not flushed yet
+        remove_recent_visits(slug, "issue", pk, project_id)
         # delete the issue from recent visits
         UserRecentVisit.objects.filter(
             project_id=project_id,
@@ -776,8 +765,12 @@ class BulkDeleteIssuesEndpoint(BaseAPIView):
         ModuleIssue.objects.filter(issue_id__in=issue_ids).delete()
 
         # Finally, delete the issues themselves
+        deleted_issue_ids = [issue.id for issue in issues]
         issues.delete()
 
+        # The queryset delete skips the signals recording the changes of the issues
+        IssueChange.record(project_id, deleted_issue_ids, IssueChange.Action.DELETE)
+
         return Response(
             {"message": f"{total_issues} issues were deleted"},
             status=status.HTTP_200_OK,
@@ -848,13 +841,7 @@ class IssuePaginatedViewSet(BaseViewSet):
 
         return paginated_data
 
-    @allow_permission([ROLE.ADMIN, ROLE.MEMBER, ROLE.GUEST])
-    def list(self, request, slug, project_id):
-        cursor = request.GET.get("cursor", None)
-        is_description_required = request.GET.get("description", "false")
-        updated_at = request.GET.get("updated_at__gt", None)
-
-        # required fields
+    def get_required_fields(self, request):
         required_fields = [
             "id",
             "name",
@@ -884,34 +871,18 @@ class IssuePaginatedViewSet(BaseViewSet):
             "sub_issues_count",
         ]
 
-        if str(is_description_required).lower() == "true":
+        if str(request.GET.get("description", "false")).lower() == "true":
             required_fields.append("description_html")
 
-        # querying issues
-        base_queryset = Issue.issue_objects.filter(workspace__slug=slug, project_id=project_id)
+        return required_fields
 
-        base_queryset = base_queryset.order_by("updated_at")
-        queryset = self.get_queryset().order_by("updated_at")
-
-        # validation for guest user
+    def is_guest_restricted(self, request, slug, project_id):
+        """Guests only see their own issues unless the project shows them everything"""
         project = Project.objects.get(pk=project_id, workspace__slug=slug)
-        project_member = ProjectMember.objects.filter(
-            workspace__slug=slug,
-            project_id=project_id,
-            member=request.user,
-            role=5,
-            is_active=True,
-        )
-        if project_member.exists() and not project.guest_view_all_features:
-            base_queryset = base_queryset.filter(created_by=request.user)
-            queryset = queryset.filter(created_by=request.user)
+        return get_project_role(request, slug, project_id) == ROLE.GUEST.value and not project.guest_view_all_features
 
-        # filtering issues by greater then updated_at given by the user
-        if updated_at:
-            base_queryset = base_queryset.filter(updated_at__gt=updated_at)
-            queryset = queryset.filter(updated_at__gt=updated_at)
-
-        queryset = queryset.annotate(
+    def annotate_relation_ids(self, queryset):
+        return queryset.annotate(
             label_ids=Coalesce(
                 Subquery(
                     IssueLabel.objects.filter(issue_id=OuterRef("pk"))
@@ -947,6 +918,35 @@ class IssuePaginatedViewSet(BaseViewSet):
             ),
         )
 
+    @allow_permission([ROLE.ADMIN, ROLE.MEMBER, ROLE.GUEST])
+    def list(self, request, slug, project_id):
+        cursor = request.GET.get("cursor", None)
+        updated_at = request.GET.get("updated_at__gt", None)
+
+        # Read before the issues, the changes committed meanwhile are synced again
+        sync_token = IssueChange.get_sync_token(project_id)
+
+        # required fields
+        required_fields = self.get_required_fields(request)
+
+        # querying issues
+        base_queryset = Issue.issue_objects.filter(workspace__slug=slug, project_id=project_id)
+
+        base_queryset = base_queryset.order_by("updated_at")
+        queryset = self.get_queryset().order_by("updated_at")
+
+        # validation for guest user
+        if self.is_guest_restricted(request, slug, project_id):
+            base_queryset = base_queryset.filter(created_by=request.user)
+            queryset = queryset.filter(created_by=request.user)
+
+        # filtering issues by greater then updated_at given by the user
+        if updated_at:
+            base_queryset = base_queryset.filter(updated_at__gt=updated_at)
+            queryset = queryset.filter(updated_at__gt=updated_at)
+
+        queryset = self.annotate_relation_ids(queryset)
+
         paginated_data = paginate(
             base_queryset=base_queryset,
             queryset=queryset,
@@ -955,9 +955,55 @@ class IssuePaginatedViewSet(BaseViewSet):
                 required_fields, results, request.user.user_timezone
             ),
         )
+        paginated_data["sync_token"] = str(sync_token)
 
         return Response(paginated_data, status=status.HTTP_200_OK)
 
+    @allow_permission([ROLE.ADMIN, ROLE.MEMBER, ROLE.GUEST])
+    def sync(self, request, slug, project_id):
+        """
+        Return the issues changed after the sync token, oldest change first.
+        Issues deleted, archived, drafted or otherwise out of the list come
+        back as ids to drop.
+        """
+        try:
+            sync_token = int(request.GET.get("sync_token"))
+        except (TypeError, ValueError):
+            return Response({"error": "A valid sync token is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes = list(
+            IssueChange.objects.filter(project_id=project_id, sequence__gt=sync_token)
+            .order_by("sequence")
+            .values_list("issue_identifier", "sequence", "action")[: PAGINATOR_MAX_LIMIT + 1]
+        )
+        has_more = len(changes) > PAGINATOR_MAX_LIMIT
+        changes = changes[:PAGINATOR_MAX_LIMIT]
+
+        queryset = self.get_queryset().filter(
+            id__in=[issue_id for issue_id, _, action in changes if action == IssueChange.Action.UPSERT]
+        )
+        if self.is_guest_restricted(request, slug, project_id):
+            queryset = queryset.filter(created_by=request.user)
+
+        results = list(
+            self.process_paginated_result(
+                self.get_required_fields(request),
+                self.annotate_relation_ids(queryset),
+                request.user.user_timezone,
+            )
+        )
+        upserted_ids = {str(issue["id"]) for issue in results}
+
+        return Response(
+            {
+                "sync_token": str(changes[-1][1] if changes else sync_token),
+                "has_more": has_more,
+                "results": results,
+                "deleted": [str(issue_id) for issue_id, _, _ in changes if str(issue_id) not in upserted_ids],
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class IssueDetailEndpoint(BaseAPIView):
     filter_backends = (ComplexFilterBackend,)
@@ -1121,6 +1167,7 @@ class IssueBulkUpdateDateEndpoint(BaseAPIView):
         issues = list(Issue.objects.filter(id__in=issue_ids))
         issues_dict = {str(issue.id): issue for issue in issues}
         issues_to_update = []
+        issue_deltas = []
 
         for update in updates:
             issue_id = update["id"]
@@ -1139,27 +1186,23 @@ class IssueBulkUpdateDateEndpoint(BaseAPIView):
                 )
 
             if start_date:
-                issue_activity.delay(
-                    type="issue.activity.updated",
-                    requested_data=json.dumps({"start_date": update.get("start_date")}),
-                    current_instance=json.dumps({"start_date": str(issue.start_date)}),
-                    issue_id=str(issue_id),
-                    actor_id=str(request.user.id),
-                    project_id=str(project_id),
-                    epoch=epoch,
+                issue_deltas.append(
+                    {
+                        "issue_id": str(issue_id),
+                        "requested_data": json.dumps({"start_date": update.get("start_date")}),
+                        "current_instance": json.dumps({"start_date": str(issue.start_date)}),
+                    }
                 )
                 issue.start_date = start_date
                 issues_to_update.append(issue)
 
             if target_date:
-                issue_activity.delay(
-                    type="issue.activity.updated",
-                    requested_data=json.dumps({"target_date": update.get("target_date")}),
-                    current_instance=json.dumps({"target_date": str(issue.target_date)}),
-                    issue_id=str(issue_id),
-                    actor_id=str(request.user.id),
-                    project_id=str(project_id),
-                    epoch=epoch,
+                issue_deltas.append(
+                    {
+                        "issue_id": str(issue_id),
+                        "requested_data": json.dumps({"target_date": update.get("target_date")}),
+                        "current_instance": json.dumps({"target_date": str(issue.target_date)}),
+                    }
                 )
                 issue.target_date = target_date
                 issues_to_update.append(issue)
@@ -1167,6 +1210,15 @@ class IssueBulkUpdateDateEndpoint(BaseAPIView):
         # Bulk update issues
         Issue.objects.bulk_update(issues_to_update, ["start_date", "target_date"])
 
+        # Log the activities of all the updated issues together
+        queue_bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=issue_deltas,
+            actor_id=str(request.user.id),
+            project_id=str(project_id),
+            epoch=epoch,
+        )
+
         return Response({"message": "Issues updated successfully"}, status=status.HTTP_200_OK)
 
 
@@ -1205,12 +1257,7 @@ class IssueDetailIdentifierEndpoint(BaseAPIView):
         project = Project.objects.get(identifier__iexact=project_identifier, workspace__slug=slug)
 
         # Check if the user is a member of the project
-        if not ProjectMember.objects.filter(
-            workspace__slug=slug,
-            project_id=project.id,
-            member=request.user,
-            is_active=True,
-        ).exists():
+        if get_project_role(request, slug, project.id) is None:
             return Response(
                 {"error": "You are not allowed to view this issue"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -1326,13 +1373,7 @@ class IssueDetailIdentifierEndpoint(BaseAPIView):
         """
 
         if (
-            ProjectMember.objects.filter(
-                workspace__slug=slug,
-                project_id=project.id,
-                member=request.user,
-                role=5,
-                is_active=True,
-            ).exists()
+            get_project_role(request, slug, project.id) == ROLE.GUEST.value
             and not project.guest_view_all_features
             and not issue.created_by == request.user
         ):
@@ -1341,7 +1382,7 @@ class IssueDetailIdentifierEndpoint(BaseAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             entity_name="issue",
             entity_identifier=str(issue.id),
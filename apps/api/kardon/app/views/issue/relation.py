@@ -30,76 +30,54 @@ from kardon.db.models import (
     CycleIssue,
 )
 from kardon.bgtasks.issue_activities_task import issue_activity
-from kardon.utils.issue_relation_mapper import get_actual_relation
+from kardon.utils.issue_graph import (
+    DEPENDENCY_RELATIONS,
+    TRANSITIVE_RELATIONS,
+    creates_cycle,
+    get_critical_path,
+    get_transitive_issue_ids,
+)
+from kardon.utils.issue_relation_mapper import get_actual_relation, get_inverse_relation
 from kardon.utils.host import base_host
 
 
+# Relation types listed for an issue, as they read from it
+RELATION_TYPES = [
+    "blocking",
+    "blocked_by",
+    "duplicate",
+    "relates_to",
+    "start_after",
+    "start_before",
+    "finish_after",
+    "finish_before",
+]
+
+
 class IssueRelationViewSet(BaseViewSet):
     serializer_class = IssueRelationSerializer
     model = IssueRelation
     permission_classes = [ProjectEntityPermission]
 
-    def list(self, request, slug, project_id, issue_id):
-        issue_relations = (
-            IssueRelation.objects.filter(Q(issue_id=issue_id) | Q(related_issue=issue_id))
-            .filter(workspace__slug=self.kwargs.get("slug"))
-            .select_related("project")
-            .select_related("workspace")
-            .select_related("issue")
-            .order_by("-created_at")
-            .distinct()
-        )
-        # get all blocking issues
-        blocking_issues = issue_relations.filter(relation_type="blocked_by", related_issue_id=issue_id).values_list(
-            "issue_id", flat=True
-        )
-
-        # get all blocked by issues
-        blocked_by_issues = issue_relations.filter(relation_type="blocked_by", issue_id=issue_id).values_list(
-            "related_issue_id", flat=True
-        )
-
-        # get all duplicate issues
-        duplicate_issues = issue_relations.filter(issue_id=issue_id, relation_type="duplicate").values_list(
-            "related_issue_id", flat=True
-        )
-
-        # get all relates to issues
-        duplicate_issues_related = issue_relations.filter(
-            related_issue_id=issue_id, relation_type="duplicate"
-        ).values_list("issue_id", flat=True)
-
-        # get all relates to issues
-        relates_to_issues = issue_relations.filter(issue_id=issue_id, relation_type="relates_to").values_list(
-            "related_issue_id", flat=True
-        )
-
-        # get all relates to issues
-        relates_to_issues_related = issue_relations.filter(
-            related_issue_id=issue_id, relation_type="relates_to"
-        ).values_list("issue_id", flat=True)
-
-        # get all start after issues
-        start_after_issues = issue_relations.filter(
-            relation_type="start_before", related_issue_id=issue_id
-        ).values_list("issue_id", flat=True)
-
-        # get all start_before issues
-        start_before_issues = issue_relations.filter(relation_type="start_before", issue_id=issue_id).values_list(
-            "related_issue_id", flat=True
-        )
-
-        # get all finish after issues
-        finish_after_issues = issue_relations.filter(
-            relation_type="finish_before", related_issue_id=issue_id
-        ).values_list("issue_id", flat=True)
-
-        # get all finish before issues
-        finish_before_issues = issue_relations.filter(relation_type="finish_before", issue_id=issue_id).values_list(
-            "related_issue_id", flat=True
-        )
+    # Fields of the related issues
+    related_issue_fields = [
+        "id",
+        "name",
+        "state_id",
+        "sort_order",
+        "priority",
+        "sequence_id",
+        "project_id",
+        "label_ids",
+        "assignee_ids",
+        "created_at",
+        "updated_at",
+        "created_by",
+        "updated_by",
+    ]
 
-        queryset = (
+    def get_related_issue_queryset(self, slug):
+        return (
             Issue.issue_objects.filter(workspace__slug=slug)
             .select_related("workspace", "project", "state", "parent")
             .prefetch_related("assignees", "labels", "issue_module__module")
@@ -153,59 +131,73 @@ class IssueRelationViewSet(BaseViewSet):
             )
         ).distinct()
 
-        # Fields
-        fields = [
-            "id",
-            "name",
-            "state_id",
-            "sort_order",
-            "priority",
-            "sequence_id",
-            "project_id",
-            "label_ids",
-            "assignee_ids",
-            "created_at",
-            "updated_at",
-            "created_by",
-            "updated_by",
-            "relation_type",
-        ]
+    def list(self, request, slug, project_id, issue_id):
+        issue_relations = (
+            IssueRelation.objects.filter(Q(issue_id=issue_id) | Q(related_issue=issue_id))
+            .filter(workspace__slug=self.kwargs.get("slug"))
+            .values_list("issue_id", "related_issue_id", "relation_type")
+        )
+
+        # Sort the relations of the issue by the way they read from it, in one query
+        related_issue_ids = {relation_type: [] for relation_type in RELATION_TYPES}
+        for relation_issue_id, relation_related_issue_id, relation_type in issue_relations:
+            if str(relation_issue_id) == str(issue_id):
+                relation_type, related_issue_id = relation_type, relation_related_issue_id
+            else:
+                relation_type, related_issue_id = get_inverse_relation(relation_type), relation_issue_id
+            if relation_type in related_issue_ids:
+                related_issue_ids[relation_type].append(related_issue_id)
+
+        related_issues = {
+            str(issue["id"]): issue
+            for issue in self.get_related_issue_queryset(slug)
+            .filter(pk__in=[pk for issue_ids in related_issue_ids.values() for pk in issue_ids])
+            .values(*self.related_issue_fields)
+        }
 
         response_data = {
-            "blocking": queryset.filter(pk__in=blocking_issues)
-            .annotate(relation_type=Value("blocking", output_field=CharField()))
-            .values(*fields),
-            "blocked_by": queryset.filter(pk__in=blocked_by_issues)
-            .annotate(relation_type=Value("blocked_by", output_field=CharField()))
-            .values(*fields),
-            "duplicate": queryset.filter(pk__in=duplicate_issues)
-            .annotate(relation_type=Value("duplicate", output_field=CharField()))
-            .values(*fields)
-            | queryset.filter(pk__in=duplicate_issues_related)
-            .annotate(relation_type=Value("duplicate", output_field=CharField()))
-            .values(*fields),
-            "relates_to": queryset.filter(pk__in=relates_to_issues)
-            .annotate(relation_type=Value("relates_to", output_field=CharField()))
-            .values(*fields)
-            | queryset.filter(pk__in=relates_to_issues_related)
-            .annotate(relation_type=Value("relates_to", output_field=CharField()))
-            .values(*fields),
-            "start_after": queryset.filter(pk__in=start_after_issues)
-            .annotate(relation_type=Value("start_after", output_field=CharField()))
-            .values(*fields),
-            "start_before": queryset.filter(pk__in=start_before_issues)
-            .annotate(relation_type=Value("start_before", output_field=CharField()))
-            .values(*fields),
-            "finish_after": queryset.filter(pk__in=finish_after_issues)
-            .annotate(relation_type=Value("finish_after", output_field=CharField()))
-            .values(*fields),
-            "finish_before": queryset.filter(pk__in=finish_before_issues)
-            .annotate(relation_type=Value("finish_before", output_field=CharField()))
-            .values(*fields),
+            relation_type: [
+                {**related_issues[str(pk)], "relation_type": relation_type}
+                for pk in issue_ids
+                if str(pk) in related_issues
+            ]
+            for relation_type, issue_ids in related_issue_ids.items()
         }
 
         return Response(response_data, status=status.HTTP_200_OK)
 
+    def graph(self, request, slug, project_id, issue_id):
+        """Return every issue the relation type reaches from the issue, recursively"""
+        relation_type = request.GET.get("relation_type", "blocking")
+        if relation_type not in TRANSITIVE_RELATIONS:
+            return Response(
+                {"error": f"Relation type must be one of {', '.join(TRANSITIVE_RELATIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        issues = (
+            self.get_related_issue_queryset(slug)
+            .filter(pk__in=get_transitive_issue_ids(issue_id, relation_type))
+            .annotate(relation_type=Value(relation_type, output_field=CharField()))
+            .values(*self.related_issue_fields, "relation_type")
+        )
+        return Response(issues, status=status.HTTP_200_OK)
+
+    def critical_path(self, request, slug, project_id, issue_id):
+        """Return the longest chain of start and finish dependencies running through the issue"""
+        path, duration = get_critical_path(issue_id)
+
+        issues = {
+            str(issue["id"]): issue
+            for issue in self.get_related_issue_queryset(slug)
+            .filter(pk__in=path)
+            .values(*self.related_issue_fields, "start_date", "target_date")
+        }
+        return Response(
+            {"duration": duration, "issues": [issues[pk] for pk in path if pk in issues]},
+            status=status.HTTP_200_OK,
+        )
+
     def create(self, request, slug, project_id, issue_id):
         relation_type = request.data.get("relation_type", None)
         if relation_type is None:
@@ -217,6 +209,20 @@ class IssueRelationViewSet(BaseViewSet):
         issues = request.data.get("issues", [])
         project = Project.objects.get(pk=project_id)
 
+        # Dependencies closing a cycle could never be scheduled
+        if get_actual_relation(relation_type) in DEPENDENCY_RELATIONS:
+            reversed_relation = relation_type in ["blocked_by", "start_after", "finish_after"]
+            cyclic_issues = [
+                issue
+                for issue in issues
+                if creates_cycle(*((issue, issue_id) if reversed_relation else (issue_id, issue)))
+            ]
+            if cyclic_issues:
+                return Response(
+                    {"error": "The relation would create a dependency cycle", "issues": cyclic_issues},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
         issue_relation = IssueRelation.objects.bulk_create(
             [
                 IssueRelation(
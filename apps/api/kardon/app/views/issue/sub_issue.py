@@ -23,7 +23,7 @@ from .. import BaseAPIView
 from kardon.app.serializers import IssueSerializer
 from kardon.app.permissions import ProjectEntityPermission
 from kardon.db.models import Issue, IssueLink, FileAsset, CycleIssue
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import queue_bulk_issue_activity
 from kardon.utils.timezone_converter import user_timezone_converter
 from collections import defaultdict
 from kardon.utils.host import base_host
@@ -190,20 +190,22 @@ class SubIssuesEndpoint(BaseAPIView):
         updated_sub_issues = Issue.issue_objects.filter(id__in=sub_issue_ids).annotate(state_group=F("state__group"))
 
         # Track the issue
-        _ = [
-            issue_activity.delay(
-                type="issue.activity.updated",
-                requested_data=json.dumps({"parent": str(issue_id)}),
-                actor_id=str(request.user.id),
-                issue_id=str(sub_issue_id),
-                project_id=str(project_id),
-                current_instance=json.dumps({"parent": str(sub_issue_id)}),
-                epoch=int(timezone.now().timestamp()),
-                notification=True,
-                origin=base_host(request=request, is_app=True),
-            )
-            for sub_issue_id in sub_issue_ids
-        ]
+        queue_bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=[
+                {
+                    "issue_id": str(sub_issue_id),
+                    "requested_data": json.dumps({"parent": str(issue_id)}),
+                    "current_instance": json.dumps({"parent": str(sub_issue_id)}),
+                }
+                for sub_issue_id in sub_issue_ids
+            ],
+            actor_id=str(request.user.id),
+            project_id=str(project_id),
+            epoch=int(timezone.now().timestamp()),
+            notification=True,
+            origin=base_host(request=request, is_app=True),
+        )
 
         # create's a dict with state group name with their respective issue id's
         result = defaultdict(list)
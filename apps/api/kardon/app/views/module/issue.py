@@ -19,7 +19,7 @@ from rest_framework.response import Response
 
 from kardon.app.permissions import allow_permission, ROLE
 from kardon.app.serializers import ModuleIssueSerializer
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import issue_activity, queue_bulk_issue_activity
 from kardon.db.models import (
     Issue,
     FileAsset,
@@ -229,20 +229,22 @@ class ModuleIssueViewSet(BaseViewSet):
             ignore_conflicts=True,
         )
         # Bulk Update the activity
-        _ = [
-            issue_activity.delay(
-                type="module.activity.created",
-                requested_data=json.dumps({"module_id": str(module_id)}),
-                actor_id=str(request.user.id),
-                issue_id=str(issue),
-                project_id=project_id,
-                current_instance=None,
-                epoch=int(timezone.now().timestamp()),
-                notification=True,
-                origin=base_host(request=request, is_app=True),
-            )
-            for issue in issues
-        ]
+        queue_bulk_issue_activity(
+            type="module.activity.created",
+            issue_deltas=[
+                {
+                    "issue_id": str(issue),
+                    "requested_data": json.dumps({"module_id": str(module_id)}),
+                    "current_instance": None,
+                }
+                for issue in issues
+            ],
+            actor_id=str(request.user.id),
+            project_id=str(project_id),
+            epoch=int(timezone.now().timestamp()),
+            notification=True,
+            origin=base_host(request=request, is_app=True),
+        )
         return Response({"message": "success"}, status=status.HTTP_201_CREATED)
 
     @allow_permission([ROLE.ADMIN, ROLE.MEMBER])
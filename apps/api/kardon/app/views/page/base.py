@@ -51,7 +51,8 @@ from kardon.utils.error_codes import ERROR_CODES
 from ..base import BaseAPIView, BaseViewSet
 from kardon.bgtasks.page_transaction_task import page_transaction
 from kardon.bgtasks.page_version_task import page_version
-from kardon.bgtasks.recent_visited_task import recent_visited_task
+from kardon.bgtasks.recent_visited_task import record_recent_visit
+from kardon.utils.recent_visit import remove_recent_visits
 from kardon.bgtasks.copy_s3_object import copy_s3_objects_of_description_and_assets
 from kardon.app.permissions import ProjectPagePermission
 
@@ -234,7 +235,7 @@ class PageViewSet(BaseViewSet):
             data = PageDetailSerializer(page).data
             data["issue_ids"] = issue_ids
             if track_visit:
-                recent_visited_task.delay(
+                record_recent_visit(
                     slug=slug,
                     entity_name="page",
                     entity_identifier=page_id,
@@ -409,6 +410,8 @@ class PageViewSet(BaseViewSet):
             entity_identifier=page_id,
             entity_type="page",
         ).delete()
+        # Drop it from the recent visits not flushed yet
+        remove_recent_visits(slug, "page", page_id, project_id)
         # Delete the page from recent visit
         UserRecentVisit.objects.filter(
             project_id=project_id,
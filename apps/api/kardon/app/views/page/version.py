@@ -11,6 +11,7 @@ from kardon.db.models import PageVersion
 from ..base import BaseAPIView
 from kardon.app.serializers import PageVersionSerializer, PageVersionDetailSerializer
 from kardon.app.permissions import ProjectPagePermission
+from kardon.utils.page_version import load_page_version
 
 
 class PageVersionEndpoint(BaseAPIView):
@@ -20,7 +21,9 @@ class PageVersionEndpoint(BaseAPIView):
         # Check if pk is provided
         if pk:
             # Return a single page version
-            page_version = PageVersion.objects.get(workspace__slug=slug, page_id=page_id, pk=pk)
+            page_version = PageVersion.objects.select_related("base").get(workspace__slug=slug, page_id=page_id, pk=pk)
+            # Rebuild the content of versions stored as a delta
+            load_page_version(page_version)
             # Serialize the page version
             serializer = PageVersionDetailSerializer(page_version)
             return Response(serializer.data, status=status.HTTP_200_OK)
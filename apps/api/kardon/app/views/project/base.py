@@ -23,7 +23,7 @@ from kardon.app.serializers import (
     ProjectSerializer,
 )
 from kardon.app.views.base import BaseAPIView, BaseViewSet
-from kardon.bgtasks.recent_visited_task import recent_visited_task
+from kardon.bgtasks.recent_visited_task import record_recent_visit
 from kardon.bgtasks.webhook_task import model_activity, webhook_activity
 from kardon.db.models import (
     UserFavorite,
@@ -230,7 +230,7 @@ class ProjectViewSet(BaseViewSet):
                     status=status.HTTP_409_CONFLICT,
                 )
 
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             project_id=pk,
             entity_name="project",
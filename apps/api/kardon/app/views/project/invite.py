@@ -32,6 +32,7 @@ from kardon.db.models import (
 )
 from kardon.db.models.project import ProjectNetwork
 from kardon.utils.host import base_host
+from kardon.utils.membership import invalidate_membership_cache
 
 
 class ProjectInvitationsViewset(BaseViewSet):
@@ -163,6 +164,7 @@ class UserProjectInvitationsViewset(BaseViewSet):
             ],
             ignore_conflicts=True,
         )
+        invalidate_membership_cache([request.user.id])
 
         ProjectUserProperty.objects.bulk_create(
             [
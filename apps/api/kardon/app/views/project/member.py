@@ -21,6 +21,7 @@ from kardon.app.permissions import WorkspaceUserPermission
 from kardon.db.models import Project, ProjectMember, ProjectUserProperty, WorkspaceMember
 from kardon.bgtasks.project_add_user_email_task import project_add_user_email
 from kardon.utils.host import base_host
+from kardon.utils.membership import invalidate_membership_cache
 from kardon.app.permissions.base import allow_permission, ROLE
 
 
@@ -132,6 +133,7 @@ class ProjectMemberViewSet(BaseViewSet):
 
         # Bulk create the project members and issue properties
         project_members = ProjectMember.objects.bulk_create(bulk_project_members, batch_size=10, ignore_conflicts=True)
+        invalidate_membership_cache([member.get("member_id") for member in members])
 
         _ = ProjectUserProperty.objects.bulk_create(bulk_issue_props, batch_size=10, ignore_conflicts=True)
 
@@ -36,10 +36,14 @@ from kardon.db.models import (
     Module,
     Page,
     IssueView,
+    IntakeIssue,
     ProjectMember,
     ProjectPage,
     WorkspaceMember,
 )
+from kardon.utils.issue_search import search_issues
+from kardon.utils.membership import get_member_project_ids
+from kardon.utils.search import search_queryset
 
 
 class GlobalSearchEndpoint(BaseAPIView):
@@ -48,54 +52,26 @@ class GlobalSearchEndpoint(BaseAPIView):
     """
 
     def filter_workspaces(self, query, _slug, _project_id, _workspace_search):
-        fields = ["name"]
-        q = Q()
+        workspaces = Workspace.objects.filter(workspace_member__member=self.request.user)
         if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
-        return (
-            Workspace.objects.filter(q, workspace_member__member=self.request.user)
-            .order_by("-created_at")
-            .distinct()
-            .values("name", "id", "slug")
-        )
+            workspaces = workspaces.filter(name__icontains=query)
+        return workspaces.order_by("-created_at").distinct().values("name", "id", "slug")
 
     def filter_projects(self, query, slug, _project_id, _workspace_search):
-        fields = ["name", "identifier"]
-        q = Q()
-        if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
-        return (
-            Project.objects.filter(
-                q,
-                project_projectmember__member=self.request.user,
-                project_projectmember__is_active=True,
-                archived_at__isnull=True,
-                workspace__slug=slug,
-            )
-            .order_by("-created_at")
-            .distinct()
-            .values("name", "id", "identifier", "workspace__slug")
+        projects = Project.objects.filter(
+            id__in=get_member_project_ids(self.request, slug),
+            archived_at__isnull=True,
+            workspace__slug=slug,
         )
-
-    def filter_issues(self, query, slug, project_id, workspace_search):
-        fields = ["name", "sequence_id", "project__identifier"]
-        q = Q()
         if query:
-            for field in fields:
-                if field == "sequence_id":
-                    # Match whole integers only (exclude decimal numbers)
-                    sequences = re.findall(r"\b\d+\b", query)
-                    for sequence_id in sequences:
-                        q |= Q(**{"sequence_id": sequence_id})
-                else:
-                    q |= Q(**{f"{field}__icontains": query})
+            projects = search_queryset(projects, query, extra=Q(identifier__icontains=query))
+        else:
+            projects = projects.order_by("-created_at")
+        return projects.values("name", "id", "identifier", "workspace__slug")
 
+    def filter_issues(self, query, slug, project_id, workspace_search):
         issues = Issue.issue_objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
+            project_id__in=get_member_project_ids(self.request, slug),
             project__archived_at__isnull=True,
             workspace__slug=slug,
         )
@@ -103,7 +79,10 @@ class GlobalSearchEndpoint(BaseAPIView):
         if workspace_search == "false" and project_id:
             issues = issues.filter(project_id=project_id)
 
-        return issues.distinct().values(
+        if query:
+            issues = search_issues(query, issues, slug=slug)
+
+        return issues.values(
             "name",
             "id",
             "sequence_id",
@@ -112,64 +91,33 @@ class GlobalSearchEndpoint(BaseAPIView):
             "workspace__slug",
         )[:100]
 
-    def filter_cycles(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
-
-        cycles = Cycle.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
+    def filter_project_entities(self, queryset, query, slug, project_id, workspace_search):
+        """Search the cycles, modules or views of the projects the user is a member of"""
+        queryset = queryset.filter(
+            project_id__in=get_member_project_ids(self.request, slug),
             project__archived_at__isnull=True,
             workspace__slug=slug,
         )
 
         if workspace_search == "false" and project_id:
-            cycles = cycles.filter(project_id=project_id)
-
-        return (
-            cycles.order_by("-created_at")
-            .distinct()
-            .values("name", "id", "project_id", "project__identifier", "workspace__slug")
-        )
+            queryset = queryset.filter(project_id=project_id)
 
-    def filter_modules(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
         if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
+            queryset = search_queryset(queryset, query)
+        else:
+            queryset = queryset.order_by("-created_at")
 
-        modules = Module.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
-            project__archived_at__isnull=True,
-            workspace__slug=slug,
-        )
+        return queryset.values("name", "id", "project_id", "project__identifier", "workspace__slug")
 
-        if workspace_search == "false" and project_id:
-            modules = modules.filter(project_id=project_id)
+    def filter_cycles(self, query, slug, project_id, workspace_search):
+        return self.filter_project_entities(Cycle.objects.all(), query, slug, project_id, workspace_search)
 
-        return (
-            modules.order_by("-created_at")
-            .distinct()
-            .values("name", "id", "project_id", "project__identifier", "workspace__slug")
-        )
+    def filter_modules(self, query, slug, project_id, workspace_search):
+        return self.filter_project_entities(Module.objects.all(), query, slug, project_id, workspace_search)
 
     def filter_pages(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
-
         pages = (
             Page.objects.filter(
-                q,
                 projects__project_projectmember__member=self.request.user,
                 projects__project_projectmember__is_active=True,
                 projects__archived_at__isnull=True,
@@ -200,72 +148,40 @@ class GlobalSearchEndpoint(BaseAPIView):
 
             pages = pages.annotate(project_id=Subquery(project_subquery)).filter(project_id=project_id)
 
-        return (
-            pages.order_by("-created_at")
-            .distinct()
-            .values("name", "id", "project_ids", "project_identifiers", "workspace__slug")
-        )
-
-    def filter_views(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
         if query:
-            for field in fields:
-                q |= Q(**{f"{field}__icontains": query})
-
-        issue_views = IssueView.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
-            project__archived_at__isnull=True,
-            workspace__slug=slug,
-        )
+            pages = search_queryset(pages, query)
+        else:
+            pages = pages.order_by("-created_at")
 
-        if workspace_search == "false" and project_id:
-            issue_views = issue_views.filter(project_id=project_id)
+        return pages.distinct().values("name", "id", "project_ids", "project_identifiers", "workspace__slug")
 
-        return (
-            issue_views.order_by("-created_at")
-            .distinct()
-            .values("name", "id", "project_id", "project__identifier", "workspace__slug")
-        )
+    def filter_views(self, query, slug, project_id, workspace_search):
+        return self.filter_project_entities(IssueView.objects.all(), query, slug, project_id, workspace_search)
 
     def filter_intakes(self, query, slug, project_id, workspace_search):
-        fields = ["name", "sequence_id", "project__identifier"]
-        q = Q()
-        if query:
-            for field in fields:
-                if field == "sequence_id":
-                    # Match whole integers only (exclude decimal numbers)
-                    sequences = re.findall(r"\b\d+\b", query)
-                    for sequence_id in sequences:
-                        q |= Q(**{"sequence_id": sequence_id})
-                else:
-                    q |= Q(**{f"{field}__icontains": query})
-
         issues = Issue.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
+            project_id__in=get_member_project_ids(self.request, slug),
             project__archived_at__isnull=True,
             workspace__slug=slug,
-        ).filter(models.Q(issue_intake__status=0) | models.Q(issue_intake__status=-2))
+            id__in=IntakeIssue.objects.filter(status__in=[0, -2]).values("issue_id"),
+        )
 
         if workspace_search == "false" and project_id:
             issues = issues.filter(project_id=project_id)
 
-        return (
-            issues.order_by("-created_at")
-            .distinct()
-            .values(
-                "name",
-                "id",
-                "sequence_id",
-                "project__identifier",
-                "project_id",
-                "workspace__slug",
-            )[:100]
-        )
+        if query:
+            issues = search_issues(query, issues, slug=slug)
+        else:
+            issues = issues.order_by("-created_at")
+
+        return issues.values(
+            "name",
+            "id",
+            "sequence_id",
+            "project__identifier",
+            "project_id",
+            "workspace__slug",
+        )[:100]
 
     def get(self, request, slug):
         query = request.query_params.get("search", False)
@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from .base import BaseAPIView
 from kardon.db.models import Issue, ProjectMember, IssueRelation
 from kardon.utils.issue_search import search_issues
+from kardon.utils.membership import get_member_project_ids
 
 
 class IssueSearchEndpoint(BaseAPIView):
@@ -25,12 +26,12 @@ class IssueSearchEndpoint(BaseAPIView):
 
         return issues
 
-    def search_issues_by_query(self, query: str, issues: QuerySet) -> QuerySet:
+    def search_issues_by_query(self, query: str, issues: QuerySet, slug: str) -> QuerySet:
         """
         Search issues by query
         """
 
-        issues = search_issues(query, issues)
+        issues = search_issues(query, issues, slug=slug)
 
         return issues
 
@@ -109,8 +110,7 @@ class IssueSearchEndpoint(BaseAPIView):
 
         issues = Issue.issue_objects.filter(
             workspace__slug=slug,
-            project__project_projectmember__member=self.request.user,
-            project__project_projectmember__is_active=True,
+            project_id__in=get_member_project_ids(request, slug),
             project__archived_at__isnull=True,
         )
 
@@ -118,7 +118,7 @@ class IssueSearchEndpoint(BaseAPIView):
             issues = self.filter_issues_by_project(project_id, issues)
 
         if query:
-            issues = self.search_issues_by_query(query, issues)
+            issues = self.search_issues_by_query(query, issues, slug)
 
         if parent == "true" and issue_id:
             issues = self.search_issues_and_excluding_parent(issues, issue_id)
@@ -42,7 +42,8 @@ from kardon.db.models import (
 )
 from kardon.utils.issue_filters import issue_filters
 from kardon.utils.order_queryset import order_issue_queryset
-from kardon.bgtasks.recent_visited_task import recent_visited_task
+from kardon.bgtasks.recent_visited_task import record_recent_visit
+from kardon.utils.recent_visit import remove_recent_visits
 from .. import BaseViewSet
 from kardon.db.models import UserFavorite
 from kardon.utils.filters import ComplexFilterBackend
@@ -102,7 +103,7 @@ class WorkspaceViewViewSet(BaseViewSet):
     def retrieve(self, request, slug, pk):
         issue_view = self.get_queryset().filter(pk=pk).first()
         serializer = IssueViewSerializer(issue_view)
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             project_id=None,
             entity_name="view",
@@ -331,7 +332,7 @@ class IssueViewViewSet(BaseViewSet):
             )
 
         serializer = IssueViewSerializer(issue_view)
-        recent_visited_task.delay(
+        record_recent_visit(
             slug=slug,
             project_id=project_id,
             entity_name="view",
@@ -383,6 +384,8 @@ class IssueViewViewSet(BaseViewSet):
                 entity_identifier=pk,
                 entity_type="view",
             ).delete()
+            # Drop it from the recent visits not flushed yet
+            remove_recent_visits(slug, "view", pk, project_id)
             # Delete the page from recent visit
             UserRecentVisit.objects.filter(
                 project_id=project_id,
@@ -30,6 +30,7 @@ from kardon.bgtasks.workspace_invitation_task import workspace_invitation
 from kardon.db.models import User, Workspace, WorkspaceMember, WorkspaceMemberInvite
 from kardon.utils.cache import invalidate_cache, invalidate_cache_directly
 from kardon.utils.host import base_host
+from kardon.utils.membership import invalidate_membership_cache
 from kardon.utils.analytics_events import USER_JOINED_WORKSPACE, USER_INVITED_TO_WORKSPACE
 from .. import BaseViewSet
 
@@ -298,6 +299,7 @@ class UserWorkspaceInvitationsViewSet(BaseViewSet):
             ],
             ignore_conflicts=True,
         )
+        invalidate_membership_cache([request.user.id])
 
         # Delete joined workspace invites
         workspace_invitations.delete()
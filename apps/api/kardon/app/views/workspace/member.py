@@ -23,6 +23,7 @@ from kardon.app.serializers import (
 from kardon.app.views.base import BaseAPIView
 from kardon.db.models import Project, ProjectMember, WorkspaceMember, DraftIssue
 from kardon.utils.cache import invalidate_cache
+from kardon.utils.membership import invalidate_membership_cache
 
 from .. import BaseViewSet
 
@@ -87,6 +88,7 @@ class WorkSpaceMemberViewSet(BaseViewSet):
         # If a user is moved to a guest role he can't have any other role in projects
         if "role" in request.data and int(request.data.get("role")) == 5:
             ProjectMember.objects.filter(workspace__slug=slug, member_id=workspace_member.member_id).update(role=5)
+            invalidate_membership_cache([workspace_member.member_id])
 
         serializer = WorkSpaceMemberSerializer(workspace_member, data=request.data, partial=True)
 
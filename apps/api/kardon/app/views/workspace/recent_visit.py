@@ -12,6 +12,7 @@ from kardon.app.serializers import WorkspaceRecentVisitSerializer
 # Modules imports
 from ..base import BaseViewSet
 from kardon.app.permissions import allow_permission, ROLE
+from kardon.utils.recent_visit import get_recent_visits
 
 
 class UserRecentVisitViewSet(BaseViewSet):
@@ -23,14 +24,17 @@ class UserRecentVisitViewSet(BaseViewSet):
 
     @allow_permission([ROLE.ADMIN, ROLE.MEMBER, ROLE.GUEST], level="WORKSPACE")
     def list(self, request, slug):
-        user_recent_visits = UserRecentVisit.objects.filter(workspace__slug=slug, user=request.user)
+        # Read from the sorted set of the user with the visits not flushed yet
+        user_recent_visits = get_recent_visits(slug, request.user)
 
         entity_name = request.query_params.get("entity_name")
 
         if entity_name:
-            user_recent_visits = user_recent_visits.filter(entity_name=entity_name)
+            user_recent_visits = [visit for visit in user_recent_visits if visit.entity_name == entity_name]
 
-        user_recent_visits = user_recent_visits.filter(entity_name__in=["issue", "page", "project"])
+        user_recent_visits = [
+            visit for visit in user_recent_visits if visit.entity_name in ["issue", "page", "project"]
+        ]
 
         serializer = WorkspaceRecentVisitSerializer(user_recent_visits[:20], many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
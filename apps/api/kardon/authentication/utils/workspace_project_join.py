@@ -13,6 +13,7 @@ from kardon.db.models import (
     WorkspaceMemberInvite,
 )
 from kardon.utils.cache import invalidate_cache_directly
+from kardon.utils.membership import invalidate_membership_cache
 from kardon.bgtasks.event_tracking_task import track_event
 from kardon.utils.analytics_events import USER_JOINED_WORKSPACE
 
@@ -86,6 +87,8 @@ def process_workspace_project_invitations(user):
         ignore_conflicts=True,
     )
 
+    invalidate_membership_cache([user.id])
+
     # Delete all the invites
     workspace_member_invites.delete()
     project_member_invites.delete()
@@ -0,0 +1,133 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import logging
+from collections import defaultdict
+
+# Django imports
+from django.conf import settings
+
+# Third party imports
+from celery import shared_task
+
+# Module imports
+from kardon.db.models import AnalyticsRollupState, Project
+from kardon.settings.redis import redis_instance
+from kardon.utils.analytics_rollup import (
+    get_stale_rollup_project_ids,
+    refresh_analytics_rollup,
+    update_analytics_rollup,
+)
+from kardon.utils.exception_logger import log_exception
+
+logger = logging.getLogger("kardon.worker")
+
+ANALYTICS_ROLLUP_KEY_PREFIX = "analytics_rollup_refresh"
+
+
+def schedule_analytics_rollup_refresh(ri):
+    """Schedule the refresh task once per window, at the first change marked in it"""
+    # The flag expires on its own if the refresh never runs, the next change reschedules it
+    if ri.set(f"{ANALYTICS_ROLLUP_KEY_PREFIX}:scheduled", 1, nx=True, ex=settings.ANALYTICS_ROLLUP_REFRESH_WINDOW + 60):
+        analytics_rollup_refresh_task.apply_async(countdown=settings.ANALYTICS_ROLLUP_REFRESH_WINDOW)
+
+
+def queue_analytics_rollup_refresh(project_ids):
+    """Mark the projects for a full rebuild of their rollup at the end of the window"""
+    project_ids = {str(project_id) for project_id in project_ids if project_id}
+    if not project_ids:
+        return
+
+    ri = redis_instance()
+    ri.sadd(f"{ANALYTICS_ROLLUP_KEY_PREFIX}:project", *project_ids)
+    schedule_analytics_rollup_refresh(ri)
+
+
+def queue_analytics_rollup_update(issues):
+    """
+    Mark the (project id, issue id) pairs as changed, only the days the
+    issues were created on are recounted at the end of the window
+    """
+    members = {f"{project_id}:{issue_id}" for project_id, issue_id in issues if project_id and issue_id}
+    if not members:
+        return
+
+    ri = redis_instance()
+    ri.sadd(f"{ANALYTICS_ROLLUP_KEY_PREFIX}:issue", *members)
+    schedule_analytics_rollup_refresh(ri)
+
+
+def ensure_analytics_rollup(project_ids, axes):
+    """
+    Return whether the rollup answers the axis and segment pairs for the
+    projects, the missing pairs are added and rebuilt in the background
+    """
+    project_ids = [str(project_id) for project_id in project_ids]
+    stale_project_ids = get_stale_rollup_project_ids(project_ids, axes)
+    if not stale_project_ids:
+        return True
+
+    AnalyticsRollupState.all_objects.bulk_create(
+        [
+            AnalyticsRollupState(
+                workspace_id=workspace_id, project_id=project_id, x_axis=x_axis, segment_axis=segment_axis
+            )
+            for project_id, workspace_id in Project.objects.filter(id__in=stale_project_ids).values_list(
+                "id", "workspace_id"
+            )
+            for x_axis, segment_axis in set(axes)
+        ],
+        ignore_conflicts=True,
+    )
+    queue_analytics_rollup_refresh(stale_project_ids)
+    return False
+
+
+@shared_task
+def analytics_rollup_refresh_task():
+    """Rebuild the rollup of the projects marked as stale and recount the days of the changed issues"""
+    try:
+        pipe = redis_instance().pipeline(transaction=True)
+        pipe.smembers(f"{ANALYTICS_ROLLUP_KEY_PREFIX}:project")
+        pipe.smembers(f"{ANALYTICS_ROLLUP_KEY_PREFIX}:issue")
+        pipe.delete(
+            f"{ANALYTICS_ROLLUP_KEY_PREFIX}:project",
+            f"{ANALYTICS_ROLLUP_KEY_PREFIX}:issue",
+            f"{ANALYTICS_ROLLUP_KEY_PREFIX}:scheduled",
+        )
+        project_ids, issues, _ = pipe.execute()
+
+        project_ids = {project_id.decode() for project_id in project_ids}
+        for project_id in project_ids:
+            refresh_analytics_rollup(project_id)
+
+        changed_issue_ids = defaultdict(list)
+        for member in issues:
+            project_id, issue_id = member.decode().split(":")
+            # A full rebuild already counted the changes of the project
+            if project_id not in project_ids:
+                changed_issue_ids[project_id].append(issue_id)
+        for project_id, issue_ids in changed_issue_ids.items():
+            update_analytics_rollup(project_id, issue_ids)
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+@shared_task
+def reconcile_analytics_rollup():
+    """
+    Rebuild the analytics rollup of every project keeping one, correcting
+    the drift of the changes made without an issue activity
+    """
+    try:
+        project_ids = list(AnalyticsRollupState.objects.order_by().values_list("project_id", flat=True).distinct())
+        for project_id in project_ids:
+            refresh_analytics_rollup(project_id)
+
+        logger.info(f"Reconciled the analytics rollup of {len(project_ids)} projects")
+    except Exception as e:
+        log_exception(e)
+        return
@@ -0,0 +1,72 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from datetime import datetime, timezone as dt_timezone
+
+# Django imports
+from django.conf import settings
+from django.utils import timezone
+
+# Third party imports
+from celery import shared_task
+
+# Module imports
+from kardon.db.models import APIToken
+from kardon.settings.redis import redis_instance
+from kardon.utils.exception_logger import log_exception
+
+API_TOKEN_LAST_USED_KEY = "api_token_last_used"
+
+LAST_USED_BATCH_SIZE = 500
+
+
+def track_api_token_last_used(api_token_id):
+    """
+    Buffer the last use of the token, the first use of an interval schedules
+    the write of every token used until then
+    """
+    try:
+        pipe = redis_instance().pipeline()
+        # Later uses overwrite the buffered timestamp of the token
+        pipe.hset(API_TOKEN_LAST_USED_KEY, str(api_token_id), timezone.now().timestamp())
+        # The flag expires on its own if the flush never runs, the next use reschedules it
+        pipe.set(
+            f"{API_TOKEN_LAST_USED_KEY}:scheduled",
+            1,
+            nx=True,
+            ex=settings.API_TOKEN_LAST_USED_FLUSH_INTERVAL + 60,
+        )
+        _, scheduled = pipe.execute()
+
+        if scheduled:
+            flush_api_token_last_used.apply_async(countdown=settings.API_TOKEN_LAST_USED_FLUSH_INTERVAL)
+    except Exception as e:
+        # Losing a last use must never fail the request
+        log_exception(e)
+
+
+@shared_task
+def flush_api_token_last_used():
+    """Write the buffered last uses of the tokens in bulk"""
+    try:
+        pipe = redis_instance().pipeline(transaction=True)
+        pipe.hgetall(API_TOKEN_LAST_USED_KEY)
+        pipe.delete(API_TOKEN_LAST_USED_KEY, f"{API_TOKEN_LAST_USED_KEY}:scheduled")
+        last_used, _ = pipe.execute()
+
+        APIToken.all_objects.bulk_update(
+            [
+                APIToken(
+                    id=api_token_id.decode(),
+                    last_used=datetime.fromtimestamp(float(timestamp), tz=dt_timezone.utc),
+                )
+                for api_token_id, timestamp in last_used.items()
+            ],
+            ["last_used"],
+            batch_size=LAST_USED_BATCH_SIZE,
+        )
+    except Exception as e:
+        log_exception(e)
+        return
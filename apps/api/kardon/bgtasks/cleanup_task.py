@@ -29,6 +29,7 @@ from kardon.db.models import (
 )
 from kardon.settings.mongo import MongoConnection
 from kardon.utils.exception_logger import log_exception
+from kardon.utils.page_version import rebuild_page_content
 
 
 logger = logging.getLogger("kardon.worker")
@@ -204,6 +205,17 @@ def transform_email_log(record: Dict) -> Dict:
 
 def transform_page_version(record: Dict) -> Dict:
     """Transform page version record."""
+    # Versions stored as a delta are archived with their full content
+    if record.get("delta") is not None:
+        record.update(
+            rebuild_page_content(
+                record["base__description_html"],
+                record["base__description_binary"],
+                record["base__description_json"],
+                record["delta"],
+            )
+        )
+
     return {
         "id": str(record["id"]),
         "created_at": str(record["created_at"]) if record.get("created_at") else None,
@@ -334,6 +346,8 @@ def get_page_versions_queryset():
 
     return (
         PageVersion.all_objects.filter(id__in=Subquery(subq))
+        # Snapshots are kept until no version is built on them anymore
+        .exclude(id__in=PageVersion.all_objects.filter(base__isnull=False).values("base_id"))
         .values(
             "id",
             "created_at",
@@ -349,6 +363,10 @@ def get_page_versions_queryset():
             "updated_by_id",
             "deleted_at",
             "last_saved_at",
+            "delta",
+            "base__description_html",
+            "base__description_binary",
+            "base__description_json",
         )
         .iterator(chunk_size=BATCH_SIZE)
     )
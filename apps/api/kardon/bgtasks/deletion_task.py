@@ -2,17 +2,96 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
+# Python imports
+import logging
+from collections import Counter
+from functools import lru_cache
+
 # Django imports
 from django.utils import timezone
 from django.apps import apps
 from django.conf import settings
-from django.db import models
-from django.db.models.fields.related import OneToOneRel
-
 
 # Third party imports
 from celery import shared_task
 
+# Module imports
+from kardon.utils.exception_logger import log_exception
+
+logger = logging.getLogger("kardon.worker")
+
+
+# Rows selected and soft deleted per statement of the cascade
+SOFT_DELETE_BATCH_SIZE = 1000
+
+# Rows soft deleted between two progress log lines
+SOFT_DELETE_PROGRESS_INTERVAL = 10000
+
+SET_NULL = "set_null"
+CASCADE = "cascade"
+
+
+@lru_cache(maxsize=None)
+def get_soft_delete_plan(model):
+    """
+    Compute once per model the reverse relations the soft delete cascades through,
+    as (action, related model, field name) tuples
+    """
+    plan = []
+    for relation in model._meta.get_fields():
+        # Only the reverse relationships
+        if not ((relation.one_to_many or relation.one_to_one) and relation.auto_created and not relation.concrete):
+            continue
+
+        # Get the on_delete behavior name
+        on_delete_name = relation.on_delete.__name__ if hasattr(relation.on_delete, "__name__") else ""
+
+        if on_delete_name == "DO_NOTHING":
+            continue
+        elif on_delete_name == "SET_NULL":
+            plan.append((SET_NULL, relation.related_model, relation.remote_field.name))
+        elif hasattr(relation.related_model, "deleted_at"):
+            # Handle CASCADE and other delete behaviors
+            plan.append((CASCADE, relation.related_model, relation.remote_field.name))
+
+    return tuple(plan)
+
+
+def soft_delete_cascade(model, ids, deleted_at, progress, using=None, batch_size=SOFT_DELETE_BATCH_SIZE):
+    """
+    Soft delete the rows related to the ids level by level, each level being
+    applied with set based updates over bounded id batches
+    """
+    for action, related_model, field_name in get_soft_delete_plan(model):
+        lookup = {f"{field_name}__pk__in": ids}
+        try:
+            if action == SET_NULL:
+                related_model._default_manager.using(using).filter(**lookup).update(**{field_name: None})
+                continue
+
+            values = {"deleted_at": deleted_at}
+            if hasattr(related_model, "updated_at"):
+                values["updated_at"] = deleted_at
+
+            queryset = related_model._base_manager.using(using)
+            while True:
+                batch = list(
+                    queryset.filter(deleted_at__isnull=True, **lookup).values_list("pk", flat=True)[:batch_size]
+                )
+                if not batch:
+                    break
+                queryset.filter(pk__in=batch).update(**values)
+                progress(related_model, len(batch))
+
+                # Recursively handle the rows related to the deleted batch
+                if get_soft_delete_plan(related_model):
+                    soft_delete_cascade(related_model, batch, deleted_at, progress, using, batch_size)
+        except Exception as e:
+            # Log the error and move on to the next relation
+            logger.error(f"Error handling relation {related_model._meta.label}.{field_name}: {str(e)}")
+            log_exception(e, warning=True)
+            continue
+
 
 @shared_task
 def soft_delete_related_objects(app_label, model_name, instance_pk, using=None):
@@ -28,76 +107,19 @@ def soft_delete_related_objects(app_label, model_name, instance_pk, using=None):
     except model_class.DoesNotExist:
         return
 
-    # Get all related fields that are reverse relationships
-    all_related = [
-        f for f in instance._meta.get_fields() if (f.one_to_many or f.one_to_one) and f.auto_created and not f.concrete
-    ]
-
-    # Handle each related field
-    for relation in all_related:
-        related_name = relation.get_accessor_name()
+    counts = Counter()
 
-        # Skip if the relation doesn't exist
-        if not hasattr(instance, related_name):
-            continue
+    def progress(related_model, count):
+        total = counts.total()
+        counts[related_model._meta.label] += count
+        if total // SOFT_DELETE_PROGRESS_INTERVAL != counts.total() // SOFT_DELETE_PROGRESS_INTERVAL:
+            logger.info(f"Soft deleting {model_class._meta.label} {instance_pk}: {counts.total()} related rows")
 
-        # Get the on_delete behavior name
-        on_delete_name = relation.on_delete.__name__ if hasattr(relation.on_delete, "__name__") else ""
-
-        if on_delete_name == "DO_NOTHING":
-            continue
+    soft_delete_cascade(model_class, [instance.pk], timezone.now(), progress, using=using)
 
-        elif on_delete_name == "SET_NULL":
-            # Handle SET_NULL relationships
-            if isinstance(relation, OneToOneRel):
-                # For OneToOne relationships
-                related_obj = getattr(instance, related_name, None)
-                if related_obj and isinstance(related_obj, models.Model):
-                    setattr(related_obj, relation.remote_field.name, None)
-                    related_obj.save(update_fields=[relation.remote_field.name])
-            else:
-                # For other relationships
-                related_queryset = getattr(instance, related_name).all()
-                related_queryset.update(**{relation.remote_field.name: None})
-
-        else:
-            # Handle CASCADE and other delete behaviors
-            try:
-                if relation.one_to_one:
-                    # Handle OneToOne relationships
-                    related_obj = getattr(instance, related_name, None)
-                    if related_obj:
-                        if hasattr(related_obj, "deleted_at"):
-                            if not related_obj.deleted_at:
-                                related_obj.deleted_at = timezone.now()
-                                related_obj.save()
-                                # Recursively handle related objects
-                                soft_delete_related_objects(
-                                    related_obj._meta.app_label,
-                                    related_obj._meta.model_name,
-                                    related_obj.pk,
-                                    using,
-                                )
-                else:
-                    # Handle other relationships
-                    related_queryset = getattr(instance, related_name)(manager="objects").all()
-
-                    for related_obj in related_queryset:
-                        if hasattr(related_obj, "deleted_at"):
-                            if not related_obj.deleted_at:
-                                related_obj.deleted_at = timezone.now()
-                                related_obj.save()
-                                # Recursively handle related objects
-                                soft_delete_related_objects(
-                                    related_obj._meta.app_label,
-                                    related_obj._meta.model_name,
-                                    related_obj.pk,
-                                    using,
-                                )
-            except Exception as e:
-                # Log the error or handle as needed
-                print(f"Error handling relation {related_name}: {str(e)}")
-                continue
+    logger.info(
+        f"Soft deleted {model_class._meta.label} {instance_pk} with {counts.total()} related rows: {dict(counts)}"
+    )
 
     # Finally, soft delete the instance itself if it hasn't been deleted yet
     if hasattr(instance, "deleted_at") and not instance.deleted_at:
@@ -7,9 +7,6 @@ import uuid
 import random
 from datetime import datetime, timedelta
 
-# Django imports
-from django.db.models import Max
-
 # Third party imports
 from celery import shared_task
 from faker import Faker
@@ -27,6 +24,7 @@ from kardon.db.models import (
     Module,
     Issue,
     IssueSequence,
+    IssueSequenceCounter,
     IssueAssignee,
     IssueLabel,
     IssueActivity,
@@ -277,17 +275,8 @@ def create_issues(workspace, project, user_id, issue_count):
 
     issues = []
 
-    # Get the maximum sequence_id
-    last_id = IssueSequence.objects.filter(project=project).aggregate(largest=Max("sequence"))["largest"]
-
-    last_id = 1 if last_id is None else last_id + 1
-
-    # Get the maximum sort order
-    largest_sort_order = Issue.objects.filter(
-        project=project, state_id=states[random.randint(0, len(states) - 1)]
-    ).aggregate(largest=Max("sort_order"))["largest"]
-
-    largest_sort_order = 65535 if largest_sort_order is None else largest_sort_order + 10000
+    # Reserve the sequence ids and sort orders of the issues
+    last_id, largest_sort_order = IssueSequenceCounter.reserve(project.id, issue_count)
 
     for _ in range(0, issue_count):
         start_date = [None, fake.date_this_year()][random.randint(0, 1)]
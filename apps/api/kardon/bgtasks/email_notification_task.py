@@ -3,13 +3,17 @@
 # See the LICENSE file for details.
 
 import logging
+import os
 import re
+import time
 from datetime import datetime
+from smtplib import SMTPServerDisconnected
 
 from bs4 import BeautifulSoup
 
 # Third party imports
 from celery import shared_task
+from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 
@@ -45,43 +49,44 @@ def release_lock(lock_id):
 
 @shared_task
 def stack_email_notification():
-    # get all email notifications
-    email_notifications = EmailNotificationLog.objects.filter(processed_at__isnull=True).order_by("receiver").values()
-
-    # Create the below format for each of the issues
+    """Group the unprocessed notifications by receiver and issue in one pass and queue their emails in batches"""
+    email_notifications = (
+        EmailNotificationLog.objects.filter(processed_at__isnull=True)
+        .order_by("receiver", "created_at")
+        .values("id", "receiver_id", "entity_identifier", "triggered_by_id", "data")
+    )
+
+    # Create the below format for each of the issues of each receiver
     # {"issue_id" : { "actor_id1": [ { data }, { data } ], "actor_id2": [ { data }, { data } ] }}
+    emails = {}
+    for notification in email_notifications:
+        receiver_id = str(notification.get("receiver_id"))
+        issue_id = str(notification.get("entity_identifier"))
+        email = emails.setdefault(
+            (receiver_id, issue_id),
+            {
+                "issue_id": issue_id,
+                "receiver_id": receiver_id,
+                "notification_data": {},
+                "email_notification_ids": [],
+            },
+        )
+        email["notification_data"].setdefault(str(notification.get("triggered_by_id")), []).append(
+            notification.get("data")
+        )
+        email["email_notification_ids"].append(str(notification.get("id")))
+
+    if not emails:
+        return
 
-    # Convert to unique receivers list
-    receivers = list(set([str(notification.get("receiver_id")) for notification in email_notifications]))
-    processed_notifications = []
-    # Loop through all the issues to create the emails
-    for receiver_id in receivers:
-        # Notification triggered for the receiver
-        receiver_notifications = [
-            notification for notification in email_notifications if str(notification.get("receiver_id")) == receiver_id
-        ]
-        # create payload for all issues
-        payload = {}
-        email_notification_ids = []
-        for receiver_notification in receiver_notifications:
-            payload.setdefault(receiver_notification.get("entity_identifier"), {}).setdefault(
-                str(receiver_notification.get("triggered_by_id")), []
-            ).append(receiver_notification.get("data"))
-            # append processed notifications
-            processed_notifications.append(receiver_notification.get("id"))
-            email_notification_ids.append(receiver_notification.get("id"))
-
-        # Create emails for all the issues
-        for issue_id, notification_data in payload.items():
-            send_email_notification.delay(
-                issue_id=issue_id,
-                notification_data=notification_data,
-                receiver_id=receiver_id,
-                email_notification_ids=email_notification_ids,
-            )
+    emails = list(emails.values())
+    for index in range(0, len(emails), settings.EMAIL_NOTIFICATION_BATCH_SIZE):
+        send_email_notification_batch.delay(emails=emails[index : index + settings.EMAIL_NOTIFICATION_BATCH_SIZE])
 
     # Update the email notification log
-    EmailNotificationLog.objects.filter(pk__in=processed_notifications).update(processed_at=timezone.now())
+    EmailNotificationLog.objects.filter(
+        pk__in=[pk for email in emails for pk in email["email_notification_ids"]]
+    ).update(processed_at=timezone.now())
 
 
 def create_payload(notification_data):
@@ -127,180 +132,295 @@ def create_payload(notification_data):
     return data
 
 
-def process_mention(mention_component):
+def get_user(user_id, users):
+    """Return the user from the preloaded ones, loading and keeping the missing ones"""
+    user_id = str(user_id)
+    if user_id not in users:
+        users[user_id] = User.objects.get(pk=user_id)
+    return users[user_id]
+
+
+def process_mention(mention_component, users=None):
+    users = {} if users is None else users
     soup = BeautifulSoup(mention_component, "html.parser")
     mentions = soup.find_all("mention-component")
     for mention in mentions:
         user_id = mention["entity_identifier"]
-        user = User.objects.get(pk=user_id)
+        user = get_user(user_id, users)
         user_name = user.display_name
         highlighted_name = f"@{user_name}"
         mention.replace_with(highlighted_name)
     return str(soup)
 
 
-def process_html_content(content):
+def process_html_content(content, users=None):
     if content is None:
         return None
     processed_content_list = []
     for html_content in content:
-        processed_content = process_mention(html_content)
+        processed_content = process_mention(html_content, users)
         processed_content_list.append(processed_content)
     return processed_content_list
 
 
-@shared_task
-def send_email_notification(issue_id, notification_data, receiver_id, email_notification_ids):
+class PooledEmailConnection:
+    """
+    SMTP connection kept open across the emails sent by the worker. It is
+    reopened once it sent EMAIL_MESSAGES_PER_CONNECTION messages, after
+    being idle for EMAIL_CONNECTION_IDLE_TIMEOUT seconds, and once when the
+    server dropped it.
+    """
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        self.connection = None
+        self.sent = 0
+        self.used_at = 0
+
+    def open(self):
+        self.close()
+        host, username, password, port, use_tls, use_ssl, _ = self.configuration
+        self.connection = get_connection(
+            host=host,
+            port=int(port),
+            username=username,
+            password=password,
+            use_tls=use_tls == "1",
+            use_ssl=use_ssl == "1",
+        )
+        self.connection.open()
+        self.sent = 0
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+
+    def send(self, message):
+        """Send the message over the pooled connection"""
+        if (
+            self.connection is None
+            or self.sent >= settings.EMAIL_MESSAGES_PER_CONNECTION
+            or time.monotonic() - self.used_at > settings.EMAIL_CONNECTION_IDLE_TIMEOUT
+        ):
+            self.open()
+
+        message.connection = self.connection
+        try:
+            message.send()
+        except SMTPServerDisconnected:
+            self.open()
+            message.connection = self.connection
+            message.send()
+        self.sent += 1
+        self.used_at = time.monotonic()
+
+
+# Pooled SMTP connections of the worker process per email configuration, rebuilt after a fork
+_email_connections = {}
+_email_connections_pid = None
+
+
+def get_email_connection(configuration):
+    """Return the worker's pooled SMTP connection for the email configuration"""
+    global _email_connections, _email_connections_pid
+
+    if _email_connections_pid != os.getpid():
+        _email_connections = {}
+        _email_connections_pid = os.getpid()
+
+    configuration = tuple(configuration)
+    if configuration not in _email_connections:
+        _email_connections[configuration] = PooledEmailConnection(configuration)
+    return _email_connections[configuration]
+
+
+def build_email_notification(issue, receiver, notification_data, base_api, users, email_from):
+    """Render the email of the changes made to the issue for the receiver"""
+    data = create_payload(notification_data=notification_data)
+
+    template_data = []
+    total_changes = 0
+    comments = []
+    actors_involved = []
+    for actor_id, changes in data.items():
+        actor = get_user(actor_id, users)
+        total_changes = total_changes + len(changes)
+        comment = changes.pop("comment", False)
+        mention = changes.pop("mention", False)
+        actors_involved.append(actor_id)
+        if comment:
+            comments.append(
+                {
+                    "actor_comments": comment,
+                    "actor_detail": {
+                        "avatar_url": f"{base_api}{actor.avatar_url}",
+                        "first_name": actor.first_name,
+                        "last_name": actor.last_name,
+                    },
+                }
+            )
+        if mention:
+            mention["new_value"] = process_html_content(mention.get("new_value"), users)
+            mention["old_value"] = process_html_content(mention.get("old_value"), users)
+            comments.append(
+                {
+                    "actor_comments": mention,
+                    "actor_detail": {
+                        "avatar_url": f"{base_api}{actor.avatar_url}",
+                        "first_name": actor.first_name,
+                        "last_name": actor.last_name,
+                    },
+                }
+            )
+        activity_time = changes.pop("activity_time")
+        # Parse the input string into a datetime object
+        formatted_time = datetime.strptime(activity_time, "%Y-%m-%d %H:%M:%S").strftime("%H:%M %p")
+
+        if changes:
+            template_data.append(
+                {
+                    "actor_detail": {
+                        "avatar_url": f"{base_api}{actor.avatar_url}",
+                        "first_name": actor.first_name,
+                        "last_name": actor.last_name,
+                    },
+                    "changes": changes,
+                    "issue_details": {
+                        "name": issue.name,
+                        "identifier": f"{issue.project.identifier}-{issue.sequence_id}",
+                    },
+                    "activity_time": str(formatted_time),
+                }
+            )
+
+    summary = "Updates were made to the issue by"
+
+    # Send the mail
+    subject = f"{issue.project.identifier}-{issue.sequence_id} {remove_unwanted_characters(issue.name)}"
+    context = {
+        "data": template_data,
+        "summary": summary,
+        "actors_involved": len(set(actors_involved)),
+        "issue": {
+            "issue_identifier": f"{str(issue.project.identifier)}-{str(issue.sequence_id)}",
+            "name": issue.name,
+            "issue_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/{str(issue.id)}",  # noqa: E501
+        },
+        "receiver": {"email": receiver.email},
+        "issue_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/{str(issue.id)}",  # noqa: E501
+        "project_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/",  # noqa: E501
+        "workspace": str(issue.project.workspace.slug),
+        "project": str(issue.project.name),
+        "user_preference": f"{base_api}/{str(issue.project.workspace.slug)}/settings/account/notifications/",
+        "comments": comments,
+        "entity_type": "issue",
+    }
+    html_content = render_to_string("emails/notifications/issue-updates.html", context)
+    text_content = strip_tags(html_content)
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=email_from,
+        to=[receiver.email],
+    )
+    msg.attach_alternative(html_content, "text/html")
+    return msg
+
+
+def get_email_lock_id(email):
     # Convert UUIDs to a sorted, concatenated string
-    sorted_ids = sorted(email_notification_ids)
-    ids_str = "_".join(str(id) for id in sorted_ids)
-    lock_id = f"send_email_notif_{issue_id}_{receiver_id}_{ids_str}"
+    ids_str = "_".join(str(id) for id in sorted(email["email_notification_ids"]))
+    return f"send_email_notif_{email['issue_id']}_{email['receiver_id']}_{ids_str}"
 
-    # acquire the lock for sending emails
-    try:
-        if acquire_lock(lock_id=lock_id):
-            # get the redis instance
-            ri = redis_instance()
-            base_api = ri.get(str(issue_id)).decode() if ri.get(str(issue_id)) else None
-
-            # Skip if base api is not present
-            if not base_api:
-                return
-
-            data = create_payload(notification_data=notification_data)
-
-            # Get email configurations
-            (
-                EMAIL_HOST,
-                EMAIL_HOST_USER,
-                EMAIL_HOST_PASSWORD,
-                EMAIL_PORT,
-                EMAIL_USE_TLS,
-                EMAIL_USE_SSL,
-                EMAIL_FROM,
-            ) = get_email_configuration()
-
-            receiver = User.objects.get(pk=receiver_id)
-            issue = Issue.objects.get(pk=issue_id)
-            template_data = []
-            total_changes = 0
-            comments = []
-            actors_involved = []
-            for actor_id, changes in data.items():
-                actor = User.objects.get(pk=actor_id)
-                total_changes = total_changes + len(changes)
-                comment = changes.pop("comment", False)
-                mention = changes.pop("mention", False)
-                actors_involved.append(actor_id)
-                if comment:
-                    comments.append(
-                        {
-                            "actor_comments": comment,
-                            "actor_detail": {
-                                "avatar_url": f"{base_api}{actor.avatar_url}",
-                                "first_name": actor.first_name,
-                                "last_name": actor.last_name,
-                            },
-                        }
-                    )
-                if mention:
-                    mention["new_value"] = process_html_content(mention.get("new_value"))
-                    mention["old_value"] = process_html_content(mention.get("old_value"))
-                    comments.append(
-                        {
-                            "actor_comments": mention,
-                            "actor_detail": {
-                                "avatar_url": f"{base_api}{actor.avatar_url}",
-                                "first_name": actor.first_name,
-                                "last_name": actor.last_name,
-                            },
-                        }
-                    )
-                activity_time = changes.pop("activity_time")
-                # Parse the input string into a datetime object
-                formatted_time = datetime.strptime(activity_time, "%Y-%m-%d %H:%M:%S").strftime("%H:%M %p")
-
-                if changes:
-                    template_data.append(
-                        {
-                            "actor_detail": {
-                                "avatar_url": f"{base_api}{actor.avatar_url}",
-                                "first_name": actor.first_name,
-                                "last_name": actor.last_name,
-                            },
-                            "changes": changes,
-                            "issue_details": {
-                                "name": issue.name,
-                                "identifier": f"{issue.project.identifier}-{issue.sequence_id}",
-                            },
-                            "activity_time": str(formatted_time),
-                        }
-                    )
 
-            summary = "Updates were made to the issue by"
-
-            # Send the mail
-            subject = f"{issue.project.identifier}-{issue.sequence_id} {remove_unwanted_characters(issue.name)}"
-            context = {
-                "data": template_data,
-                "summary": summary,
-                "actors_involved": len(set(actors_involved)),
-                "issue": {
-                    "issue_identifier": f"{str(issue.project.identifier)}-{str(issue.sequence_id)}",
-                    "name": issue.name,
-                    "issue_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/{str(issue.id)}",  # noqa: E501
-                },
-                "receiver": {"email": receiver.email},
-                "issue_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/{str(issue.id)}",  # noqa: E501
-                "project_url": f"{base_api}/{str(issue.project.workspace.slug)}/projects/{str(issue.project.id)}/issues/",  # noqa: E501
-                "workspace": str(issue.project.workspace.slug),
-                "project": str(issue.project.name),
-                "user_preference": f"{base_api}/{str(issue.project.workspace.slug)}/settings/account/notifications/",
-                "comments": comments,
-                "entity_type": "issue",
-            }
-            html_content = render_to_string("emails/notifications/issue-updates.html", context)
-            text_content = strip_tags(html_content)
+@shared_task
+def send_email_notification_batch(emails):
+    """
+    Send the issue emails of the batch over the pooled SMTP connection, the
+    issues and users of the whole batch are loaded up front
+    """
+    locked_emails = []
+    for email in emails:
+        # acquire the lock for sending emails
+        if acquire_lock(lock_id=get_email_lock_id(email)):
+            locked_emails.append(email)
+        else:
+            logging.getLogger("kardon.worker").info("Duplicate email received skipping")
 
-            try:
-                connection = get_connection(
-                    host=EMAIL_HOST,
-                    port=int(EMAIL_PORT),
-                    username=EMAIL_HOST_USER,
-                    password=EMAIL_HOST_PASSWORD,
-                    use_tls=EMAIL_USE_TLS == "1",
-                    use_ssl=EMAIL_USE_SSL == "1",
-                )
+    if not locked_emails:
+        return
+
+    sent_ids = []
+    try:
+        # get the base api of every issue in one round trip
+        issue_ids = list({email["issue_id"] for email in locked_emails})
+        base_apis = dict(zip(issue_ids, redis_instance().mget(issue_ids)))
+
+        issues = {
+            str(pk): issue
+            for pk, issue in Issue.objects.select_related("project", "project__workspace").in_bulk(issue_ids).items()
+        }
+        user_ids = {email["receiver_id"] for email in locked_emails} | {
+            actor_id for email in locked_emails for actor_id in email["notification_data"]
+        }
+        users = {str(pk): user for pk, user in User.objects.in_bulk(user_ids).items()}
+
+        # Get email configurations
+        configuration = get_email_configuration()
+        connection = get_email_connection(configuration)
+
+        for email in locked_emails:
+            base_api = base_apis.get(email["issue_id"])
+            issue = issues.get(email["issue_id"])
+            receiver = users.get(email["receiver_id"])
+
+            # Skip if base api, the issue or the receiver is not present
+            if not base_api or issue is None or receiver is None:
+                continue
 
-                msg = EmailMultiAlternatives(
-                    subject=subject,
-                    body=text_content,
-                    from_email=EMAIL_FROM,
-                    to=[receiver.email],
-                    connection=connection,
+            try:
+                msg = build_email_notification(
+                    issue=issue,
+                    receiver=receiver,
+                    notification_data=email["notification_data"],
+                    base_api=base_api.decode(),
+                    users=users,
+                    email_from=configuration[-1],
                 )
-                msg.attach_alternative(html_content, "text/html")
-                msg.send()
+                connection.send(msg)
                 logging.getLogger("kardon.worker").info("Email Sent Successfully")
-
-                # Update the logs
-                EmailNotificationLog.objects.filter(pk__in=email_notification_ids).update(sent_at=timezone.now())
-
-                # release the lock
-                release_lock(lock_id=lock_id)
-                return
+                sent_ids.extend(email["email_notification_ids"])
+            except User.DoesNotExist:
+                continue
             except Exception as e:
                 log_exception(e)
-                # release the lock
-                release_lock(lock_id=lock_id)
-                return
-        else:
-            logging.getLogger("kardon.worker").info("Duplicate email received skipping")
-            return
-    except (Issue.DoesNotExist, User.DoesNotExist):
-        release_lock(lock_id=lock_id)
-        return
     except Exception as e:
         log_exception(e)
-        release_lock(lock_id=lock_id)
-        return
+    finally:
+        # Update the logs
+        if sent_ids:
+            EmailNotificationLog.objects.filter(pk__in=sent_ids).update(sent_at=timezone.now())
+
+        # release the locks
+        for email in locked_emails:
+            release_lock(lock_id=get_email_lock_id(email))
+
+
+@shared_task
+def send_email_notification(issue_id, notification_data, receiver_id, email_notification_ids):
+    # Kept for the emails queued before they were sent in batches
+    send_email_notification_batch(
+        emails=[
+            {
+                "issue_id": str(issue_id),
+                "receiver_id": str(receiver_id),
+                "notification_data": notification_data,
+                "email_notification_ids": [str(pk) for pk in email_notification_ids],
+            }
+        ]
+    )
@@ -5,7 +5,7 @@
 # Python imports
 import io
 import zipfile
-from typing import List
+from typing import IO, List
 import boto3
 from botocore.client import Config
 from uuid import UUID
@@ -16,7 +16,7 @@ from celery import shared_task
 # Django imports
 from django.conf import settings
 from django.utils import timezone
-from django.db.models import Prefetch
+from django.db.models import Prefetch, QuerySet
 
 # Module imports
 from kardon.db.models import ExporterHistory, Issue, IssueComment, IssueRelation, IssueSubscriber
@@ -25,91 +25,149 @@ from kardon.utils.porters.exporter import DataExporter
 from kardon.utils.porters.serializers.issue import IssueExportSerializer
 
 
-def create_zip_file(files: List[tuple[str, str | bytes]]) -> io.BytesIO:
+# Smallest part S3 accepts for all but the last part of a multipart upload
+EXPORT_UPLOAD_PART_SIZE = 8 * 1024 * 1024
+
+
+class S3MultipartWriter(io.RawIOBase):
     """
-    Create a ZIP file from the provided files.
+    Writable stream uploading its content to S3 as a multipart upload,
+    holding at most one part in memory
     """
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for filename, file_content in files:
-            zipf.writestr(filename, file_content)
 
-    zip_buffer.seek(0)
-    return zip_buffer
+    def __init__(self, client, bucket: str, key: str, part_size: int = EXPORT_UPLOAD_PART_SIZE, **extra_args):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.buffer = bytearray()
+        self.parts = []
+        self.position = 0
+        self.upload_id = client.create_multipart_upload(Bucket=bucket, Key=key, **extra_args)["UploadId"]
 
+    def writable(self) -> bool:
+        return True
 
-# TODO: Change the upload_to_s3 function to use the new storage method with entry in file asset table
-def upload_to_s3(zip_file: io.BytesIO, workspace_id: UUID, token_id: str, slug: str) -> None:
-    """
-    Upload a ZIP file to S3 and generate a presigned URL.
-    """
-    file_name = f"{workspace_id}/export-{slug}-{token_id[:6]}-{str(timezone.now().date())}.zip"
-    expires_in = 7 * 24 * 60 * 60
+    def tell(self) -> int:
+        return self.position
 
-    if settings.USE_MINIO:
-        upload_s3 = boto3.client(
-            "s3",
-            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            config=Config(signature_version="s3v4"),
+    def write(self, data) -> int:
+        self.buffer.extend(data)
+        self.position += len(data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[: self.part_size]))
+            del self.buffer[: self.part_size]
+        return len(data)
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
         )
-        upload_s3.upload_fileobj(
-            zip_file,
-            settings.AWS_STORAGE_BUCKET_NAME,
-            file_name,
-            ExtraArgs={"ACL": "public-read", "ContentType": "application/zip"},
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def close(self) -> None:
+        """Upload the remaining bytes and complete the upload"""
+        if self.closed:
+            return
+        if self.buffer or not self.parts:
+            self._upload_part(bytes(self.buffer))
+            self.buffer.clear()
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
         )
+        super().close()
 
-        # Generate presigned url for the uploaded file with different base
-        presign_s3 = boto3.client(
+    def abort(self) -> None:
+        """Drop the uploaded parts"""
+        if self.closed:
+            return
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        self.buffer.clear()
+        super().close()
+
+
+def get_s3_client(endpoint_url: str | None = None):
+    """Return the S3 client for the configured storage"""
+    # If endpoint url is present, use it
+    if endpoint_url or settings.USE_MINIO or settings.AWS_S3_ENDPOINT_URL:
+        return boto3.client(
             "s3",
-            endpoint_url=(
-                f"{settings.AWS_S3_URL_PROTOCOL}//{str(settings.AWS_S3_CUSTOM_DOMAIN).replace('/uploads', '')}/"
-            ),
+            endpoint_url=endpoint_url or settings.AWS_S3_ENDPOINT_URL,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             config=Config(signature_version="s3v4"),
         )
+    return boto3.client(
+        "s3",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(signature_version="s3v4"),
+    )
 
-        presigned_url = presign_s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": file_name},
-            ExpiresIn=expires_in,
-        )
-    else:
-        # If endpoint url is present, use it
-        if settings.AWS_S3_ENDPOINT_URL:
-            s3 = boto3.client(
-                "s3",
-                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                config=Config(signature_version="s3v4"),
-            )
-        else:
-            s3 = boto3.client(
-                "s3",
-                region_name=settings.AWS_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                config=Config(signature_version="s3v4"),
-            )
 
-        # Upload the file to S3
-        s3.upload_fileobj(
-            zip_file,
-            settings.AWS_STORAGE_BUCKET_NAME,
-            file_name,
-            ExtraArgs={"ContentType": "application/zip"},
-        )
+def write_export_zip(output: IO[bytes], exporter: DataExporter, files: List[tuple[str, QuerySet]]) -> None:
+    """
+    Stream every queryset through the exporter into its own entry of a ZIP
+    written to output, one entry at a time.
+    """
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for filename, queryset in files:
+            with zipf.open(exporter.get_filename(filename), "w", force_zip64=True) as entry:
+                exporter.stream(queryset, entry)
+
+
+# TODO: Change the stream_to_s3 function to use the new storage method with entry in file asset table
+def stream_to_s3(
+    exporter: DataExporter,
+    files: List[tuple[str, QuerySet]],
+    workspace_id: UUID,
+    token_id: str,
+    slug: str,
+) -> None:
+    """
+    Stream the ZIP of the exported files to S3 and generate a presigned URL.
+    """
+    file_name = f"{workspace_id}/export-{slug}-{token_id[:6]}-{str(timezone.now().date())}.zip"
+    expires_in = 7 * 24 * 60 * 60
+
+    extra_args = {"ContentType": "application/zip"}
+    if settings.USE_MINIO:
+        extra_args["ACL"] = "public-read"
 
-        # Generate presigned url for the uploaded file
-        presigned_url = s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": file_name},
-            ExpiresIn=expires_in,
+    upload_s3 = get_s3_client()
+    writer = S3MultipartWriter(upload_s3, settings.AWS_STORAGE_BUCKET_NAME, file_name, **extra_args)
+    try:
+        write_export_zip(writer, exporter, files)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+
+    if settings.USE_MINIO:
+        # Generate presigned url for the uploaded file with different base
+        presign_s3 = get_s3_client(
+            endpoint_url=(
+                f"{settings.AWS_S3_URL_PROTOCOL}//{str(settings.AWS_S3_CUSTOM_DOMAIN).replace('/uploads', '')}/"
+            )
         )
+    else:
+        presign_s3 = upload_s3
+
+    # Generate presigned url for the uploaded file
+    presigned_url = presign_s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": file_name},
+        ExpiresIn=expires_in,
+    )
 
     exporter_instance = ExporterHistory.objects.get(token=token_id)
 
@@ -200,22 +258,16 @@ def issue_export_task(
             exporter_instance.save(update_fields=["status", "reason"])
             return
 
-        files = []
         if multiple:
             # Export each project separately with its own queryset
-            for project_id in project_ids:
-                project_issues = workspace_issues.filter(project_id=project_id)
-                export_filename = f"{slug}-{project_id}"
-                filename, content = exporter.export(export_filename, project_issues)
-                files.append((filename, content))
+            files = [
+                (f"{slug}-{project_id}", workspace_issues.filter(project_id=project_id)) for project_id in project_ids
+            ]
         else:
             # Export all issues in a single file
-            export_filename = f"{slug}-{workspace_id}"
-            filename, content = exporter.export(export_filename, workspace_issues)
-            files.append((filename, content))
+            files = [(f"{slug}-{workspace_id}", workspace_issues)]
 
-        zip_buffer = create_zip_file(files)
-        upload_to_s3(zip_buffer, workspace_id, token_id, slug)
+        stream_to_s3(exporter, files, workspace_id, token_id, slug)
 
     except Exception as e:
         exporter_instance = ExporterHistory.objects.get(token=token_id)
@@ -16,12 +16,15 @@ from django.utils import timezone
 
 # Module imports
 from kardon.app.serializers import IssueActivitySerializer
-from kardon.bgtasks.notification_task import notifications
+from kardon.bgtasks.analytics_rollup_task import queue_analytics_rollup_update
+from kardon.bgtasks.notification_task import bulk_notifications, notifications
+from kardon.bgtasks.progress_task import queue_activity_progress_refresh
 from kardon.db.models import (
     CommentReaction,
     Cycle,
     Issue,
     IssueActivity,
+    IssueChange,
     IssueComment,
     IssueReaction,
     IssueSubscriber,
@@ -33,6 +36,7 @@ from kardon.db.models import (
     EstimatePoint,
 )
 from kardon.settings.redis import redis_instance
+from kardon.utils.cache import bump_project_data_version
 from kardon.utils.exception_logger import log_exception
 from kardon.utils.issue_relation_mapper import get_inverse_relation
 from kardon.utils.uuid import is_valid_uuid
@@ -1499,6 +1503,37 @@ def create_intake_activity(
         )
 
 
+ACTIVITY_MAPPER = {
+    "issue.activity.created": create_issue_activity,
+    "issue.activity.updated": update_issue_activity,
+    "issue.activity.deleted": delete_issue_activity,
+    "comment.activity.created": create_comment_activity,
+    "comment.activity.updated": update_comment_activity,
+    "comment.activity.deleted": delete_comment_activity,
+    "cycle.activity.created": create_cycle_issue_activity,
+    "cycle.activity.deleted": delete_cycle_issue_activity,
+    "module.activity.created": create_module_issue_activity,
+    "module.activity.deleted": delete_module_issue_activity,
+    "link.activity.created": create_link_activity,
+    "link.activity.updated": update_link_activity,
+    "link.activity.deleted": delete_link_activity,
+    "attachment.activity.created": create_attachment_activity,
+    "attachment.activity.deleted": delete_attachment_activity,
+    "issue_relation.activity.created": create_issue_relation_activity,
+    "issue_relation.activity.deleted": delete_issue_relation_activity,
+    "issue_reaction.activity.created": create_issue_reaction_activity,
+    "issue_reaction.activity.deleted": delete_issue_reaction_activity,
+    "comment_reaction.activity.created": create_comment_reaction_activity,
+    "comment_reaction.activity.deleted": delete_comment_reaction_activity,
+    "issue_vote.activity.created": create_issue_vote_activity,
+    "issue_vote.activity.deleted": delete_issue_vote_activity,
+    "issue_draft.activity.created": create_draft_issue_activity,
+    "issue_draft.activity.updated": update_draft_issue_activity,
+    "issue_draft.activity.deleted": delete_draft_issue_activity,
+    "intake.activity.created": create_intake_activity,
+}
+
+
 # Receive message from room group
 @shared_task
 def issue_activity(
@@ -1537,36 +1572,6 @@ def issue_activity(
                 except Exception:
                     pass
 
-        ACTIVITY_MAPPER = {
-            "issue.activity.created": create_issue_activity,
-            "issue.activity.updated": update_issue_activity,
-            "issue.activity.deleted": delete_issue_activity,
-            "comment.activity.created": create_comment_activity,
-            "comment.activity.updated": update_comment_activity,
-            "comment.activity.deleted": delete_comment_activity,
-            "cycle.activity.created": create_cycle_issue_activity,
-            "cycle.activity.deleted": delete_cycle_issue_activity,
-            "module.activity.created": create_module_issue_activity,
-            "module.activity.deleted": delete_module_issue_activity,
-            "link.activity.created": create_link_activity,
-            "link.activity.updated": update_link_activity,
-            "link.activity.deleted": delete_link_activity,
-            "attachment.activity.created": create_attachment_activity,
-            "attachment.activity.deleted": delete_attachment_activity,
-            "issue_relation.activity.created": create_issue_relation_activity,
-            "issue_relation.activity.deleted": delete_issue_relation_activity,
-            "issue_reaction.activity.created": create_issue_reaction_activity,
-            "issue_reaction.activity.deleted": delete_issue_reaction_activity,
-            "comment_reaction.activity.created": create_comment_reaction_activity,
-            "comment_reaction.activity.deleted": delete_comment_reaction_activity,
-            "issue_vote.activity.created": create_issue_vote_activity,
-            "issue_vote.activity.deleted": delete_issue_vote_activity,
-            "issue_draft.activity.created": create_draft_issue_activity,
-            "issue_draft.activity.updated": update_draft_issue_activity,
-            "issue_draft.activity.deleted": delete_draft_issue_activity,
-            "intake.activity.created": create_intake_activity,
-        }
-
         func = ACTIVITY_MAPPER.get(type)
         if func is not None:
             func(
@@ -1598,6 +1603,109 @@ def issue_activity(
                 current_instance=current_instance,
             )
 
+        queue_activity_progress_refresh(issue_activities_created)
+        queue_analytics_rollup_update(
+            {(activity.project_id, activity.issue_id) for activity in issue_activities_created}
+        )
+        return
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+# Number of issue deltas carried by a single bulk activity message
+BULK_ISSUE_ACTIVITY_BATCH_SIZE = 500
+
+
+def queue_bulk_issue_activity(type, issue_deltas, batch_size=BULK_ISSUE_ACTIVITY_BATCH_SIZE, **kwargs):
+    """
+    Queue the same activity type for many issues as a few bulk messages.
+    issue_deltas is a list of {"issue_id", "requested_data", "current_instance"}
+    """
+    for index in range(0, len(issue_deltas), batch_size):
+        bulk_issue_activity.delay(type=type, issue_deltas=issue_deltas[index : index + batch_size], **kwargs)
+
+
+@shared_task
+def bulk_issue_activity(
+    type,
+    issue_deltas,
+    actor_id,
+    project_id,
+    epoch,
+    subscriber=True,
+    notification=False,
+    origin=None,
+):
+    try:
+        # check if project_id is valid
+        if not is_valid_uuid(str(project_id)):
+            return
+
+        project = Project.objects.get(pk=project_id)
+        workspace_id = project.workspace_id
+        issue_ids = {str(delta["issue_id"]) for delta in issue_deltas if delta.get("issue_id")}
+
+        if issue_ids:
+            if origin:
+                # set the request origin of every issue in redis in one round trip
+                pipeline = redis_instance().pipeline()
+                for issue_id in issue_ids:
+                    pipeline.set(issue_id, origin, ex=600)
+                pipeline.execute()
+            Issue.objects.filter(pk__in=issue_ids).update(updated_at=timezone.now())
+            # The update skips the signals of the issues
+            bump_project_data_version(project_id)
+            IssueChange.record(project_id, issue_ids)
+
+        # Build the activities of every delta, remembering which ones belong to it
+        issue_activities = []
+        delta_ranges = []
+        func = ACTIVITY_MAPPER.get(type)
+        for delta in issue_deltas:
+            start = len(issue_activities)
+            if func is not None:
+                func(
+                    requested_data=delta.get("requested_data"),
+                    current_instance=delta.get("current_instance"),
+                    issue_id=delta.get("issue_id"),
+                    project_id=project_id,
+                    workspace_id=workspace_id,
+                    actor_id=actor_id,
+                    issue_activities=issue_activities,
+                    epoch=epoch,
+                )
+            delta_ranges.append((delta, start, len(issue_activities)))
+
+        # Save all the values to database
+        issue_activities_created = IssueActivity.objects.bulk_create(issue_activities, batch_size=500)
+
+        if notification and issue_activities_created:
+            serialized_activities = IssueActivitySerializer(issue_activities_created, many=True).data
+            bulk_notifications.delay(
+                type=type,
+                actor_id=actor_id,
+                project_id=project_id,
+                subscriber=subscriber,
+                issue_deltas=json.dumps(
+                    [
+                        {
+                            "issue_id": str(delta.get("issue_id")),
+                            "requested_data": delta.get("requested_data"),
+                            "current_instance": delta.get("current_instance"),
+                            "issue_activities_created": serialized_activities[start:end],
+                        }
+                        for delta, start, end in delta_ranges
+                        if end > start
+                    ],
+                    cls=DjangoJSONEncoder,
+                ),
+            )
+
+        queue_activity_progress_refresh(issue_activities_created)
+        queue_analytics_rollup_update(
+            {(activity.project_id, activity.issue_id) for activity in issue_activities_created}
+        )
         return
     except Exception as e:
         log_exception(e)
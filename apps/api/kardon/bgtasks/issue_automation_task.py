@@ -14,7 +14,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 # Module imports
-from kardon.bgtasks.issue_activities_task import issue_activity
+from kardon.bgtasks.issue_activities_task import queue_bulk_issue_activity
 from kardon.db.models import Issue, Project, State
 from kardon.utils.exception_logger import log_exception
 
@@ -66,20 +66,22 @@ def archive_old_issues():
                 # Bulk Update the issues and log the activity
                 if issues_to_update:
                     Issue.objects.bulk_update(issues_to_update, ["archived_at"], batch_size=100)
-                    _ = [
-                        issue_activity.delay(
-                            type="issue.activity.updated",
-                            requested_data=json.dumps({"archived_at": str(archive_at), "automation": True}),
-                            actor_id=str(project.created_by_id),
-                            issue_id=issue.id,
-                            project_id=project_id,
-                            current_instance=json.dumps({"archived_at": None}),
-                            subscriber=False,
-                            epoch=int(timezone.now().timestamp()),
-                            notification=True,
-                        )
-                        for issue in issues_to_update
-                    ]
+                    queue_bulk_issue_activity(
+                        type="issue.activity.updated",
+                        issue_deltas=[
+                            {
+                                "issue_id": str(issue.id),
+                                "requested_data": json.dumps({"archived_at": str(archive_at), "automation": True}),
+                                "current_instance": json.dumps({"archived_at": None}),
+                            }
+                            for issue in issues_to_update
+                        ],
+                        actor_id=str(project.created_by_id),
+                        project_id=str(project_id),
+                        subscriber=False,
+                        epoch=int(timezone.now().timestamp()),
+                        notification=True,
+                    )
         return
     except Exception as e:
         log_exception(e)
@@ -129,20 +131,22 @@ def close_old_issues():
                 # Bulk Update the issues and log the activity
                 if issues_to_update:
                     Issue.objects.bulk_update(issues_to_update, ["state"], batch_size=100)
-                    [
-                        issue_activity.delay(
-                            type="issue.activity.updated",
-                            requested_data=json.dumps({"closed_to": str(issue.state_id)}),
-                            actor_id=str(project.created_by_id),
-                            issue_id=issue.id,
-                            project_id=project_id,
-                            current_instance=None,
-                            subscriber=False,
-                            epoch=int(timezone.now().timestamp()),
-                            notification=True,
-                        )
-                        for issue in issues_to_update
-                    ]
+                    queue_bulk_issue_activity(
+                        type="issue.activity.updated",
+                        issue_deltas=[
+                            {
+                                "issue_id": str(issue.id),
+                                "requested_data": json.dumps({"closed_to": str(issue.state_id)}),
+                                "current_instance": None,
+                            }
+                            for issue in issues_to_update
+                        ],
+                        actor_id=str(project.created_by_id),
+                        project_id=str(project_id),
+                        subscriber=False,
+                        epoch=int(timezone.now().timestamp()),
+                        notification=True,
+                    )
         return
     except Exception as e:
         log_exception(e)
@@ -4,7 +4,7 @@
 
 # Python imports
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # Third party imports
 from pymongo.collection import Collection
@@ -18,6 +18,9 @@ from kardon.db.models import APIActivityLog
 
 logger = logging.getLogger("kardon.worker")
 
+# Fields only stored on the MongoDB documents
+MONGO_LOG_FIELDS = ("created_at", "updated_at", "created_by", "updated_by")
+
 
 def get_mongo_collection() -> Optional[Collection]:
     """
@@ -98,3 +101,31 @@ def process_logs(log_data: Dict[str, Any], mongo_log: Dict[str, Any]) -> None:
         log_to_mongo(mongo_log)
     else:
         log_to_postgres(log_data)
+
+
+@shared_task
+def process_log_batch(logs: List[Dict[str, Any]]) -> None:
+    """
+    Save a batch of logs with a single insert to MongoDB or Postgres
+    based on the configuration
+    """
+    if MongoConnection.is_configured():
+        mongo_collection = get_mongo_collection()
+        if mongo_collection is None:
+            return
+        try:
+            # Unordered so one rejected document does not stop the rest of the batch
+            mongo_collection.insert_many(logs, ordered=False)
+        except Exception as e:
+            log_exception(e)
+        return
+
+    try:
+        APIActivityLog.objects.bulk_create(
+            [
+                APIActivityLog(**{key: value for key, value in log.items() if key not in MONGO_LOG_FIELDS})
+                for log in logs
+            ]
+        )
+    except Exception as e:
+        log_exception(e)
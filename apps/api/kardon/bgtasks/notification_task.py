@@ -4,8 +4,6 @@
 
 # Python imports
 import json
-import uuid
-from uuid import UUID
 
 
 # Module imports
@@ -24,7 +22,6 @@ from kardon.db.models import (
     UserNotificationPreference,
     ProjectMember,
 )
-from django.db.models import Subquery
 
 # Third Party imports
 from celery import shared_task
@@ -81,30 +78,25 @@ def get_removed_mentions(requested_instance, current_instance):
 
 
 # Adds mentions as subscribers
-def extract_mentions_as_subscribers(project_id, issue_id, mentions):
+def extract_mentions_as_subscribers(project, issue, mentions, context):
     # mentions is an array of User IDs representing the FILTERED set of mentioned users
+    # context holds the subscribers, assignees and members preloaded for the issue
 
     bulk_mention_subscribers = []
 
-    for mention_id in mentions:
+    for mention_id in set(mentions):
         # If the particular mention has not already been subscribed to the issue, he must be sent the mentioned notification # noqa: E501
         if (
-            not IssueSubscriber.objects.filter(
-                issue_id=issue_id, subscriber_id=mention_id, project_id=project_id
-            ).exists()
-            and not IssueAssignee.objects.filter(
-                project_id=project_id, issue_id=issue_id, assignee_id=mention_id
-            ).exists()
-            and not Issue.objects.filter(project_id=project_id, pk=issue_id, created_by_id=mention_id).exists()
-            and ProjectMember.objects.filter(project_id=project_id, member_id=mention_id, is_active=True).exists()
+            mention_id not in context["issue_subscribers"]
+            and mention_id not in context["issue_assignees"]
+            and mention_id != str(issue.created_by_id)
+            and mention_id in context["project_members"]
         ):
-            project = Project.objects.get(pk=project_id)
-
             bulk_mention_subscribers.append(
                 IssueSubscriber(
                     workspace_id=project.workspace_id,
-                    project_id=project_id,
-                    issue_id=issue_id,
+                    project_id=project.id,
+                    issue_id=issue.id,
                     subscriber_id=mention_id,
                 )
             )
@@ -187,487 +179,481 @@ def create_mention_notification(project, notification_comment, issue, actor_id,
     )
 
 
-@shared_task
-def notifications(
+def get_issue_notification_data(issue, with_project=False):
+    data = {
+        "id": str(issue.id),
+        "name": str(issue.name),
+        "identifier": str(issue.project.identifier),
+        "sequence_id": issue.sequence_id,
+        "state_name": issue.state.name,
+        "state_group": issue.state.group,
+    }
+    if with_project:
+        data["project_id"] = str(issue.project.id)
+        data["workspace_slug"] = str(issue.project.workspace.slug)
+    return data
+
+
+def get_activity_identifiers(activity):
+    return {
+        "old_identifier": (str(activity.get("old_identifier")) if activity.get("old_identifier") else None),
+        "new_identifier": (str(activity.get("new_identifier")) if activity.get("new_identifier") else None),
+    }
+
+
+# Activity types that never notify the subscribers
+SKIPPED_NOTIFICATION_TYPES = [
+    "cycle.activity.created",
+    "cycle.activity.deleted",
+    "module.activity.created",
+    "module.activity.deleted",
+    "issue_reaction.activity.created",
+    "issue_reaction.activity.deleted",
+    "comment_reaction.activity.created",
+    "comment_reaction.activity.deleted",
+    "issue_vote.activity.created",
+    "issue_vote.activity.deleted",
+    "issue_draft.activity.created",
+    "issue_draft.activity.updated",
+    "issue_draft.activity.deleted",
+]
+
+
+def get_project_notification_context(project_id):
+    """Preload the project level data shared by every issue of a fan out"""
+    return {
+        "project": Project.objects.select_related("workspace").get(pk=project_id),
+        "project_members": {
+            str(member_id)
+            for member_id in ProjectMember.objects.filter(project_id=project_id, is_active=True).values_list(
+                "member_id", flat=True
+            )
+        },
+        "completed_state_ids": {
+            str(state_id)
+            for state_id in State.objects.filter(project_id=project_id, group="completed").values_list("id", flat=True)
+        },
+        "actors": {},
+    }
+
+
+def get_issue_notification_context(context, issue_id):
+    """Preload the subscribers and assignees of the issue as sets"""
+    return {
+        **context,
+        "issue_subscribers": {
+            str(subscriber_id)
+            for subscriber_id in IssueSubscriber.objects.filter(issue_id=issue_id).values_list(
+                "subscriber_id", flat=True
+            )
+        },
+        "issue_assignees": {
+            str(assignee_id)
+            for assignee_id in IssueAssignee.objects.filter(issue_id=issue_id).values_list("assignee_id", flat=True)
+        },
+    }
+
+
+def get_notification_preferences(user_ids):
+    """Return the notification preference of every user keyed by user id"""
+    preferences = {}
+    for preference in UserNotificationPreference.objects.filter(user_id__in=user_ids).order_by("created_at"):
+        preferences.setdefault(str(preference.user_id), preference)
+    return preferences
+
+
+def send_issue_notifications(
+    context,
     type,
     issue_id,
-    project_id,
     actor_id,
     subscriber,
     issue_activities_created,
     requested_data,
     current_instance,
 ):
-    try:
-        issue_activities_created = (
-            json.loads(issue_activities_created) if issue_activities_created is not None else None
-        )
-        if type not in [
-            "cycle.activity.created",
-            "cycle.activity.deleted",
-            "module.activity.created",
-            "module.activity.deleted",
-            "issue_reaction.activity.created",
-            "issue_reaction.activity.deleted",
-            "comment_reaction.activity.created",
-            "comment_reaction.activity.deleted",
-            "issue_vote.activity.created",
-            "issue_vote.activity.deleted",
-            "issue_draft.activity.created",
-            "issue_draft.activity.updated",
-            "issue_draft.activity.deleted",
-        ]:
-            # Create Notifications
-            bulk_notifications = []
-            bulk_email_logs = []
-
-            """
-            Mention Tasks
-            1. Perform Diffing and Extract the mentions, that mention notification needs to be sent
-            2. From the latest set of mentions, extract the users which are not a subscribers & make them subscribers
-            """
-
-            # get the list of active project members
-            project_members = ProjectMember.objects.filter(project_id=project_id, is_active=True).values_list(
-                "member_id", flat=True
-            )
+    """
+    Build the in app notifications and email logs of the activities of an issue
+    in memory, everything the fan out needs being loaded once up front
+    """
+    if type in SKIPPED_NOTIFICATION_TYPES:
+        return
 
-            # Get new mentions from the newer instance
-            new_mentions = get_new_mentions(requested_instance=requested_data, current_instance=current_instance)
-            new_mentions = list(set(new_mentions) & {str(member) for member in project_members})
-            removed_mention = get_removed_mentions(requested_instance=requested_data, current_instance=current_instance)
+    issue_id = str(issue_id)
+    actor_id = str(actor_id)
+    project = context["project"]
+    project_members = context["project_members"]
 
-            comment_mentions = []
-            all_comment_mentions = []
+    issue = Issue.objects.select_related("project", "project__workspace", "state").filter(pk=issue_id).first()
+    if issue is None:
+        return
+    context = get_issue_notification_context(context, issue_id)
+
+    # Create Notifications
+    bulk_notifications = []
+    bulk_email_logs = []
+
+    """
+    Mention Tasks
+    1. Perform Diffing and Extract the mentions, that mention notification needs to be sent
+    2. From the latest set of mentions, extract the users which are not a subscribers & make them subscribers
+    """
+
+    # Get new mentions from the newer instance
+    new_mentions = get_new_mentions(requested_instance=requested_data, current_instance=current_instance)
+    new_mentions = list(set(new_mentions) & project_members)
+    removed_mention = get_removed_mentions(requested_instance=requested_data, current_instance=current_instance)
+
+    comment_mentions = []
+    all_comment_mentions = []
+
+    # Get New Subscribers from the mentions of the newer instance
+    requested_mentions = extract_mentions(issue_instance=requested_data)
+    mention_subscribers = extract_mentions_as_subscribers(
+        project=project, issue=issue, mentions=requested_mentions, context=context
+    )
 
-            # Get New Subscribers from the mentions of the newer instance
-            requested_mentions = extract_mentions(issue_instance=requested_data)
-            mention_subscribers = extract_mentions_as_subscribers(
-                project_id=project_id, issue_id=issue_id, mentions=requested_mentions
+    for issue_activity in issue_activities_created:
+        issue_comment = issue_activity.get("issue_comment")
+        if issue_comment is not None:
+            # TODO: Maybe save the comment mentions, so that in future, we can filter out the issues based on comment mentions as well.
+            all_comment_mentions = all_comment_mentions + extract_comment_mentions(issue_activity.get("new_value"))
+            comment_mentions = comment_mentions + get_new_comment_mentions(
+                old_value=issue_activity.get("old_value"),
+                new_value=issue_activity.get("new_value"),
             )
+    comment_mentions = [mention for mention in comment_mentions if mention in project_members]
 
-            for issue_activity in issue_activities_created:
-                issue_comment = issue_activity.get("issue_comment")
-                issue_comment_new_value = issue_activity.get("new_value")
-                issue_comment_old_value = issue_activity.get("old_value")
-                if issue_comment is not None:
-                    # TODO: Maybe save the comment mentions, so that in future, we can filter out the issues based on comment mentions as well.
-
-                    all_comment_mentions = all_comment_mentions + extract_comment_mentions(issue_comment_new_value)
-
-                    new_comment_mentions = get_new_comment_mentions(
-                        old_value=issue_comment_old_value,
-                        new_value=issue_comment_new_value,
-                    )
-                    comment_mentions = comment_mentions + new_comment_mentions
-                    comment_mentions = [
-                        mention for mention in comment_mentions if UUID(mention) in set(project_members)
-                    ]
-
-            comment_mention_subscribers = extract_mentions_as_subscribers(
-                project_id=project_id, issue_id=issue_id, mentions=all_comment_mentions
-            )
-            """
-            We will not send subscription activity notification to the below mentioned user sets
-            - Those who have been newly mentioned in the issue description, we will send mention notification to them.
-            - When the activity is a comment_created and there exist a mention in the comment, 
-              then we have to send the "mention_in_comment" notification
-            - When the activity is a comment_updated and there exist a mention change, 
-              then also we have to send the "mention_in_comment" notification
-            """
-
-            # ---------------------------------------------------------------------------------------------------------
-            issue_subscribers = list(
-                IssueSubscriber.objects.filter(
-                    project_id=project_id,
-                    issue_id=issue_id,
-                    subscriber__in=Subquery(project_members),
+    comment_mention_subscribers = extract_mentions_as_subscribers(
+        project=project, issue=issue, mentions=all_comment_mentions, context=context
+    )
+    """
+    We will not send subscription activity notification to the below mentioned user sets
+    - Those who have been newly mentioned in the issue description, we will send mention notification to them.
+    - When the activity is a comment_created and there exist a mention in the comment,
+      then we have to send the "mention_in_comment" notification
+    - When the activity is a comment_updated and there exist a mention change,
+      then also we have to send the "mention_in_comment" notification
+    """
+
+    # ---------------------------------------------------------------------------------------------------------
+    issue_subscribers = (context["issue_subscribers"] & project_members) - set(
+        new_mentions + comment_mentions + [actor_id]
+    )
+    issue_assignees = context["issue_assignees"] & project_members
+    created_by_id = str(issue.created_by_id) if issue.created_by_id else None
+
+    if subscriber and actor_id not in context["issue_subscribers"]:
+        # add the user to issue subscriber
+        try:
+            _ = IssueSubscriber.objects.get_or_create(project_id=project.id, issue_id=issue_id, subscriber_id=actor_id)
+        except Exception:
+            pass
+
+    # Load the preferences of every receiver and the commented activities at once
+    preferences = get_notification_preferences(issue_subscribers | set(comment_mentions) | set(new_mentions))
+    issue_comments = {
+        str(comment.id): comment
+        for comment in IssueComment.objects.filter(
+            id__in=[
+                issue_activity.get("issue_comment")
+                for issue_activity in issue_activities_created
+                if issue_activity.get("issue_comment")
+            ],
+            issue_id=issue_id,
+            project_id=project.id,
+            workspace_id=project.workspace_id,
+        )
+    }
+
+    for subscriber_id in issue_subscribers:
+        if created_by_id and created_by_id == subscriber_id:
+            sender = "in_app:issue_activities:created"
+        elif subscriber_id in issue_assignees and created_by_id not in issue_assignees:
+            sender = "in_app:issue_activities:assigned"
+        else:
+            sender = "in_app:issue_activities:subscribed"
+
+        preference = preferences.get(subscriber_id)
+
+        for issue_activity in issue_activities_created:
+            # If activity done in blocking then blocked by email should not go
+            if str(issue_activity.get("issue_detail").get("id")) != issue_id:
+                continue
+
+            # Do not send notification for description update
+            if issue_activity.get("field") == "description":
+                continue
+
+            # Check if the value should be sent or not
+            send_email = False
+            if preference is None:
+                send_email = False
+            elif issue_activity.get("field") == "state" and preference.state_change:
+                send_email = True
+            elif (
+                issue_activity.get("field") == "state"
+                and preference.issue_completed
+                and str(issue_activity.get("new_identifier")) in context["completed_state_ids"]
+            ):
+                send_email = True
+            elif issue_activity.get("field") == "comment" and preference.comment:
+                send_email = True
+            elif preference.property_change:
+                send_email = True
+
+            # If activity is of issue comment fetch the comment
+            issue_comment = issue_comments.get(str(issue_activity.get("issue_comment")))
+
+            activity_data = {
+                "id": str(issue_activity.get("id")),
+                "verb": str(issue_activity.get("verb")),
+                "field": str(issue_activity.get("field")),
+                "actor": str(issue_activity.get("actor_id")),
+                "new_value": str(issue_activity.get("new_value")),
+                "old_value": str(issue_activity.get("old_value")),
+                "issue_comment": str(issue_comment.comment_stripped if issue_comment is not None else ""),
+                **get_activity_identifiers(issue_activity),
+            }
+
+            # Create in app notification
+            bulk_notifications.append(
+                Notification(
+                    workspace=project.workspace,
+                    sender=sender,
+                    triggered_by_id=actor_id,
+                    receiver_id=subscriber_id,
+                    entity_identifier=issue_id,
+                    entity_name="issue",
+                    project=project,
+                    title=issue_activity.get("comment"),
+                    data={
+                        "issue": get_issue_notification_data(issue),
+                        "issue_activity": activity_data,
+                    },
                 )
-                .exclude(subscriber_id__in=list(new_mentions + comment_mentions + [actor_id]))
-                .values_list("subscriber", flat=True)
             )
-
-            issue = Issue.objects.filter(pk=issue_id).first()
-
-            if subscriber:
-                # add the user to issue subscriber
-                try:
-                    _ = IssueSubscriber.objects.get_or_create(
-                        project_id=project_id, issue_id=issue_id, subscriber_id=actor_id
+            # Create email notification
+            if send_email:
+                bulk_email_logs.append(
+                    EmailNotificationLog(
+                        triggered_by_id=actor_id,
+                        receiver_id=subscriber_id,
+                        entity_identifier=issue_id,
+                        entity_name="issue",
+                        data={
+                            "issue": get_issue_notification_data(issue, with_project=True),
+                            "issue_activity": {
+                                **activity_data,
+                                "activity_time": issue_activity.get("created_at"),
+                            },
+                        },
                     )
-                except Exception:
-                    pass
-
-            project = Project.objects.get(pk=project_id)
-
-            issue_assignees = IssueAssignee.objects.filter(
-                issue_id=issue_id,
-                project_id=project_id,
-                assignee__in=Subquery(project_members),
-            ).values_list("assignee", flat=True)
+                )
 
-            issue_subscribers = list(set(issue_subscribers) - {uuid.UUID(actor_id)})
+    # -------------------------------------------------------------------------------------------------------- #
 
-            for subscriber in issue_subscribers:
-                if issue.created_by_id and issue.created_by_id == subscriber:
-                    sender = "in_app:issue_activities:created"
-                elif subscriber in issue_assignees and issue.created_by_id not in issue_assignees:
-                    sender = "in_app:issue_activities:assigned"
-                else:
-                    sender = "in_app:issue_activities:subscribed"
+    # Add Mentioned as Issue Subscribers
+    IssueSubscriber.objects.bulk_create(
+        mention_subscribers + comment_mention_subscribers,
+        batch_size=100,
+        ignore_conflicts=True,
+    )
 
-                preference = UserNotificationPreference.objects.get(user_id=subscriber)
+    if comment_mentions or new_mentions:
+        last_activity = IssueActivity.objects.filter(issue_id=issue_id).order_by("-created_at").first()
+        if actor_id not in context["actors"]:
+            context["actors"][actor_id] = User.objects.get(pk=actor_id)
+        actor = context["actors"][actor_id]
 
-                for issue_activity in issue_activities_created:
-                    # If activity done in blocking then blocked by email should not go
-                    if issue_activity.get("issue_detail").get("id") != issue_id:
-                        continue
-
-                    # Do not send notification for description update
-                    if issue_activity.get("field") == "description":
-                        continue
-
-                    # Check if the value should be sent or not
-                    send_email = False
-                    if issue_activity.get("field") == "state" and preference.state_change:
-                        send_email = True
-                    elif (
-                        issue_activity.get("field") == "state"
-                        and preference.issue_completed
-                        and State.objects.filter(
-                            project_id=project_id,
-                            pk=issue_activity.get("new_identifier"),
-                            group="completed",
-                        ).exists()
-                    ):
-                        send_email = True
-                    elif issue_activity.get("field") == "comment" and preference.comment:
-                        send_email = True
-                    elif preference.property_change:
-                        send_email = True
-                    else:
-                        send_email = False
-
-                    # If activity is of issue comment fetch the comment
-                    issue_comment = (
-                        IssueComment.objects.filter(
-                            id=issue_activity.get("issue_comment"),
-                            issue_id=issue_id,
-                            project_id=project_id,
-                            workspace_id=project.workspace_id,
-                        ).first()
-                        if issue_activity.get("issue_comment")
-                        else None
-                    )
+    for mention_id in comment_mentions:
+        if mention_id != actor_id:
+            preference = preferences.get(mention_id)
+            for issue_activity in issue_activities_created:
+                notification = create_mention_notification(
+                    project=project,
+                    issue=issue,
+                    notification_comment=f"{actor.display_name} has mentioned you in a comment in issue {issue.name}",  # noqa: E501
+                    actor_id=actor_id,
+                    mention_id=mention_id,
+                    issue_id=issue_id,
+                    activity=issue_activity,
+                )
 
-                    # Create in app notification
-                    bulk_notifications.append(
-                        Notification(
-                            workspace=project.workspace,
-                            sender=sender,
+                # check for email notifications
+                if preference is not None and preference.mention:
+                    bulk_email_logs.append(
+                        EmailNotificationLog(
                             triggered_by_id=actor_id,
-                            receiver_id=subscriber,
+                            receiver_id=mention_id,
                             entity_identifier=issue_id,
                             entity_name="issue",
-                            project=project,
-                            title=issue_activity.get("comment"),
                             data={
-                                "issue": {
-                                    "id": str(issue_id),
-                                    "name": str(issue.name),
-                                    "identifier": str(issue.project.identifier),
-                                    "sequence_id": issue.sequence_id,
-                                    "state_name": issue.state.name,
-                                    "state_group": issue.state.group,
-                                },
+                                "issue": get_issue_notification_data(issue, with_project=True),
                                 "issue_activity": {
                                     "id": str(issue_activity.get("id")),
                                     "verb": str(issue_activity.get("verb")),
-                                    "field": str(issue_activity.get("field")),
+                                    "field": str("mention"),
                                     "actor": str(issue_activity.get("actor_id")),
                                     "new_value": str(issue_activity.get("new_value")),
                                     "old_value": str(issue_activity.get("old_value")),
-                                    "issue_comment": str(
-                                        issue_comment.comment_stripped if issue_comment is not None else ""
-                                    ),
-                                    "old_identifier": (
-                                        str(issue_activity.get("old_identifier"))
-                                        if issue_activity.get("old_identifier")
-                                        else None
-                                    ),
-                                    "new_identifier": (
-                                        str(issue_activity.get("new_identifier"))
-                                        if issue_activity.get("new_identifier")
-                                        else None
-                                    ),
+                                    **get_activity_identifiers(issue_activity),
+                                    "activity_time": issue_activity.get("created_at"),
                                 },
                             },
                         )
                     )
-                    # Create email notification
-                    if send_email:
+                bulk_notifications.append(notification)
+
+    for mention_id in new_mentions:
+        if mention_id != actor_id:
+            preference = preferences.get(mention_id)
+            if (
+                last_activity is not None
+                and last_activity.field == "description"
+                and actor_id == str(last_activity.actor_id)
+            ):
+                last_activity_data = {
+                    "id": str(last_activity.id),
+                    "verb": str(last_activity.verb),
+                    "field": str(last_activity.field),
+                    "actor": str(last_activity.actor_id),
+                    "new_value": str(last_activity.new_value),
+                    "old_value": str(last_activity.old_value),
+                    "old_identifier": (str(last_activity.old_identifier) if last_activity.old_identifier else None),
+                    "new_identifier": (str(last_activity.new_identifier) if last_activity.new_identifier else None),
+                }
+                bulk_notifications.append(
+                    Notification(
+                        workspace=project.workspace,
+                        sender="in_app:issue_activities:mentioned",
+                        triggered_by_id=actor_id,
+                        receiver_id=mention_id,
+                        entity_identifier=issue_id,
+                        entity_name="issue",
+                        project=project,
+                        message=f"You have been mentioned in the issue {issue.name}",
+                        data={
+                            "issue": get_issue_notification_data(issue, with_project=True),
+                            "issue_activity": last_activity_data,
+                        },
+                    )
+                )
+                if preference is not None and preference.mention:
+                    bulk_email_logs.append(
+                        EmailNotificationLog(
+                            triggered_by_id=actor_id,
+                            receiver_id=mention_id,
+                            entity_identifier=issue_id,
+                            entity_name="issue",
+                            data={
+                                "issue": get_issue_notification_data(issue),
+                                "issue_activity": {
+                                    **last_activity_data,
+                                    "field": "mention",
+                                    "activity_time": str(last_activity.created_at),
+                                },
+                            },
+                        )
+                    )
+            else:
+                for issue_activity in issue_activities_created:
+                    notification = create_mention_notification(
+                        project=project,
+                        issue=issue,
+                        notification_comment=f"You have been mentioned in the issue {issue.name}",
+                        actor_id=actor_id,
+                        mention_id=mention_id,
+                        issue_id=issue_id,
+                        activity=issue_activity,
+                    )
+                    if preference is not None and preference.mention:
                         bulk_email_logs.append(
                             EmailNotificationLog(
                                 triggered_by_id=actor_id,
-                                receiver_id=subscriber,
+                                receiver_id=mention_id,
                                 entity_identifier=issue_id,
                                 entity_name="issue",
                                 data={
-                                    "issue": {
-                                        "id": str(issue_id),
-                                        "name": str(issue.name),
-                                        "identifier": str(issue.project.identifier),
-                                        "project_id": str(issue.project.id),
-                                        "workspace_slug": str(issue.project.workspace.slug),
-                                        "sequence_id": issue.sequence_id,
-                                        "state_name": issue.state.name,
-                                        "state_group": issue.state.group,
-                                    },
+                                    "issue": get_issue_notification_data(issue),
                                     "issue_activity": {
                                         "id": str(issue_activity.get("id")),
                                         "verb": str(issue_activity.get("verb")),
-                                        "field": str(issue_activity.get("field")),
+                                        "field": str("mention"),
                                         "actor": str(issue_activity.get("actor_id")),
                                         "new_value": str(issue_activity.get("new_value")),
                                         "old_value": str(issue_activity.get("old_value")),
-                                        "issue_comment": str(
-                                            issue_comment.comment_stripped if issue_comment is not None else ""
-                                        ),
-                                        "old_identifier": (
-                                            str(issue_activity.get("old_identifier"))
-                                            if issue_activity.get("old_identifier")
-                                            else None
-                                        ),
-                                        "new_identifier": (
-                                            str(issue_activity.get("new_identifier"))
-                                            if issue_activity.get("new_identifier")
-                                            else None
-                                        ),
+                                        **get_activity_identifiers(issue_activity),
                                         "activity_time": issue_activity.get("created_at"),
                                     },
                                 },
                             )
                         )
+                    bulk_notifications.append(notification)
 
-            # -------------------------------------------------------------------------------------------------------- #
+    # save new mentions for the particular issue and remove the mentions that has been deleted from the description # noqa: E501
+    update_mentions_for_issue(
+        issue=issue,
+        project=project,
+        new_mentions=new_mentions,
+        removed_mention=removed_mention,
+    )
+    # Bulk create notifications
+    Notification.objects.bulk_create(bulk_notifications, batch_size=100)
+    EmailNotificationLog.objects.bulk_create(bulk_email_logs, batch_size=100, ignore_conflicts=True)
 
-            # Add Mentioned as Issue Subscribers
-            IssueSubscriber.objects.bulk_create(
-                mention_subscribers + comment_mention_subscribers,
-                batch_size=100,
-                ignore_conflicts=True,
-            )
 
-            last_activity = IssueActivity.objects.filter(issue_id=issue_id).order_by("-created_at").first()
-
-            actor = User.objects.get(pk=actor_id)
-
-            for mention_id in comment_mentions:
-                if mention_id != actor_id:
-                    preference = UserNotificationPreference.objects.get(user_id=mention_id)
-                    for issue_activity in issue_activities_created:
-                        notification = create_mention_notification(
-                            project=project,
-                            issue=issue,
-                            notification_comment=f"{actor.display_name} has mentioned you in a comment in issue {issue.name}",  # noqa: E501
-                            actor_id=actor_id,
-                            mention_id=mention_id,
-                            issue_id=issue_id,
-                            activity=issue_activity,
-                        )
+@shared_task
+def notifications(
+    type,
+    issue_id,
+    project_id,
+    actor_id,
+    subscriber,
+    issue_activities_created,
+    requested_data,
+    current_instance,
+):
+    try:
+        if type in SKIPPED_NOTIFICATION_TYPES:
+            return
+
+        issue_activities_created = json.loads(issue_activities_created) if issue_activities_created is not None else []
+        send_issue_notifications(
+            context=get_project_notification_context(project_id),
+            type=type,
+            issue_id=issue_id,
+            actor_id=actor_id,
+            subscriber=subscriber,
+            issue_activities_created=issue_activities_created,
+            requested_data=requested_data,
+            current_instance=current_instance,
+        )
+        return
+    except Exception as e:
+        print(e)
+        return
 
-                        # check for email notifications
-                        if preference.mention:
-                            bulk_email_logs.append(
-                                EmailNotificationLog(
-                                    triggered_by_id=actor_id,
-                                    receiver_id=mention_id,
-                                    entity_identifier=issue_id,
-                                    entity_name="issue",
-                                    data={
-                                        "issue": {
-                                            "id": str(issue_id),
-                                            "name": str(issue.name),
-                                            "identifier": str(issue.project.identifier),
-                                            "sequence_id": issue.sequence_id,
-                                            "state_name": issue.state.name,
-                                            "state_group": issue.state.group,
-                                            "project_id": str(issue.project.id),
-                                            "workspace_slug": str(issue.project.workspace.slug),
-                                        },
-                                        "issue_activity": {
-                                            "id": str(issue_activity.get("id")),
-                                            "verb": str(issue_activity.get("verb")),
-                                            "field": str("mention"),
-                                            "actor": str(issue_activity.get("actor_id")),
-                                            "new_value": str(issue_activity.get("new_value")),
-                                            "old_value": str(issue_activity.get("old_value")),
-                                            "old_identifier": (
-                                                str(issue_activity.get("old_identifier"))
-                                                if issue_activity.get("old_identifier")
-                                                else None
-                                            ),
-                                            "new_identifier": (
-                                                str(issue_activity.get("new_identifier"))
-                                                if issue_activity.get("new_identifier")
-                                                else None
-                                            ),
-                                            "activity_time": issue_activity.get("created_at"),
-                                        },
-                                    },
-                                )
-                            )
-                        bulk_notifications.append(notification)
-
-            for mention_id in new_mentions:
-                if mention_id != actor_id:
-                    preference = UserNotificationPreference.objects.get(user_id=mention_id)
-                    if (
-                        last_activity is not None
-                        and last_activity.field == "description"
-                        and actor_id == str(last_activity.actor_id)
-                    ):
-                        bulk_notifications.append(
-                            Notification(
-                                workspace=project.workspace,
-                                sender="in_app:issue_activities:mentioned",
-                                triggered_by_id=actor_id,
-                                receiver_id=mention_id,
-                                entity_identifier=issue_id,
-                                entity_name="issue",
-                                project=project,
-                                message=f"You have been mentioned in the issue {issue.name}",
-                                data={
-                                    "issue": {
-                                        "id": str(issue_id),
-                                        "name": str(issue.name),
-                                        "identifier": str(issue.project.identifier),
-                                        "sequence_id": issue.sequence_id,
-                                        "state_name": issue.state.name,
-                                        "state_group": issue.state.group,
-                                        "project_id": str(issue.project.id),
-                                        "workspace_slug": str(issue.project.workspace.slug),
-                                    },
-                                    "issue_activity": {
-                                        "id": str(last_activity.id),
-                                        "verb": str(last_activity.verb),
-                                        "field": str(last_activity.field),
-                                        "actor": str(last_activity.actor_id),
-                                        "new_value": str(last_activity.new_value),
-                                        "old_value": str(last_activity.old_value),
-                                        "old_identifier": (
-                                            str(issue_activity.get("old_identifier"))
-                                            if issue_activity.get("old_identifier")
-                                            else None
-                                        ),
-                                        "new_identifier": (
-                                            str(issue_activity.get("new_identifier"))
-                                            if issue_activity.get("new_identifier")
-                                            else None
-                                        ),
-                                    },
-                                },
-                            )
-                        )
-                        if preference.mention:
-                            bulk_email_logs.append(
-                                EmailNotificationLog(
-                                    triggered_by_id=actor_id,
-                                    receiver_id=subscriber,
-                                    entity_identifier=issue_id,
-                                    entity_name="issue",
-                                    data={
-                                        "issue": {
-                                            "id": str(issue_id),
-                                            "name": str(issue.name),
-                                            "identifier": str(issue.project.identifier),
-                                            "sequence_id": issue.sequence_id,
-                                            "state_name": issue.state.name,
-                                            "state_group": issue.state.group,
-                                        },
-                                        "issue_activity": {
-                                            "id": str(last_activity.id),
-                                            "verb": str(last_activity.verb),
-                                            "field": "mention",
-                                            "actor": str(last_activity.actor_id),
-                                            "new_value": str(last_activity.new_value),
-                                            "old_value": str(last_activity.old_value),
-                                            "old_identifier": (
-                                                str(issue_activity.get("old_identifier"))
-                                                if issue_activity.get("old_identifier")
-                                                else None
-                                            ),
-                                            "new_identifier": (
-                                                str(issue_activity.get("new_identifier"))
-                                                if issue_activity.get("new_identifier")
-                                                else None
-                                            ),
-                                            "activity_time": str(last_activity.created_at),
-                                        },
-                                    },
-                                )
-                            )
-                    else:
-                        for issue_activity in issue_activities_created:
-                            notification = create_mention_notification(
-                                project=project,
-                                issue=issue,
-                                notification_comment=f"You have been mentioned in the issue {issue.name}",
-                                actor_id=actor_id,
-                                mention_id=mention_id,
-                                issue_id=issue_id,
-                                activity=issue_activity,
-                            )
-                            if preference.mention:
-                                bulk_email_logs.append(
-                                    EmailNotificationLog(
-                                        triggered_by_id=actor_id,
-                                        receiver_id=subscriber,
-                                        entity_identifier=issue_id,
-                                        entity_name="issue",
-                                        data={
-                                            "issue": {
-                                                "id": str(issue_id),
-                                                "name": str(issue.name),
-                                                "identifier": str(issue.project.identifier),
-                                                "sequence_id": issue.sequence_id,
-                                                "state_name": issue.state.name,
-                                                "state_group": issue.state.group,
-                                            },
-                                            "issue_activity": {
-                                                "id": str(issue_activity.get("id")),
-                                                "verb": str(issue_activity.get("verb")),
-                                                "field": str("mention"),
-                                                "actor": str(issue_activity.get("actor_id")),
-                                                "new_value": str(issue_activity.get("new_value")),
-                                                "old_value": str(issue_activity.get("old_value")),
-                                                "old_identifier": (
-                                                    str(issue_activity.get("old_identifier"))
-                                                    if issue_activity.get("old_identifier")
-                                                    else None
-                                                ),
-                                                "new_identifier": (
-                                                    str(issue_activity.get("new_identifier"))
-                                                    if issue_activity.get("new_identifier")
-                                                    else None
-                                                ),
-                                                "activity_time": issue_activity.get("created_at"),
-                                            },
-                                        },
-                                    )
-                                )
-                            bulk_notifications.append(notification)
-
-            # save new mentions for the particular issue and remove the mentions that has been deleted from the description # noqa: E501
-            update_mentions_for_issue(
-                issue=issue,
-                project=project,
-                new_mentions=new_mentions,
-                removed_mention=removed_mention,
+
+@shared_task
+def bulk_notifications(type, project_id, actor_id, subscriber, issue_deltas):
+    """Fan out the notifications of a bulk activity, loading the project data once"""
+    try:
+        if type in SKIPPED_NOTIFICATION_TYPES:
+            return
+
+        context = get_project_notification_context(project_id)
+        for delta in json.loads(issue_deltas):
+            send_issue_notifications(
+                context=context,
+                type=type,
+                issue_id=delta["issue_id"],
+                actor_id=actor_id,
+                subscriber=subscriber,
+                issue_activities_created=delta["issue_activities_created"],
+                requested_data=delta["requested_data"],
+                current_instance=delta["current_instance"],
             )
-            # Bulk create notifications
-            Notification.objects.bulk_create(bulk_notifications, batch_size=100)
-            EmailNotificationLog.objects.bulk_create(bulk_email_logs, batch_size=100, ignore_conflicts=True)
         return
     except Exception as e:
         print(e)
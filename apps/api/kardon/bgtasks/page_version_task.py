@@ -9,8 +9,9 @@ import json
 from celery import shared_task
 
 # Module imports
-from kardon.db.models import Page, PageVersion
+from kardon.db.models import Page
 from kardon.utils.exception_logger import log_exception
+from kardon.utils.page_version import save_page_version
 
 
 @shared_task
@@ -24,22 +25,7 @@ def page_version(page_id, existing_instance, user_id):
 
         # Create a version if description_html is updated
         if current_instance.get("description_html") != page.description_html:
-            # Create a new page version
-            PageVersion.objects.create(
-                page_id=page_id,
-                workspace_id=page.workspace_id,
-                description_html=page.description_html,
-                description_binary=page.description_binary,
-                owned_by_id=user_id,
-                last_saved_at=page.updated_at,
-                description_json=page.description_json,
-                description_stripped=page.description_stripped,
-            )
-
-            # If page versions are greater than 20 delete the oldest one
-            if PageVersion.objects.filter(page_id=page_id).count() > 20:
-                # Delete the old page version
-                PageVersion.objects.filter(page_id=page_id).order_by("last_saved_at").first().delete()
+            save_page_version(page, user_id)
 
         return
     except Page.DoesNotExist:
@@ -0,0 +1,174 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import logging
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+# Third party imports
+from celery import shared_task
+
+# Module imports
+from kardon.db.models import (
+    Cycle,
+    CycleBurndownSnapshot,
+    CycleIssue,
+    Module,
+    ModuleBurndownSnapshot,
+    ModuleIssue,
+)
+from kardon.settings.redis import redis_instance
+from kardon.utils.burndown import get_progress_burndown, store_burndown
+from kardon.utils.exception_logger import log_exception
+from kardon.utils.progress import refresh_cycle_progress, refresh_module_progress
+
+logger = logging.getLogger("kardon.worker")
+
+PROGRESS_REFRESH_KEY_PREFIX = "progress_refresh"
+
+# Activity fields changing which state group or estimate an issue counts in
+PROGRESS_ACTIVITY_FIELDS = {"state", "archived_at", "draft", "issue", "intake"}
+
+RECONCILE_BATCH_SIZE = 500
+
+
+def queue_progress_refresh(cycle_ids=(), module_ids=()):
+    """
+    Mark the cycles and modules as stale, the first change of a window
+    schedules the refresh of every entity marked until then
+    """
+    cycle_ids = {str(cycle_id) for cycle_id in cycle_ids if cycle_id}
+    module_ids = {str(module_id) for module_id in module_ids if module_id}
+    if not cycle_ids and not module_ids:
+        return
+
+    ri = redis_instance()
+    pipe = ri.pipeline()
+    if cycle_ids:
+        pipe.sadd(f"{PROGRESS_REFRESH_KEY_PREFIX}:cycle", *cycle_ids)
+    if module_ids:
+        pipe.sadd(f"{PROGRESS_REFRESH_KEY_PREFIX}:module", *module_ids)
+    pipe.execute()
+
+    # The flag expires on its own if the refresh never runs, the next change reschedules it
+    if ri.set(f"{PROGRESS_REFRESH_KEY_PREFIX}:scheduled", 1, nx=True, ex=settings.PROGRESS_REFRESH_WINDOW + 60):
+        progress_refresh_task.apply_async(countdown=settings.PROGRESS_REFRESH_WINDOW)
+
+
+def queue_activity_progress_refresh(issue_activities):
+    """Queue the refresh of the cycles and modules whose progress the issue activities changed"""
+    issue_ids = set()
+    cycle_ids = set()
+    module_ids = set()
+    for activity in issue_activities:
+        field = activity.field or ""
+        if field == "cycles":
+            cycle_ids.update([activity.old_identifier, activity.new_identifier])
+        elif field == "modules":
+            module_ids.update([activity.old_identifier, activity.new_identifier])
+        elif field in PROGRESS_ACTIVITY_FIELDS or field.startswith("estimate_"):
+            issue_ids.add(activity.issue_id)
+
+    for ids in (issue_ids, cycle_ids, module_ids):
+        ids.discard(None)
+
+    if issue_ids:
+        # Include the removed memberships so a deleted issue leaves the counts
+        cycle_ids.update(CycleIssue.all_objects.filter(issue_id__in=issue_ids).values_list("cycle_id", flat=True))
+        module_ids.update(ModuleIssue.all_objects.filter(issue_id__in=issue_ids).values_list("module_id", flat=True))
+
+    queue_progress_refresh(cycle_ids=cycle_ids, module_ids=module_ids)
+
+
+@shared_task
+def progress_refresh_task():
+    """Recalculate the progress of the cycles and modules marked as stale"""
+    try:
+        pipe = redis_instance().pipeline(transaction=True)
+        pipe.smembers(f"{PROGRESS_REFRESH_KEY_PREFIX}:cycle")
+        pipe.smembers(f"{PROGRESS_REFRESH_KEY_PREFIX}:module")
+        pipe.delete(
+            f"{PROGRESS_REFRESH_KEY_PREFIX}:cycle",
+            f"{PROGRESS_REFRESH_KEY_PREFIX}:module",
+            f"{PROGRESS_REFRESH_KEY_PREFIX}:scheduled",
+        )
+        cycle_ids, module_ids, _ = pipe.execute()
+
+        refresh_cycle_progress([cycle_id.decode() for cycle_id in cycle_ids])
+        refresh_module_progress([module_id.decode() for module_id in module_ids])
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+@shared_task
+def reconcile_progress():
+    """
+    Recalculate the progress of every open cycle and module, correcting the
+    drift of the changes made without an issue activity
+    """
+    try:
+        recently = timezone.now() - timedelta(days=1)
+        cycle_ids = list(
+            Cycle.objects.filter(
+                Q(end_date__isnull=True) | Q(end_date__gte=recently), archived_at__isnull=True
+            ).values_list("id", flat=True)
+        )
+        module_ids = list(
+            Module.objects.filter(archived_at__isnull=True)
+            .exclude(status__in=["completed", "cancelled"])
+            .values_list("id", flat=True)
+        )
+
+        for index in range(0, len(cycle_ids), RECONCILE_BATCH_SIZE):
+            refresh_cycle_progress(cycle_ids[index : index + RECONCILE_BATCH_SIZE])
+        for index in range(0, len(module_ids), RECONCILE_BATCH_SIZE):
+            refresh_module_progress(module_ids[index : index + RECONCILE_BATCH_SIZE])
+
+        logger.info(f"Reconciled the progress of {len(cycle_ids)} cycles and {len(module_ids)} modules")
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+@shared_task
+def snapshot_burndown():
+    """
+    Write the burndown snapshot of the day that just ended for every cycle
+    and module running on it
+    """
+    try:
+        date = timezone.now().date() - timedelta(days=1)
+        cycle_ids = list(
+            Cycle.objects.filter(
+                start_date__date__lte=date, end_date__date__gte=date, archived_at__isnull=True
+            ).values_list("id", flat=True)
+        )
+        module_ids = list(
+            Module.objects.filter(start_date__lte=date, target_date__gte=date, archived_at__isnull=True).values_list(
+                "id", flat=True
+            )
+        )
+
+        for snapshot_model, entity_field, refresh, entity_ids in [
+            (CycleBurndownSnapshot, "cycle", refresh_cycle_progress, cycle_ids),
+            (ModuleBurndownSnapshot, "module", refresh_module_progress, module_ids),
+        ]:
+            for index in range(0, len(entity_ids), RECONCILE_BATCH_SIZE):
+                progress = refresh(entity_ids[index : index + RECONCILE_BATCH_SIZE])
+                store_burndown(
+                    snapshot_model,
+                    entity_field,
+                    [(entity_id, date, get_progress_burndown(values)) for entity_id, values in progress.items()],
+                )
+
+        logger.info(f"Snapshotted the burndown of {len(cycle_ids)} cycles and {len(module_ids)} modules for {date}")
+    except Exception as e:
+        log_exception(e)
+        return
@@ -3,59 +3,160 @@
 # See the LICENSE file for details.
 
 # Python imports
+from datetime import datetime, timezone as dt_timezone
+
+# Django imports
+from django.conf import settings
+from django.db.models import F, Subquery, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
-from django.db import DatabaseError
 
 # Third party imports
 from celery import shared_task
 
 # Module imports
 from kardon.db.models import UserRecentVisit, Workspace
+from kardon.settings.redis import redis_instance
 from kardon.utils.exception_logger import log_exception
+from kardon.utils.recent_visit import (
+    MAX_RECENT_VISITS,
+    RECENT_VISITS_KEY,
+    RECENT_VISITS_TTL,
+    get_recent_visit_member,
+    get_recent_visitors_key,
+    get_recent_visits_key,
+    parse_recent_visit_member,
+)
+
+# Sorted sets changed since the last flush
+RECENT_VISITS_CHANGED_KEY = f"{RECENT_VISITS_KEY}:changed"
+
+
+def record_recent_visit(entity_name, entity_identifier, user_id, project_id, slug):
+    """
+    Record the visit in the sorted set of the user, the first visit of an
+    interval schedules the write of every set changed until then
+    """
+    try:
+        key = get_recent_visits_key(slug, user_id)
+        member = get_recent_visit_member(entity_name, entity_identifier, project_id)
+        pipe = redis_instance().pipeline()
+        pipe.zadd(key, {member: timezone.now().timestamp()})
+        # Keep the latest visits only
+        pipe.zremrangebyrank(key, 0, -(MAX_RECENT_VISITS + 1))
+        pipe.expire(key, RECENT_VISITS_TTL)
+        # Deleting the entity drops it from the sets of its visitors
+        visitors_key = get_recent_visitors_key(slug, entity_name, entity_identifier)
+        pipe.sadd(visitors_key, str(user_id))
+        pipe.expire(visitors_key, RECENT_VISITS_TTL)
+        pipe.sadd(RECENT_VISITS_CHANGED_KEY, key)
+        # The flag expires on its own if the flush never runs, the next visit reschedules it
+        pipe.set(
+            f"{RECENT_VISITS_KEY}:scheduled",
+            1,
+            nx=True,
+            ex=settings.RECENT_VISIT_FLUSH_INTERVAL + 60,
+        )
+        *_, scheduled = pipe.execute()
+
+        if scheduled:
+            flush_recent_visits.apply_async(countdown=settings.RECENT_VISIT_FLUSH_INTERVAL)
+    except Exception as e:
+        # Losing a visit must never fail the request
+        log_exception(e)
 
 
 @shared_task
-def recent_visited_task(entity_name, entity_identifier, user_id, project_id, slug):
+def flush_recent_visits():
+    """Write the visits of the changed sorted sets in bulk and keep the latest ones per user"""
     try:
-        workspace = Workspace.objects.get(slug=slug)
-        recent_visited = UserRecentVisit.objects.filter(
-            entity_name=entity_name,
-            entity_identifier=entity_identifier,
-            user_id=user_id,
-            project_id=project_id,
-            workspace_id=workspace.id,
-        ).first()
-
-        if recent_visited:
-            # Check if the database is available
-            try:
-                recent_visited.visited_at = timezone.now()
-                recent_visited.save(update_fields=["visited_at"])
-            except DatabaseError:
-                pass
-        else:
-            recent_visited_count = UserRecentVisit.objects.filter(user_id=user_id, workspace_id=workspace.id).count()
-            if recent_visited_count == 20:
-                recent_visited = (
-                    UserRecentVisit.objects.filter(user_id=user_id, workspace_id=workspace.id)
-                    .order_by("created_at")
-                    .first()
+        ri = redis_instance()
+        pipe = ri.pipeline(transaction=True)
+        pipe.smembers(RECENT_VISITS_CHANGED_KEY)
+        pipe.delete(RECENT_VISITS_CHANGED_KEY, f"{RECENT_VISITS_KEY}:scheduled")
+        keys, _ = pipe.execute()
+        if not keys:
+            return
+
+        keys = [key.decode() for key in keys]
+        pipe = ri.pipeline(transaction=False)
+        for key in keys:
+            pipe.zrevrange(key, 0, -1, withscores=True)
+        members = pipe.execute()
+
+        # Keys are recent_visits:<slug>:<user id>
+        owners = [key.split(":")[1:] for key in keys]
+        workspace_ids = dict(Workspace.objects.filter(slug__in={slug for slug, _ in owners}).values_list("slug", "id"))
+
+        visits = {}
+        for (slug, user_id), key_members in zip(owners, members):
+            if slug not in workspace_ids:
+                continue
+            for member, score in key_members:
+                entity_name, entity_identifier, project_id = parse_recent_visit_member(member)
+                visits[(user_id, str(workspace_ids[slug]), entity_name, entity_identifier)] = (
+                    project_id,
+                    datetime.fromtimestamp(score, tz=dt_timezone.utc),
                 )
-                recent_visited.delete()
-
-            recent_activity = UserRecentVisit.objects.create(
-                entity_name=entity_name,
-                entity_identifier=entity_identifier,
-                user_id=user_id,
-                visited_at=timezone.now(),
-                project_id=project_id,
-                workspace_id=workspace.id,
+        if not visits:
+            return
+
+        user_ids = {user_id for user_id, *_ in visits}
+        existing = UserRecentVisit.objects.filter(user_id__in=user_ids, workspace_id__in=workspace_ids.values())
+
+        updated = []
+        for recent_visit in existing:
+            visit = visits.pop(
+                (
+                    str(recent_visit.user_id),
+                    str(recent_visit.workspace_id),
+                    recent_visit.entity_name,
+                    str(recent_visit.entity_identifier),
+                ),
+                None,
             )
-            recent_activity.created_by_id = user_id
-            recent_activity.updated_by_id = user_id
-            recent_activity.save(update_fields=["created_by_id", "updated_by_id"])
+            if visit is not None:
+                recent_visit.visited_at = visit[1]
+                updated.append(recent_visit)
 
-        return
+        UserRecentVisit.objects.bulk_update(updated, ["visited_at"], batch_size=500)
+        UserRecentVisit.objects.bulk_create(
+            [
+                UserRecentVisit(
+                    user_id=user_id,
+                    workspace_id=workspace_id,
+                    entity_name=entity_name,
+                    entity_identifier=entity_identifier,
+                    project_id=project_id,
+                    visited_at=visited_at,
+                    created_by_id=user_id,
+                    updated_by_id=user_id,
+                )
+                for (user_id, workspace_id, entity_name, entity_identifier), (project_id, visited_at) in visits.items()
+            ],
+            batch_size=500,
+        )
+
+        # Drop the visits past the latest ones of the users
+        UserRecentVisit.objects.filter(
+            id__in=Subquery(
+                existing.annotate(
+                    row_number=Window(
+                        expression=RowNumber(),
+                        partition_by=[F("user_id"), F("workspace_id")],
+                        order_by=F("visited_at").desc(),
+                    )
+                )
+                .filter(row_number__gt=MAX_RECENT_VISITS)
+                .values("id")
+            )
+        ).delete(soft=False)
     except Exception as e:
         log_exception(e)
         return
+
+
+@shared_task
+def recent_visited_task(entity_name, entity_identifier, user_id, project_id, slug):
+    # Kept for the messages queued before the visits were buffered in redis
+    record_recent_visit(entity_name, entity_identifier, user_id, project_id, slug)
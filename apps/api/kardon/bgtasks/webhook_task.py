@@ -6,9 +6,12 @@ import hashlib
 import hmac
 import json
 import logging
+import os
+import time
 import uuid
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List, Optional, Union
 
 # Third party imports
@@ -53,6 +56,7 @@ from kardon.db.models import (
 from kardon.license.utils.instance_value import get_email_configuration
 from kardon.utils.exception_logger import log_exception
 from kardon.settings.mongo import MongoConnection
+from kardon.settings.redis import redis_instance
 
 
 SERIALIZER_MAPPER = {
@@ -82,6 +86,37 @@ MODEL_MAPPER = {
 
 logger = logging.getLogger("kardon.worker")
 
+WEBHOOK_ACTION_MAPPER = {
+    "POST": "create",
+    "PATCH": "update",
+    "PUT": "update",
+    "DELETE": "delete",
+}
+
+WEBHOOK_BATCH_KEY_PREFIX = "webhook_batch"
+
+# Pooled session of the worker process, rebuilt after a fork
+_webhook_session = None
+_webhook_session_pid = None
+
+
+def get_webhook_session() -> requests.Session:
+    """Return the worker's pooled session keeping the connections to the webhook hosts alive"""
+    global _webhook_session, _webhook_session_pid
+
+    if _webhook_session is None or _webhook_session_pid != os.getpid():
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.WEBHOOK_POOL_MAXSIZE,
+            pool_maxsize=settings.WEBHOOK_POOL_MAXSIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _webhook_session = session
+        _webhook_session_pid = os.getpid()
+
+    return _webhook_session
+
 
 def get_issue_prefetches():
     return [
@@ -100,6 +135,8 @@ def save_webhook_log(
     response_body: str,
     retry_count: int,
     event_type: str,
+    event_count: int = 1,
+    response_time_ms: Optional[int] = None,
 ) -> None:
     # webhook_logs
     mongo_collection = MongoConnection.get_collection("webhook_logs")
@@ -115,6 +152,8 @@ def save_webhook_log(
         "response_headers": str(response_headers),
         "response_body": str(response_body),
         "retry_count": retry_count,
+        "event_count": event_count,
+        "response_time_ms": response_time_ms,
     }
 
     mongo_save_success = False
@@ -250,6 +289,122 @@ def send_webhook_deactivation_email(webhook_id: str, receiver_id: str, current_s
         logger.error(f"Failed to send email: {e}")
 
 
+def get_webhook_headers(
+    webhook: Webhook, event: str, payload: Union[Dict[str, Any], List[Dict[str, Any]]]
+) -> Dict[str, str]:
+    """Build the delivery headers and sign the payload with the webhook secret"""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "Autopilot",
+        "X-Kardon-Delivery": str(uuid.uuid4()),
+        "X-Kardon-Event": event,
+    }
+
+    # Use HMAC for generating signature
+    if webhook.secret_key:
+        hmac_signature = hmac.new(
+            webhook.secret_key.encode("utf-8"),
+            json.dumps(payload).encode("utf-8"),
+            hashlib.sha256,
+        )
+        signature = hmac_signature.hexdigest()
+        headers["X-Kardon-Signature"] = signature
+
+    return headers
+
+
+def get_webhook_payload(
+    webhook: Webhook,
+    event: str,
+    event_data: Optional[Dict[str, Any]],
+    action: str,
+    activity: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Build the payload of a single webhook event"""
+    event_data = json.loads(json.dumps(event_data, cls=DjangoJSONEncoder)) if event_data is not None else None
+
+    activity = json.loads(json.dumps(activity, cls=DjangoJSONEncoder)) if activity is not None else None
+
+    return {
+        "event": event,
+        "action": WEBHOOK_ACTION_MAPPER.get(action, action),
+        "webhook_id": str(webhook.id),
+        "workspace_id": str(webhook.workspace_id),
+        "data": event_data,
+        "activity": activity,
+    }
+
+
+def deliver_webhook(
+    webhook: Webhook,
+    headers: Dict[str, str],
+    payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+    action: str,
+    event: str,
+    retry_count: int,
+    event_count: int = 1,
+) -> requests.Response:
+    """
+    Post the payload over the pooled session and log the delivery with its stats.
+
+    Raises:
+        requests.RequestException: If the request fails, after logging it
+    """
+    started_at = time.monotonic()
+    try:
+        response = get_webhook_session().post(webhook.url, headers=headers, json=payload, timeout=30)
+    except requests.RequestException as e:
+        # Log the failed webhook request
+        save_webhook_log(
+            webhook=webhook,
+            request_method=action,
+            request_headers=headers,
+            request_body=payload,
+            response_status=500,
+            response_headers="",
+            response_body=str(e),
+            retry_count=retry_count,
+            event_type=event,
+            event_count=event_count,
+            response_time_ms=int((time.monotonic() - started_at) * 1000),
+        )
+        raise
+
+    # Log the webhook request
+    save_webhook_log(
+        webhook=webhook,
+        request_method=action,
+        request_headers=headers,
+        request_body=payload,
+        response_status=response.status_code,
+        response_headers=response.headers,
+        response_body=response.text,
+        retry_count=retry_count,
+        event_type=event,
+        event_count=event_count,
+        response_time_ms=int((time.monotonic() - started_at) * 1000),
+    )
+    return response
+
+
+def handle_webhook_failure(task, webhook: Webhook, error: requests.RequestException, current_site: str) -> None:
+    """Deactivate the webhook once the retries are exhausted, otherwise retry the task"""
+    logger.error(f"Webhook {webhook.id} failed with error: {error}")
+    # Retry logic
+    if task.request.retries >= task.max_retries:
+        Webhook.objects.filter(pk=webhook.id).update(is_active=False)
+        if webhook:
+            # send email for the deactivation of the webhook
+            send_webhook_deactivation_email.delay(
+                webhook_id=webhook.id,
+                receiver_id=webhook.created_by_id,
+                reason=str(error),
+                current_site=current_site,
+            )
+        return
+    raise requests.RequestException()
+
+
 @shared_task(
     bind=True,
     autoretry_for=(requests.RequestException,),
@@ -282,43 +437,11 @@ def webhook_send_task(
     try:
         webhook = Webhook.objects.get(id=webhook_id, workspace__slug=slug)
 
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "Autopilot",
-            "X-Kardon-Delivery": str(uuid.uuid4()),
-            "X-Kardon-Event": event,
-        }
-
-        # # Your secret key
-        event_data = json.loads(json.dumps(event_data, cls=DjangoJSONEncoder)) if event_data is not None else None
-
-        activity = json.loads(json.dumps(activity, cls=DjangoJSONEncoder)) if activity is not None else None
-
-        action = {
-            "POST": "create",
-            "PATCH": "update",
-            "PUT": "update",
-            "DELETE": "delete",
-        }.get(action, action)
-
-        payload = {
-            "event": event,
-            "action": action,
-            "webhook_id": str(webhook.id),
-            "workspace_id": str(webhook.workspace_id),
-            "data": event_data,
-            "activity": activity,
-        }
-
-        # Use HMAC for generating signature
-        if webhook.secret_key:
-            hmac_signature = hmac.new(
-                webhook.secret_key.encode("utf-8"),
-                json.dumps(payload).encode("utf-8"),
-                hashlib.sha256,
-            )
-            signature = hmac_signature.hexdigest()
-            headers["X-Kardon-Signature"] = signature
+        payload = get_webhook_payload(
+            webhook=webhook, event=event, event_data=event_data, action=action, activity=activity
+        )
+        action = payload["action"]
+        headers = get_webhook_headers(webhook=webhook, event=event, payload=payload)
     except Exception as e:
         log_exception(e)
         logger.error(f"Failed to send webhook: {e}")
@@ -326,54 +449,149 @@ def webhook_send_task(
 
     try:
         # Send the webhook event
-        response = requests.post(webhook.url, headers=headers, json=payload, timeout=30)
-
-        # Log the webhook request
-        save_webhook_log(
+        deliver_webhook(
             webhook=webhook,
-            request_method=action,
-            request_headers=headers,
-            request_body=payload,
-            response_status=response.status_code,
-            response_headers=response.headers,
-            response_body=response.text,
+            headers=headers,
+            payload=payload,
+            action=action,
+            event=event,
             retry_count=self.request.retries,
-            event_type=event,
         )
         logger.info(f"Webhook {webhook.id} sent successfully")
     except requests.RequestException as e:
-        # Log the failed webhook request
-        save_webhook_log(
+        handle_webhook_failure(self, webhook=webhook, error=e, current_site=current_site)
+
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+def queue_webhook_batch(
+    webhook: Webhook,
+    slug: str,
+    event: str,
+    event_data: Optional[Dict[str, Any]],
+    action: str,
+    current_site: str,
+    activity: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Buffer the event of a batched webhook, the first event of a window
+    schedules the flush of every event buffered until then
+    """
+    batch_key = f"{WEBHOOK_BATCH_KEY_PREFIX}:{webhook.id}"
+    ri = redis_instance()
+    ri.rpush(
+        batch_key,
+        json.dumps(
+            get_webhook_payload(webhook=webhook, event=event, event_data=event_data, action=action, activity=activity),
+            cls=DjangoJSONEncoder,
+        ),
+    )
+    # The flag expires on its own if the flush never runs, the next event reschedules it
+    if ri.set(f"{batch_key}:scheduled", 1, nx=True, ex=settings.WEBHOOK_BATCH_WINDOW + 60):
+        webhook_batch_flush_task.apply_async(
+            kwargs={"webhook_id": str(webhook.id), "slug": slug, "current_site": current_site},
+            countdown=settings.WEBHOOK_BATCH_WINDOW,
+        )
+
+
+@shared_task
+def webhook_batch_flush_task(webhook_id: str, slug: str, current_site: str) -> None:
+    """Drain the events buffered for the webhook into a single batched delivery"""
+    try:
+        batch_key = f"{WEBHOOK_BATCH_KEY_PREFIX}:{webhook_id}"
+        pipe = redis_instance().pipeline(transaction=True)
+        pipe.lrange(batch_key, 0, -1)
+        pipe.delete(batch_key)
+        pipe.delete(f"{batch_key}:scheduled")
+        events, _, _ = pipe.execute()
+
+        if events:
+            webhook_batch_send_task.delay(
+                webhook_id=webhook_id,
+                slug=slug,
+                payloads=[json.loads(event) for event in events],
+                current_site=current_site,
+            )
+    except Exception as e:
+        log_exception(e)
+        return
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(requests.RequestException,),
+    retry_backoff=600,
+    max_retries=5,
+    retry_jitter=True,
+)
+def webhook_batch_send_task(
+    self,
+    webhook_id: str,
+    slug: str,
+    payloads: List[Dict[str, Any]],
+    current_site: str,
+) -> None:
+    """Send the coalesced events of a webhook as one signed payload array"""
+    try:
+        webhook = Webhook.objects.get(id=webhook_id, workspace__slug=slug)
+        headers = get_webhook_headers(webhook=webhook, event="batch", payload=payloads)
+        headers["X-Kardon-Batch-Size"] = str(len(payloads))
+    except Exception as e:
+        log_exception(e)
+        logger.error(f"Failed to send webhook: {e}")
+        return
+
+    try:
+        deliver_webhook(
             webhook=webhook,
-            request_method=action,
-            request_headers=headers,
-            request_body=payload,
-            response_status=500,
-            response_headers="",
-            response_body=str(e),
+            headers=headers,
+            payload=payloads,
+            action="batch",
+            event="batch",
             retry_count=self.request.retries,
-            event_type=event,
+            event_count=len(payloads),
         )
-        logger.error(f"Webhook {webhook.id} failed with error: {e}")
-        # Retry logic
-        if self.request.retries >= self.max_retries:
-            Webhook.objects.filter(pk=webhook.id).update(is_active=False)
-            if webhook:
-                # send email for the deactivation of the webhook
-                send_webhook_deactivation_email.delay(
-                    webhook_id=webhook.id,
-                    receiver_id=webhook.created_by_id,
-                    reason=str(e),
-                    current_site=current_site,
-                )
-            return
-        raise requests.RequestException()
+        logger.info(f"Webhook {webhook.id} sent {len(payloads)} events successfully")
+    except requests.RequestException as e:
+        handle_webhook_failure(self, webhook=webhook, error=e, current_site=current_site)
 
     except Exception as e:
         log_exception(e)
         return
 
 
+def get_event_webhooks(slug, event):
+    """Return the active webhooks of the workspace subscribed to the event"""
+    webhooks = Webhook.objects.filter(workspace__slug=slug, is_active=True)
+
+    if event == "project":
+        webhooks = webhooks.filter(project=True)
+
+    if event == "issue":
+        webhooks = webhooks.filter(issue=True)
+
+    if event == "module" or event == "module_issue":
+        webhooks = webhooks.filter(module=True)
+
+    if event == "cycle" or event == "cycle_issue":
+        webhooks = webhooks.filter(cycle=True)
+
+    if event == "issue_comment":
+        webhooks = webhooks.filter(issue_comment=True)
+
+    return webhooks
+
+
+def send_webhook_delivery(webhook, delivery):
+    """Send the delivery right away or add it to the batch of the webhook"""
+    if webhook.batch_delivery:
+        queue_webhook_batch(webhook=webhook, **delivery)
+    else:
+        webhook_send_task.delay(webhook_id=webhook.id, **delivery)
+
+
 @shared_task
 def webhook_activity(
     event: str,
@@ -415,32 +633,18 @@ def webhook_activity(
         race conditions where objects might have been deleted.
     """
     try:
-        webhooks = Webhook.objects.filter(workspace__slug=slug, is_active=True)
-
-        if event == "project":
-            webhooks = webhooks.filter(project=True)
-
-        if event == "issue":
-            webhooks = webhooks.filter(issue=True)
-
-        if event == "module" or event == "module_issue":
-            webhooks = webhooks.filter(module=True)
-
-        if event == "cycle" or event == "cycle_issue":
-            webhooks = webhooks.filter(cycle=True)
-
-        if event == "issue_comment":
-            webhooks = webhooks.filter(issue_comment=True)
+        webhooks = get_event_webhooks(slug, event)
 
         for webhook in webhooks:
-            webhook_send_task.delay(
-                webhook_id=webhook.id,
-                slug=slug,
-                event=event,
-                event_data=({"id": event_id} if verb == "deleted" else get_model_data(event=event, event_id=event_id)),
-                action=verb,
-                current_site=current_site,
-                activity={
+            delivery = {
+                "slug": slug,
+                "event": event,
+                "event_data": (
+                    {"id": event_id} if verb == "deleted" else get_model_data(event=event, event_id=event_id)
+                ),
+                "action": verb,
+                "current_site": current_site,
+                "activity": {
                     "field": field,
                     "new_value": new_value,
                     "old_value": old_value,
@@ -448,7 +652,8 @@ def webhook_activity(
                     "old_identifier": old_identifier,
                     "new_identifier": new_identifier,
                 },
-            )
+            }
+            send_webhook_delivery(webhook, delivery)
         return
     except Exception as e:
         # Return if a does not exist error occurs
@@ -504,3 +709,42 @@ def model_activity(model_name, model_id, requested_data, current_instance, actor
                 )
 
     return
+
+
+@shared_task
+def bulk_model_activity(model_name, model_ids, actor_id, slug, origin=None):
+    """Send the created webhooks of many models of the same type from a single message"""
+    try:
+        webhooks = list(get_event_webhooks(slug, model_name))
+        if not webhooks:
+            return
+
+        # Serialize the models and the actor once for every webhook
+        event_data = {str(data["id"]): data for data in get_model_data(event=model_name, event_id=model_ids, many=True)}
+        actor = get_model_data(event="user", event_id=actor_id)
+        for webhook in webhooks:
+            for model_id in model_ids:
+                if str(model_id) not in event_data:
+                    continue
+                send_webhook_delivery(
+                    webhook,
+                    {
+                        "slug": slug,
+                        "event": model_name,
+                        "event_data": event_data[str(model_id)],
+                        "action": "created",
+                        "current_site": origin,
+                        "activity": {
+                            "field": None,
+                            "new_value": None,
+                            "old_value": None,
+                            "actor": actor,
+                            "old_identifier": None,
+                            "new_identifier": None,
+                        },
+                    },
+                )
+    except Exception as e:
+        if isinstance(e, ObjectDoesNotExist):
+            return
+        log_exception(e)
@@ -42,6 +42,7 @@ from kardon.db.models import (
     User,
     BotTypeEnum,
 )
+from kardon.utils.membership import invalidate_membership_cache
 
 logger = logging.getLogger("kardon.worker")
 
@@ -124,6 +125,7 @@ def create_project_and_member(workspace: Workspace, bot_user: User) -> Dict[int,
                 for workspace_member in workspace_members
             ]
         )
+        invalidate_membership_cache([workspace_member["member_id"] for workspace_member in workspace_members])
 
         # Create issue user properties
         ProjectUserProperty.objects.bulk_create(
@@ -32,6 +32,10 @@ app.conf.beat_schedule = {
         "task": "kardon.bgtasks.email_notification_task.stack_email_notification",
         "schedule": crontab(minute="*/5"),  # Every 5 minutes
     },
+    "run-every-hour-to-reconcile-progress": {
+        "task": "kardon.bgtasks.progress_task.reconcile_progress",
+        "schedule": crontab(minute=15),  # Every hour
+    },
     "run-every-6-hours-for-instance-trace": {
         "task": "kardon.license.bgtasks.tracer.instance_traces",
         "schedule": crontab(hour="*/6", minute=0),  # Every 6 hours
@@ -41,6 +45,10 @@ app.conf.beat_schedule = {
         "task": "kardon.bgtasks.deletion_task.hard_delete",
         "schedule": crontab(hour=0, minute=0),  # UTC 00:00
     },
+    "run-every-day-to-snapshot-burndown": {
+        "task": "kardon.bgtasks.progress_task.snapshot_burndown",
+        "schedule": crontab(hour=0, minute=5),  # UTC 00:05
+    },
     "check-every-day-to-archive-and-close": {
         "task": "kardon.bgtasks.issue_automation_task.archive_and_close_old_issues",
         "schedule": crontab(hour=1, minute=0),  # UTC 01:00
@@ -77,6 +85,10 @@ app.conf.beat_schedule = {
         "task": "kardon.bgtasks.exporter_expired_task.delete_old_s3_link",
         "schedule": crontab(hour=3, minute=45),  # UTC 03:45
     },
+    "run-every-day-to-reconcile-analytics-rollup": {
+        "task": "kardon.bgtasks.analytics_rollup_task.reconcile_analytics_rollup",
+        "schedule": crontab(hour=4, minute=0),  # UTC 04:00
+    },
 }
 
 
@@ -0,0 +1,65 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from datetime import timedelta
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import Cycle, CycleBurndownSnapshot, Module, ModuleBurndownSnapshot
+from kardon.utils.burndown import calculate_burndown, get_date_range, store_burndown
+
+
+class Command(BaseCommand):
+    help = "Writes the burndown snapshots of the past days of every cycle and module"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=str, help="Only backfill the cycles and modules of the project")
+
+    def backfill(self, snapshot_model, entity_field, relation, entities):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        count = 0
+        for entity_id, start_date, end_date in entities:
+            dates = get_date_range(start_date, min(end_date, yesterday))
+            if not dates:
+                continue
+
+            burndown = calculate_burndown(relation, entity_field, entity_id, dates)
+            store_burndown(
+                snapshot_model,
+                entity_field,
+                [(entity_id, date, values) for date, values in burndown.items()],
+            )
+            count += 1
+        return count
+
+    def handle(self, *args, **options):
+        cycles = Cycle.objects.filter(start_date__isnull=False, end_date__isnull=False)
+        modules = Module.objects.filter(start_date__isnull=False, target_date__isnull=False)
+        if options["project"]:
+            cycles = cycles.filter(project_id=options["project"])
+            modules = modules.filter(project_id=options["project"])
+
+        cycle_count = self.backfill(
+            CycleBurndownSnapshot,
+            "cycle",
+            "issue_cycle",
+            (
+                (cycle_id, start_date.date(), end_date.date())
+                for cycle_id, start_date, end_date in cycles.values_list("id", "start_date", "end_date").iterator()
+            ),
+        )
+        module_count = self.backfill(
+            ModuleBurndownSnapshot,
+            "module",
+            "issue_module",
+            modules.values_list("id", "start_date", "target_date").iterator(),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled the burndown snapshots of {cycle_count} cycles and {module_count} modules")
+        )
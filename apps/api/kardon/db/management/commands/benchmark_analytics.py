@@ -0,0 +1,84 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import json
+import statistics
+import time
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Module imports
+from kardon.bgtasks.analytics_rollup_task import ensure_analytics_rollup
+from kardon.db.models import Issue, Workspace
+from kardon.utils.analytics_plot import build_graph_plot
+from kardon.utils.analytics_rollup import (
+    ROLLUP_BASE_AXES,
+    get_rollup_project_ids,
+    get_stale_rollup_project_ids,
+    refresh_analytics_rollup,
+    rollup_graph_plot,
+    rollup_total,
+)
+
+
+def normalize(distribution):
+    """Return the distribution with the values as strings and the rows in a stable order"""
+    return {
+        key: sorted(json.dumps(row, default=str, sort_keys=True) for row in rows)
+        for key, rows in json.loads(json.dumps(distribution, default=str)).items()
+    }
+
+
+class Command(BaseCommand):
+    help = "Compares the timings and the results of the live and the rollup analytics of a workspace"
+
+    def add_arguments(self, parser):
+        parser.add_argument("slug", type=str, help="Workspace slug")
+        parser.add_argument("--x-axis", type=str, default="priority", help="Analytics x axis")
+        parser.add_argument("--y-axis", type=str, default="issue_count", help="Analytics y axis")
+        parser.add_argument("--segment", type=str, default="", help="Analytics segment")
+        parser.add_argument("--runs", type=int, default=5, help="Runs of each query")
+
+    def time_runs(self, runs, func):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), result
+
+    def handle(self, *args, **options):
+        slug = options["slug"]
+        if not Workspace.objects.filter(slug=slug).exists():
+            raise CommandError(f"Workspace {slug} does not exist")
+
+        x_axis, y_axis, segment = options["x_axis"], options["y_axis"], options["segment"]
+        axes = [(x_axis, segment), ROLLUP_BASE_AXES]
+
+        # Build the rollup of the axes for every project before timing the reads
+        project_ids = get_rollup_project_ids(slug, {})
+        ensure_analytics_rollup(project_ids, axes)
+        for project_id in get_stale_rollup_project_ids(project_ids, axes):
+            refresh_analytics_rollup(project_id)
+
+        def live():
+            queryset = Issue.issue_objects.filter(workspace__slug=slug)
+            return queryset.count(), build_graph_plot(queryset, x_axis=x_axis, y_axis=y_axis, segment=segment)
+
+        def rollup():
+            return rollup_total(project_ids), rollup_graph_plot(
+                project_ids, x_axis=x_axis, y_axis=y_axis, segment=segment
+            )
+
+        live_ms, (live_total, live_distribution) = self.time_runs(options["runs"], live)
+        rollup_ms, (rollup_total_count, rollup_distribution) = self.time_runs(options["runs"], rollup)
+
+        self.stdout.write(f"live:   {live_ms:.1f}ms median over {options['runs']} runs")
+        self.stdout.write(f"rollup: {rollup_ms:.1f}ms median over {options['runs']} runs")
+
+        if live_total != rollup_total_count or normalize(live_distribution) != normalize(rollup_distribution):
+            raise CommandError("The rollup results differ from the live results")
+        self.stdout.write(self.style.SUCCESS(f"Results match for {live_total} issues"))
@@ -4,12 +4,10 @@
 
 # Django imports
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Max
-from django.db import connection, transaction
+from django.db import transaction
 
 # Module imports
-from kardon.db.models import Project, Issue, IssueSequence
-from kardon.utils.uuid import convert_uuid_to_integer
+from kardon.db.models import Project, Issue, IssueSequence, IssueSequenceCounter
 
 
 class Command(BaseCommand):
@@ -57,18 +55,8 @@ class Command(BaseCommand):
 
             self.stdout.write(self.style.SUCCESS(f"{issues.count()} issues found with identifier {issue_identifier}"))
             with transaction.atomic():
-                # This ensures only one transaction per project can execute this code at a time
-                lock_key = convert_uuid_to_integer(project.id)
-
-                # Acquire an exclusive lock using the project ID as the lock key
-                with connection.cursor() as cursor:
-                    # Get an exclusive lock using the project ID as the lock key
-                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_key])
-
-                # Get the maximum sequence ID for the project
-                last_sequence = IssueSequence.objects.filter(project=project).aggregate(largest=Max("sequence"))[
-                    "largest"
-                ]
+                # Reserve new sequence ids for the duplicates
+                first_sequence, _ = IssueSequenceCounter.reserve(project.id, issues.count() - 1)
 
                 bulk_issues = []
                 bulk_issue_sequences = []
@@ -77,7 +65,7 @@ class Command(BaseCommand):
 
                 # change the ids of duplicate issues
                 for index, issue in enumerate(issues[1:]):
-                    updated_sequence_id = last_sequence + index + 1
+                    updated_sequence_id = first_sequence + index
                     issue.sequence_id = updated_sequence_id
                     bulk_issues.append(issue)
 
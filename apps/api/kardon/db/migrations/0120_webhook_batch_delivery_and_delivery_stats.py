@@ -0,0 +1,28 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0119_add_messaging_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_delivery',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='webhooklog',
+            name='event_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='webhooklog',
+            name='response_time_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
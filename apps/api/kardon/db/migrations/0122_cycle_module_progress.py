@@ -0,0 +1,79 @@
+# Generated by Django 4.2.27 on 2026-10-17 23:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0121_issue_page_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleProgress',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('backlog_issues', models.PositiveIntegerField(default=0)),
+                ('unstarted_issues', models.PositiveIntegerField(default=0)),
+                ('started_issues', models.PositiveIntegerField(default=0)),
+                ('completed_issues', models.PositiveIntegerField(default=0)),
+                ('cancelled_issues', models.PositiveIntegerField(default=0)),
+                ('total_issues', models.PositiveIntegerField(default=0)),
+                ('backlog_estimate_points', models.FloatField(default=0)),
+                ('unstarted_estimate_points', models.FloatField(default=0)),
+                ('started_estimate_points', models.FloatField(default=0)),
+                ('completed_estimate_points', models.FloatField(default=0)),
+                ('cancelled_estimate_points', models.FloatField(default=0)),
+                ('total_estimate_points', models.FloatField(default=0)),
+                ('calculated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('module', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='db.module')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Module Progress',
+                'verbose_name_plural': 'Module Progress',
+                'db_table': 'module_progress',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='CycleProgress',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('backlog_issues', models.PositiveIntegerField(default=0)),
+                ('unstarted_issues', models.PositiveIntegerField(default=0)),
+                ('started_issues', models.PositiveIntegerField(default=0)),
+                ('completed_issues', models.PositiveIntegerField(default=0)),
+                ('cancelled_issues', models.PositiveIntegerField(default=0)),
+                ('total_issues', models.PositiveIntegerField(default=0)),
+                ('backlog_estimate_points', models.FloatField(default=0)),
+                ('unstarted_estimate_points', models.FloatField(default=0)),
+                ('started_estimate_points', models.FloatField(default=0)),
+                ('completed_estimate_points', models.FloatField(default=0)),
+                ('cancelled_estimate_points', models.FloatField(default=0)),
+                ('total_estimate_points', models.FloatField(default=0)),
+                ('calculated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('cycle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='db.cycle')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Cycle Progress',
+                'verbose_name_plural': 'Cycle Progress',
+                'db_table': 'cycle_progress',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
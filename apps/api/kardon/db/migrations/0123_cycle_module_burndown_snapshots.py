@@ -0,0 +1,70 @@
+# Generated by Django 4.2.27 on 2026-10-17 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0122_cycle_module_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleBurndownSnapshot',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('date', models.DateField()),
+                ('total_issues', models.PositiveIntegerField(default=0)),
+                ('pending_issues', models.PositiveIntegerField(default=0)),
+                ('total_estimate_points', models.FloatField(default=0)),
+                ('pending_estimate_points', models.FloatField(default=0)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='burndown_snapshots', to='db.module')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Module Burndown Snapshot',
+                'verbose_name_plural': 'Module Burndown Snapshots',
+                'db_table': 'module_burndown_snapshots',
+                'ordering': ('date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='CycleBurndownSnapshot',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('date', models.DateField()),
+                ('total_issues', models.PositiveIntegerField(default=0)),
+                ('pending_issues', models.PositiveIntegerField(default=0)),
+                ('total_estimate_points', models.FloatField(default=0)),
+                ('pending_estimate_points', models.FloatField(default=0)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='burndown_snapshots', to='db.cycle')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+            ],
+            options={
+                'verbose_name': 'Cycle Burndown Snapshot',
+                'verbose_name_plural': 'Cycle Burndown Snapshots',
+                'db_table': 'cycle_burndown_snapshots',
+                'ordering': ('date',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='moduleburndownsnapshot',
+            constraint=models.UniqueConstraint(fields=('module', 'date'), name='module_burndown_snapshot_unique_module_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='cycleburndownsnapshot',
+            constraint=models.UniqueConstraint(fields=('cycle', 'date'), name='cycle_burndown_snapshot_unique_cycle_date'),
+        ),
+    ]
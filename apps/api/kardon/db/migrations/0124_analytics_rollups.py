@@ -0,0 +1,72 @@
+# Generated by Django 4.2.27 on 2026-10-17 23:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0123_cycle_module_burndown_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollupState',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('x_axis', models.CharField(max_length=255)),
+                ('segment_axis', models.CharField(blank=True, default='', max_length=255)),
+                ('calculated_at', models.DateTimeField(null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_%(class)s', to='db.project')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workspace_%(class)s', to='db.workspace')),
+            ],
+            options={
+                'verbose_name': 'Analytics Rollup State',
+                'verbose_name_plural': 'Analytics Rollup States',
+                'db_table': 'analytics_rollup_states',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsRollup',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Last Modified At')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Deleted At')),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('x_axis', models.CharField(max_length=255)),
+                ('segment_axis', models.CharField(blank=True, default='', max_length=255)),
+                ('dimension', models.CharField(max_length=255, null=True)),
+                ('segment', models.CharField(max_length=255, null=True)),
+                ('bucket', models.DateField()),
+                ('issue_count', models.PositiveIntegerField(default=0)),
+                ('estimate', models.FloatField(null=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_%(class)s', to='db.project')),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='Last Modified By')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workspace_%(class)s', to='db.workspace')),
+            ],
+            options={
+                'verbose_name': 'Analytics Rollup',
+                'verbose_name_plural': 'Analytics Rollups',
+                'db_table': 'analytics_rollups',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='analyticsrollupstate',
+            constraint=models.UniqueConstraint(fields=('project', 'x_axis', 'segment_axis'), name='analytics_rollup_state_unique_project_axes'),
+        ),
+        migrations.AddIndex(
+            model_name='analyticsrollup',
+            index=models.Index(fields=['project', 'x_axis', 'segment_axis', 'bucket'], name='analytics_rollup_axes_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-17 23:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0125_issue_sequence_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pageversion',
+            name='base',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deltas', to='db.pageversion'),
+        ),
+        migrations.AddField(
+            model_name='pageversion',
+            name='delta',
+            field=models.BinaryField(null=True),
+        ),
+    ]
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
-from .analytic import AnalyticView
+from .analytic import AnalyticsRollup, AnalyticsRollupState, AnalyticView
 from .api import APIActivityLog, APIToken
 from .asset import FileAsset
 from .base import BaseModel
@@ -34,6 +34,8 @@ from .issue import (
     IssueActivity,
     IssueAssignee,
     IssueBlocker,
+    IssueChange,
+    IssueChangeCounter,
     IssueComment,
     IssueLabel,
     IssueLink,
@@ -41,6 +43,7 @@ from .issue import (
     IssueReaction,
     IssueRelation,
     IssueSequence,
+    IssueSequenceCounter,
     IssueSubscriber,
     IssueVote,
     IssueVersion,
@@ -49,6 +52,7 @@ from .issue import (
 from .module import Module, ModuleIssue, ModuleLink, ModuleMember, ModuleUserProperties
 from .notification import EmailNotificationLog, Notification, UserNotificationPreference
 from .page import Page, PageLabel, PageLog, ProjectPage, PageVersion
+from .progress import CycleBurndownSnapshot, CycleProgress, ModuleBurndownSnapshot, ModuleProgress
 from .project import (
     Project,
     ProjectBaseModel,
@@ -6,6 +6,7 @@
 from django.db import models
 
 from .base import BaseModel
+from .project import ProjectBaseModel
 
 
 class AnalyticView(BaseModel):
@@ -24,3 +25,49 @@ class AnalyticView(BaseModel):
     def __str__(self):
         """Return name of the analytic view"""
         return f"{self.name} <{self.workspace.name}>"
+
+
+class AnalyticsRollup(ProjectBaseModel):
+    """Issue counts and estimate sums of a project by analytics axis, segment and creation day"""
+
+    x_axis = models.CharField(max_length=255)
+    segment_axis = models.CharField(max_length=255, blank=True, default="")
+    dimension = models.CharField(max_length=255, null=True)
+    segment = models.CharField(max_length=255, null=True)
+    bucket = models.DateField()
+    issue_count = models.PositiveIntegerField(default=0)
+    estimate = models.FloatField(null=True)
+
+    class Meta:
+        verbose_name = "Analytics Rollup"
+        verbose_name_plural = "Analytics Rollups"
+        db_table = "analytics_rollups"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["project", "x_axis", "segment_axis", "bucket"], name="analytics_rollup_axes_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.x_axis}/{self.segment_axis} {self.bucket} <{self.issue_count}>"
+
+
+class AnalyticsRollupState(ProjectBaseModel):
+    """Axis and segment pair kept in the analytics rollup of a project"""
+
+    x_axis = models.CharField(max_length=255)
+    segment_axis = models.CharField(max_length=255, blank=True, default="")
+    calculated_at = models.DateTimeField(null=True)
+
+    class Meta:
+        verbose_name = "Analytics Rollup State"
+        verbose_name_plural = "Analytics Rollup States"
+        db_table = "analytics_rollup_states"
+        ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "x_axis", "segment_axis"], name="analytics_rollup_state_unique_project_axes"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.x_axis}/{self.segment_axis}"
@@ -8,6 +8,8 @@ from uuid import uuid4
 # Django imports
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from .base import BaseModel
 
@@ -48,6 +50,15 @@ class APIToken(BaseModel):
         return str(self.user.id)
 
 
+@receiver([post_save, post_delete], sender=APIToken)
+def invalidate_cached_api_token(sender, instance, **kwargs):
+    # Module imports
+    from kardon.utils.api_token import invalidate_api_token_cache
+
+    # Revoked, deleted, expiry changed or reactivated tokens are looked up again
+    invalidate_api_token_cache([instance.token])
+
+
 class APIActivityLog(BaseModel):
     token_identifier = models.CharField(max_length=255)
 
@@ -13,14 +13,17 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models, transaction, connection
 from django.utils import timezone
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django import apps
 
 # Module imports
 from kardon.utils.html_processor import strip_tags
 from kardon.db.mixins import SoftDeletionManager
 from kardon.utils.exception_logger import log_exception
-from .project import ProjectBaseModel
-from kardon.utils.uuid import convert_uuid_to_integer
+from .base import BaseModel
+from .project import Project, ProjectBaseModel
+from kardon.utils.search import search_indexes
 from .description import Description
 from kardon.db.mixins import ChangeTrackerMixin
 from .state import StateGroup
@@ -174,6 +177,7 @@ class Issue(ProjectBaseModel):
         verbose_name_plural = "Issues"
         db_table = "issues"
         ordering = ("-created_at",)
+        indexes = search_indexes("name", "issue")
 
     def save(self, *args, **kwargs):
         if self.state is None:
@@ -202,32 +206,16 @@ class Issue(ProjectBaseModel):
                 pass
 
         if self._state.adding:
+            # Reserved outside of the transaction so the counter row is not locked while the issue is written
+            self.sequence_id, self.sort_order = IssueSequenceCounter.reserve(self.project_id)
+
             with transaction.atomic():
-                # Create a lock for this specific project using a transaction-level advisory lock
-                # This ensures only one transaction per project can execute this code at a time
-                # The lock is automatically released when the transaction ends
-                lock_key = convert_uuid_to_integer(self.project.id)
-
-                with connection.cursor() as cursor:
-                    # Get an exclusive transaction-level lock using the project ID as the lock key
-                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_key])
-
-                # Get the last sequence for the project
-                last_sequence = IssueSequence.objects.filter(project=self.project).aggregate(
-                    largest=models.Max("sequence")
-                )["largest"]
-                self.sequence_id = last_sequence + 1 if last_sequence else 1
                 # Strip the html tags using html parser
                 self.description_stripped = (
                     None
                     if (self.description_html == "" or self.description_html is None)
                     else strip_tags(self.description_html)
                 )
-                largest_sort_order = Issue.objects.filter(project=self.project, state=self.state).aggregate(
-                    largest=models.Max("sort_order")
-                )["largest"]
-                if largest_sort_order is not None:
-                    self.sort_order = largest_sort_order + 10000
 
                 super(Issue, self).save(*args, **kwargs)
 
@@ -561,6 +549,177 @@ class IssueSequence(ProjectBaseModel):
         ordering = ("-created_at",)
 
 
+class IssueSequenceCounter(BaseModel):
+    """
+    Last sequence id and sort order given to an issue of the project, the
+    issues reserve their ids from it instead of scanning the project
+    """
+
+    SORT_ORDER_STEP = 10000
+
+    project = models.OneToOneField("db.Project", on_delete=models.CASCADE, related_name="issue_sequence_counter")
+    last_sequence = models.PositiveBigIntegerField(default=0)
+    # The first issue of a project gets the default sort order
+    last_sort_order = models.FloatField(default=65535 - SORT_ORDER_STEP)
+
+    class Meta:
+        verbose_name = "Issue Sequence Counter"
+        verbose_name_plural = "Issue Sequence Counters"
+        db_table = "issue_sequence_counters"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.project_id} <{self.last_sequence}>"
+
+    @classmethod
+    def reserve(cls, project_id, count=1):
+        """
+        Reserve a block of count sequence ids and sort orders of the project in a
+        single statement, returns the first sequence id and sort order of the block
+        """
+        query = f"""
+            UPDATE {cls._meta.db_table}
+            SET last_sequence = last_sequence + %s, last_sort_order = last_sort_order + %s
+            WHERE project_id = %s
+            RETURNING last_sequence, last_sort_order
+        """
+        params = [count, count * cls.SORT_ORDER_STEP, project_id]
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            if row is None:
+                cls.initialize(project_id)
+                cursor.execute(query, params)
+                row = cursor.fetchone()
+
+        last_sequence, last_sort_order = row
+        return last_sequence - count + 1, last_sort_order - (count - 1) * cls.SORT_ORDER_STEP
+
+    @classmethod
+    def initialize(cls, project_id):
+        """Create the counter of the project from its existing issues, once"""
+        last_sequence = IssueSequence.all_objects.filter(project_id=project_id).aggregate(
+            largest=models.Max("sequence")
+        )["largest"]
+        largest_sort_order = Issue.all_objects.filter(project_id=project_id).aggregate(
+            largest=models.Max("sort_order")
+        )["largest"]
+
+        counter = cls(project_id=project_id, last_sequence=last_sequence or 0)
+        if largest_sort_order is not None:
+            counter.last_sort_order = largest_sort_order
+        # A counter created concurrently is kept
+        cls.objects.bulk_create([counter], ignore_conflicts=True)
+
+
+class IssueChangeCounter(BaseModel):
+    """
+    Last change sequence given in the project, the change of a write holds
+    its row until the write commits so the sequences follow the commit order
+    """
+
+    project = models.OneToOneField("db.Project", on_delete=models.CASCADE, related_name="issue_change_counter")
+    last_sequence = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Issue Change Counter"
+        verbose_name_plural = "Issue Change Counters"
+        db_table = "issue_change_counters"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.project_id} <{self.last_sequence}>"
+
+
+class IssueChange(ProjectBaseModel):
+    """
+    Latest change of an issue of the project. Every write moves the row of the
+    issue to the next sequence of the project, the rows after a sequence are
+    the issues a client synced up to it has to fetch or drop.
+    """
+
+    class Action(models.TextChoices):
+        UPSERT = "upsert", "Upsert"
+        DELETE = "delete", "Delete"
+
+    issue_identifier = models.UUIDField()
+    sequence = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=Action.choices, default=Action.UPSERT)
+
+    class Meta:
+        verbose_name = "Issue Change"
+        verbose_name_plural = "Issue Changes"
+        db_table = "issue_changes"
+        ordering = ("sequence",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "issue_identifier"],
+                name="issue_change_unique_project_issue_identifier",
+            )
+        ]
+        indexes = [models.Index(fields=["project", "sequence"], name="issue_change_project_seq_idx")]
+
+    def __str__(self):
+        return f"{self.issue_identifier} <{self.action} {self.sequence}>"
+
+    @classmethod
+    def record(cls, project_id, issue_ids, action=Action.UPSERT):
+        """
+        Move the issues to the next sequences of the project in a single
+        statement, the counter stays locked until the transaction commits
+        """
+        issue_ids = list(dict.fromkeys(str(issue_id) for issue_id in issue_ids if issue_id is not None))
+        if not issue_ids:
+            return
+
+        query = f"""
+            WITH counter AS (
+                UPDATE {IssueChangeCounter._meta.db_table}
+                SET last_sequence = last_sequence + %(count)s
+                WHERE project_id = %(project_id)s
+                RETURNING last_sequence
+            )
+            INSERT INTO {cls._meta.db_table}
+                (id, created_at, updated_at, project_id, workspace_id, issue_identifier, sequence, action)
+            SELECT
+                change.id, %(now)s, %(now)s, project.id, project.workspace_id, change.issue_identifier,
+                counter.last_sequence - %(count)s + change.position, %(action)s
+            FROM counter
+            CROSS JOIN {Project._meta.db_table} project
+            CROSS JOIN unnest(%(ids)s::uuid[], %(issue_ids)s::uuid[])
+                WITH ORDINALITY AS change(id, issue_identifier, position)
+            WHERE project.id = %(project_id)s
+            ON CONFLICT (project_id, issue_identifier) DO UPDATE
+            SET sequence = EXCLUDED.sequence, action = EXCLUDED.action, updated_at = EXCLUDED.updated_at
+        """
+        params = {
+            "count": len(issue_ids),
+            "project_id": project_id,
+            "now": timezone.now(),
+            "action": action,
+            "ids": [str(uuid4()) for _ in issue_ids],
+            "issue_ids": issue_ids,
+        }
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            if cursor.rowcount == 0:
+                # A concurrently created counter is kept
+                IssueChangeCounter.objects.bulk_create(
+                    [IssueChangeCounter(project_id=project_id)], ignore_conflicts=True
+                )
+                cursor.execute(query, params)
+
+    @classmethod
+    def get_sync_token(cls, project_id):
+        """Return the sequence of the latest committed change of the project"""
+        return (
+            IssueChangeCounter.objects.filter(project_id=project_id).values_list("last_sequence", flat=True).first()
+            or 0
+        )
+
+
 class IssueSubscriber(ProjectBaseModel):
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="issue_subscribers")
     subscriber = models.ForeignKey(
@@ -664,6 +823,54 @@ class IssueVote(ProjectBaseModel):
         return f"{self.issue.name} {self.actor.email}"
 
 
+@receiver([post_save, post_delete], sender=Issue)
+@receiver([post_save, post_delete], sender=IssueComment)
+@receiver([post_save, post_delete], sender=IssueReaction)
+@receiver([post_save, post_delete], sender=CommentReaction)
+@receiver([post_save, post_delete], sender=IssueVote)
+def bump_issue_project_data_version(sender, instance, **kwargs):
+    # Module imports
+    from kardon.utils.cache import bump_project_data_version
+
+    # Published boards cache the issues of the project until its data version moves
+    project_id = instance.project_id
+    transaction.on_commit(lambda: bump_project_data_version(project_id))
+
+
+@receiver([post_save, post_delete], sender=Issue)
+@receiver([post_save, post_delete], sender=IssueRelation)
+@receiver([post_save, post_delete], sender=IssueLabel)
+@receiver([post_save, post_delete], sender=IssueAssignee)
+@receiver([post_save, post_delete], sender="db.ModuleIssue")
+@receiver([post_save, post_delete], sender="db.CycleIssue")
+def record_issue_change(sender, instance, signal, **kwargs):
+    if signal is post_delete:
+        origin = kwargs.get("origin")
+        origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+        # Rows removed by the cascade of a project or an issue being hard deleted are not changes
+        # to sync, recording them would recreate the counter and change rows the cascade just deleted
+        if origin_model is not sender:
+            return
+
+    if sender is Issue:
+        issue_ids = [instance.id]
+        deleted = signal is post_delete or instance.deleted_at is not None
+    else:
+        issue_ids = [instance.issue_id, getattr(instance, "related_issue_id", None)]
+        deleted = False
+
+    try:
+        # A savepoint keeps a failed record from breaking the transaction of the write
+        with transaction.atomic():
+            IssueChange.record(
+                instance.project_id,
+                issue_ids,
+                IssueChange.Action.DELETE if deleted else IssueChange.Action.UPSERT,
+            )
+    except Exception as e:
+        log_exception(e)
+
+
 class IssueVersion(ProjectBaseModel):
     PRIORITY_CHOICES = (
         ("urgent", "Urgent"),
@@ -12,6 +12,7 @@ from django.db import models
 
 # Module imports
 from kardon.utils.html_processor import strip_tags
+from kardon.utils.search import search_indexes
 
 from .base import BaseModel
 
@@ -62,6 +63,7 @@ class Page(BaseModel):
         verbose_name_plural = "Pages"
         db_table = "pages"
         ordering = ("-created_at",)
+        indexes = search_indexes("name", "page")
 
     def __str__(self):
         """Return owner email and page name"""
@@ -165,6 +167,9 @@ class PageVersion(BaseModel):
     description_stripped = models.TextField(blank=True, null=True)
     description_json = models.JSONField(default=dict, blank=True)
     sub_pages_data = models.JSONField(default=dict, blank=True)
+    # Versions between two full snapshots only keep a compressed delta from their snapshot
+    base = models.ForeignKey("self", on_delete=models.CASCADE, null=True, related_name="deltas")
+    delta = models.BinaryField(null=True)
 
     class Meta:
         verbose_name = "Page Version"
@@ -0,0 +1,105 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Django imports
+from django.db import models
+from django.utils import timezone
+
+# Module imports
+from .base import BaseModel
+
+
+class ProgressAggregate(BaseModel):
+    """
+    Issue counts and point estimate sums by state group, refreshed when the
+    issues change and reconciled periodically
+    """
+
+    backlog_issues = models.PositiveIntegerField(default=0)
+    unstarted_issues = models.PositiveIntegerField(default=0)
+    started_issues = models.PositiveIntegerField(default=0)
+    completed_issues = models.PositiveIntegerField(default=0)
+    cancelled_issues = models.PositiveIntegerField(default=0)
+    total_issues = models.PositiveIntegerField(default=0)
+    backlog_estimate_points = models.FloatField(default=0)
+    unstarted_estimate_points = models.FloatField(default=0)
+    started_estimate_points = models.FloatField(default=0)
+    completed_estimate_points = models.FloatField(default=0)
+    cancelled_estimate_points = models.FloatField(default=0)
+    total_estimate_points = models.FloatField(default=0)
+    calculated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+
+
+class CycleProgress(ProgressAggregate):
+    cycle = models.OneToOneField("db.Cycle", on_delete=models.CASCADE, related_name="progress")
+
+    class Meta:
+        verbose_name = "Cycle Progress"
+        verbose_name_plural = "Cycle Progress"
+        db_table = "cycle_progress"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.cycle_id} <{self.completed_issues}/{self.total_issues}>"
+
+
+class ModuleProgress(ProgressAggregate):
+    module = models.OneToOneField("db.Module", on_delete=models.CASCADE, related_name="progress")
+
+    class Meta:
+        verbose_name = "Module Progress"
+        verbose_name_plural = "Module Progress"
+        db_table = "module_progress"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.module_id} <{self.completed_issues}/{self.total_issues}>"
+
+
+class BurndownSnapshot(BaseModel):
+    """Issues and point estimates left at the end of a day of a cycle or module"""
+
+    date = models.DateField()
+    total_issues = models.PositiveIntegerField(default=0)
+    pending_issues = models.PositiveIntegerField(default=0)
+    total_estimate_points = models.FloatField(default=0)
+    pending_estimate_points = models.FloatField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class CycleBurndownSnapshot(BurndownSnapshot):
+    cycle = models.ForeignKey("db.Cycle", on_delete=models.CASCADE, related_name="burndown_snapshots")
+
+    class Meta:
+        verbose_name = "Cycle Burndown Snapshot"
+        verbose_name_plural = "Cycle Burndown Snapshots"
+        db_table = "cycle_burndown_snapshots"
+        ordering = ("date",)
+        constraints = [
+            models.UniqueConstraint(fields=["cycle", "date"], name="cycle_burndown_snapshot_unique_cycle_date")
+        ]
+
+    def __str__(self):
+        return f"{self.cycle_id} {self.date} <{self.pending_issues}/{self.total_issues}>"
+
+
+class ModuleBurndownSnapshot(BurndownSnapshot):
+    module = models.ForeignKey("db.Module", on_delete=models.CASCADE, related_name="burndown_snapshots")
+
+    class Meta:
+        verbose_name = "Module Burndown Snapshot"
+        verbose_name_plural = "Module Burndown Snapshots"
+        db_table = "module_burndown_snapshots"
+        ordering = ("date",)
+        constraints = [
+            models.UniqueConstraint(fields=["module", "date"], name="module_burndown_snapshot_unique_module_date")
+        ]
+
+    def __str__(self):
+        return f"{self.module_id} {self.date} <{self.pending_issues}/{self.total_issues}>"
@@ -11,6 +11,8 @@ from enum import Enum
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.db.models import Q
 
 # Module imports
@@ -258,6 +260,14 @@ class ProjectMember(ProjectBaseModel):
         return f"{self.member.email} <{self.project.name}>"
 
 
+@receiver([post_save, post_delete], sender=ProjectMember)
+def invalidate_project_member_cache(sender, instance, **kwargs):
+    # Module imports
+    from kardon.utils.membership import invalidate_membership_cache
+
+    invalidate_membership_cache([instance.member_id])
+
+
 # TODO: Remove workspace relation later
 class ProjectIdentifier(AuditModel):
     workspace = models.ForeignKey("db.Workspace", models.CASCADE, related_name="project_identifiers", null=True)
@@ -43,6 +43,8 @@ class Webhook(BaseModel):
     issue_comment = models.BooleanField(default=False)
     is_internal = models.BooleanField(default=False)
     version = models.CharField(default="v1", max_length=50)
+    # Coalesce the events of a short window into a single payload array
+    batch_delivery = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.workspace.slug} {self.url}"
@@ -81,6 +83,10 @@ class WebhookLog(BaseModel):
     # Retry Count
     retry_count = models.PositiveSmallIntegerField(default=0)
 
+    # Delivery stats
+    event_count = models.PositiveIntegerField(default=1)
+    response_time_ms = models.PositiveIntegerField(blank=True, null=True)
+
     class Meta:
         verbose_name = "Webhook Log"
         verbose_name_plural = "Webhook Logs"
@@ -10,6 +10,8 @@ from typing import Optional, Any
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 # Module imports
 from .base import BaseModel
@@ -231,6 +233,14 @@ class WorkspaceMember(BaseModel):
         return f"{self.member.email} <{self.workspace.name}>"
 
 
+@receiver([post_save, post_delete], sender=WorkspaceMember)
+def invalidate_workspace_member_cache(sender, instance, **kwargs):
+    # Module imports
+    from kardon.utils.membership import invalidate_membership_cache
+
+    invalidate_membership_cache([instance.member_id])
+
+
 class WorkspaceMemberInvite(BaseModel):
     workspace = models.ForeignKey("db.Workspace", on_delete=models.CASCADE, related_name="workspace_member_invite")
     email = models.CharField(max_length=255)
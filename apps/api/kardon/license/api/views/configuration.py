@@ -13,6 +13,7 @@ from smtplib import (
 
 # Django imports
 from django.core.mail import BadHeaderError, EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.db.models import Q, Case, When, Value
 
 # Third party imports
@@ -26,7 +27,7 @@ from kardon.license.models import InstanceConfiguration
 from kardon.license.api.serializers import InstanceConfigurationSerializer
 from kardon.license.utils.encryption import encrypt_data
 from kardon.utils.cache import cache_response, invalidate_cache
-from kardon.license.utils.instance_value import get_email_configuration
+from kardon.license.utils.instance_value import get_email_configuration, invalidate_instance_configuration_cache
 
 
 class InstanceConfigurationEndpoint(BaseAPIView):
@@ -53,6 +54,8 @@ class InstanceConfigurationEndpoint(BaseAPIView):
             bulk_configurations.append(configuration)
 
         InstanceConfiguration.objects.bulk_update(bulk_configurations, ["value"], batch_size=100)
+        # bulk_update sends no signals, move the configuration version here
+        transaction.on_commit(invalidate_instance_configuration_cache)
 
         serializer = InstanceConfigurationSerializer(configurations, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -76,6 +79,7 @@ class DisableEmailFeatureEndpoint(BaseAPIView):
                     ]
                 )
             ).update(value=Case(When(key="ENABLE_SMTP", then=Value("0")), default=Value("")))
+            transaction.on_commit(invalidate_instance_configuration_cache)
             return Response(status=status.HTTP_200_OK)
         except Exception:
             return Response(
@@ -4,6 +4,7 @@
 
 # Python imports
 import os
+import time
 
 # Django imports
 from django.conf import settings
@@ -11,32 +12,73 @@ from django.conf import settings
 # Module imports
 from kardon.license.models import InstanceConfiguration
 from kardon.license.utils.encryption import decrypt_data
+from kardon.settings.redis import redis_instance
+from kardon.utils.exception_logger import log_exception
+
+# Redis key holding the version of the instance configuration, shared by every process
+INSTANCE_CONFIGURATION_VERSION_KEY = "instance_configuration_version"
+
+# Decrypted configuration values of this process and the version they were loaded at
+_configuration_cache = {"pid": None, "version": None, "checked_at": 0.0, "values": None}
+
+
+def get_instance_configuration_version():
+    """Return the current configuration version, None when redis can not be reached"""
+    try:
+        # A configuration never saved yet is at the first version
+        return redis_instance().get(INSTANCE_CONFIGURATION_VERSION_KEY) or b"0"
+    except Exception as e:
+        log_exception(e)
+        return None
+
+
+def load_instance_configuration():
+    """Return the decrypted value of every instance configuration by key"""
+    return {
+        item["key"]: decrypt_data(item["value"]) if item["is_encrypted"] else item["value"]
+        for item in InstanceConfiguration.objects.values("key", "value", "is_encrypted")
+    }
+
+
+def get_instance_configuration():
+    """
+    Return the decrypted instance configuration of the process. The values are
+    reused for INSTANCE_CONFIGURATION_CACHE_TTL seconds, after which the redis
+    version is checked and the rows are only read again when it moved.
+    """
+    now = time.monotonic()
+    if _configuration_cache["pid"] != os.getpid():
+        # Forked workers load their own copy
+        _configuration_cache.update(pid=os.getpid(), version=None, checked_at=0.0, values=None)
+    elif _configuration_cache["values"] is not None:
+        if now - _configuration_cache["checked_at"] < settings.INSTANCE_CONFIGURATION_CACHE_TTL:
+            return _configuration_cache["values"]
+
+    version = get_instance_configuration_version()
+    if version is None or version != _configuration_cache["version"] or _configuration_cache["values"] is None:
+        _configuration_cache["values"] = load_instance_configuration()
+    _configuration_cache.update(version=version, checked_at=now)
+    return _configuration_cache["values"]
+
+
+def invalidate_instance_configuration_cache():
+    """Move the configuration to a new version so every process reloads it"""
+    _configuration_cache.update(version=None, checked_at=0.0, values=None)
+    try:
+        redis_instance().incr(INSTANCE_CONFIGURATION_VERSION_KEY)
+    except Exception as e:
+        log_exception(e)
 
 
 # Helper function to return value from the passed key
 def get_configuration_value(keys):
-    environment_list = []
     if settings.SKIP_ENV_VAR:
         # Get the configurations
-        instance_configuration = InstanceConfiguration.objects.values("key", "value", "is_encrypted")
-
-        for key in keys:
-            for item in instance_configuration:
-                if key.get("key") == item.get("key"):
-                    if item.get("is_encrypted", False):
-                        environment_list.append(decrypt_data(item.get("value")))
-                    else:
-                        environment_list.append(item.get("value"))
-
-                    break
-            else:
-                environment_list.append(key.get("default"))
-    else:
-        # Get the configuration from os
-        for key in keys:
-            environment_list.append(os.environ.get(key.get("key"), key.get("default")))
-
-    return tuple(environment_list)
+        instance_configuration = get_instance_configuration()
+        return tuple(instance_configuration.get(key.get("key"), key.get("default")) for key in keys)
+
+    # Get the configuration from os
+    return tuple(os.environ.get(key.get("key"), key.get("default")) for key in keys)
 
 
 def get_email_configuration():
@@ -4,9 +4,12 @@
 
 # Python imports
 import logging
+import random
 import time
+from functools import lru_cache
 
 # Django imports
+from django.conf import settings
 from django.http import HttpRequest
 from django.utils import timezone
 
@@ -16,7 +19,8 @@ from rest_framework.request import Request
 # Module imports
 from kardon.utils.ip_address import get_client_ip
 from kardon.utils.exception_logger import log_exception
-from kardon.bgtasks.logger_task import process_logs
+from kardon.utils.api_log_buffer import APILogBuffer, get_log_body, get_log_headers
+from kardon.bgtasks.logger_task import process_log_batch
 
 api_logger = logging.getLogger("kardon.api.request")
 
@@ -75,9 +79,21 @@ class RequestLoggerMiddleware:
         return response
 
 
+@lru_cache(maxsize=1)
+def get_api_log_buffer():
+    """Return the log buffer of the process"""
+    return APILogBuffer(
+        ship=lambda logs: process_log_batch.delay(logs=logs),
+        batch_size=settings.API_LOG_BATCH_SIZE,
+        flush_interval=settings.API_LOG_FLUSH_INTERVAL,
+        max_size=settings.API_LOG_BUFFER_MAX_SIZE,
+    )
+
+
 class APITokenLogMiddleware:
     """
     Middleware to log External API requests to MongoDB or PostgreSQL.
+    The logs are buffered in the process and shipped in batches.
     """
 
     def __init__(self, get_response):
@@ -89,27 +105,21 @@ class APITokenLogMiddleware:
         self.process_request(request, response, request_body)
         return response
 
-    def _safe_decode_body(self, content):
-        """
-        Safely decodes request/response body content, handling binary data.
-        Returns None if content is None, or a string representation of the content.
-        """
-        # If the content is None, return None
-        if content is None:
-            return None
-
-        # If the content is an empty bytes object, return None
-        if content == b"":
-            return None
-
-        # Check if content is binary by looking for common binary file signatures
-        if content.startswith(b"\x89PNG") or content.startswith(b"\xff\xd8\xff") or content.startswith(b"%PDF"):
-            return "[Binary Content]"
-
-        try:
-            return content.decode("utf-8")
-        except UnicodeDecodeError:
-            return "[Could not decode content]"
+    def _get_bodies(self, request_body, response, log_buffer):
+        """Apply the sampling and size policy to the request and response bodies"""
+        # Bodies of failed requests are always kept to debug them
+        if response.status_code < 400 and random.random() >= settings.API_LOG_BODY_SAMPLE_RATE:
+            log_buffer.record("sampled_out")
+            return None, None
+
+        body, body_truncated = get_log_body(request_body, settings.API_LOG_BODY_MAX_BYTES)
+        # Streamed responses are not read into memory for the logs
+        response_body, response_truncated = (
+            (None, False) if response.streaming else get_log_body(response.content, settings.API_LOG_BODY_MAX_BYTES)
+        )
+        if body_truncated or response_truncated:
+            log_buffer.record("truncated")
+        return body, response_body
 
     def process_request(self, request, response, request_body):
         api_key_header = "X-Api-Key"
@@ -120,33 +130,32 @@ class APITokenLogMiddleware:
             return
 
         try:
-            log_data = {
-                "token_identifier": api_key,
-                "path": request.path,
-                "method": request.method,
-                "query_params": request.META.get("QUERY_STRING", ""),
-                "headers": str(request.headers),
-                "body": self._safe_decode_body(request_body) if request_body else None,
-                "response_body": self._safe_decode_body(response.content) if response.content else None,
-                "response_code": response.status_code,
-                "ip_address": get_client_ip(request=request),
-                "user_agent": request.META.get("HTTP_USER_AGENT", None),
-            }
+            log_buffer = get_api_log_buffer()
+            body, response_body = self._get_bodies(request_body, response, log_buffer)
             user_id = (
                 str(request.user.id)
                 if getattr(request, "user") and getattr(request.user, "is_authenticated", False)
                 else None
             )
-            # Additional fields for MongoDB
-            mongo_log = {
-                **log_data,
-                "created_at": timezone.now(),
-                "updated_at": timezone.now(),
-                "created_by": user_id,
-                "updated_by": user_id,
-            }
-
-            process_logs.delay(log_data=log_data, mongo_log=mongo_log)
+            log_buffer.add(
+                {
+                    "token_identifier": api_key,
+                    "path": request.path[:255],
+                    "method": request.method,
+                    "query_params": request.META.get("QUERY_STRING", ""),
+                    "headers": get_log_headers(request.headers),
+                    "body": body,
+                    "response_body": response_body,
+                    "response_code": response.status_code,
+                    "ip_address": get_client_ip(request=request),
+                    "user_agent": request.META.get("HTTP_USER_AGENT", "")[:512] or None,
+                    # Additional fields for MongoDB
+                    "created_at": timezone.now(),
+                    "updated_at": timezone.now(),
+                    "created_by": user_id,
+                    "updated_by": user_id,
+                }
+            )
 
         except Exception as e:
             log_exception(e)
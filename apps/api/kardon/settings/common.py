@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Inhouse apps
     "kardon.analytics",
     "kardon.app",
@@ -292,6 +293,50 @@ CELERY_IMPORTS = (
 
 FILE_SIZE_LIMIT = int(os.environ.get("FILE_SIZE_LIMIT", 5242880))
 
+# Seconds the membership roles of a user are cached for the permission checks, 0 to disable
+MEMBERSHIP_CACHE_TIMEOUT = int(os.environ.get("MEMBERSHIP_CACHE_TIMEOUT", 0))
+
+# Seconds a looked up API token is cached for, 0 to disable, unknown tokens are cached for less
+API_TOKEN_CACHE_TIMEOUT = int(os.environ.get("API_TOKEN_CACHE_TIMEOUT", 60))
+API_TOKEN_NEGATIVE_CACHE_TIMEOUT = int(os.environ.get("API_TOKEN_NEGATIVE_CACHE_TIMEOUT", 10))
+
+# Seconds the last use of the API tokens is buffered for before it is written
+API_TOKEN_LAST_USED_FLUSH_INTERVAL = int(os.environ.get("API_TOKEN_LAST_USED_FLUSH_INTERVAL", 5))
+
+# Seconds the recent visits are buffered in redis for before they are written
+RECENT_VISIT_FLUSH_INTERVAL = int(os.environ.get("RECENT_VISIT_FLUSH_INTERVAL", 30))
+
+# API request logs, the bodies are cut at the byte limit (0 keeps them whole) and kept for
+# the sampled share of the successful requests, failed requests always keep their bodies
+API_LOG_BODY_MAX_BYTES = int(os.environ.get("API_LOG_BODY_MAX_BYTES", 8192))
+API_LOG_BODY_SAMPLE_RATE = float(os.environ.get("API_LOG_BODY_SAMPLE_RATE", 1.0))
+# The logs are shipped per batch once full or every flush interval, in seconds, logs past the
+# buffer size are dropped
+API_LOG_BATCH_SIZE = int(os.environ.get("API_LOG_BATCH_SIZE", 100))
+API_LOG_FLUSH_INTERVAL = int(os.environ.get("API_LOG_FLUSH_INTERVAL", 5))
+API_LOG_BUFFER_MAX_SIZE = int(os.environ.get("API_LOG_BUFFER_MAX_SIZE", 5000))
+
+# Issue notification emails queued per task, sent over a persistent SMTP connection of the worker
+# reopened after the messages per connection or once idle for the timeout, in seconds
+EMAIL_NOTIFICATION_BATCH_SIZE = int(os.environ.get("EMAIL_NOTIFICATION_BATCH_SIZE", 50))
+EMAIL_MESSAGES_PER_CONNECTION = int(os.environ.get("EMAIL_MESSAGES_PER_CONNECTION", 100))
+EMAIL_CONNECTION_IDLE_TIMEOUT = int(os.environ.get("EMAIL_CONNECTION_IDLE_TIMEOUT", 30))
+
+# Webhook delivery
+WEBHOOK_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_POOL_MAXSIZE", 10))
+WEBHOOK_BATCH_WINDOW = int(os.environ.get("WEBHOOK_BATCH_WINDOW", 5))
+
+# Seconds the cycle and module progress refreshes are batched for
+PROGRESS_REFRESH_WINDOW = int(os.environ.get("PROGRESS_REFRESH_WINDOW", 5))
+
+# Seconds the analytics rollup rebuilds of changed projects are batched for
+ANALYTICS_ROLLUP_REFRESH_WINDOW = int(os.environ.get("ANALYTICS_ROLLUP_REFRESH_WINDOW", 30))
+
+# Seconds within which the saves of a page by the same user replace their latest version
+PAGE_VERSION_COALESCE_WINDOW = int(os.environ.get("PAGE_VERSION_COALESCE_WINDOW", 120))
+# Versions of a page stored per full snapshot, the others are stored as deltas
+PAGE_VERSION_SNAPSHOT_INTERVAL = int(os.environ.get("PAGE_VERSION_SNAPSHOT_INTERVAL", 10))
+
 # Unsplash Access key
 UNSPLASH_ACCESS_KEY = os.environ.get("UNSPLASH_ACCESS_KEY")
 # Github Access Token
@@ -308,6 +353,9 @@ POSTHOG_HOST = os.environ.get("POSTHOG_HOST", False)
 # Skip environment variable configuration
 SKIP_ENV_VAR = os.environ.get("SKIP_ENV_VAR", "1") == "1"
 
+# Seconds a process reuses the instance configuration before checking its version
+INSTANCE_CONFIGURATION_CACHE_TTL = int(os.environ.get("INSTANCE_CONFIGURATION_CACHE_TTL", 10))
+
 DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get("FILE_SIZE_LIMIT", 5242880))
 
 # Cookie Settings
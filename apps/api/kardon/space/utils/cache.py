@@ -0,0 +1,89 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import hashlib
+import json
+from functools import wraps
+from urllib.parse import urlencode
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+# Third party imports
+from rest_framework import status
+from rest_framework.response import Response
+
+# Module imports
+from kardon.db.models import DeployBoard
+from kardon.utils.cache import get_project_data_version
+
+
+def get_anchor_cache_key(anchor, query_params, version):
+    """Generate the key shared by every visitor of the anchor asking for the same query"""
+    query = urlencode(sorted((key, value) for key in query_params for value in query_params.getlist(key)))
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return f"space:{anchor}:{version}:{query_hash}"
+
+
+def get_response_etag(data):
+    """Return a strong ETag of the response data"""
+    return quote_etag(hashlib.sha256(json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")).hexdigest())
+
+
+def is_not_modified(request, etag):
+    """Check the ETag against the If-None-Match header, weakly as the header requires"""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = [value.removeprefix("W/") for value in parse_etags(header)]
+    return "*" in etags or etag in etags
+
+
+def cache_anchor_response(timeout=60 * 60):
+    """
+    Cache the response of a published project board for all of its visitors.
+    Entries are scoped by the data version of the project, so any write to
+    its issues moves the board to new entries, and repeat visitors sending
+    the ETag back get a 304 without the view running.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(instance, request, anchor, *args, **kwargs):
+            project_id = (
+                DeployBoard.objects.filter(anchor=anchor, entity_name="project")
+                .values_list("entity_identifier", flat=True)
+                .first()
+            )
+            if project_id is None:
+                return view_func(instance, request, anchor, *args, **kwargs)
+
+            key = get_anchor_cache_key(anchor, request.query_params, get_project_data_version(project_id))
+            cached_result = cache.get(key)
+
+            if cached_result is None:
+                response = view_func(instance, request, anchor, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cached_result = {"data": response.data, "etag": get_response_etag(response.data)}
+                if not settings.DEBUG:
+                    cache.set(key, cached_result, timeout)
+
+            if is_not_modified(request, cached_result["etag"]):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(cached_result["data"], status=status.HTTP_200_OK)
+            response["ETag"] = cached_result["etag"]
+            # Shared caches may keep the response but have to revalidate it
+            patch_cache_control(response, public=True, no_cache=True)
+            return response
+
+        return _wrapped_view
+
+    return decorator
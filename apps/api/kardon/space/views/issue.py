@@ -43,6 +43,7 @@ from kardon.space.utils.grouper import (
     issue_on_results,
     issue_queryset_grouper,
 )
+from kardon.space.utils.cache import cache_anchor_response
 
 
 from kardon.utils.order_queryset import order_issue_queryset
@@ -73,6 +74,7 @@ from kardon.utils.issue_filters import issue_filters
 class ProjectIssuesPublicEndpoint(BaseAPIView):
     permission_classes = [AllowAny]
 
+    @cache_anchor_response()
     def get(self, request, anchor):
         filters = issue_filters(request.query_params, "GET")
         order_by_param = request.GET.get("order_by", "-created_at")
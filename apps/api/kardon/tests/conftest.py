@@ -3,6 +3,8 @@
 # See the LICENSE file for details.
 
 import pytest
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework.test import APIClient
 from pytest_django.fixtures import django_db_setup
 
@@ -138,3 +140,19 @@ def workspace(create_user):
     WorkspaceMember.objects.create(workspace=created_workspace, member=create_user, role=20)
 
     return created_workspace
+
+
+@pytest.fixture
+def locmem_cache():
+    """Run the test against an isolated in-memory cache instead of Redis"""
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "kardon-test-cache",
+            "OPTIONS": {"MAX_ENTRIES": 100000},
+        }
+    }
+    with override_settings(CACHES=caches):
+        cache.clear()
+        yield cache
+        cache.clear()
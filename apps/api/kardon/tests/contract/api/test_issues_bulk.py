@@ -0,0 +1,129 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from unittest.mock import patch
+
+import pytest
+from rest_framework import status
+
+from kardon.db.models import (
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    IssueSequence,
+    IssueSequenceCounter,
+    Label,
+    Project,
+    ProjectMember,
+    State,
+)
+
+
+@pytest.fixture
+def project(db, workspace, create_user):
+    """Create a test project with the user as a member and a default state"""
+    project = Project.objects.create(
+        name="Test Project",
+        identifier="TP",
+        workspace=workspace,
+        created_by=create_user,
+    )
+    ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+    State.objects.create(name="Todo", group="unstarted", default=True, project=project, workspace=workspace)
+    return project
+
+
+def get_issue_url(workspace_slug, project_id):
+    return f"/api/v1/workspaces/{workspace_slug}/projects/{project_id}/issues/"
+
+
+@pytest.mark.contract
+class TestIssueSequenceCounter:
+    """Test the issues reserve their sequence ids and sort orders from the project counter"""
+
+    @pytest.mark.django_db
+    def test_issues_get_consecutive_sequences(self, project):
+        first = Issue.objects.create(name="First", project=project)
+        second = Issue.objects.create(name="Second", project=project)
+
+        assert (first.sequence_id, second.sequence_id) == (1, 2)
+        assert first.sort_order == 65535
+        assert second.sort_order == 65535 + IssueSequenceCounter.SORT_ORDER_STEP
+        assert IssueSequenceCounter.objects.get(project=project).last_sequence == 2
+
+    @pytest.mark.django_db
+    def test_counter_starts_after_existing_issues(self, project):
+        """Test a project without a counter continues after its largest sequence"""
+        IssueSequence.objects.create(sequence=41, project=project)
+
+        assert Issue.objects.create(name="Issue", project=project).sequence_id == 42
+
+    @pytest.mark.django_db
+    def test_reserve_block(self, project):
+        assert IssueSequenceCounter.reserve(project.id, 10)[0] == 1
+        assert IssueSequenceCounter.reserve(project.id, 5)[0] == 11
+
+
+@pytest.mark.contract
+class TestBulkIssueCreate:
+    """Test a list of work items is created in bulk"""
+
+    @pytest.mark.django_db
+    @patch("kardon.api.views.issue.bulk_model_activity")
+    @patch("kardon.bgtasks.issue_activities_task.bulk_issue_activity")
+    def test_bulk_create(self, mock_activity, mock_model_activity, api_key_client, workspace, project, create_user):
+        label = Label.objects.create(name="Bug", project=project, workspace=workspace)
+        payload = [
+            {"name": f"Issue {index}", "labels": [str(label.id)], "assignees": [str(create_user.id)]}
+            for index in range(3)
+        ]
+
+        response = api_key_client.post(get_issue_url(workspace.slug, project.id), payload, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [issue["sequence_id"] for issue in response.data] == [1, 2, 3]
+        assert Issue.objects.filter(project=project, state__default=True).count() == 3
+        assert IssueSequence.objects.filter(project=project).count() == 3
+        assert IssueLabel.objects.filter(project=project, label=label).count() == 3
+        assert IssueAssignee.objects.filter(project=project, assignee=create_user).count() == 3
+        # One activity and one webhook message for the whole payload
+        assert mock_activity.delay.call_count == 1
+        assert len(mock_activity.delay.call_args.kwargs["issue_deltas"]) == 3
+        assert mock_model_activity.delay.call_count == 1
+
+    @pytest.mark.django_db
+    def test_bulk_create_existing_external_id(self, api_key_client, workspace, project):
+        issue = Issue.objects.create(name="Imported", project=project, external_source="jira", external_id="J-1")
+        payload = [
+            {"name": "New", "external_source": "jira", "external_id": "J-2"},
+            {"name": "Imported", "external_source": "jira", "external_id": "J-1"},
+        ]
+
+        response = api_key_client.post(get_issue_url(workspace.slug, project.id), payload, format="json")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["ids"] == [str(issue.id)]
+        assert Issue.objects.filter(project=project).count() == 1
+
+    @pytest.mark.django_db
+    def test_bulk_create_repeated_external_id(self, api_key_client, workspace, project):
+        payload = [
+            {"name": "First", "external_source": "jira", "external_id": "J-1"},
+            {"name": "Second", "external_source": "jira", "external_id": "J-1"},
+        ]
+
+        response = api_key_client.post(get_issue_url(workspace.slug, project.id), payload, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["external_id"] == "J-1"
+        assert not Issue.objects.filter(project=project).exists()
+
+    @pytest.mark.django_db
+    def test_bulk_create_invalid_item(self, api_key_client, workspace, project):
+        response = api_key_client.post(
+            get_issue_url(workspace.slug, project.id), [{"name": "Valid"}, {"priority": "urgent"}], format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Issue.objects.filter(project=project).exists()
@@ -0,0 +1,127 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from kardon.db.models import AnalyticsRollup, Issue, IssueAssignee, Project, ProjectMember, State
+from kardon.utils.analytics_rollup import get_rollup_project_ids, refresh_analytics_rollup, update_analytics_rollup
+
+
+def normalize(data):
+    """Return the response data with the values as strings and the rows in a stable order"""
+    data = {**data, "extras": {key: list(details) for key, details in data["extras"].items()}}
+    data = json.loads(json.dumps(data, default=str))
+    data["distribution"] = {
+        key: sorted(rows, key=lambda row: json.dumps(row, sort_keys=True)) for key, rows in data["distribution"].items()
+    }
+    return data
+
+
+@pytest.mark.unit
+class TestRollupFilters:
+    """Test the issue filters the rollup answers"""
+
+    def test_unsupported_filter_falls_back(self):
+        """Test a filter the rollup does not keep needs the live query"""
+        assert get_rollup_project_ids("test-workspace", {"priority__in": ["urgent"]}) is None
+
+
+@pytest.mark.contract
+class TestAnalyticsRollup:
+    """Test the analytics are answered from the rollup with the live results"""
+
+    @pytest.fixture
+    def project(self, workspace, create_user):
+        project = Project.objects.create(name="Rollup Project", identifier="RLP", workspace=workspace)
+        ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+        states = [
+            State.objects.create(name=group, group=group, project=project, workspace=workspace)
+            for group in ["backlog", "started", "completed"]
+        ]
+        for index, priority in enumerate(["urgent", "high", "high", "none", "low"]):
+            Issue.objects.create(
+                name=f"Issue {index}",
+                workspace=workspace,
+                project=project,
+                state=states[index % len(states)],
+                priority=priority,
+                sequence_id=index + 1,
+            )
+        return project
+
+    @pytest.mark.django_db
+    @patch("kardon.bgtasks.analytics_rollup_task.queue_analytics_rollup_refresh")
+    def test_rollup_matches_live(self, mock_queue, session_client, workspace, project):
+        """Test the first request falls back to the live query and the rollup answers the same afterwards"""
+        url = reverse("kardon-analytics", kwargs={"slug": workspace.slug})
+        params = {"x_axis": "priority", "y_axis": "issue_count", "segment": "state_id"}
+
+        live = session_client.get(url, params)
+        assert live.status_code == status.HTTP_200_OK
+        mock_queue.assert_called_once_with([str(project.id)])
+
+        refresh_analytics_rollup(project.id)
+        assert AnalyticsRollup.objects.filter(project=project, x_axis="priority", segment_axis="state_id").exists()
+
+        rollup = session_client.get(url, params)
+        assert rollup.status_code == status.HTTP_200_OK
+        assert mock_queue.call_count == 1
+        assert normalize(rollup.data) == normalize(live.data)
+        assert rollup.data["total"] == 5
+
+    @pytest.mark.django_db
+    @patch("kardon.bgtasks.analytics_rollup_task.queue_analytics_rollup_refresh")
+    def test_rollup_matches_live_on_nullable_axis(self, mock_queue, session_client, workspace, project, create_user):
+        """Test the unassigned issues are left out of the rollup as they are out of the live query"""
+        for issue in Issue.objects.filter(project=project, sequence_id__lte=2):
+            IssueAssignee.objects.create(issue=issue, assignee=create_user, project=project, workspace=workspace)
+        url = reverse("kardon-analytics", kwargs={"slug": workspace.slug})
+        params = {"x_axis": "assignees__id", "y_axis": "issue_count", "segment": "priority"}
+
+        live = session_client.get(url, params)
+        refresh_analytics_rollup(project.id)
+        rollup = session_client.get(url, params)
+
+        assert rollup.status_code == status.HTTP_200_OK
+        assert mock_queue.call_count == 1
+        assert normalize(rollup.data) == normalize(live.data)
+        assert list(rollup.data["distribution"]) == [str(create_user.id)]
+
+    @pytest.mark.django_db
+    @patch("kardon.bgtasks.analytics_rollup_task.queue_analytics_rollup_refresh")
+    def test_update_recounts_changed_days(self, mock_queue, session_client, workspace, project):
+        """Test recounting the days of the changed issues keeps the rollup in line with the live query"""
+        url = reverse("kardon-analytics", kwargs={"slug": workspace.slug})
+        params = {"x_axis": "priority", "y_axis": "issue_count", "segment": "state_id"}
+        session_client.get(url, params)
+        refresh_analytics_rollup(project.id)
+
+        # Changes made without an activity, then recounted as the refresh task does
+        changed = Issue.objects.filter(project=project, priority="high").first()
+        deleted = Issue.objects.get(project=project, priority="low")
+        Issue.objects.filter(pk=changed.pk).update(priority="urgent")
+        Issue.objects.filter(pk=deleted.pk).delete()
+        update_analytics_rollup(project.id, [changed.id, deleted.id])
+
+        rollup = session_client.get(url, params)
+        with patch("kardon.app.views.analytic.base.ensure_analytics_rollup", return_value=False):
+            live = session_client.get(url, params)
+        assert normalize(rollup.data) == normalize(live.data)
+        assert rollup.data["total"] == 4
+
+    @pytest.mark.django_db
+    @patch("kardon.bgtasks.analytics_rollup_task.queue_analytics_rollup_refresh")
+    def test_unsupported_filter_uses_live_query(self, mock_queue, session_client, workspace, project):
+        """Test a filter the rollup can not answer is served live without queueing a rebuild"""
+        url = reverse("kardon-analytics", kwargs={"slug": workspace.slug})
+        response = session_client.get(url, {"x_axis": "state__group", "y_axis": "issue_count", "priority": "high"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total"] == 2
+        mock_queue.assert_not_called()
@@ -0,0 +1,109 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import Q
+from django.urls import reverse
+from rest_framework import status
+
+from kardon.db.models import Issue, Project, ProjectMember, State
+from kardon.utils.issue_search import search_issues
+
+
+@pytest.mark.contract
+class TestGlobalSearch:
+    """Test the command palette search of the workspace"""
+
+    @pytest.fixture
+    def project(self, workspace, create_user):
+        project = Project.objects.create(name="Search Project", identifier="SRCH", workspace=workspace)
+        ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+        state = State.objects.create(name="Todo", project=project, workspace=workspace)
+        for sequence_id, name in enumerate(["Login page crashes", "Fix login", "Billing report", "Blogin"], start=1):
+            Issue.objects.create(name=name, workspace=workspace, project=project, state=state, sequence_id=sequence_id)
+        return project
+
+    @pytest.mark.django_db
+    def test_issues_ranked_by_relevance(self, session_client, workspace, project):
+        """Test the word matches come before the substring matches"""
+        url = reverse("global-search", kwargs={"slug": workspace.slug})
+        response = session_client.get(url, {"search": "login", "entities": "issue", "workspace_search": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        names = [issue["name"] for issue in response.data["results"]["issue"]]
+        assert set(names) == {"Login page crashes", "Fix login", "Blogin"}
+        assert names[-1] == "Blogin"
+
+    @pytest.mark.django_db
+    def test_identifier_and_sequence_match(self, session_client, workspace, project):
+        """Test the project identifier and sequence id still find the issue"""
+        url = reverse("global-search", kwargs={"slug": workspace.slug})
+        response = session_client.get(url, {"search": "3", "entities": "issue", "workspace_search": "true"})
+
+        assert [issue["name"] for issue in response.data["results"]["issue"]] == ["Billing report"]
+
+
+@pytest.mark.contract
+@pytest.mark.slow
+class TestIssueSearchBenchmark:
+    """Benchmark the indexed search against the icontains scan on seeded issues"""
+
+    def icontains_search(self, query, user, slug):
+        return list(
+            Issue.issue_objects.filter(
+                Q(name__icontains=query) | Q(project__identifier__icontains=query),
+                project__project_projectmember__member=user,
+                project__project_projectmember__is_active=True,
+                project__archived_at__isnull=True,
+                workspace__slug=slug,
+            )
+            .distinct()
+            .values("name", "id")[:100]
+        )
+
+    def indexed_search(self, query, user, slug):
+        issues = Issue.issue_objects.filter(
+            project_id__in=ProjectMember.objects.filter(member=user, is_active=True).values("project_id"),
+            project__archived_at__isnull=True,
+            workspace__slug=slug,
+        )
+        return list(search_issues(query, issues, slug=slug).values("name", "id")[:100])
+
+    @pytest.mark.django_db
+    def test_indexed_search_finds_the_icontains_matches(self, workspace, create_user):
+        """Test the indexed search returns the substring matches of the scan"""
+        project = Project.objects.create(name="Bench", identifier="BNCH", workspace=workspace)
+        ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+        state = State.objects.create(name="Todo", project=project, workspace=workspace)
+        Issue.objects.bulk_create(
+            [
+                Issue(
+                    name=f"Routine maintenance task {index}" if index % 500 else f"Checkout timeout {index}",
+                    workspace=workspace,
+                    project=project,
+                    state=state,
+                    sequence_id=index + 1,
+                )
+                for index in range(50000)
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE issues")
+
+        results = {}
+        timings = {}
+        for name, search in [("icontains", self.icontains_search), ("indexed", self.indexed_search)]:
+            # Best of three runs, leaving out the warm up of the first one
+            for _ in range(3):
+                started_at = time.perf_counter()
+                results[name] = search("checkout", create_user, workspace.slug)
+                timings[name] = min(timings.get(name, float("inf")), time.perf_counter() - started_at)
+
+        assert timings["indexed"] < timings["icontains"]
+        assert len(results["indexed"]) == 100
+        assert {issue["id"] for issue in results["indexed"]} == {issue["id"] for issue in results["icontains"]}
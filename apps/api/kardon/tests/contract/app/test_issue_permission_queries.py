@@ -0,0 +1,43 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from kardon.db.models import Issue, Project, ProjectMember, State
+
+
+@pytest.mark.contract
+@pytest.mark.slow
+class TestIssuePermissionQueries:
+    """Benchmark the membership queries of the main issue endpoints"""
+
+    @pytest.fixture
+    def project(self, workspace, create_user):
+        project = Project.objects.create(name="Test Project", identifier="TP", workspace=workspace)
+        ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+        state = State.objects.create(name="Todo", project=project, workspace=workspace)
+        Issue.objects.create(name="Issue", workspace=workspace, project=project, state=state)
+        return project
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("url_name", ["project-issue", "project-issue-detail", "project-issues-paginated"])
+    def test_membership_loaded_once(self, session_client, workspace, project, url_name):
+        """Test each request reads the workspace and project members once"""
+        url = reverse(url_name, kwargs={"slug": workspace.slug, "project_id": project.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = session_client.get(url)
+
+        membership_queries = [
+            query["sql"]
+            for query in queries
+            if query["sql"].lstrip().startswith("SELECT")
+            and ('FROM "workspace_members"' in query["sql"] or 'FROM "project_members"' in query["sql"])
+        ]
+        assert response.status_code == status.HTTP_200_OK
+        assert len(membership_queries) <= 2
@@ -0,0 +1,95 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from kardon.db.models import (
+    Issue,
+    IssueChange,
+    IssueChangeCounter,
+    Label,
+    IssueLabel,
+    Project,
+    ProjectMember,
+    State,
+)
+
+
+@pytest.mark.contract
+class TestIssueSync:
+    """Test the issue changes are synced from the token of the full list"""
+
+    @pytest.fixture
+    def project(self, workspace, create_user):
+        project = Project.objects.create(name="Test Project", identifier="TP", workspace=workspace)
+        ProjectMember.objects.create(project=project, member=create_user, role=20, is_active=True)
+        return project
+
+    @pytest.fixture
+    def state(self, workspace, project):
+        return State.objects.create(name="Todo", project=project, workspace=workspace)
+
+    def sync(self, session_client, workspace, project, sync_token):
+        url = reverse("project-issues-sync", kwargs={"slug": workspace.slug, "project_id": project.id})
+        return session_client.get(url, {"sync_token": sync_token})
+
+    @pytest.mark.django_db
+    def test_changes_after_list_token(self, session_client, workspace, project, state):
+        kept = Issue.objects.create(name="Kept", workspace=workspace, project=project, state=state)
+        archived = Issue.objects.create(name="Archived", workspace=workspace, project=project, state=state)
+        deleted = Issue.objects.create(name="Deleted", workspace=workspace, project=project, state=state)
+        url = reverse("project-issues-paginated", kwargs={"slug": workspace.slug, "project_id": project.id})
+        sync_token = session_client.get(url).data["sync_token"]
+
+        label = Label.objects.create(name="Bug", project=project, workspace=workspace)
+        IssueLabel.objects.create(issue=kept, label=label, project=project, workspace=workspace)
+        archived.archived_at = timezone.now().date()
+        archived.save()
+        deleted.delete()
+
+        response = self.sync(session_client, workspace, project, sync_token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [str(issue["id"]) for issue in response.data["results"]] == [str(kept.id)]
+        assert response.data["results"][0]["label_ids"] == [label.id]
+        assert set(response.data["deleted"]) == {str(archived.id), str(deleted.id)}
+        assert not response.data["has_more"]
+
+        response = self.sync(session_client, workspace, project, response.data["sync_token"])
+        assert response.data["results"] == []
+        assert response.data["deleted"] == []
+
+    @pytest.mark.django_db
+    def test_one_row_per_issue(self, workspace, project, state):
+        issue = Issue.objects.create(name="Issue", workspace=workspace, project=project, state=state)
+        for index in range(3):
+            issue.name = f"Issue {index}"
+            issue.save()
+
+        changes = IssueChange.objects.filter(project=project)
+        assert changes.count() == 1
+        assert changes.get().sequence == IssueChange.get_sync_token(project.id)
+
+    @pytest.mark.django_db
+    def test_invalid_token(self, session_client, workspace, project):
+        response = self.sync(session_client, workspace, project, "latest")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_project_hard_delete(self, workspace, project, state):
+        issue = Issue.objects.create(name="Issue", workspace=workspace, project=project, state=state)
+        label = Label.objects.create(name="Bug", project=project, workspace=workspace)
+        IssueLabel.objects.create(issue=issue, label=label, project=project, workspace=workspace)
+
+        Project.all_objects.filter(pk=project.pk).delete()
+        # Run the deferred foreign key checks the commit would run
+        connection.check_constraints()
+
+        assert not IssueChange.all_objects.filter(project_id=project.id).exists()
+        assert not IssueChangeCounter.all_objects.filter(project_id=project.id).exists()
@@ -0,0 +1,83 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from kardon.bgtasks.issue_activities_task import bulk_issue_activity, queue_bulk_issue_activity
+from kardon.db.models import Issue, IssueActivity, Project
+
+
+@pytest.mark.unit
+class TestQueueBulkIssueActivity:
+    """Test the bulk activity deltas are split into a few messages"""
+
+    @patch("kardon.bgtasks.issue_activities_task.bulk_issue_activity.delay")
+    def test_deltas_are_batched(self, mock_delay):
+        """Test 5,000 deltas produce a handful of messages"""
+        issue_deltas = [
+            {"issue_id": str(index), "requested_data": "{}", "current_instance": None} for index in range(5000)
+        ]
+
+        queue_bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=issue_deltas,
+            actor_id="actor",
+            project_id="project",
+            epoch=0,
+        )
+
+        assert mock_delay.call_count == 10
+        assert sum(len(call.kwargs["issue_deltas"]) for call in mock_delay.call_args_list) == 5000
+
+    @patch("kardon.bgtasks.issue_activities_task.bulk_issue_activity.delay")
+    def test_no_deltas_no_message(self, mock_delay):
+        """Test nothing is queued when there is no delta"""
+        queue_bulk_issue_activity(type="issue.activity.updated", issue_deltas=[], actor_id="a", project_id="p", epoch=0)
+        mock_delay.assert_not_called()
+
+
+@pytest.mark.unit
+class TestBulkIssueActivity:
+    """Test the set based bulk activity writer"""
+
+    @pytest.fixture
+    def project(self, workspace):
+        return Project.objects.create(name="Test Project", identifier="TP", workspace=workspace)
+
+    @pytest.fixture
+    def issues(self, workspace, project):
+        return [Issue.objects.create(name=f"Issue {index}", workspace=workspace, project=project) for index in range(5)]
+
+    @pytest.mark.django_db
+    @patch("kardon.bgtasks.issue_activities_task.bulk_notifications.delay")
+    def test_bulk_activity_writes_all_rows(self, mock_notifications, create_user, project, issues):
+        """Test every delta gets its activity, one updated_at bump and one notification fan out"""
+        started_at = timezone.now()
+        archive_at = str(timezone.now().date())
+
+        bulk_issue_activity(
+            type="issue.activity.updated",
+            issue_deltas=[
+                {
+                    "issue_id": str(issue.id),
+                    "requested_data": json.dumps({"archived_at": archive_at, "automation": True}),
+                    "current_instance": json.dumps({"archived_at": None}),
+                }
+                for issue in issues
+            ],
+            actor_id=str(create_user.id),
+            project_id=str(project.id),
+            epoch=int(timezone.now().timestamp()),
+            subscriber=False,
+            notification=True,
+        )
+
+        assert IssueActivity.objects.filter(issue__in=issues, field="archived_at").count() == len(issues)
+        assert Issue.objects.filter(pk__in=[issue.id for issue in issues], updated_at__gte=started_at).count() == 5
+        mock_notifications.assert_called_once()
+        assert len(json.loads(mock_notifications.call_args.kwargs["issue_deltas"])) == len(issues)
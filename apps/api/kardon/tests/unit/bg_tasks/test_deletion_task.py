@@ -0,0 +1,74 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kardon.bgtasks.deletion_task import CASCADE, SET_NULL, get_soft_delete_plan, soft_delete_related_objects
+from kardon.db.models import Issue, IssueActivity, IssueComment, Project, State
+
+
+@pytest.mark.unit
+class TestSoftDeletePlan:
+    """Test the cascade plan computed from the model meta"""
+
+    def test_plan_is_computed_once(self):
+        """Test the plan of a model is cached"""
+        assert get_soft_delete_plan(Issue) is get_soft_delete_plan(Issue)
+
+    def test_do_nothing_relations_are_skipped(self):
+        """Test the DO_NOTHING activity relation of an issue is not cascaded"""
+        assert (CASCADE, IssueActivity, "issue") not in get_soft_delete_plan(Issue)
+        assert (SET_NULL, IssueActivity, "issue") not in get_soft_delete_plan(Issue)
+
+    def test_cascade_relations_are_soft_deletable(self):
+        """Test the plan only cascades into models with a deleted_at column"""
+        plan = get_soft_delete_plan(Project)
+        assert (CASCADE, Issue, "project") in plan
+        assert all(hasattr(model, "deleted_at") for action, model, _ in plan if action == CASCADE)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestSoftDeleteCascadeBenchmark:
+    """Benchmark the soft delete cascade of a seeded project"""
+
+    def seed_project(self, workspace, user, identifier, issue_count):
+        project = Project.objects.create(name=f"Project {identifier}", identifier=identifier, workspace=workspace)
+        state = State.objects.create(name="Todo", project=project, workspace=workspace)
+        issues = Issue.objects.bulk_create(
+            [
+                Issue(name=f"Issue {index}", workspace=workspace, project=project, state=state, sequence_id=index + 1)
+                for index in range(issue_count)
+            ]
+        )
+        IssueComment.objects.bulk_create(
+            [
+                IssueComment(
+                    comment_html="<p>comment</p>", issue=issue, project=project, workspace=workspace, actor=user
+                )
+                for issue in issues
+            ]
+        )
+        Project.objects.filter(pk=project.pk).delete()
+        return project
+
+    def soft_delete(self, project, issue_count):
+        with CaptureQueriesContext(connection) as queries:
+            soft_delete_related_objects("db", "project", project.pk)
+
+        # The rows are updated in batches, never one statement per issue
+        assert len(queries) < issue_count
+        assert Issue.objects.filter(project=project).count() == 0
+        assert IssueComment.objects.filter(project=project).count() == 0
+        return len(queries)
+
+    @pytest.mark.django_db
+    def test_query_count_grows_with_batches_not_rows(self, workspace, create_user):
+        """Test 3x the issues only adds the statements of the extra batches"""
+        small = self.soft_delete(self.seed_project(workspace, create_user, "SM", 1000), 1000)
+        large = self.soft_delete(self.seed_project(workspace, create_user, "LG", 3000), 3000)
+
+        assert large < small * 2
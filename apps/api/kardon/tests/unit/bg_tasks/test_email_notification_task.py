@@ -0,0 +1,129 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import socketserver
+import threading
+import time
+
+import pytest
+from django.core.mail import EmailMessage
+
+from kardon.bgtasks.email_notification_task import PooledEmailConnection
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Accept every message and drop it, hanging up after drop_after messages if set"""
+
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b"220 sink ESMTP\r\n")
+        messages = 0
+        while True:
+            command = self.rfile.readline().strip().upper()
+            if not command or command == b"QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            if command == b"DATA":
+                self.wfile.write(b"354 end with .\r\n")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.messages += 1
+                messages += 1
+                self.wfile.write(b"250 queued\r\n")
+                if self.server.drop_after and messages >= self.server.drop_after:
+                    return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after=None):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = 0
+
+
+@pytest.fixture
+def smtp_sink():
+    sinks = []
+
+    def start(drop_after=None):
+        sink = SMTPSink(drop_after)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        sinks.append(sink)
+        return sink
+
+    yield start
+    for sink in sinks:
+        sink.shutdown()
+        sink.server_close()
+
+
+def get_configuration(sink):
+    return ("127.0.0.1", None, None, sink.server_address[1], "0", "0", "Kardon <team@kardon.so>")
+
+
+def make_message(index):
+    return EmailMessage(subject=f"Issue {index}", body="Updates", from_email="team@kardon.so", to=["user@kardon.so"])
+
+
+@pytest.mark.unit
+class TestPooledEmailConnection:
+    """Test the emails of the worker share their SMTP connections"""
+
+    @pytest.fixture(autouse=True)
+    def email_settings(self, settings):
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_MESSAGES_PER_CONNECTION = 2
+        settings.EMAIL_CONNECTION_IDLE_TIMEOUT = 30
+
+    def test_connection_reused_up_to_limit(self, smtp_sink):
+        sink = smtp_sink()
+        connection = PooledEmailConnection(get_configuration(sink))
+
+        for index in range(5):
+            connection.send(make_message(index))
+        connection.close()
+
+        assert sink.messages == 5
+        assert sink.connections == 3
+
+    def test_dropped_connection_reopened(self, smtp_sink):
+        sink = smtp_sink(drop_after=1)
+        connection = PooledEmailConnection(get_configuration(sink))
+
+        connection.send(make_message(0))
+        connection.send(make_message(1))
+        connection.close()
+
+        assert sink.messages == 2
+        assert sink.connections == 2
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestPooledEmailConnectionBenchmark:
+    """Benchmark the pooled connection against a connection per email"""
+
+    def test_throughput(self, smtp_sink, settings):
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_CONNECTION_IDLE_TIMEOUT = 30
+        sink = smtp_sink()
+        elapsed = {}
+
+        for messages_per_connection in (1, 100):
+            settings.EMAIL_MESSAGES_PER_CONNECTION = messages_per_connection
+            connection = PooledEmailConnection(get_configuration(sink))
+            started_at = time.perf_counter()
+            for index in range(500):
+                connection.send(make_message(index))
+            connection.close()
+            elapsed[messages_per_connection] = time.perf_counter() - started_at
+
+        assert sink.messages == 1000
+        assert elapsed[100] < elapsed[1]
@@ -0,0 +1,122 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import io
+import json
+import tracemalloc
+import zipfile
+
+import pytest
+from rest_framework import serializers
+
+from kardon.bgtasks.export_task import S3MultipartWriter, write_export_zip
+from kardon.utils.porters import CSVFormatter, DataExporter, JSONFormatter, XLSXFormatter
+
+
+class RowSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    sequence_id = serializers.IntegerField()
+    labels = serializers.ListField(child=serializers.CharField())
+
+
+class RowQuerySet:
+    """Generate the rows lazily like a server side cursor would"""
+
+    def __init__(self, count):
+        self.count = count
+
+    def iterator(self, chunk_size=None):
+        for index in range(self.count):
+            yield {"name": f"Issue {index}", "sequence_id": index, "labels": ["bug", "ui"]}
+
+
+class InMemoryS3:
+    """Keep the uploaded parts of the multipart uploads"""
+
+    def __init__(self):
+        self.parts = []
+        self.objects = {}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        return {"UploadId": "upload"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.parts.append(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = b"".join(self.parts)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.parts = []
+
+
+@pytest.mark.unit
+class TestStreamingFormatters:
+    """Test the streamed content matches the in memory encoding"""
+
+    rows = [
+        {"name": "Issue 1", "sequence_id": 1, "labels": ["bug"]},
+        {"name": "Issue 2", "sequence_id": 2, "labels": []},
+    ]
+
+    def stream(self, formatter, rows):
+        output = io.BytesIO()
+        formatter.stream(iter(rows), output)
+        return output.getvalue()
+
+    def test_csv_stream_matches_encode(self):
+        """Test the streamed CSV is byte for byte the encoded CSV"""
+        formatter = CSVFormatter()
+        assert self.stream(formatter, self.rows).decode("utf-8") == formatter.encode(self.rows)
+
+    def test_json_stream_is_valid_array(self):
+        """Test the streamed JSON parses back to the rows"""
+        assert json.loads(self.stream(JSONFormatter(), self.rows)) == self.rows
+        assert json.loads(self.stream(JSONFormatter(), [])) == []
+
+    def test_xlsx_stream_decodes_back(self):
+        """Test the write only workbook holds every row"""
+        formatter = XLSXFormatter()
+        decoded = formatter.decode(self.stream(formatter, self.rows))
+        assert [row["name"] for row in decoded] == ["Issue 1", "Issue 2"]
+
+
+@pytest.mark.unit
+class TestStreamingExport:
+    """Test the export ZIP is streamed to S3 in parts"""
+
+    @pytest.mark.parametrize("provider", ["csv", "json", "xlsx"])
+    def test_zip_uploaded_in_parts(self, provider):
+        """Test the ZIP is uploaded as several parts and holds every file"""
+        client = InMemoryS3()
+        writer = S3MultipartWriter(client, "uploads", "export.zip", part_size=8 * 1024)
+        exporter = DataExporter(RowSerializer, format_type=provider)
+
+        write_export_zip(writer, exporter, [("project-1", RowQuerySet(5000)), ("project-2", RowQuerySet(10))])
+        writer.close()
+
+        assert len(client.parts) > 1
+        with zipfile.ZipFile(io.BytesIO(client.objects["export.zip"])) as zipf:
+            assert zipf.namelist() == [f"project-1.{provider}", f"project-2.{provider}"]
+            if provider == "csv":
+                assert zipf.read("project-1.csv").decode("utf-8").count("\n") == 5001
+
+    @pytest.mark.slow
+    def test_peak_memory_is_bounded(self):
+        """Test 10x the rows does not grow the peak memory of the export"""
+        peaks = []
+        for count in [5000, 50000]:
+            client = InMemoryS3()
+            client.complete_multipart_upload = lambda **kwargs: None
+            client.upload_part = lambda **kwargs: {"ETag": "etag"}
+            writer = S3MultipartWriter(client, "uploads", "export.zip", part_size=256 * 1024)
+
+            tracemalloc.start()
+            write_export_zip(writer, DataExporter(RowSerializer, format_type="csv"), [("issues", RowQuerySet(count))])
+            writer.close()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        assert peaks[1] < peaks[0] * 2
@@ -0,0 +1,89 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kardon.bgtasks.notification_task import get_project_notification_context, send_issue_notifications
+from kardon.db.models import (
+    Issue,
+    IssueSubscriber,
+    Notification,
+    Project,
+    ProjectMember,
+    User,
+)
+
+
+@pytest.mark.unit
+class TestNotificationFanOut:
+    """Test the notification fan out does not query per subscriber"""
+
+    @pytest.fixture
+    def project(self, workspace):
+        return Project.objects.create(name="Test Project", identifier="TP", workspace=workspace)
+
+    @pytest.fixture
+    def issue(self, workspace, project):
+        return Issue.objects.create(name="Issue", workspace=workspace, project=project)
+
+    def add_subscribers(self, project, issue, count):
+        users = User.objects.bulk_create(
+            [User(email=f"{uuid.uuid4().hex}@kardon.so", username=uuid.uuid4().hex) for _ in range(count)]
+        )
+        ProjectMember.objects.bulk_create(
+            [ProjectMember(project=project, workspace_id=project.workspace_id, member=user) for user in users]
+        )
+        IssueSubscriber.objects.bulk_create(
+            [
+                IssueSubscriber(
+                    project=project,
+                    workspace_id=project.workspace_id,
+                    issue=issue,
+                    subscriber=user,
+                )
+                for user in users
+            ]
+        )
+
+    def fan_out(self, project, issue, actor):
+        activity = {
+            "id": str(uuid.uuid4()),
+            "verb": "updated",
+            "field": "priority",
+            "actor_id": str(actor.id),
+            "old_value": "none",
+            "new_value": "urgent",
+            "issue_comment": None,
+            "issue_detail": {"id": str(issue.id)},
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            send_issue_notifications(
+                context=get_project_notification_context(project.id),
+                type="issue.activity.updated",
+                issue_id=issue.id,
+                actor_id=actor.id,
+                subscriber=False,
+                issue_activities_created=[activity],
+                requested_data=None,
+                current_instance=None,
+            )
+        return len(queries)
+
+    @pytest.mark.django_db
+    def test_query_count_does_not_grow_with_subscribers(self, create_user, project, issue):
+        """Test 5 and 50 subscribers cost the same number of queries"""
+        self.add_subscribers(project, issue, 5)
+        few_queries = self.fan_out(project, issue, create_user)
+        assert Notification.objects.filter(entity_identifier=issue.id).count() == 5
+
+        self.add_subscribers(project, issue, 45)
+        many_queries = self.fan_out(project, issue, create_user)
+
+        assert Notification.objects.filter(entity_identifier=issue.id).count() == 55
+        assert many_queries == few_queries
@@ -0,0 +1,131 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kardon.bgtasks.progress_task import queue_activity_progress_refresh, queue_progress_refresh
+from kardon.db.models import (
+    Cycle,
+    CycleIssue,
+    CycleProgress,
+    Estimate,
+    EstimatePoint,
+    Issue,
+    Project,
+    State,
+)
+from kardon.utils.progress import get_cycle_progress, refresh_cycle_progress
+
+
+def make_activity(field, issue_id=None, old_identifier=None, new_identifier=None):
+    return SimpleNamespace(field=field, issue_id=issue_id, old_identifier=old_identifier, new_identifier=new_identifier)
+
+
+@pytest.mark.unit
+class TestQueueProgressRefresh:
+    """Test the issue activities mark the right cycles and modules as stale"""
+
+    @patch("kardon.bgtasks.progress_task.queue_progress_refresh")
+    def test_membership_changes_mark_both_sides(self, mock_queue):
+        """Test moving an issue between cycles refreshes the old and the new cycle"""
+        old_cycle, new_cycle, module = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        queue_activity_progress_refresh(
+            [
+                make_activity("cycles", old_identifier=old_cycle, new_identifier=new_cycle),
+                make_activity("modules", new_identifier=module),
+                make_activity("priority", issue_id=uuid.uuid4()),
+            ]
+        )
+
+        mock_queue.assert_called_once()
+        assert mock_queue.call_args.kwargs["cycle_ids"] == {old_cycle, new_cycle}
+        assert mock_queue.call_args.kwargs["module_ids"] == {module}
+
+    @patch("kardon.bgtasks.progress_task.progress_refresh_task")
+    @patch("kardon.bgtasks.progress_task.redis_instance")
+    def test_refresh_scheduled_once_per_window(self, mock_redis, mock_task):
+        """Test only the first change of a window schedules the refresh"""
+        ri = MagicMock()
+        ri.set.side_effect = [True, False]
+        mock_redis.return_value = ri
+
+        queue_progress_refresh(cycle_ids=[uuid.uuid4()])
+        queue_progress_refresh(module_ids=[uuid.uuid4()])
+
+        assert mock_task.apply_async.call_count == 1
+
+    @patch("kardon.bgtasks.progress_task.redis_instance")
+    def test_nothing_to_refresh(self, mock_redis):
+        """Test activities outside cycles and modules do not touch redis"""
+        queue_progress_refresh(cycle_ids=[None], module_ids=[])
+        mock_redis.assert_not_called()
+
+
+@pytest.mark.unit
+class TestCycleProgress:
+    """Test the cycle progress is calculated in a single pass and read from the store"""
+
+    @pytest.fixture
+    def cycle(self, workspace, create_user):
+        project = Project.objects.create(name="Progress Project", identifier="PP", workspace=workspace)
+        cycle = Cycle.objects.create(name="Cycle", project=project, owned_by=create_user)
+        estimate = Estimate.objects.create(name="Points", type="points", project=project)
+        points = {
+            value: EstimatePoint.objects.create(estimate=estimate, key=value, value=str(value), project=project)
+            for value in [1, 3, 5]
+        }
+        states = {
+            group: State.objects.create(name=group, group=group, project=project)
+            for group in ["backlog", "started", "completed"]
+        }
+        for index, (group, point) in enumerate([("backlog", 1), ("started", 3), ("completed", 5), ("completed", 1)]):
+            issue = Issue.objects.create(
+                name=f"Issue {index}",
+                project=project,
+                state=states[group],
+                estimate_point=points[point],
+                sequence_id=index + 1,
+            )
+            CycleIssue.objects.create(cycle=cycle, issue=issue, project=project)
+        return cycle
+
+    @pytest.mark.django_db
+    def test_counts_and_estimates_by_state_group(self, cycle):
+        """Test the issue counts and point sums of every state group"""
+        progress = refresh_cycle_progress([cycle.id])[str(cycle.id)]
+
+        assert progress["total_issues"] == 4
+        assert progress["completed_issues"] == 2
+        assert progress["backlog_issues"] == 1
+        assert progress["unstarted_issues"] == 0
+        assert progress["completed_estimate_points"] == 6
+        assert progress["total_estimate_points"] == 10
+
+    @pytest.mark.django_db
+    def test_progress_read_from_store(self, cycle):
+        """Test a stored progress is read with a single query"""
+        get_cycle_progress(cycle.id)
+        assert CycleProgress.objects.filter(cycle=cycle).exists()
+
+        with CaptureQueriesContext(connection) as queries:
+            progress = get_cycle_progress(cycle.id)
+
+        assert len(queries) == 1
+        assert progress["started_issues"] == 1
+
+    @pytest.mark.django_db
+    def test_refresh_upserts_the_row(self, cycle):
+        """Test refreshing again updates the stored row"""
+        refresh_cycle_progress([cycle.id])
+        CycleIssue.objects.filter(cycle=cycle).first().delete()
+        refresh_cycle_progress([cycle.id])
+
+        assert CycleProgress.objects.filter(cycle=cycle).count() == 1
+        assert CycleProgress.objects.get(cycle=cycle).total_issues == 3
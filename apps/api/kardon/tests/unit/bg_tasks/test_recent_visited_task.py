@@ -0,0 +1,184 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from kardon.bgtasks.recent_visited_task import flush_recent_visits, record_recent_visit
+from kardon.db.models import Project, UserRecentVisit
+from kardon.utils.recent_visit import (
+    MAX_RECENT_VISITS,
+    get_recent_visit_member,
+    get_recent_visits,
+    remove_recent_visits,
+)
+
+
+class FakeRedis:
+    """Keep the sets and sorted sets the visits go through in memory"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update({member.encode(): score for member, score in mapping.items()})
+
+    def zremrangebyrank(self, key, start, end):
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: item[1])
+        for member, _ in members[start : max(len(members) + end + 1, 0)]:
+            del self.data[key][member]
+
+    def zrevrange(self, key, start, end, withscores=False):
+        return sorted(self.data.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+
+    def zrem(self, key, member):
+        return self.data.get(key, {}).pop(member.encode(), None) is not None
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member.encode())
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+
+        return queue
+
+    def execute(self):
+        return [call(*args, **kwargs) for call, args, kwargs in self.calls]
+
+
+@pytest.mark.unit
+class TestRecordRecentVisit:
+    """Test the visits are recorded in redis and flushed once per interval"""
+
+    @patch("kardon.bgtasks.recent_visited_task.flush_recent_visits")
+    @patch("kardon.bgtasks.recent_visited_task.redis_instance")
+    def test_flush_scheduled_once_per_interval(self, mock_redis, mock_flush):
+        pipe = MagicMock()
+        pipe.execute.side_effect = [[1, 0, True, 1, True], [0, 0, True, 0, None]]
+        mock_redis.return_value.pipeline.return_value = pipe
+
+        record_recent_visit("issue", "issue-id", "user-id", "project-id", "slug")
+        record_recent_visit("issue", "issue-id", "user-id", "project-id", "slug")
+
+        key, mapping = pipe.zadd.call_args.args
+        assert key == "recent_visits:slug:user-id"
+        assert list(mapping) == ["issue:issue-id:project-id"]
+        pipe.zremrangebyrank.assert_called_with("recent_visits:slug:user-id", 0, -(MAX_RECENT_VISITS + 1))
+        assert mock_flush.apply_async.call_count == 1
+
+    @patch("kardon.bgtasks.recent_visited_task.log_exception")
+    @patch("kardon.bgtasks.recent_visited_task.redis_instance")
+    def test_redis_failure_does_not_fail_the_request(self, mock_redis, mock_log):
+        mock_redis.side_effect = ConnectionError("redis is down")
+
+        record_recent_visit("issue", "issue-id", "user-id", "project-id", "slug")
+
+        mock_log.assert_called_once()
+
+
+@pytest.mark.unit
+class TestFlushRecentVisits:
+    """Test the sorted sets are written to the database in bulk"""
+
+    @pytest.fixture
+    def project_id(self, workspace):
+        return Project.objects.create(name="Project", identifier="PR", workspace=workspace).id
+
+    @pytest.mark.django_db
+    def test_visits_upserted(self, workspace, create_user, project_id):
+        visited_issue = uuid4()
+        existing = UserRecentVisit.objects.create(
+            entity_name="project",
+            entity_identifier=project_id,
+            project_id=project_id,
+            user=create_user,
+            workspace=workspace,
+        )
+        visited_at = (timezone.now() + timedelta(minutes=5)).timestamp()
+        key = f"recent_visits:{workspace.slug}:{create_user.id}"
+        members = [
+            (get_recent_visit_member("project", project_id, project_id).encode(), visited_at),
+            (get_recent_visit_member("issue", visited_issue, project_id).encode(), visited_at),
+        ]
+
+        with patch("kardon.bgtasks.recent_visited_task.redis_instance") as mock_redis:
+            pipe = MagicMock()
+            pipe.execute.side_effect = [[{key.encode()}, 2], [members]]
+            mock_redis.return_value.pipeline.return_value = pipe
+            flush_recent_visits()
+
+        existing.refresh_from_db()
+        assert existing.visited_at.timestamp() == pytest.approx(visited_at)
+        assert UserRecentVisit.objects.filter(user=create_user, entity_identifier=visited_issue).exists()
+        assert UserRecentVisit.objects.filter(user=create_user).count() == 2
+
+    @pytest.mark.django_db
+    def test_unflushed_visits_listed_first(self, workspace, create_user, project_id):
+        UserRecentVisit.objects.create(
+            entity_name="project",
+            entity_identifier=project_id,
+            project_id=project_id,
+            user=create_user,
+            workspace=workspace,
+        )
+        visited_issue = uuid4()
+        member = get_recent_visit_member("issue", visited_issue, project_id).encode()
+
+        with patch("kardon.utils.recent_visit.redis_instance") as mock_redis:
+            mock_redis.return_value.zrevrange.return_value = [
+                (member, (timezone.now() + timedelta(minutes=1)).timestamp())
+            ]
+            visits = get_recent_visits(workspace.slug, create_user)
+
+        assert [(visit.entity_name, str(visit.entity_identifier)) for visit in visits] == [
+            ("issue", str(visited_issue)),
+            ("project", str(project_id)),
+        ]
+
+    @pytest.mark.django_db
+    def test_entity_deleted_before_flush(self, workspace, create_user, project_id):
+        issue_id = uuid4()
+        redis = FakeRedis()
+
+        with (
+            patch("kardon.bgtasks.recent_visited_task.redis_instance", return_value=redis),
+            patch("kardon.utils.recent_visit.redis_instance", return_value=redis),
+        ):
+            with patch("kardon.bgtasks.recent_visited_task.flush_recent_visits"):
+                record_recent_visit("issue", issue_id, create_user.id, project_id, workspace.slug)
+            remove_recent_visits(workspace.slug, "issue", issue_id, project_id)
+            flush_recent_visits()
+            visits = get_recent_visits(workspace.slug, create_user)
+
+        assert not UserRecentVisit.objects.filter(entity_identifier=issue_id).exists()
+        assert visits == []
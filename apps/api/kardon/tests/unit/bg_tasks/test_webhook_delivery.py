@@ -0,0 +1,106 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import hashlib
+import hmac
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from kardon.bgtasks.webhook_task import deliver_webhook, get_webhook_headers, get_webhook_session
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    """Record the deliveries and the client port they came from"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.deliveries.append(
+            {"port": self.client_address[1], "headers": dict(self.headers), "body": body.decode("utf-8")}
+        )
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhookHandler)
+    server.deliveries = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook(stub_server):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        workspace_id=uuid.uuid4(),
+        url=f"http://127.0.0.1:{stub_server.server_address[1]}/hook",
+        secret_key="kardon_wh_secret",
+    )
+
+
+@pytest.mark.unit
+class TestWebhookDelivery:
+    """Test the pooled and batched webhook delivery"""
+
+    def test_session_is_reused(self):
+        """Test the worker keeps a single pooled session"""
+        assert get_webhook_session() is get_webhook_session()
+
+    @patch("kardon.bgtasks.webhook_task.save_webhook_log")
+    def test_deliveries_share_the_connection(self, mock_log, stub_server, webhook):
+        """Test consecutive deliveries to a host reuse the kept alive connection"""
+        for _ in range(5):
+            payload = {"event": "issue", "webhook_id": str(webhook.id)}
+            deliver_webhook(
+                webhook=webhook,
+                headers=get_webhook_headers(webhook=webhook, event="issue", payload=payload),
+                payload=payload,
+                action="update",
+                event="issue",
+                retry_count=0,
+            )
+
+        assert len(stub_server.deliveries) == 5
+        assert len({delivery["port"] for delivery in stub_server.deliveries}) == 1
+        assert mock_log.call_count == 5
+
+    @patch("kardon.bgtasks.webhook_task.save_webhook_log")
+    def test_batch_is_one_signed_array(self, mock_log, stub_server, webhook):
+        """Test a batch is posted once as a signed array and logged with its stats"""
+        payloads = [{"event": "issue", "data": {"id": str(index)}} for index in range(3)]
+
+        deliver_webhook(
+            webhook=webhook,
+            headers=get_webhook_headers(webhook=webhook, event="batch", payload=payloads),
+            payload=payloads,
+            action="batch",
+            event="batch",
+            retry_count=0,
+            event_count=len(payloads),
+        )
+
+        [delivery] = stub_server.deliveries
+        assert json.loads(delivery["body"]) == payloads
+        signature = hmac.new(webhook.secret_key.encode("utf-8"), delivery["body"].encode("utf-8"), hashlib.sha256)
+        assert delivery["headers"]["X-Kardon-Signature"] == signature.hexdigest()
+        assert mock_log.call_args.kwargs["event_count"] == 3
+        assert mock_log.call_args.kwargs["response_status"] == 200
+        assert mock_log.call_args.kwargs["response_time_ms"] is not None
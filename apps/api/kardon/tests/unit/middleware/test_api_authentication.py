@@ -0,0 +1,104 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+
+from kardon.api.middleware.api_authentication import APIKeyAuthentication
+from kardon.bgtasks.api_token_task import track_api_token_last_used
+from kardon.db.models import APIToken
+
+
+@pytest.mark.unit
+@patch("kardon.api.middleware.api_authentication.track_api_token_last_used")
+class TestCachedAPIKeyAuthentication:
+    """Test the API tokens are validated from the cache without writing on every request"""
+
+    @pytest.mark.django_db
+    def test_token_read_from_cache(self, mock_track, api_token, locmem_cache):
+        """Test a cached token only loads the user and buffers its last use"""
+        authentication = APIKeyAuthentication()
+        authentication.validate_api_token(api_token.token)
+
+        with CaptureQueriesContext(connection) as queries:
+            user, token = authentication.validate_api_token(api_token.token)
+
+        assert len(queries) == 1
+        assert user == api_token.user
+        assert token == api_token.token
+        mock_track.assert_called_with(api_token.id)
+        api_token.refresh_from_db()
+        assert api_token.last_used is None
+
+    @pytest.mark.django_db
+    def test_unknown_token_cached(self, mock_track, locmem_cache):
+        """Test an unknown token is rejected from the cache on the next attempt"""
+        authentication = APIKeyAuthentication()
+        with pytest.raises(AuthenticationFailed):
+            authentication.validate_api_token("kardon_api_unknown")
+
+        with CaptureQueriesContext(connection) as queries:
+            with pytest.raises(AuthenticationFailed):
+                authentication.validate_api_token("kardon_api_unknown")
+
+        assert len(queries) == 0
+        mock_track.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_revoked_token_rejected(self, mock_track, api_token, locmem_cache):
+        """Test deactivating a cached token drops it from the cache"""
+        authentication = APIKeyAuthentication()
+        authentication.validate_api_token(api_token.token)
+
+        api_token.is_active = False
+        api_token.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authentication.validate_api_token(api_token.token)
+
+    @pytest.mark.django_db
+    def test_expired_token_rejected(self, mock_track, api_token, locmem_cache):
+        """Test a cached token is rejected once it expires"""
+        authentication = APIKeyAuthentication()
+        APIToken.objects.filter(pk=api_token.pk).update(expired_at=timezone.now() + timedelta(seconds=1))
+        authentication.validate_api_token(api_token.token)
+
+        with patch("kardon.utils.api_token.timezone.now", return_value=timezone.now() + timedelta(minutes=1)):
+            with pytest.raises(AuthenticationFailed):
+                authentication.validate_api_token(api_token.token)
+
+
+@pytest.mark.unit
+class TestTrackLastUsed:
+    """Test the last uses are coalesced into one scheduled flush"""
+
+    @patch("kardon.bgtasks.api_token_task.flush_api_token_last_used")
+    @patch("kardon.bgtasks.api_token_task.redis_instance")
+    def test_flush_scheduled_once_per_interval(self, mock_redis, mock_flush):
+        """Test only the first use of an interval schedules the flush"""
+        pipe = MagicMock()
+        pipe.execute.side_effect = [[1, True], [0, None]]
+        mock_redis.return_value.pipeline.return_value = pipe
+
+        track_api_token_last_used("token-id")
+        track_api_token_last_used("token-id")
+
+        assert pipe.hset.call_count == 2
+        assert mock_flush.apply_async.call_count == 1
+
+    @patch("kardon.bgtasks.api_token_task.log_exception")
+    @patch("kardon.bgtasks.api_token_task.redis_instance")
+    def test_redis_failure_does_not_fail_the_request(self, mock_redis, mock_log):
+        """Test an unreachable redis only logs the lost last use"""
+        mock_redis.side_effect = ConnectionError("redis is down")
+
+        track_api_token_last_used("token-id")
+
+        mock_log.assert_called_once()
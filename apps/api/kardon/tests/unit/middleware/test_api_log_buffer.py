@@ -0,0 +1,113 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.http import HttpResponse
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from kardon.middleware.logger import APITokenLogMiddleware
+from kardon.utils.api_log_buffer import APILogBuffer, get_log_body, get_log_headers
+
+
+def make_buffer(ship=None, batch_size=2, max_size=4):
+    return APILogBuffer(ship=ship or MagicMock(), batch_size=batch_size, flush_interval=0, max_size=max_size)
+
+
+@pytest.mark.unit
+class TestLogBody:
+    """Test the bodies are cut to the byte limit"""
+
+    def test_small_body_kept(self):
+        assert get_log_body(b'{"name": "issue"}', 1024) == ('{"name": "issue"}', False)
+
+    def test_large_body_truncated(self):
+        body, truncated = get_log_body(b"a" * 100, 10)
+        assert truncated is True
+        assert body == "a" * 10 + "...[truncated 90 bytes]"
+
+    def test_truncation_inside_a_character(self):
+        """Test a character cut by the limit is left out instead of failing the decode"""
+        body, truncated = get_log_body("aé".encode(), 2)
+        assert truncated is True
+        assert body.startswith("a...")
+
+    def test_binary_body(self):
+        assert get_log_body(b"%PDF-1.4", 1024) == ("[Binary Content]", False)
+
+    def test_credentials_removed_from_headers(self):
+        headers = get_log_headers({"X-Api-Key": "kardon_api_secret", "Content-Type": "application/json"})
+        assert "kardon_api_secret" not in headers
+        assert "application/json" in headers
+
+
+@pytest.mark.unit
+class TestAPILogBuffer:
+    """Test the logs are shipped in batches and dropped once the buffer is full"""
+
+    def test_full_batch_shipped(self):
+        ship = MagicMock()
+        log_buffer = make_buffer(ship)
+
+        log_buffer.add({"path": "/1"})
+        ship.assert_not_called()
+        log_buffer.add({"path": "/2"})
+
+        ship.assert_called_once_with([{"path": "/1"}, {"path": "/2"}])
+        assert log_buffer.get_metrics() == {"shipped": 2, "buffered": 0}
+
+    def test_logs_dropped_when_full(self):
+        """Test a failing shipment keeps the buffer bounded and counts the drops"""
+        log_buffer = make_buffer(MagicMock(side_effect=ConnectionError("broker is down")), max_size=2)
+
+        with patch("kardon.utils.api_log_buffer.log_exception"):
+            with patch.object(log_buffer, "flush"):
+                assert log_buffer.add({"path": "/1"}) is True
+                assert log_buffer.add({"path": "/2"}) is True
+                assert log_buffer.add({"path": "/3"}) is False
+            log_buffer.flush()
+
+        assert log_buffer.get_metrics() == {"dropped": 3, "buffered": 0}
+
+
+@pytest.mark.unit
+class TestAPITokenLogMiddleware:
+    """Test the middleware buffers the logs according to the body policy"""
+
+    def process(self, response, log_buffer, api_key="kardon_api_test"):
+        headers = {"HTTP_X_API_KEY": api_key} if api_key else {}
+        request = APIRequestFactory().post("/api/v1/workspaces/", data=b"x" * 100, content_type="text/plain", **headers)
+        request.user = None
+        with patch("kardon.middleware.logger.get_api_log_buffer", return_value=log_buffer):
+            APITokenLogMiddleware(lambda request: response).process_request(request, response, request.body)
+
+    @override_settings(API_LOG_BODY_MAX_BYTES=10, API_LOG_BODY_SAMPLE_RATE=1.0)
+    def test_request_logged_with_truncated_bodies(self):
+        log_buffer = make_buffer(batch_size=10)
+        self.process(HttpResponse(b"y" * 100), log_buffer)
+
+        (log,) = log_buffer.logs
+        assert log["body"].startswith("x" * 10 + "...")
+        assert log["response_body"].startswith("y" * 10 + "...")
+        assert "kardon_api_test" not in log["headers"]
+        assert log_buffer.counts["truncated"] == 1
+
+    @override_settings(API_LOG_BODY_SAMPLE_RATE=0.0)
+    def test_bodies_sampled_out(self):
+        """Test the unsampled successful requests are logged without bodies, failed ones keep them"""
+        log_buffer = make_buffer(batch_size=10)
+        self.process(HttpResponse(b"ok"), log_buffer)
+        self.process(HttpResponse(b"error", status=400), log_buffer)
+
+        success, failure = log_buffer.logs
+        assert success["body"] is None and success["response_body"] is None
+        assert failure["response_body"] == "error"
+        assert log_buffer.counts["sampled_out"] == 1
+
+    def test_request_without_api_key(self):
+        log_buffer = make_buffer()
+        self.process(HttpResponse(b"ok"), log_buffer, api_key=None)
+        assert log_buffer.logs == []
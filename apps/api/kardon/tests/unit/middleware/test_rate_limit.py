@@ -0,0 +1,74 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from kardon.api.rate_limit import ApiKeyRateThrottle, ServiceTokenRateThrottle
+
+
+def make_request(api_key="kardon_api_test"):
+    headers = {"HTTP_X_API_KEY": api_key} if api_key else {}
+    return APIRequestFactory().get("/api/v1/workspaces/", **headers)
+
+
+@pytest.mark.unit
+class TestRedisRateThrottle:
+    """Test the throttles make a single script call and expose the rate limit headers"""
+
+    @patch("kardon.api.rate_limit.get_gcra_script")
+    def test_allowed_request_sets_headers(self, mock_script):
+        """Test an allowed request carries the remaining requests and the reset time"""
+        script = MagicMock(return_value=[1, 59, "1.0", "0"])
+        mock_script.return_value = script
+        request = make_request()
+
+        assert ApiKeyRateThrottle().allow_request(request, None) is True
+        assert request.META["X-RateLimit-Remaining"] == 59
+        assert "X-RateLimit-Reset" in request.META
+
+        script.assert_called_once()
+        assert script.call_args.kwargs["args"] == [1.0, 60]
+        assert "kardon_api_test" not in script.call_args.kwargs["keys"][0]
+
+    @patch("kardon.api.rate_limit.get_gcra_script")
+    def test_throttled_request_waits(self, mock_script):
+        """Test a throttled request reports when it can be retried"""
+        mock_script.return_value = MagicMock(return_value=[0, 0, "60.0", "0.2"])
+        request = make_request()
+        throttle = ServiceTokenRateThrottle()
+
+        assert throttle.allow_request(request, None) is False
+        assert throttle.wait() == 0.2
+        assert request.META["X-RateLimit-Remaining"] == 0
+
+    @patch("kardon.api.rate_limit.get_gcra_script")
+    def test_scopes_use_separate_keys(self, mock_script):
+        """Test the api key and the service token limits are counted apart"""
+        script = MagicMock(return_value=[1, 1, "1.0", "0"])
+        mock_script.return_value = script
+
+        ApiKeyRateThrottle().allow_request(make_request(), None)
+        ServiceTokenRateThrottle().allow_request(make_request(), None)
+
+        first, second = (call.kwargs["keys"][0] for call in script.call_args_list)
+        assert first.startswith("throttle:api_key:")
+        assert second.startswith("throttle:service_token:")
+
+    @patch("kardon.api.rate_limit.get_gcra_script")
+    def test_request_without_api_key(self, mock_script):
+        """Test requests without an API key are not throttled"""
+        assert ApiKeyRateThrottle().allow_request(make_request(api_key=None), None) is True
+        mock_script.assert_not_called()
+
+    @patch("kardon.api.rate_limit.log_exception")
+    @patch("kardon.api.rate_limit.get_gcra_script")
+    def test_redis_failure_lets_requests_through(self, mock_script, mock_log):
+        """Test an unreachable redis does not fail the request"""
+        mock_script.return_value = MagicMock(side_effect=ConnectionError("redis is down"))
+
+        assert ApiKeyRateThrottle().allow_request(make_request(), None) is True
+        mock_log.assert_called_once()
@@ -0,0 +1,70 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from kardon.space.utils.cache import cache_anchor_response
+from kardon.utils.cache import bump_project_data_version
+
+
+class BoardView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    calls = 0
+
+    @cache_anchor_response()
+    def get(self, request, anchor):
+        BoardView.calls += 1
+        return Response({"issues": [str(uuid4())]})
+
+
+@pytest.mark.unit
+class TestCacheAnchorResponse:
+    """Test the published board responses are shared, versioned and revalidated"""
+
+    @pytest.fixture(autouse=True)
+    def project_id(self, locmem_cache):
+        BoardView.calls = 0
+        project_id = uuid4()
+        with patch("kardon.space.utils.cache.DeployBoard") as deploy_board:
+            deploy_board.objects.filter.return_value.values_list.return_value.first.return_value = project_id
+            yield project_id
+
+    def get(self, query="", **headers):
+        request = APIRequestFactory().get(f"/api/public/anchor/board/issues/{query}", **headers)
+        return BoardView.as_view()(request, anchor="board")
+
+    def test_visitors_share_the_response(self):
+        first = self.get("?group_by=state_id&order_by=-created_at")
+        second = self.get("?order_by=-created_at&group_by=state_id")
+
+        assert BoardView.calls == 1
+        assert first.data == second.data
+        assert first["ETag"] == second["ETag"]
+
+    def test_matching_etag_not_modified(self):
+        etag = self.get()["ETag"]
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert BoardView.calls == 1
+
+    def test_data_version_bump_invalidates(self, project_id):
+        first = self.get()
+
+        bump_project_data_version(project_id)
+        second = self.get(HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert BoardView.calls == 2
+        assert second.status_code == 200
+        assert second["ETag"] != first["ETag"]
@@ -0,0 +1,118 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from kardon.db.models import (
+    Cycle,
+    CycleBurndownSnapshot,
+    CycleIssue,
+    Estimate,
+    EstimatePoint,
+    Issue,
+    Project,
+    State,
+)
+from kardon.utils.analytics_plot import burndown_plot
+from kardon.utils.burndown import calculate_burndown, get_cycle_burndown, get_date_range
+
+
+@pytest.mark.unit
+class TestDateRange:
+    """Test the dates of the burndown series"""
+
+    def test_both_ends_included(self):
+        """Test the range includes the start and the end date"""
+        assert get_date_range(date(2024, 1, 30), date(2024, 2, 2)) == [
+            date(2024, 1, 30),
+            date(2024, 1, 31),
+            date(2024, 2, 1),
+            date(2024, 2, 2),
+        ]
+
+    def test_missing_dates(self):
+        """Test a cycle or module without dates has no series"""
+        assert get_date_range(None, date(2024, 1, 1)) == []
+
+
+@pytest.mark.unit
+class TestCycleBurndown:
+    """Test the burndown is calculated from the completions and served from the snapshots"""
+
+    @pytest.fixture
+    def cycle(self, workspace, create_user):
+        today = timezone.now().date()
+        start_date = today - timedelta(days=4)
+        project = Project.objects.create(name="Burndown Project", identifier="BP", workspace=workspace)
+        cycle = Cycle.objects.create(
+            name="Cycle",
+            project=project,
+            owned_by=create_user,
+            start_date=datetime.combine(start_date, datetime.min.time(), tzinfo=dt_timezone.utc),
+            end_date=datetime.combine(today + timedelta(days=2), datetime.min.time(), tzinfo=dt_timezone.utc),
+        )
+        estimate = Estimate.objects.create(name="Points", type="points", project=project)
+        completed = State.objects.create(name="Done", group="completed", project=project)
+        started = State.objects.create(name="Doing", group="started", project=project)
+
+        # Two issues completed on the second and the fourth day, one still open
+        issues = [(completed, 2, 1), (completed, 3, 3), (started, 5, None)]
+        for index, (state, point, completed_day) in enumerate(issues):
+            issue = Issue.objects.create(
+                name=f"Issue {index}",
+                project=project,
+                state=state,
+                estimate_point=EstimatePoint.objects.create(
+                    estimate=estimate, key=index, value=str(point), project=project
+                ),
+                sequence_id=index + 1,
+            )
+            Issue.objects.filter(pk=issue.pk).update(
+                completed_at=(
+                    datetime.combine(start_date + timedelta(days=completed_day), datetime.min.time(), dt_timezone.utc)
+                    + timedelta(hours=12)
+                    if completed_day is not None
+                    else None
+                )
+            )
+            CycleIssue.objects.create(cycle=cycle, issue=issue, project=project)
+        return cycle
+
+    @pytest.mark.django_db
+    def test_pending_by_day(self, cycle):
+        """Test the issues and points left at the end of every day"""
+        dates = get_date_range(cycle.start_date.date(), cycle.start_date.date() + timedelta(days=3))
+        burndown = calculate_burndown("issue_cycle", "cycle", cycle.id, dates)
+
+        assert [burndown[day]["pending_issues"] for day in dates] == [3, 2, 2, 1]
+        assert [burndown[day]["pending_estimate_points"] for day in dates] == [10, 8, 8, 5]
+        assert burndown[dates[0]]["total_estimate_points"] == 10
+
+    @pytest.mark.django_db
+    def test_past_days_are_snapshotted(self, cycle):
+        """Test the past days are stored once and then read from the snapshots"""
+        dates = get_date_range(cycle.start_date.date(), cycle.end_date.date())
+        get_cycle_burndown(cycle.id, dates)
+        assert CycleBurndownSnapshot.objects.filter(cycle=cycle).count() == 4
+
+        with CaptureQueriesContext(connection) as queries:
+            get_cycle_burndown(cycle.id, dates)
+
+        # The snapshots and the stored progress for today
+        assert len(queries) == 2
+
+    @pytest.mark.django_db
+    def test_plot_series(self, cycle):
+        """Test the plot serves today from the progress and leaves the future empty"""
+        chart = burndown_plot(cycle, cycle.workspace.slug, cycle.project_id, "issues", cycle_id=cycle.id)
+        today = timezone.now().date()
+
+        assert len(chart) == 7
+        assert chart[str(today)] == 1
+        assert chart[str(today + timedelta(days=1))] is None
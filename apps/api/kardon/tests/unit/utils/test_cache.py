@@ -0,0 +1,92 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import pytest
+from django.core.cache import cache
+
+from kardon.utils.cache import generate_cache_key, invalidate_cache_directly
+
+
+def populate(path, user_ids):
+    """Cache one response per user for the path and return the keys"""
+    keys = {}
+    for user_id in user_ids:
+        key = generate_cache_key(path, user_id)
+        cache.set(key, {"data": user_id, "status": 200}, 60)
+        keys[user_id] = key
+    return keys
+
+
+@pytest.mark.unit
+class TestVersionedCacheInvalidation:
+    """Test the generation based invalidation of cached responses"""
+
+    def test_generate_cache_key_is_stable(self, locmem_cache):
+        """Test the key does not change until the namespace is invalidated"""
+        assert generate_cache_key("/api/users/me/", "user-1") == generate_cache_key("/api/users/me/", "user-1")
+        assert generate_cache_key("/api/users/me/", "user-1") != generate_cache_key("/api/users/me/", "user-2")
+
+    def test_multiple_invalidates_all_users_of_path(self, locmem_cache):
+        """Test invalidating without a user drops every user's entry of the path"""
+        path = "/api/workspaces/kardon/members/"
+        keys = populate(path, ["user-1", "user-2"])
+        other_keys = populate("/api/workspaces/other/members/", ["user-1"])
+
+        invalidate_cache_directly(path=path, user=False, multiple=True)
+
+        for user_id in keys:
+            assert cache.get(generate_cache_key(path, user_id)) is None
+        assert cache.get(other_keys["user-1"]) is not None
+
+    def test_multiple_invalidates_query_variants(self, locmem_cache):
+        """Test the query string variants of a path share its namespace"""
+        path = "/api/workspaces/kardon/labels/"
+        key = generate_cache_key(f"{path}?project_id=1")
+        cache.set(key, {"data": [], "status": 200}, 60)
+
+        invalidate_cache_directly(path="workspaces/kardon/labels/", user=False, multiple=True)
+
+        assert generate_cache_key(f"{path}?project_id=1") != key
+
+    def test_multiple_with_user_keeps_other_users(self, locmem_cache):
+        """Test a user scoped invalidation leaves the other users' entries alone"""
+        path = "/api/users/me/workspaces/"
+        keys = populate(path, ["user-1", "user-2"])
+        request = type("Request", (), {"user": type("User", (), {"id": "user-1", "is_anonymous": False})()})()
+
+        invalidate_cache_directly(path=path, request=request, multiple=True)
+
+        assert generate_cache_key(path, "user-1") != keys["user-1"]
+        assert cache.get(generate_cache_key(path, "user-2")) is not None
+
+    def test_single_invalidation_deletes_key(self, locmem_cache):
+        """Test the non multiple invalidation deletes the current key"""
+        path = "/api/instances/"
+        key = generate_cache_key(path)
+        cache.set(key, {"data": {}, "status": 200}, 60)
+
+        invalidate_cache_directly(path=path, user=False)
+
+        assert cache.get(key) is None
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestCacheInvalidationBenchmark:
+    """Benchmark the invalidation cost against the size of the keyspace"""
+
+    @pytest.mark.parametrize("keyspace_size", [100, 1000, 10000])
+    def test_invalidation_cost_is_constant(self, locmem_cache, keyspace_size, mocker):
+        """Test invalidating a namespace issues the same cache calls whatever the keyspace size"""
+        path = "/api/workspaces/kardon/members/"
+        populate(path, [f"user-{index}" for index in range(keyspace_size)])
+        set_many = mocker.spy(cache, "set_many")
+        delete_many = mocker.spy(cache, "delete_many")
+
+        invalidate_cache_directly(path=path, user=False, multiple=True)
+
+        assert set_many.call_count == 1
+        assert len(set_many.call_args.args[0]) == 1
+        assert delete_many.call_count == 0
+        assert cache.get(generate_cache_key(path, "user-0")) is None
@@ -0,0 +1,96 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from unittest.mock import patch
+
+import pytest
+
+from kardon.license.utils import instance_value
+from kardon.license.utils.instance_value import get_configuration_value, invalidate_instance_configuration_cache
+
+
+class FakeRedis:
+    """Hold the version keys shared by the processes"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+        return int(self.values[key])
+
+
+@pytest.mark.unit
+class TestInstanceConfigurationCache:
+    """Test the configuration is read from the process cache until its version moves"""
+
+    @pytest.fixture(autouse=True)
+    def rows(self, settings):
+        settings.SKIP_ENV_VAR = True
+        settings.INSTANCE_CONFIGURATION_CACHE_TTL = 60
+        rows = [
+            {"key": "EMAIL_HOST", "value": "smtp.kardon.so", "is_encrypted": False},
+            {"key": "EMAIL_HOST_PASSWORD", "value": "encrypted", "is_encrypted": True},
+        ]
+        redis = FakeRedis()
+        instance_value._configuration_cache.update(pid=None, version=None, checked_at=0.0, values=None)
+        with (
+            patch.object(instance_value, "redis_instance", return_value=redis),
+            patch.object(instance_value, "decrypt_data", side_effect=lambda value: f"decrypted {value}"),
+            patch.object(instance_value.InstanceConfiguration.objects, "values", return_value=rows) as values,
+        ):
+            self.values = values
+            yield rows
+
+    def get(self):
+        return get_configuration_value(
+            [
+                {"key": "EMAIL_HOST", "default": None},
+                {"key": "EMAIL_HOST_PASSWORD", "default": None},
+                {"key": "EMAIL_PORT", "default": 587},
+            ]
+        )
+
+    def test_repeated_lookups_read_once(self):
+        for _ in range(3):
+            assert self.get() == ("smtp.kardon.so", "decrypted encrypted", 587)
+
+        assert self.values.call_count == 1
+
+    def test_version_bump_reloads(self, rows, settings):
+        self.get()
+        rows[0]["value"] = "smtp.example.com"
+        settings.INSTANCE_CONFIGURATION_CACHE_TTL = 0
+
+        # Past the TTL an unchanged version keeps the loaded values
+        assert self.get()[0] == "smtp.kardon.so"
+
+        invalidate_instance_configuration_cache()
+        assert self.get()[0] == "smtp.example.com"
+        assert self.values.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestInstanceConfigurationCacheBenchmark:
+    """Benchmark the cached lookups against reading the rows on every call"""
+
+    def test_lookups(self, settings):
+        settings.SKIP_ENV_VAR = True
+        settings.INSTANCE_CONFIGURATION_CACHE_TTL = 60
+        rows = [{"key": f"KEY_{index}", "value": str(index), "is_encrypted": False} for index in range(50)]
+        keys = [{"key": f"KEY_{index}", "default": None} for index in range(0, 50, 5)]
+        instance_value._configuration_cache.update(pid=None, version=None, checked_at=0.0, values=None)
+
+        with (
+            patch.object(instance_value, "redis_instance", return_value=FakeRedis()),
+            patch.object(instance_value.InstanceConfiguration.objects, "values", return_value=rows) as values,
+        ):
+            for _ in range(10000):
+                get_configuration_value(keys)
+
+        assert values.call_count == 1
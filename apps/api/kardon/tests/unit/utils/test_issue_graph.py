@@ -0,0 +1,111 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import time
+
+import pytest
+
+from kardon.db.models import Issue, IssueRelation, Project
+from kardon.utils.issue_graph import creates_cycle, get_critical_path, get_longest_path, get_transitive_issue_ids
+
+
+@pytest.mark.unit
+class TestLongestPath:
+    """Test the heaviest path of the dependency graph"""
+
+    def test_heaviest_branch_wins(self):
+        edges = [("a", "b"), ("b", "d"), ("a", "c"), ("c", "d")]
+        assert get_longest_path(edges, {"a": 1, "b": 5, "c": 2, "d": 1}) == (["a", "b", "d"], 7)
+
+    def test_cycles_left_out(self):
+        edges = [("a", "b"), ("b", "c"), ("c", "b")]
+        assert get_longest_path(edges, {}) == (["a"], 1)
+
+
+@pytest.mark.unit
+class TestIssueGraph:
+    """Test the recursive walks over the issue relations"""
+
+    @pytest.fixture
+    def project(self, workspace):
+        return Project.objects.create(name="Project", identifier="PR", workspace=workspace)
+
+    @pytest.fixture
+    def issues(self, workspace, project):
+        return [Issue.objects.create(name=f"Issue {index}", workspace=workspace, project=project) for index in range(4)]
+
+    def relate(self, project, issue, related_issue, relation_type):
+        IssueRelation.objects.create(
+            issue=issue, related_issue=related_issue, relation_type=relation_type, project=project
+        )
+
+    @pytest.mark.django_db
+    def test_everything_blocked_recursively(self, project, issues):
+        # Each issue is blocked by the one before it
+        for blocker, blocked in zip(issues, issues[1:]):
+            self.relate(project, blocked, blocker, "blocked_by")
+
+        assert get_transitive_issue_ids(issues[0].id, "blocking") == {str(issue.id) for issue in issues[1:]}
+        assert get_transitive_issue_ids(issues[3].id, "blocked_by") == {str(issue.id) for issue in issues[:3]}
+
+    @pytest.mark.django_db
+    def test_cycle_detected(self, project, issues):
+        self.relate(project, issues[0], issues[1], "start_before")
+        self.relate(project, issues[2], issues[1], "blocked_by")
+
+        assert creates_cycle(issues[2].id, issues[0].id)
+        assert not creates_cycle(issues[0].id, issues[2].id)
+        assert creates_cycle(issues[3].id, issues[3].id)
+
+    @pytest.mark.django_db
+    def test_critical_path_runs_through_issue(self, project, issues):
+        self.relate(project, issues[0], issues[1], "start_before")
+        self.relate(project, issues[1], issues[2], "finish_before")
+        self.relate(project, issues[3], issues[2], "start_before")
+
+        path, duration = get_critical_path(issues[1].id)
+
+        assert path == [str(issues[0].id), str(issues[1].id), str(issues[2].id)]
+        assert duration == 3
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestIssueGraphBenchmark:
+    """Benchmark the recursive walks on a project with 100k relations"""
+
+    @pytest.mark.django_db
+    def test_walks_on_large_project(self, workspace):
+        project = Project.objects.create(name="Project", identifier="PR", workspace=workspace)
+        issues = Issue.objects.bulk_create(
+            [
+                Issue(name=f"Issue {index}", workspace=workspace, project=project, sequence_id=index)
+                for index in range(50000)
+            ],
+            batch_size=5000,
+        )
+        # Two dependencies per issue on later issues, no cycle
+        IssueRelation.objects.bulk_create(
+            [
+                IssueRelation(
+                    issue=issues[index],
+                    related_issue=issues[index + step],
+                    relation_type="start_before",
+                    project=project,
+                    workspace=workspace,
+                )
+                for index in range(len(issues) - 1)
+                for step in (1, 7)
+                if index + step < len(issues)
+            ],
+            batch_size=5000,
+        )
+
+        started_at = time.perf_counter()
+        assert len(get_transitive_issue_ids(issues[49000].id, "start_before")) == 999
+        assert time.perf_counter() - started_at < 1
+
+        started_at = time.perf_counter()
+        assert not creates_cycle(issues[49999].id, issues[0].id)
+        assert time.perf_counter() - started_at < 1
@@ -0,0 +1,104 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from kardon.app.permissions import (
+    ProjectEntityPermission,
+    ProjectMemberPermission,
+    WorkspaceEntityPermission,
+    allow_permission,
+    ROLE,
+)
+from kardon.utils.membership import get_project_role, get_workspace_role, invalidate_membership_cache
+
+PROJECT_ID = uuid.uuid4()
+
+
+def membership(workspace_role=ROLE.MEMBER.value, project_role=ROLE.MEMBER.value):
+    projects = {str(PROJECT_ID): project_role} if project_role is not None else {}
+    return {
+        "workspace_role": workspace_role,
+        "projects": projects,
+        "identifiers": {"TP": project_role} if project_role is not None else {},
+    }
+
+
+def make_request(method="GET", user_id=None):
+    user = SimpleNamespace(id=user_id or uuid.uuid4(), is_anonymous=False)
+    return SimpleNamespace(method=method, user=user, _request=SimpleNamespace())
+
+
+@pytest.mark.unit
+class TestMembershipResolver:
+    """Test the roles are loaded once per request and shared by the permission checks"""
+
+    @patch("kardon.utils.membership.load_workspace_membership", return_value=membership())
+    def test_roles_loaded_once_per_request(self, mock_load):
+        """Test the decorator and the permission classes share one load"""
+        request = make_request()
+        view = SimpleNamespace(workspace_slug="kardon", project_id=PROJECT_ID, project_identifier=None)
+
+        assert ProjectEntityPermission().has_permission(request, view)
+        assert ProjectMemberPermission().has_permission(request, view)
+        assert WorkspaceEntityPermission().has_permission(request, view)
+
+        @allow_permission([ROLE.ADMIN, ROLE.MEMBER])
+        def list_issues(instance, request, slug, project_id):
+            return "ok"
+
+        assert list_issues(None, request, slug="kardon", project_id=PROJECT_ID) == "ok"
+        assert mock_load.call_count == 1
+
+    @patch("kardon.utils.membership.load_workspace_membership", return_value=membership())
+    def test_roles_not_shared_across_requests(self, mock_load):
+        """Test every request loads its own roles when the cache is disabled"""
+        get_workspace_role(make_request(), "kardon")
+        get_workspace_role(make_request(), "kardon")
+        assert mock_load.call_count == 2
+
+    @patch(
+        "kardon.utils.membership.load_workspace_membership",
+        return_value=membership(workspace_role=ROLE.ADMIN.value, project_role=ROLE.GUEST.value),
+    )
+    def test_workspace_admin_in_project_allowed(self, mock_load):
+        """Test a workspace admin who is a project guest passes a member check"""
+
+        @allow_permission([ROLE.ADMIN, ROLE.MEMBER])
+        def update_issue(instance, request, slug, project_id):
+            return "ok"
+
+        assert update_issue(None, make_request("PATCH"), slug="kardon", project_id=PROJECT_ID) == "ok"
+
+    @patch("kardon.utils.membership.load_workspace_membership", return_value=membership(project_role=None))
+    def test_non_project_member_denied(self, mock_load):
+        """Test a workspace member outside the project is denied"""
+        request = make_request("PATCH")
+        view = SimpleNamespace(workspace_slug="kardon", project_id=PROJECT_ID, project_identifier=None)
+        assert get_project_role(request, "kardon", PROJECT_ID) is None
+        assert not ProjectEntityPermission().has_permission(request, view)
+
+
+@pytest.mark.unit
+class TestMembershipCache:
+    """Test the optional cache shared across requests"""
+
+    @override_settings(MEMBERSHIP_CACHE_TIMEOUT=60)
+    @patch("kardon.utils.membership.load_workspace_membership", return_value=membership())
+    def test_roles_cached_until_invalidated(self, mock_load, locmem_cache):
+        """Test the roles are reused across requests until the membership changes"""
+        user_id = uuid.uuid4()
+
+        get_workspace_role(make_request(user_id=user_id), "kardon")
+        get_workspace_role(make_request(user_id=user_id), "kardon")
+        assert mock_load.call_count == 1
+
+        invalidate_membership_cache([user_id])
+        get_workspace_role(make_request(user_id=user_id), "kardon")
+        assert mock_load.call_count == 2
@@ -0,0 +1,128 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.utils import timezone
+
+from kardon.db.models import Page, PageVersion
+from kardon.utils.delta import apply_delta, create_delta
+from kardon.utils.page_version import (
+    MAX_PAGE_VERSIONS,
+    encode_page_delta,
+    get_content_fields,
+    load_page_version,
+    rebuild_page_content,
+    save_page_version,
+)
+
+
+def make_html(paragraphs):
+    return "".join(f"<p>Paragraph {index} with some text ✓</p>\n" for index in range(paragraphs))
+
+
+@pytest.mark.unit
+class TestDelta:
+    """Test the deltas rebuild the target byte for byte"""
+
+    @pytest.mark.parametrize(
+        "source,target",
+        [
+            (b"", b""),
+            (b"", b"<p>new</p>"),
+            (b"<p>old</p>", b""),
+            (make_html(50).encode(), make_html(60).encode()),
+            (make_html(50).encode(), make_html(50).encode().replace(b"Paragraph 7", b"Changed")),
+            (bytes(range(256)) * 4, bytes(range(255, -1, -1)) * 4),
+        ],
+    )
+    def test_round_trip(self, source, target):
+        assert apply_delta(source, create_delta(source, target)) == target
+
+    def test_small_change_gives_small_delta(self):
+        source = make_html(500).encode()
+        target = source.replace(b"Paragraph 250", b"Edited paragraph")
+        assert len(create_delta(source, target)) < len(target) // 50
+
+
+@pytest.mark.unit
+class TestPageDelta:
+    """Test the page fields are rebuilt from the snapshot and the delta"""
+
+    def test_rebuild_page_content(self):
+        base = SimpleNamespace(
+            description_html=make_html(20),
+            description_binary=b"\x01\x02binary\x00state",
+            description_json={"type": "doc", "content": []},
+        )
+        html = make_html(21)
+        binary = b"\x01\x02binary\x00state\x03"
+        document = {"type": "doc", "content": [{"type": "paragraph"}]}
+
+        content = rebuild_page_content(
+            base.description_html,
+            base.description_binary,
+            base.description_json,
+            encode_page_delta(base, get_content_fields(html, binary, document)),
+        )
+
+        assert content["description_html"] == html
+        assert content["description_binary"] == binary
+        assert content["description_json"] == document
+        assert content["description_stripped"].startswith("Paragraph 0")
+
+    def test_missing_binary(self):
+        base = SimpleNamespace(description_html="<p>a</p>", description_binary=b"state", description_json={})
+        delta = encode_page_delta(base, get_content_fields("<p>b</p>", None, {}))
+        assert rebuild_page_content("<p>a</p>", b"state", {}, delta)["description_binary"] is None
+
+
+@pytest.mark.unit
+class TestSavePageVersion:
+    """Test the versions are coalesced, stored as deltas between snapshots and trimmed"""
+
+    @pytest.fixture(autouse=True)
+    def version_settings(self, settings):
+        settings.PAGE_VERSION_COALESCE_WINDOW = 60
+        settings.PAGE_VERSION_SNAPSHOT_INTERVAL = 3
+
+    @pytest.fixture
+    def page(self, workspace, create_user):
+        return Page.objects.create(
+            name="Page", workspace=workspace, owned_by=create_user, description_html=make_html(100)
+        )
+
+    def save(self, page, user_id, html, minutes):
+        page.description_html = html
+        page.updated_at = timezone.now() + timedelta(minutes=minutes)
+        return save_page_version(page, user_id)
+
+    @pytest.mark.django_db
+    def test_rapid_saves_coalesced(self, page, create_user):
+        self.save(page, create_user.id, make_html(101), 0)
+        version = self.save(page, create_user.id, make_html(102), 0)
+
+        assert PageVersion.objects.filter(page=page).count() == 1
+        assert load_page_version(PageVersion.objects.get(pk=version.pk)).description_html == make_html(102)
+
+    @pytest.mark.django_db
+    def test_deltas_between_snapshots(self, page, create_user):
+        versions = [self.save(page, create_user.id, make_html(100 + index), index * 5) for index in range(4)]
+
+        assert [version.base_id is None for version in versions] == [True, False, False, True]
+        for index, version in enumerate(versions):
+            version = load_page_version(PageVersion.objects.select_related("base").get(pk=version.pk))
+            assert version.description_html == make_html(100 + index)
+
+    @pytest.mark.django_db
+    def test_old_versions_trimmed(self, page, create_user):
+        for index in range(MAX_PAGE_VERSIONS + 5):
+            self.save(page, create_user.id, make_html(100 + index), index * 5)
+
+        kept = PageVersion.objects.filter(page=page)
+        assert MAX_PAGE_VERSIONS <= kept.count() <= MAX_PAGE_VERSIONS + 1
+        # Every kept delta can still be rebuilt
+        assert all(version.base_id is None or version.base.deleted_at is None for version in kept)
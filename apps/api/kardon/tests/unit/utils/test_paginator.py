@@ -0,0 +1,222 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import math
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from django.db.models import Q
+
+from kardon.db.models import Issue, Project, State
+from kardon.utils.paginator import (
+    Cursor,
+    GroupedOffsetPaginator,
+    OffsetPaginator,
+    SubGroupedOffsetPaginator,
+    cache_count,
+    keyset_filter,
+)
+
+
+@pytest.mark.unit
+class TestCursor:
+    """Test the offset and keyset cursor formats"""
+
+    def test_offset_cursor_round_trip(self):
+        """Test the legacy value:offset:is_prev cursor keeps working"""
+        cursor = Cursor.from_string("100:2:1")
+        assert cursor.value == 100
+        assert cursor.offset == 2
+        assert cursor.is_prev is True
+        assert cursor.keyset is None
+        assert str(cursor) == "100:2:1"
+
+    def test_keyset_cursor_round_trip(self):
+        """Test the keyset boundary rows survive the string encoding"""
+        created_at = datetime(2024, 1, 1, 10, 30, 15, 123456, tzinfo=timezone.utc)
+        issue_id = uuid.uuid4()
+        cursor = Cursor(50, 1, False, True, keyset=[["backlog", 65535.5, created_at, issue_id]])
+
+        decoded = Cursor.from_string(str(cursor))
+
+        assert decoded.offset == 1
+        assert decoded.keyset == [["backlog", 65535.5, str(created_at), str(issue_id)]]
+
+    def test_empty_keyset_cursor(self):
+        """Test the first keyset page cursor carries an empty keyset"""
+        cursor = Cursor(50, 0, False, keyset=[])
+        assert Cursor.from_string(str(cursor)).keyset == []
+
+    @pytest.mark.parametrize("value", ["100:0", "100:0:0:not-base64!", "100:0:0:eyJhIjogMX0"])
+    def test_invalid_cursor(self, value):
+        """Test malformed cursors are rejected"""
+        with pytest.raises(ValueError):
+            Cursor.from_string(value)
+
+
+@pytest.mark.unit
+class TestKeysetFilter:
+    """Test the keyset seek conditions"""
+
+    def test_keyset_columns_make_order_unique(self):
+        """Test the sort key is completed by created_at and id"""
+        paginator = OffsetPaginator(queryset=None, order_by="-priority_order")
+        assert paginator.get_keyset_columns() == [
+            ("priority_order", True, True),
+            ("created_at", True, False),
+            ("id", True, False),
+        ]
+
+    def test_created_at_ordering_is_not_repeated(self):
+        """Test created_at is not added twice when it is the sort key"""
+        paginator = OffsetPaginator(queryset=None, order_by="-created_at")
+        assert paginator.get_keyset_columns() == [("created_at", True, True), ("id", True, False)]
+
+    def test_after_null_boundary_only_seeks_tie_breakers(self):
+        """Test nothing sorts after a null key except the remaining null rows"""
+        columns = [("target_date", False, True), ("id", True, False)]
+        condition = keyset_filter(columns, [None, "issue-id"])
+        assert condition == Q(target_date__isnull=True) & Q(id__lt="issue-id")
+
+    def test_before_boundary_includes_non_null_keys(self):
+        """Test every non null key sorts before a null boundary"""
+        columns = [("target_date", False, True)]
+        assert keyset_filter(columns, [None], after=False) == Q(target_date__isnull=False)
+
+
+@pytest.mark.unit
+class TestCountCache:
+    """Test the counts are reused across the cursors of the same filter"""
+
+    def test_counts_reused_for_same_filter(self, locmem_cache):
+        """Test the counts are computed once per filter fingerprint"""
+        calls = []
+        project_id = uuid.uuid4()
+
+        def compute():
+            calls.append(1)
+            return {"backlog": 10}
+
+        for _ in range(3):
+            queryset = Issue.issue_objects.filter(project_id=project_id).order_by("-created_at")
+            assert cache_count(queryset, ("group_totals", "state__group"), compute) == {"backlog": 10}
+
+        assert len(calls) == 1
+
+    def test_counts_not_shared_across_filters(self, locmem_cache):
+        """Test a different filter or scope computes its own counts"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        queryset = Issue.issue_objects.filter(project_id=uuid.uuid4())
+        cache_count(queryset, ("count",), compute)
+        cache_count(queryset.filter(priority="urgent"), ("count",), compute)
+        cache_count(queryset, ("group_totals", "priority"), compute)
+
+        assert len(calls) == 3
+
+    def test_total_count_cached_by_issue_boards_only(self, locmem_cache, mocker):
+        """Test only the grouped paginators reuse the total count of the same filter"""
+        count = mocker.patch("django.db.models.QuerySet.count", return_value=3)
+        queryset = Issue.issue_objects.filter(project_id=uuid.uuid4())
+        grouped = GroupedOffsetPaginator(queryset, "state_id", [], Q())
+
+        for _ in range(2):
+            assert OffsetPaginator(queryset).get_total_count(queryset) == 3
+        assert count.call_count == 2
+
+        for _ in range(2):
+            assert grouped.get_total_count(queryset) == 3
+        assert count.call_count == 3
+
+
+@pytest.mark.unit
+class TestKeysetGroupedPagination:
+    """Test walking grouped pages forward and back with keyset cursors"""
+
+    @pytest.fixture
+    def project(self, workspace):
+        project = Project.objects.create(name="Project", identifier="PR", workspace=workspace)
+        states = [
+            State.objects.create(name=name, project=project, workspace=workspace) for name in ["Todo", "Doing", "Done"]
+        ]
+        # Groups of 2, 7 and 4 issues, so two groups run out before the last page
+        for state, size in zip(states, [2, 7, 4]):
+            for index in range(size):
+                issue = Issue.objects.create(
+                    name=f"{state.name} {index}",
+                    workspace=workspace,
+                    project=project,
+                    state=state,
+                    priority=["high", "low"][index % 2],
+                )
+                # Repeated sort orders leave the ties to the created_at and id columns
+                Issue.objects.filter(pk=issue.pk).update(sort_order=index % 3)
+        return project
+
+    def get_expected_pages(self, project, group_fields, limit):
+        """Return the ids of every page of every group, in the order of the paginator"""
+        rows = Issue.issue_objects.filter(project=project).order_by("sort_order", "-created_at", "-id")
+        groups = {}
+        for row in rows.values(*group_fields, "id"):
+            groups.setdefault(tuple(row[field] for field in group_fields), []).append(row["id"])
+        page_count = max(math.ceil(len(ids) / limit) for ids in groups.values())
+        return [
+            {issue_id for ids in groups.values() for issue_id in ids[page * limit : (page + 1) * limit]}
+            for page in range(page_count)
+        ]
+
+    def walk(self, paginator, limit, moves):
+        """Follow the moves from the first keyset page, returning the ids of every page visited"""
+        cursor = Cursor(limit, 0, False, keyset=[])
+        visited = []
+        for move in [*moves, None]:
+            result = paginator.get_result(limit=limit, cursor=cursor)
+            visited.append((cursor.offset, set(result.results.values_list("id", flat=True)), result))
+            if move is not None:
+                cursor = Cursor.from_string(str(result.next if move == "next" else result.prev))
+        return visited
+
+    @pytest.mark.django_db
+    def test_grouped_pages_forward_and_back(self, locmem_cache, project):
+        expected = self.get_expected_pages(project, ["state_id"], 3)
+        paginator = GroupedOffsetPaginator(
+            queryset=Issue.issue_objects.filter(project=project),
+            group_by_field_name="state_id",
+            group_by_fields=list(State.objects.filter(project=project).values_list("id", flat=True)),
+            count_filter=Q(),
+            order_by="sort_order",
+        )
+
+        visited = self.walk(paginator, 3, ["next", "next", "prev", "prev", "next"])
+
+        assert [offset for offset, _, _ in visited] == [0, 1, 2, 1, 0, 1]
+        for offset, ids, _ in visited:
+            assert ids == expected[offset]
+        assert not visited[2][2].next.has_results
+        assert not visited[4][2].prev.has_results
+
+    @pytest.mark.django_db
+    def test_sub_grouped_pages_forward_and_back(self, locmem_cache, project):
+        expected = self.get_expected_pages(project, ["state_id", "priority"], 1)
+        paginator = SubGroupedOffsetPaginator(
+            queryset=Issue.issue_objects.filter(project=project),
+            group_by_field_name="state_id",
+            sub_group_by_field_name="priority",
+            group_by_fields=list(State.objects.filter(project=project).values_list("id", flat=True)),
+            sub_group_by_fields=["high", "low"],
+            count_filter=Q(),
+            order_by="sort_order",
+        )
+        moves = ["next"] * (len(expected) - 1) + ["prev"] * (len(expected) - 1)
+
+        visited = self.walk(paginator, 1, moves)
+
+        assert [offset for offset, _, _ in visited] == [*range(len(expected)), *range(len(expected) - 2, -1, -1)]
+        for offset, ids, _ in visited:
+            assert ids == expected[offset]
@@ -0,0 +1,53 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import uuid
+
+import pytest
+
+from kardon.db.models import Issue
+from kardon.utils.search import build_search_query, search_queryset
+
+
+@pytest.mark.unit
+class TestBuildSearchQuery:
+    """Test the tsquery built from the command palette input"""
+
+    def get_terms(self, query):
+        return build_search_query(query).get_source_expressions()[-1].value
+
+    def test_words_are_prefix_matched(self):
+        """Test every word becomes a required prefix term"""
+        assert self.get_terms("Login Bug") == "login:* & bug:*"
+
+    def test_operators_are_stripped(self):
+        """Test tsquery operators in the input can not change the query"""
+        assert self.get_terms("a | b & !c:*") == "a:* & b:* & c:*"
+
+    def test_query_without_words(self):
+        """Test punctuation only input builds no tsquery"""
+        assert build_search_query(" -- ") is None
+
+
+@pytest.mark.unit
+class TestSearchQueryset:
+    """Test the search conditions are the ones the GIN indexes serve"""
+
+    def get_sql(self, query):
+        queryset = Issue.issue_objects.filter(project_id__in=[uuid.uuid4()])
+        return str(search_queryset(queryset, query).values("id").query)
+
+    def test_all_conditions_on_indexed_expressions(self):
+        """Test the substring, full text and trigram conditions are used"""
+        sql = self.get_sql("login bug")
+        assert 'UPPER("issues"."name"::text) LIKE' in sql
+        assert "@@" in sql
+        assert 'UPPER(("issues"."name")::text) %> LOGIN BUG' in sql
+        assert "DISTINCT" not in sql
+
+    def test_short_query_skips_trigrams(self):
+        """Test queries too short for trigrams only use the other indexes"""
+        sql = self.get_sql("ab")
+        assert "%>" not in sql
+        assert "@@" in sql
@@ -0,0 +1,95 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytz
+from rest_framework.utils.encoders import JSONEncoder
+
+from kardon.utils.timezone_converter import user_timezone_converter
+
+DATETIME_FIELDS = ["created_at", "updated_at", "completed_at", "archived_at"]
+
+
+def pytz_timezone_converter(queryset, datetime_fields, user_timezone):
+    """The per value pytz conversion the converter replaced"""
+    user_tz = pytz.timezone(user_timezone)
+    for item in queryset:
+        for field in datetime_fields:
+            if field in item and item[field]:
+                item[field] = item[field].astimezone(user_tz)
+    return queryset
+
+
+def make_rows(count, start=datetime(2024, 1, 1, tzinfo=timezone.utc), step=timedelta(minutes=53)):
+    return [
+        {
+            "id": index,
+            "created_at": start + step * index,
+            "updated_at": start + step * index + timedelta(seconds=17),
+            "completed_at": None if index % 3 else start + step * (index + 1),
+            "archived_at": None,
+        }
+        for index in range(count)
+    ]
+
+
+def encode(rows):
+    encoder = JSONEncoder()
+    return [
+        {field: encoder.default(value) if isinstance(value, datetime) else value for field, value in row.items()}
+        for row in rows
+    ]
+
+
+@pytest.mark.unit
+class TestUserTimezoneConverter:
+    """Test the converter serializes exactly like the pytz conversion"""
+
+    @pytest.mark.parametrize(
+        "user_timezone", ["America/New_York", "Australia/Lord_Howe", "Asia/Kolkata", "Europe/London", "UTC"]
+    )
+    def test_matches_pytz_across_transitions(self, user_timezone):
+        """Test a year of datetimes crossing the DST transitions"""
+        rows = make_rows(10000)
+        expected = encode(pytz_timezone_converter(make_rows(10000), DATETIME_FIELDS, user_timezone))
+
+        assert encode(user_timezone_converter(rows, DATETIME_FIELDS, user_timezone)) == expected
+
+    def test_single_item(self):
+        """Test a single dict is converted and returned as a dict"""
+        item = make_rows(1)[0]
+        converted = user_timezone_converter(item, ["created_at", "completed_at"], "Asia/Kolkata")
+
+        assert isinstance(converted, dict)
+        assert converted["created_at"].isoformat() == "2024-01-01T05:30:00+05:30"
+        assert converted["completed_at"].isoformat() == "2024-01-01T06:23:00+05:30"
+
+    def test_missing_and_empty_fields(self):
+        """Test rows without the field or with a null value are left untouched"""
+        rows = user_timezone_converter([{"id": 1}, {"id": 2, "created_at": None}], DATETIME_FIELDS, "Asia/Tokyo")
+        assert rows == [{"id": 1}, {"id": 2, "created_at": None}]
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestUserTimezoneConverterBenchmark:
+    """Benchmark the converter against the pytz conversion"""
+
+    @pytest.mark.parametrize("user_timezone", ["America/New_York", "UTC"])
+    def test_faster_than_pytz(self, user_timezone):
+        """Test converting 10k rows is faster than the pytz conversion"""
+        rows = make_rows(10000)
+        started_at = time.perf_counter()
+        pytz_timezone_converter(rows, DATETIME_FIELDS, user_timezone)
+        pytz_elapsed = time.perf_counter() - started_at
+
+        rows = make_rows(10000)
+        started_at = time.perf_counter()
+        user_timezone_converter(rows, DATETIME_FIELDS, user_timezone)
+        elapsed = time.perf_counter() - started_at
+
+        assert elapsed < pytz_elapsed
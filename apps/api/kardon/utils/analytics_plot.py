@@ -3,7 +3,6 @@
 # See the LICENSE file for details.
 
 # Python imports
-from datetime import timedelta
 from itertools import groupby
 
 # Django import
@@ -14,13 +13,12 @@ from django.db.models.functions import (
     Concat,
     ExtractMonth,
     ExtractYear,
-    TruncDate,
     Cast,
 )
 from django.utils import timezone
 
 # Module imports
-from kardon.db.models import Issue, Project
+from kardon.utils.burndown import get_cycle_burndown, get_date_range, get_module_burndown
 
 
 def annotate_with_monthly_dimension(queryset, field_name, attribute):
@@ -95,145 +93,17 @@ def build_graph_plot(queryset, x_axis, y_axis, segment=None):
 
 
 def burndown_plot(queryset, slug, project_id, plot_type, cycle_id=None, module_id=None):
-    # Total Issues in Cycle or Module
-    total_issues = queryset.total_issues
-    # check whether the estimate is a point or not
-    estimate_type = Project.objects.filter(
-        workspace__slug=slug,
-        pk=project_id,
-        estimate__isnull=False,
-        estimate__type="points",
-    ).exists()
-    if estimate_type and plot_type == "points" and cycle_id:
-        issue_estimates = Issue.issue_objects.filter(
-            workspace__slug=slug,
-            project_id=project_id,
-            issue_cycle__cycle_id=cycle_id,
-            issue_cycle__deleted_at__isnull=True,
-            estimate_point__isnull=False,
-        ).values_list("estimate_point__value", flat=True)
-
-        issue_estimates = [float(value) for value in issue_estimates]
-        total_estimate_points = sum(issue_estimates)
-
-    if estimate_type and plot_type == "points" and module_id:
-        issue_estimates = Issue.issue_objects.filter(
-            workspace__slug=slug,
-            project_id=project_id,
-            issue_module__module_id=module_id,
-            issue_module__deleted_at__isnull=True,
-            estimate_point__isnull=False,
-        ).values_list("estimate_point__value", flat=True)
-
-        issue_estimates = [float(value) for value in issue_estimates]
-        total_estimate_points = sum(issue_estimates)
-
+    # Serve the precomputed burndown of the cycle or module
     if cycle_id:
-        if queryset.end_date and queryset.start_date:
-            # Get all dates between the two dates
-            date_range = [
-                (queryset.start_date + timedelta(days=x)).date()
-                for x in range((queryset.end_date.date() - queryset.start_date.date()).days + 1)
-            ]
-        else:
-            date_range = []
-
-        chart_data = {str(date): 0 for date in date_range}
-
-        if plot_type == "points":
-            completed_issues_estimate_point_distribution = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    project_id=project_id,
-                    issue_cycle__cycle_id=cycle_id,
-                    issue_cycle__deleted_at__isnull=True,
-                    estimate_point__isnull=False,
-                )
-                .annotate(date=TruncDate("completed_at"))
-                .values("date")
-                .values("date", "estimate_point__value")
-                .order_by("date")
-            )
-        else:
-            completed_issues_distribution = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    project_id=project_id,
-                    issue_cycle__cycle_id=cycle_id,
-                    issue_cycle__deleted_at__isnull=True,
-                )
-                .annotate(date=TruncDate("completed_at"))
-                .values("date")
-                .annotate(total_completed=Count("id"))
-                .values("date", "total_completed")
-                .order_by("date")
-            )
+        start_date = queryset.start_date.date() if queryset.start_date else None
+        end_date = queryset.end_date.date() if queryset.end_date else None
+        date_range = get_date_range(start_date, end_date) if start_date and end_date else []
+        burndown = get_cycle_burndown(cycle_id, date_range)
 
     if module_id:
-        # Get all dates between the two dates
-        date_range = [
-            (queryset.start_date + timedelta(days=x))
-            for x in range((queryset.target_date - queryset.start_date).days + 1)
-        ]
-
-        chart_data = {str(date): 0 for date in date_range}
-
-        if plot_type == "points":
-            completed_issues_estimate_point_distribution = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    project_id=project_id,
-                    issue_module__module_id=module_id,
-                    issue_module__deleted_at__isnull=True,
-                    estimate_point__isnull=False,
-                )
-                .annotate(date=TruncDate("completed_at"))
-                .values("date")
-                .values("date", "estimate_point__value")
-                .order_by("date")
-            )
-        else:
-            completed_issues_distribution = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    project_id=project_id,
-                    issue_module__module_id=module_id,
-                    issue_module__deleted_at__isnull=True,
-                )
-                .annotate(date=TruncDate("completed_at"))
-                .values("date")
-                .annotate(total_completed=Count("id"))
-                .values("date", "total_completed")
-                .order_by("date")
-            )
-
-    if plot_type == "points":
-        for date in date_range:
-            cumulative_pending_issues = total_estimate_points
-            total_completed = 0
-            total_completed = sum(
-                float(item["estimate_point__value"])
-                for item in completed_issues_estimate_point_distribution
-                if item["date"] is not None and item["date"] <= date
-            )
-            cumulative_pending_issues -= total_completed
-            if date > timezone.now().date():
-                chart_data[str(date)] = None
-            else:
-                chart_data[str(date)] = cumulative_pending_issues
-    else:
-        for date in date_range:
-            cumulative_pending_issues = total_issues
-            total_completed = 0
-            total_completed = sum(
-                item["total_completed"]
-                for item in completed_issues_distribution
-                if item["date"] is not None and item["date"] <= date
-            )
-            cumulative_pending_issues -= total_completed
-            if date > timezone.now().date():
-                chart_data[str(date)] = None
-            else:
-                chart_data[str(date)] = cumulative_pending_issues
-
-    return chart_data
+        date_range = get_date_range(queryset.start_date, queryset.target_date)
+        burndown = get_module_burndown(module_id, date_range)
+
+    field = "pending_estimate_points" if plot_type == "points" else "pending_issues"
+    today = timezone.now().date()
+    return {str(date): burndown[date][field] if date <= today else None for date in date_range}
@@ -0,0 +1,326 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from itertools import groupby
+
+# Django imports
+from django.db import models, transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast, Concat, ExtractMonth, ExtractYear, TruncDate, TruncMonth
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import (
+    AnalyticsRollup,
+    AnalyticsRollupState,
+    Cycle,
+    Issue,
+    Label,
+    Module,
+    Project,
+    State,
+    User,
+)
+from kardon.utils.analytics_plot import sort_data
+
+DATE_AXES = ["created_at", "start_date", "target_date", "completed_at"]
+
+# Kept for every project, answers the issue totals and the state group stats
+ROLLUP_BASE_AXES = ("state__group", "")
+
+# Issue filters the rollup answers, any other filter falls back to the live query
+ROLLUP_FILTERS = {"project__in"}
+
+ROLLUP_BATCH_SIZE = 1000
+
+STATE_GROUP_WORK_ITEMS = {
+    "started": "started_work_items",
+    "backlog": "backlog_work_items",
+    "unstarted": "un_started_work_items",
+    "completed": "completed_work_items",
+    "cancelled": "cancelled_work_items",
+}
+
+# Detail key, model, response field prefix and fields of the axes pointing to another table
+ROLLUP_DETAILS = {
+    "state_id": ("state_details", State, "state", ["name", "color"]),
+    "labels__id": ("label_details", Label, "labels", ["color", "name"]),
+    "issue_cycle__cycle_id": ("cycle_details", Cycle, "issue_cycle__cycle", ["name"]),
+    "issue_module__module_id": ("module_details", Module, "issue_module__module", ["name"]),
+}
+
+
+def get_axis_expression(axis):
+    """Return the expression grouping the issues by the axis, dates are grouped by month"""
+    if axis in DATE_AXES:
+        return Concat(ExtractYear(axis), Value("-"), ExtractMonth(axis), output_field=models.CharField())
+    return F(axis)
+
+
+def get_rollup_rows(workspace_id, project_id, issues, axes):
+    """Return the rollup rows of every axis and segment pair counted over the issues"""
+    estimate = Sum(
+        Cast("estimate_point__value", FloatField()),
+        filter=~Q(estimate_point__estimate__type="categories"),
+    )
+
+    rollups = []
+    for x_axis, segment_axis in axes:
+        queryset = issues.annotate(dimension=get_axis_expression(x_axis), bucket=TruncDate("created_at"))
+        fields = ["dimension", "bucket"]
+        if segment_axis:
+            queryset = queryset.annotate(segment=get_axis_expression(segment_axis))
+            fields.append("segment")
+
+        for row in queryset.order_by().values(*fields).annotate(issue_count=Count("id"), estimate=estimate):
+            segment = row.get("segment")
+            rollups.append(
+                AnalyticsRollup(
+                    workspace_id=workspace_id,
+                    project_id=project_id,
+                    x_axis=x_axis,
+                    segment_axis=segment_axis,
+                    dimension=None if row["dimension"] is None else str(row["dimension"]),
+                    segment=None if segment is None else str(segment),
+                    bucket=row["bucket"],
+                    issue_count=row["issue_count"],
+                    estimate=row["estimate"],
+                )
+            )
+    return rollups
+
+
+def update_analytics_rollup(project_id, issue_ids):
+    """
+    Recount the creation day buckets of the changed issues only. Every rollup
+    row counts the issues created on its day, so the other buckets stay exact.
+    """
+    workspace_id = Project.objects.filter(id=project_id).values_list("workspace_id", flat=True).first()
+    if workspace_id is None:
+        return
+
+    # The pairs not calculated yet are built by the full refresh queued with them
+    axes = set(
+        AnalyticsRollupState.objects.filter(project_id=project_id, calculated_at__isnull=False).values_list(
+            "x_axis", "segment_axis"
+        )
+    )
+    # Deleted issues still leave the counts of their day
+    buckets = list(
+        Issue.all_objects.filter(id__in=issue_ids, project_id=project_id)
+        .annotate(created_day=TruncDate("created_at"))
+        .order_by()
+        .values_list("created_day", flat=True)
+        .distinct()
+    )
+    if not axes or not buckets:
+        return
+
+    issues = (
+        Issue.issue_objects.filter(project_id=project_id)
+        .annotate(created_day=TruncDate("created_at"))
+        .filter(created_day__in=buckets)
+    )
+    rollups = get_rollup_rows(workspace_id, project_id, issues, axes)
+
+    calculated = Q()
+    for x_axis, segment_axis in axes:
+        calculated |= Q(x_axis=x_axis, segment_axis=segment_axis)
+    with transaction.atomic():
+        AnalyticsRollup.all_objects.filter(calculated, project_id=project_id, bucket__in=buckets).delete()
+        AnalyticsRollup.all_objects.bulk_create(rollups, batch_size=ROLLUP_BATCH_SIZE)
+
+
+def refresh_analytics_rollup(project_id):
+    """Rebuild the rollup rows of every axis and segment pair kept for the project"""
+    workspace_id = Project.objects.filter(id=project_id).values_list("workspace_id", flat=True).first()
+    if workspace_id is None:
+        return
+
+    axes = set(AnalyticsRollupState.objects.filter(project_id=project_id).values_list("x_axis", "segment_axis"))
+    axes.add(ROLLUP_BASE_AXES)
+
+    rollups = get_rollup_rows(workspace_id, project_id, Issue.issue_objects.filter(project_id=project_id), axes)
+
+    calculated_at = timezone.now()
+    with transaction.atomic():
+        AnalyticsRollup.all_objects.filter(project_id=project_id).delete()
+        AnalyticsRollup.all_objects.bulk_create(rollups, batch_size=ROLLUP_BATCH_SIZE)
+        AnalyticsRollupState.all_objects.bulk_create(
+            [
+                AnalyticsRollupState(
+                    workspace_id=workspace_id,
+                    project_id=project_id,
+                    x_axis=x_axis,
+                    segment_axis=segment_axis,
+                    calculated_at=calculated_at,
+                )
+                for x_axis, segment_axis in axes
+            ],
+            update_conflicts=True,
+            unique_fields=["project", "x_axis", "segment_axis"],
+            update_fields=["calculated_at", "updated_at", "deleted_at"],
+        )
+
+
+def get_rollup_project_ids(slug, filters):
+    """Return the projects the rollup answers the issue filters with, None when a filter needs the live query"""
+    if set(filters) - ROLLUP_FILTERS:
+        return None
+
+    projects = Project.objects.filter(workspace__slug=slug, archived_at__isnull=True)
+    if "project__in" in filters:
+        projects = projects.filter(id__in=filters["project__in"])
+    return [str(project_id) for project_id in projects.values_list("id", flat=True)]
+
+
+def get_stale_rollup_project_ids(project_ids, axes):
+    """Return the projects missing a calculated rollup for any of the axis and segment pairs"""
+    axes = set(axes)
+    calculated = Q()
+    for x_axis, segment_axis in axes:
+        calculated |= Q(x_axis=x_axis, segment_axis=segment_axis)
+
+    counts = {
+        str(project_id): count
+        for project_id, count in AnalyticsRollupState.objects.filter(
+            calculated, project_id__in=project_ids, calculated_at__isnull=False
+        )
+        .order_by()
+        .values("project_id")
+        .annotate(count=Count("id"))
+        .values_list("project_id", "count")
+    }
+    return [project_id for project_id in project_ids if counts.get(project_id, 0) < len(axes)]
+
+
+def rollup_graph_plot(project_ids, x_axis, y_axis, segment=None):
+    """Build the same graph payload as build_graph_plot from the rollup rows"""
+    queryset = AnalyticsRollup.objects.filter(project_id__in=project_ids, x_axis=x_axis, segment_axis=segment or "")
+    # The live query leaves the issues without a value of the axis out
+    queryset = queryset.exclude(dimension__isnull=True)
+
+    fields = ["dimension", "segment"] if segment else ["dimension"]
+    if y_axis == "issue_count":
+        queryset = queryset.values(*fields).annotate(count=Sum("issue_count"))
+    else:
+        queryset = queryset.values(*fields).annotate(estimate=Sum("estimate"))
+
+    grouped_data = {
+        str(key): list(items) for key, items in groupby(queryset.order_by(*fields), key=lambda x: x["dimension"])
+    }
+    return sort_data(grouped_data, x_axis)
+
+
+def rollup_total(project_ids):
+    """Return the number of issues of the projects from the rollup"""
+    return AnalyticsRollup.objects.filter(
+        project_id__in=project_ids, x_axis=ROLLUP_BASE_AXES[0], segment_axis=ROLLUP_BASE_AXES[1]
+    ).aggregate(total=Sum("issue_count", default=0))["total"]
+
+
+def get_rollup_details(distribution, x_axis, segment=None):
+    """Return the state, label, assignee, cycle and module details of the ids in the distribution"""
+    details = {
+        "state_details": {},
+        "assignee_details": {},
+        "label_details": {},
+        "cycle_details": {},
+        "module_details": {},
+    }
+
+    for axis, key in [(x_axis, "dimension"), (segment, "segment")]:
+        if axis != "assignees__id" and axis not in ROLLUP_DETAILS:
+            continue
+        ids = {row[key] for rows in distribution.values() for row in rows if row.get(key)}
+
+        if axis == "assignees__id":
+            details["assignee_details"] = [
+                {f"assignees__{field}": value for field, value in user.items()}
+                for user in User.objects.filter(Q(avatar__isnull=False) | Q(avatar_asset__isnull=False), id__in=ids)
+                .annotate(
+                    avatar_url=Case(
+                        When(
+                            avatar_asset__isnull=False,
+                            then=Concat(Value("/api/assets/v2/static/"), "avatar_asset", Value("/")),
+                        ),
+                        When(avatar_asset__isnull=True, then="avatar"),
+                        default=Value(None),
+                        output_field=models.CharField(),
+                    )
+                )
+                .order_by("id")
+                .values("avatar_url", "display_name", "first_name", "last_name", "id")
+            ]
+            continue
+
+        detail, model, prefix, fields = ROLLUP_DETAILS[axis]
+        details[detail] = [
+            {axis: row.pop("id"), **{f"{prefix}__{field}": value for field, value in row.items()}}
+            for row in model.all_objects.filter(id__in=ids).order_by("id").values("id", *fields)
+        ]
+    return details
+
+
+def get_work_item_aggregates():
+    """Return the aggregates counting the rollup issues in total and by state group"""
+    aggregates = {"total_work_items": Sum("issue_count", default=0)}
+    for group, name in STATE_GROUP_WORK_ITEMS.items():
+        aggregates[name] = Sum("issue_count", filter=Q(dimension=group), default=0)
+    return aggregates
+
+
+def state_group_rollup(project_ids, start_date=None, end_date=None):
+    """Return the state group rollup rows of the projects for the issues created between the dates"""
+    queryset = AnalyticsRollup.objects.filter(
+        project_id__in=project_ids, x_axis=ROLLUP_BASE_AXES[0], segment_axis=ROLLUP_BASE_AXES[1]
+    )
+    if start_date is not None:
+        queryset = queryset.filter(bucket__gte=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(bucket__lte=end_date)
+    return queryset.order_by()
+
+
+def get_analytics_project_ids(project_filters):
+    """Return the projects of the advance analytics filters"""
+    return list(
+        {str(project_id) for project_id in Project.objects.filter(**project_filters).values_list("id", flat=True)}
+    )
+
+
+def rollup_work_items_stats(project_ids, analytics_date_range=None):
+    """Count the work items of the projects in total and by state group from the rollup"""
+    current = analytics_date_range["current"] if analytics_date_range else {}
+    stats = state_group_rollup(
+        project_ids,
+        start_date=current["gte"].date() if current else None,
+        end_date=current["lte"].date() if current else None,
+    ).aggregate(**get_work_item_aggregates())
+    return {
+        key: {"count": stats[key]}
+        for key in [
+            "total_work_items",
+            "started_work_items",
+            "backlog_work_items",
+            "un_started_work_items",
+            "completed_work_items",
+        ]
+    }
+
+
+def rollup_monthly_completion(project_ids, chart_period_range=None):
+    """Return the work items created and completed by creation month from the rollup"""
+    start_date, end_date = chart_period_range or (None, None)
+    return (
+        state_group_rollup(project_ids, start_date=start_date, end_date=end_date)
+        .annotate(month=TruncMonth("bucket"))
+        .values("month")
+        .annotate(
+            created_count=Sum("issue_count"),
+            completed_count=Sum("issue_count", filter=Q(dimension="completed"), default=0),
+        )
+        .order_by("month")
+    )
@@ -0,0 +1,153 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import atexit
+import codecs
+import os
+import threading
+from collections import Counter
+
+# Third party imports
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+# Module imports
+from kardon.utils.exception_logger import log_exception
+
+# Headers carrying credentials are never written to the logs
+REDACTED_LOG_HEADERS = {"authorization", "cookie", "x-api-key", "proxy-authorization"}
+
+BINARY_SIGNATURES = (b"\x89PNG", b"\xff\xd8\xff", b"%PDF")
+
+meter = metrics.get_meter("kardon.api.request")
+
+API_LOG_COUNTERS = {
+    "shipped": meter.create_counter("kardon.api_logs.shipped", description="API request logs shipped"),
+    "dropped": meter.create_counter("kardon.api_logs.dropped", description="API request logs dropped"),
+    "truncated": meter.create_counter("kardon.api_logs.truncated", description="API log bodies truncated"),
+    "sampled_out": meter.create_counter("kardon.api_logs.sampled_out", description="API log bodies not kept"),
+}
+
+
+def get_log_headers(headers):
+    """Return the request headers without the credentials"""
+    return str({key: value for key, value in headers.items() if key.lower() not in REDACTED_LOG_HEADERS})
+
+
+def get_log_body(content, max_bytes):
+    """
+    Decode at most max_bytes of the body, returns the text and whether it
+    was truncated. Binary and undecodable content is replaced by a marker.
+    """
+    if not content:
+        return None, False
+
+    if content.startswith(BINARY_SIGNATURES):
+        return "[Binary Content]", False
+
+    truncated = bool(max_bytes) and len(content) > max_bytes
+    try:
+        if not truncated:
+            return content.decode("utf-8"), False
+        # The incremental decoder leaves out a character cut by the limit instead of failing
+        text = codecs.getincrementaldecoder("utf-8")().decode(content[:max_bytes], final=False)
+    except UnicodeDecodeError:
+        return "[Could not decode content]", False
+
+    return f"{text}...[truncated {len(content) - max_bytes} bytes]", True
+
+
+class APILogBuffer:
+    """
+    Collect the API request logs of the process and ship them in batches.
+
+    A background thread ships a batch when it is full or every flush interval,
+    with no interval the batches are shipped by the request filling them.
+    Once max_size logs are waiting new logs are dropped instead of growing
+    the memory of the process, logs of a failed shipment are dropped too.
+    """
+
+    def __init__(self, ship, batch_size, flush_interval, max_size):
+        self.ship = ship
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_size = max(self.batch_size, max_size)
+        self.counts = Counter()
+        self.pid = None
+        self.logs = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+        meter.create_observable_gauge(
+            "kardon.api_logs.buffered",
+            callbacks=[lambda options: [Observation(len(self.logs))]],
+            description="API request logs waiting to be shipped",
+        )
+        atexit.register(self.flush)
+
+    def record(self, name, amount=1, **attributes):
+        """Count an event of the buffer, kept on the process and exported as a metric"""
+        self.counts[name] += amount
+        API_LOG_COUNTERS[name].add(amount, attributes)
+
+    def get_metrics(self):
+        return {**self.counts, "buffered": len(self.logs)}
+
+    def add(self, log):
+        """Queue the log for shipping, returns False when it was dropped"""
+        self._ensure_flusher()
+
+        with self.lock:
+            if len(self.logs) >= self.max_size:
+                full = None
+            else:
+                self.logs.append(log)
+                full = len(self.logs) >= self.batch_size
+
+        if full is None:
+            self.record("dropped", reason="buffer_full")
+            return False
+
+        if full:
+            if self.flush_interval:
+                self.wakeup.set()
+            else:
+                self.flush()
+        return True
+
+    def flush(self):
+        """Ship every waiting log in batches of batch_size"""
+        while True:
+            with self.lock:
+                batch, self.logs = self.logs[: self.batch_size], self.logs[self.batch_size :]
+            if not batch:
+                return
+
+            try:
+                self.ship(batch)
+                self.record("shipped", len(batch))
+            except Exception as e:
+                self.record("dropped", len(batch), reason="ship_failed")
+                log_exception(e)
+
+    def _ensure_flusher(self):
+        # The thread does not survive a fork, every worker process starts its own
+        if not self.flush_interval or self.pid == os.getpid():
+            return
+
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            if self.pid is not None:
+                # The logs copied from the parent process are shipped by the parent
+                self.logs = []
+            self.pid = os.getpid()
+            threading.Thread(target=self._run, name="api-log-flusher", daemon=True).start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
@@ -0,0 +1,62 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import hashlib
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import APIToken
+
+API_TOKEN_CACHE_KEY_PREFIX = "api_token"
+
+
+def get_api_token_cache_key(token):
+    """Return the cache key of the token, hashed to keep the secret out of the cache keys"""
+    return f"{API_TOKEN_CACHE_KEY_PREFIX}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def load_api_token(token):
+    """Load the active API token, None when it does not exist"""
+    return (
+        APIToken.objects.filter(token=token, is_active=True)
+        .values("id", "user_id", "expired_at", "is_service", "allowed_rate_limit")
+        .first()
+    )
+
+
+def get_api_token(token):
+    """
+    Return the active and unexpired API token, the lookups of valid and
+    unknown tokens are cached for a short time
+    """
+    if not settings.API_TOKEN_CACHE_TIMEOUT:
+        api_token = load_api_token(token)
+    else:
+        key = get_api_token_cache_key(token)
+        api_token = cache.get(key)
+        if api_token is None:
+            # An empty dict caches the token as unknown
+            api_token = load_api_token(token) or {}
+            cache.set(
+                key,
+                api_token,
+                settings.API_TOKEN_CACHE_TIMEOUT if api_token else settings.API_TOKEN_NEGATIVE_CACHE_TIMEOUT,
+            )
+
+    # The expiry is checked on every use so a cached token can not outlive it
+    if not api_token or (api_token["expired_at"] is not None and api_token["expired_at"] <= timezone.now()):
+        return None
+    return api_token
+
+
+def invalidate_api_token_cache(tokens):
+    """Drop the cached lookups of the tokens"""
+    if not settings.API_TOKEN_CACHE_TIMEOUT:
+        return
+    cache.delete_many([get_api_token_cache_key(token) for token in tokens])
@@ -0,0 +1,138 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Django imports
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import (
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    IssueSequence,
+    IssueSequenceCounter,
+    IssueType,
+    ProjectMember,
+    State,
+)
+from kardon.utils.html_processor import strip_tags
+
+BULK_ISSUE_BATCH_SIZE = 500
+
+
+def bulk_create_issues(project, issues_data, created_by_id):
+    """
+    Create the issues of the project with their sequences, assignees and labels
+    in a few bulk inserts. issues_data holds the validated fields of each issue
+    with optional assignees and labels lists, the created issues are returned
+    in the same order.
+    """
+    if not issues_data:
+        return []
+
+    # Same default state as a single issue gets on save
+    states = State.objects.filter(~Q(is_triage=True), project_id=project.id)
+    default_state = states.filter(default=True).first() or states.first()
+    default_type = IssueType.objects.filter(project_issue_types__project_id=project.id, is_default=True).first()
+    # The default assignee is only given when it is still a member who can be assigned
+    default_assignee_id = (
+        project.default_assignee_id
+        if project.default_assignee_id
+        and ProjectMember.objects.filter(
+            member_id=project.default_assignee_id, project_id=project.id, role__gte=15, is_active=True
+        ).exists()
+        else None
+    )
+
+    first_sequence, first_sort_order = IssueSequenceCounter.reserve(project.id, len(issues_data))
+
+    issues = []
+    assignee_ids = []
+    label_ids = []
+    created_at = {}
+    now = timezone.now()
+    for index, data in enumerate(issues_data):
+        data = dict(data)
+        assignees = data.pop("assignees", None)
+        labels = data.pop("labels", None)
+        state = data.pop("state", None) or default_state
+        issue_type = data.pop("type", None) or default_type
+        if data.get("created_at"):
+            created_at[index] = data.pop("created_at")
+        description_html = data.get("description_html")
+
+        issues.append(
+            Issue(
+                **{"created_by_id": created_by_id, "updated_by_id": created_by_id, **data},
+                state=state,
+                type=issue_type,
+                project_id=project.id,
+                workspace_id=project.workspace_id,
+                sequence_id=first_sequence + index,
+                sort_order=first_sort_order + index * IssueSequenceCounter.SORT_ORDER_STEP,
+                description_stripped=None if not description_html else strip_tags(description_html),
+                completed_at=now if state is not None and state.group == "completed" else None,
+            )
+        )
+        assignee_ids.append(
+            list(dict.fromkeys(assignees)) if assignees else [default_assignee_id] if default_assignee_id else []
+        )
+        label_ids.append(list(dict.fromkeys(labels)) if labels else [])
+
+    with transaction.atomic():
+        Issue.objects.bulk_create(issues, batch_size=BULK_ISSUE_BATCH_SIZE)
+        # The creation dates given by imports are overwritten on insert
+        if created_at:
+            for index, value in created_at.items():
+                issues[index].created_at = value
+            Issue.objects.bulk_update([issues[index] for index in created_at], ["created_at"])
+        IssueSequence.objects.bulk_create(
+            [
+                IssueSequence(
+                    issue=issue,
+                    sequence=issue.sequence_id,
+                    project_id=project.id,
+                    workspace_id=project.workspace_id,
+                    created_by_id=issue.created_by_id,
+                )
+                for issue in issues
+            ],
+            batch_size=BULK_ISSUE_BATCH_SIZE,
+        )
+        IssueAssignee.objects.bulk_create(
+            [
+                IssueAssignee(
+                    assignee_id=assignee_id,
+                    issue=issue,
+                    project_id=project.id,
+                    workspace_id=project.workspace_id,
+                    created_by_id=issue.created_by_id,
+                    updated_by_id=issue.updated_by_id,
+                )
+                for issue, issue_assignee_ids in zip(issues, assignee_ids)
+                for assignee_id in issue_assignee_ids
+            ],
+            batch_size=BULK_ISSUE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        IssueLabel.objects.bulk_create(
+            [
+                IssueLabel(
+                    label_id=label_id,
+                    issue=issue,
+                    project_id=project.id,
+                    workspace_id=project.workspace_id,
+                    created_by_id=issue.created_by_id,
+                    updated_by_id=issue.updated_by_id,
+                )
+                for issue, issue_label_ids in zip(issues, label_ids)
+                for label_id in issue_label_ids
+            ],
+            batch_size=BULK_ISSUE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    return issues
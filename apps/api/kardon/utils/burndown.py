@@ -0,0 +1,136 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from datetime import timedelta
+
+# Django imports
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.functions import Cast, TruncDate
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import CycleBurndownSnapshot, Issue, ModuleBurndownSnapshot
+from kardon.utils.progress import get_cycle_progress, get_module_progress
+
+BURNDOWN_FIELDS = ["total_issues", "pending_issues", "total_estimate_points", "pending_estimate_points"]
+
+
+def get_date_range(start_date, end_date):
+    """Return every date from the start to the end date, both included"""
+    if start_date is None or end_date is None:
+        return []
+    return [start_date + timedelta(days=day) for day in range((end_date - start_date).days + 1)]
+
+
+def get_progress_burndown(progress):
+    """Return the burndown values of the current progress of a cycle or module"""
+    return {
+        "total_issues": progress["total_issues"],
+        "pending_issues": progress["total_issues"] - progress["completed_issues"],
+        "total_estimate_points": progress["total_estimate_points"],
+        "pending_estimate_points": progress["total_estimate_points"] - progress["completed_estimate_points"],
+    }
+
+
+def calculate_burndown(relation, entity_field, entity_id, dates):
+    """
+    Calculate the issues and points left at the end of each date from the
+    totals and the completions grouped by day
+    """
+    issues = Issue.issue_objects.filter(
+        **{f"{relation}__{entity_field}_id": entity_id, f"{relation}__deleted_at__isnull": True}
+    )
+    estimate = Cast("estimate_point__value", FloatField())
+    is_points = Q(estimate_point__estimate__type="points")
+
+    totals = issues.aggregate(
+        total_issues=Count("id"),
+        total_estimate_points=Sum(estimate, filter=is_points, default=0.0),
+    )
+    completions = iter(
+        issues.filter(completed_at__isnull=False)
+        .annotate(date=TruncDate("completed_at"))
+        .order_by("date")
+        .values("date")
+        .annotate(
+            completed_issues=Count("id"),
+            completed_estimate_points=Sum(estimate, filter=is_points, default=0.0),
+        )
+    )
+
+    burndown = {}
+    completed_issues = 0
+    completed_estimate_points = 0.0
+    completion = next(completions, None)
+    for date in sorted(dates):
+        # Completions are ordered by day, add the ones done by the end of the date
+        while completion is not None and completion["date"] <= date:
+            completed_issues += completion["completed_issues"]
+            completed_estimate_points += completion["completed_estimate_points"]
+            completion = next(completions, None)
+
+        burndown[date] = {
+            "total_issues": totals["total_issues"],
+            "pending_issues": totals["total_issues"] - completed_issues,
+            "total_estimate_points": totals["total_estimate_points"],
+            "pending_estimate_points": totals["total_estimate_points"] - completed_estimate_points,
+        }
+    return burndown
+
+
+def store_burndown(snapshot_model, entity_field, snapshots):
+    """Upsert the burndown snapshots given as (entity id, date, values) tuples"""
+    snapshot_model.all_objects.bulk_create(
+        [
+            snapshot_model(**{f"{entity_field}_id": entity_id}, date=date, **values)
+            for entity_id, date, values in snapshots
+        ],
+        update_conflicts=True,
+        unique_fields=[entity_field, "date"],
+        update_fields=BURNDOWN_FIELDS + ["updated_at", "deleted_at"],
+    )
+
+
+def get_burndown(snapshot_model, entity_field, relation, get_progress, entity_id, dates):
+    """
+    Return the burndown of the dates up to today, past dates are read from
+    the snapshots and today from the stored progress
+    """
+    today = timezone.now().date()
+    past_dates = [date for date in dates if date < today]
+
+    burndown = {}
+    if past_dates:
+        burndown = {
+            row.pop("date"): row
+            for row in snapshot_model.objects.filter(
+                **{f"{entity_field}_id": entity_id}, date__gte=min(past_dates), date__lt=today
+            ).values("date", *BURNDOWN_FIELDS)
+        }
+
+        # Calculate and keep the days the daily snapshot did not write
+        missing_dates = [date for date in past_dates if date not in burndown]
+        if missing_dates:
+            calculated = calculate_burndown(relation, entity_field, entity_id, missing_dates)
+            store_burndown(
+                snapshot_model,
+                entity_field,
+                [(entity_id, date, values) for date, values in calculated.items()],
+            )
+            burndown.update(calculated)
+
+    if today in dates:
+        burndown[today] = get_progress_burndown(get_progress(entity_id))
+    return burndown
+
+
+def get_cycle_burndown(cycle_id, dates):
+    """Return the burndown of the cycle for the dates up to today"""
+    return get_burndown(CycleBurndownSnapshot, "cycle", "issue_cycle", get_cycle_progress, cycle_id, dates)
+
+
+def get_module_burndown(module_id, dates):
+    """Return the burndown of the module for the dates up to today"""
+    return get_burndown(ModuleBurndownSnapshot, "module", "issue_module", get_module_progress, module_id, dates)
@@ -3,6 +3,7 @@
 # See the LICENSE file for details.
 
 # Python imports
+import uuid
 from functools import wraps
 
 # Django imports
@@ -13,13 +14,71 @@ from django.core.cache import cache
 from rest_framework.response import Response
 
 
+# Prefix of the keys holding the generation of every cache namespace
+CACHE_VERSION_KEY_PREFIX = "cache_version"
+# A namespace generation only has to outlive the entries written under it,
+# an expired generation simply turns the old entries into cache misses
+CACHE_VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def get_cache_namespace(custom_path):
+    """Reduce a path to the namespace shared by all of its query variants"""
+    namespace = custom_path.split("?", 1)[0].strip("/")
+    if namespace.startswith("api/"):
+        namespace = namespace[len("api/") :]
+    return namespace
+
+
+def get_cache_version_keys(custom_path, auth_header=None):
+    """Return the generation keys scoping the path, and the user if given"""
+    namespace = get_cache_namespace(custom_path)
+    version_keys = [f"{CACHE_VERSION_KEY_PREFIX}:{namespace}"]
+    if auth_header:
+        version_keys.append(f"{CACHE_VERSION_KEY_PREFIX}:{namespace}:{auth_header}")
+    return version_keys
+
+
+def get_cache_versions(version_keys):
+    """Fetch the current generation of every namespace, creating missing ones"""
+    versions = cache.get_many(version_keys)
+    missing_keys = [key for key in version_keys if key not in versions]
+    if missing_keys:
+        for key in missing_keys:
+            # add() keeps the generation written by a concurrent request
+            cache.add(key, uuid.uuid4().hex, CACHE_VERSION_TIMEOUT)
+        versions.update(cache.get_many(missing_keys))
+    return [str(versions.get(key, "")) for key in version_keys]
+
+
+def bump_cache_versions(version_keys):
+    """Move the namespaces to a new generation, orphaning every entry under them"""
+    cache.set_many({key: uuid.uuid4().hex for key in version_keys}, CACHE_VERSION_TIMEOUT)
+
+
+def get_project_data_version_key(project_id):
+    """Return the generation key of the data of the project shown on its published boards"""
+    return f"{CACHE_VERSION_KEY_PREFIX}:project_data:{project_id}"
+
+
+def get_project_data_version(project_id):
+    """Return the current data version of the project"""
+    return get_cache_versions([get_project_data_version_key(project_id)])[0]
+
+
+def bump_project_data_version(project_id):
+    """Move the project to a new data version, orphaning the cached responses of its boards"""
+    if project_id is not None:
+        bump_cache_versions([get_project_data_version_key(project_id)])
+
+
 def generate_cache_key(custom_path, auth_header=None):
     """Generate a cache key with the given params"""
     if auth_header:
         key_data = f"{custom_path}:{auth_header}"
     else:
         key_data = custom_path
-    return key_data
+    versions = get_cache_versions(get_cache_version_keys(custom_path, auth_header))
+    return f"{key_data}:{'.'.join(versions)}"
 
 
 def cache_response(timeout=60 * 60, path=None, user=True):
@@ -61,12 +120,14 @@ def invalidate_cache_directly(path=None, url_params=False, user=True, request=No
     else:
         custom_path = path if path is not None else request.get_full_path()
     auth_header = None if request and request.user.is_anonymous else str(request.user.id) if user else None
-    key = generate_cache_key(custom_path, auth_header)
 
     if multiple:
-        cache.delete_many(keys=cache.keys(f"*{key}*"))
+        # Invalidate every query variant of the path by moving its namespace,
+        # or the user's scope of it, to a new generation instead of scanning keys
+        version_keys = get_cache_version_keys(custom_path, auth_header)
+        bump_cache_versions(version_keys[-1:])
     else:
-        cache.delete(key)
+        cache.delete(generate_cache_key(custom_path, auth_header))
 
 
 def invalidate_cache(path=None, url_params=False, user=True, multiple=False):
@@ -30,6 +30,7 @@ from kardon.db.models import (
 from kardon.utils.analytics_plot import burndown_plot
 from kardon.bgtasks.issue_activities_task import issue_activity
 from kardon.utils.host import base_host
+from kardon.utils.progress import refresh_cycle_progress
 
 
 def transfer_cycle_issues(
@@ -64,82 +65,8 @@ def transfer_cycle_issues(
             "error": "The cycle where the issues are transferred is already completed",
         }
 
-    # Get the old cycle with issue counts
-    old_cycle = (
-        Cycle.objects.filter(workspace__slug=slug, project_id=project_id, pk=cycle_id)
-        .annotate(
-            total_issues=Count(
-                "issue_cycle",
-                filter=Q(
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__deleted_at__isnull=True,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                ),
-            )
-        )
-        .annotate(
-            completed_issues=Count(
-                "issue_cycle__issue__state__group",
-                filter=Q(
-                    issue_cycle__issue__state__group="completed",
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                    issue_cycle__deleted_at__isnull=True,
-                ),
-            )
-        )
-        .annotate(
-            cancelled_issues=Count(
-                "issue_cycle__issue__state__group",
-                filter=Q(
-                    issue_cycle__issue__state__group="cancelled",
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                    issue_cycle__deleted_at__isnull=True,
-                ),
-            )
-        )
-        .annotate(
-            started_issues=Count(
-                "issue_cycle__issue__state__group",
-                filter=Q(
-                    issue_cycle__issue__state__group="started",
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                    issue_cycle__deleted_at__isnull=True,
-                ),
-            )
-        )
-        .annotate(
-            unstarted_issues=Count(
-                "issue_cycle__issue__state__group",
-                filter=Q(
-                    issue_cycle__issue__state__group="unstarted",
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                    issue_cycle__deleted_at__isnull=True,
-                ),
-            )
-        )
-        .annotate(
-            backlog_issues=Count(
-                "issue_cycle__issue__state__group",
-                filter=Q(
-                    issue_cycle__issue__state__group="backlog",
-                    issue_cycle__issue__archived_at__isnull=True,
-                    issue_cycle__issue__is_draft=False,
-                    issue_cycle__issue__deleted_at__isnull=True,
-                    issue_cycle__deleted_at__isnull=True,
-                ),
-            )
-        )
-    )
-    old_cycle = old_cycle.first()
+    # Get the old cycle
+    old_cycle = Cycle.objects.filter(workspace__slug=slug, project_id=project_id, pk=cycle_id).first()
 
     if old_cycle is None:
         return {
@@ -147,6 +74,9 @@ def transfer_cycle_issues(
             "error": "Source cycle not found",
         }
 
+    # Recalculate the issue counts of the old cycle in a single pass for the snapshot
+    progress = refresh_cycle_progress([cycle_id])[str(cycle_id)]
+
     # Check if project uses estimates
     estimate_type = Project.objects.filter(
         workspace__slug=slug,
@@ -408,12 +338,12 @@ def transfer_cycle_issues(
     current_cycle = Cycle.objects.filter(workspace__slug=slug, project_id=project_id, pk=cycle_id).first()
 
     current_cycle.progress_snapshot = {
-        "total_issues": old_cycle.total_issues,
-        "completed_issues": old_cycle.completed_issues,
-        "cancelled_issues": old_cycle.cancelled_issues,
-        "started_issues": old_cycle.started_issues,
-        "unstarted_issues": old_cycle.unstarted_issues,
-        "backlog_issues": old_cycle.backlog_issues,
+        "total_issues": progress["total_issues"],
+        "completed_issues": progress["completed_issues"],
+        "cancelled_issues": progress["cancelled_issues"],
+        "started_issues": progress["started_issues"],
+        "unstarted_issues": progress["unstarted_issues"],
+        "backlog_issues": progress["backlog_issues"],
         "distribution": {
             "labels": label_distribution_data,
             "assignees": assignee_distribution_data,
@@ -0,0 +1,59 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import re
+import struct
+from difflib import SequenceMatcher
+from itertools import accumulate
+
+# The contents are compared by tokens ending at a tag, a line or a null byte
+TOKEN_BOUNDARY = re.compile(rb"(?<=[>\n\x00])")
+
+COPY = b"C"
+INSERT = b"I"
+
+
+def tokenize(data):
+    return [token for token in TOKEN_BOUNDARY.split(data) if token]
+
+
+def create_delta(source, target):
+    """
+    Encode the target as the ranges of bytes copied from the source and the
+    bytes inserted between them
+    """
+    source_tokens, target_tokens = tokenize(source), tokenize(target)
+    source_offsets = list(accumulate((len(token) for token in source_tokens), initial=0))
+    target_offsets = list(accumulate((len(token) for token in target_tokens), initial=0))
+
+    operations = []
+    matcher = SequenceMatcher(None, source_tokens, target_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            start, end = source_offsets[i1], source_offsets[i2]
+            operations.append(COPY + struct.pack(">II", start, end - start))
+        elif j2 > j1:
+            data = target[target_offsets[j1] : target_offsets[j2]]
+            operations.append(INSERT + struct.pack(">I", len(data)) + data)
+    return b"".join(operations)
+
+
+def apply_delta(source, delta):
+    """Rebuild the target from the source and the delta of create_delta"""
+    parts = []
+    position = 0
+    while position < len(delta):
+        operation = delta[position : position + 1]
+        if operation == COPY:
+            start, length = struct.unpack_from(">II", delta, position + 1)
+            parts.append(source[start : start + length])
+            position += 9
+        elif operation == INSERT:
+            (length,) = struct.unpack_from(">I", delta, position + 1)
+            parts.append(delta[position + 5 : position + 5 + length])
+            position += 5 + length
+        else:
+            raise ValueError(f"Invalid delta operation at {position}")
+    return b"".join(parts)
@@ -0,0 +1,190 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from collections import defaultdict, deque
+
+# Django imports
+from django.db import connection
+
+# Module imports
+from kardon.db.models import Issue, IssueRelation
+
+# Relations ordering two issues, a cycle through them can never be scheduled
+DEPENDENCY_RELATIONS = ["blocked_by", "start_before", "finish_before"]
+
+# Relations stored with the issue coming first in related_issue, the others store it in issue
+REVERSED_RELATIONS = ["blocked_by"]
+
+SUCCESSORS = "successors"
+PREDECESSORS = "predecessors"
+
+# Relation types as the clients ask for them, with the stored relation and the direction to walk it
+TRANSITIVE_RELATIONS = {
+    "blocking": ("blocked_by", SUCCESSORS),
+    "blocked_by": ("blocked_by", PREDECESSORS),
+    "start_before": ("start_before", SUCCESSORS),
+    "start_after": ("start_before", PREDECESSORS),
+    "finish_before": ("finish_before", SUCCESSORS),
+    "finish_after": ("finish_before", PREDECESSORS),
+}
+
+# Relations the critical path runs through
+SCHEDULE_RELATIONS = ["start_before", "finish_before"]
+
+# The first and the next issue of a relation row, in the order of the dependency
+FIRST_ISSUE = "CASE WHEN r.relation_type = ANY(%(reversed)s) THEN r.related_issue_id ELSE r.issue_id END"
+NEXT_ISSUE = "CASE WHEN r.relation_type = ANY(%(reversed)s) THEN r.issue_id ELSE r.related_issue_id END"
+
+
+def get_edge_condition(direction, node):
+    """
+    Match the relations leaving the node in the direction, split on the stored
+    column so each side is served by the index of its foreign key
+    """
+    first, other = ("related_issue_id", "issue_id") if direction == SUCCESSORS else ("issue_id", "related_issue_id")
+    return f"""
+        r.deleted_at IS NULL
+        AND r.relation_type = ANY(%(relation_types)s)
+        AND (
+            (r.relation_type = ANY(%(reversed)s) AND r.{first} = {node})
+            OR (r.relation_type <> ALL(%(reversed)s) AND r.{other} = {node})
+        )
+    """
+
+
+def get_dependency_edges(issue_id, relation_types, direction=SUCCESSORS):
+    """
+    Return every (first, next) dependency reachable from the issue in the
+    direction with a single recursive query, each relation is walked once
+    so cycles end the walk
+    """
+    next_node = "walk.next_issue_id" if direction == SUCCESSORS else "walk.first_issue_id"
+    query = f"""
+        WITH RECURSIVE walk(first_issue_id, next_issue_id) AS (
+            SELECT {FIRST_ISSUE}, {NEXT_ISSUE}
+            FROM {IssueRelation._meta.db_table} r
+            WHERE {get_edge_condition(direction, "%(issue_id)s::uuid")}
+            UNION
+            SELECT {FIRST_ISSUE}, {NEXT_ISSUE}
+            FROM walk
+            JOIN {IssueRelation._meta.db_table} r ON {get_edge_condition(direction, next_node)}
+        )
+        SELECT first_issue_id, next_issue_id FROM walk
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            query,
+            {"issue_id": str(issue_id), "relation_types": list(relation_types), "reversed": REVERSED_RELATIONS},
+        )
+        return cursor.fetchall()
+
+
+def get_transitive_issue_ids(issue_id, relation_type):
+    """Return the ids of the issues the client relation type reaches from the issue, recursively"""
+    stored_relation, direction = TRANSITIVE_RELATIONS[relation_type]
+    edges = get_dependency_edges(issue_id, [stored_relation], direction)
+    issue_ids = {str(edge[1] if direction == SUCCESSORS else edge[0]) for edge in edges}
+    issue_ids.discard(str(issue_id))
+    return issue_ids
+
+
+def creates_cycle(first_issue_id, next_issue_id):
+    """
+    Check if making the first issue come before the next one closes a cycle,
+    that is if the next issue already comes before the first one. The walk
+    stops at the first path found.
+    """
+    if str(first_issue_id) == str(next_issue_id):
+        return True
+
+    query = f"""
+        WITH RECURSIVE walk(issue_id) AS (
+            SELECT %(issue_id)s::uuid
+            UNION
+            SELECT {NEXT_ISSUE}
+            FROM walk
+            JOIN {IssueRelation._meta.db_table} r ON {get_edge_condition(SUCCESSORS, "walk.issue_id")}
+        )
+        SELECT EXISTS (SELECT 1 FROM walk WHERE issue_id = %(target_id)s::uuid)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            query,
+            {
+                "issue_id": str(next_issue_id),
+                "target_id": str(first_issue_id),
+                "relation_types": DEPENDENCY_RELATIONS,
+                "reversed": REVERSED_RELATIONS,
+            },
+        )
+        return cursor.fetchone()[0]
+
+
+def get_longest_path(edges, weights, default_weight=1):
+    """
+    Return the heaviest path of the dependency graph and its weight. Issues
+    on a cycle can not be ordered and are left out.
+    """
+    successors = defaultdict(list)
+    in_degree = defaultdict(int)
+    nodes = set()
+    for first, following in set(edges):
+        successors[first].append(following)
+        in_degree[following] += 1
+        nodes.update((first, following))
+
+    # Heaviest path ending at each issue, final once the issue comes out of the queue
+    best = {node: weights.get(node, default_weight) for node in nodes}
+    previous = {}
+    ordered = []
+    queue = deque(node for node in nodes if not in_degree[node])
+    while queue:
+        node = queue.popleft()
+        ordered.append(node)
+        for following in successors[node]:
+            if best[node] + weights.get(following, default_weight) > best[following]:
+                best[following] = best[node] + weights.get(following, default_weight)
+                previous[following] = node
+            in_degree[following] -= 1
+            if not in_degree[following]:
+                queue.append(following)
+
+    if not ordered:
+        return [], 0
+
+    last = max(ordered, key=lambda node: best[node])
+    path = [last]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    return path[::-1], best[last]
+
+
+def get_issue_duration(start_date, target_date):
+    """Days an issue is scheduled over, issues without a schedule count as one day"""
+    if start_date is None or target_date is None or target_date < start_date:
+        return 1
+    return (target_date - start_date).days + 1
+
+
+def get_critical_path(issue_id):
+    """
+    Return the longest chain of start_before and finish_before dependencies
+    running through the issue, weighted by the scheduled days of its issues
+    """
+    edges = get_dependency_edges(issue_id, SCHEDULE_RELATIONS, PREDECESSORS) + get_dependency_edges(
+        issue_id, SCHEDULE_RELATIONS, SUCCESSORS
+    )
+    issue_ids = {issue_id} | {node for edge in edges for node in edge}
+    weights = {
+        str(pk): get_issue_duration(start_date, target_date)
+        for pk, start_date, target_date in Issue.issue_objects.filter(id__in=issue_ids).values_list(
+            "id", "start_date", "target_date"
+        )
+    }
+
+    if not edges:
+        return [str(issue_id)], weights.get(str(issue_id), 1)
+    # Every other issue of the walk comes before or after the issue, so the heaviest path runs through it
+    return get_longest_path([(str(first), str(following)) for first, following in edges], weights)
@@ -9,16 +9,26 @@ import re
 from django.db.models import Q
 
 # Module imports
+from kardon.db.models import Project
+from kardon.utils.search import search_queryset
 
 
-def search_issues(query, queryset):
-    fields = ["name", "sequence_id", "project__identifier"]
+def search_issues(query, queryset, slug=None):
+    """Search the issues by name, sequence id and project identifier, best matches first"""
+    query = query.strip()
     q = Q()
-    for field in fields:
-        if field == "sequence_id" and len(query) <= 20:
-            sequences = re.findall(r"\b\d+\b", query)
-            for sequence_id in sequences:
-                q |= Q(**{"sequence_id": sequence_id})
-        else:
-            q |= Q(**{f"{field}__icontains": query})
-    return queryset.filter(q).distinct()
+    if len(query) <= 20:
+        # Match whole integers only (exclude decimal numbers)
+        sequences = re.findall(r"\b\d+\b", query)
+        if sequences:
+            q |= Q(sequence_id__in=sequences)
+
+    # Resolve the matching projects first so every condition is on the issues table
+    projects = Project.objects.filter(identifier__icontains=query)
+    if slug:
+        projects = projects.filter(workspace__slug=slug)
+    project_ids = list(projects.values_list("id", flat=True))
+    if project_ids:
+        q |= Q(project_id__in=project_ids)
+
+    return search_queryset(queryset, query, extra=q)
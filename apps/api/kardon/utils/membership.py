@@ -0,0 +1,105 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import uuid
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+
+# Module imports
+from kardon.db.models import ProjectMember, WorkspaceMember
+
+MEMBERSHIP_CACHE_KEY_PREFIX = "membership"
+MEMBERSHIP_VERSION_KEY_PREFIX = "membership_version"
+
+
+def get_membership_version(user_id):
+    """Return the version of the user's cached memberships"""
+    version_key = f"{MEMBERSHIP_VERSION_KEY_PREFIX}:{user_id}"
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another request may have set the version in the meantime
+        if not cache.add(version_key, version, settings.MEMBERSHIP_CACHE_TIMEOUT):
+            version = cache.get(version_key, version)
+    return version
+
+
+def invalidate_membership_cache(user_ids):
+    """Drop the cached memberships of the users by bumping their versions"""
+    if not settings.MEMBERSHIP_CACHE_TIMEOUT:
+        return
+    cache.set_many(
+        {f"{MEMBERSHIP_VERSION_KEY_PREFIX}:{user_id}": uuid.uuid4().hex for user_id in set(user_ids)},
+        settings.MEMBERSHIP_CACHE_TIMEOUT,
+    )
+
+
+def load_workspace_membership(user_id, slug):
+    """Load the active roles of the user in the workspace and its projects"""
+    workspace_role = (
+        WorkspaceMember.objects.filter(member_id=user_id, workspace__slug=slug, is_active=True)
+        .values_list("role", flat=True)
+        .first()
+    )
+    projects = {}
+    identifiers = {}
+    for project_id, identifier, role in ProjectMember.objects.filter(
+        member_id=user_id, workspace__slug=slug, is_active=True
+    ).values_list("project_id", "project__identifier", "role"):
+        projects[str(project_id)] = role
+        identifiers[identifier] = role
+
+    return {"workspace_role": workspace_role, "projects": projects, "identifiers": identifiers}
+
+
+def get_workspace_membership(request, slug):
+    """
+    Return the roles of the requesting user in the workspace, loaded once per
+    request and shared by every permission check of the request
+    """
+    # Keep the roles on the django request so the DRF request wrappers share them
+    http_request = getattr(request, "_request", request)
+    memberships = http_request.__dict__.setdefault("_workspace_memberships", {})
+
+    if slug not in memberships:
+        user_id = request.user.id
+        if settings.MEMBERSHIP_CACHE_TIMEOUT:
+            cache_key = f"{MEMBERSHIP_CACHE_KEY_PREFIX}:{user_id}:{slug}:{get_membership_version(user_id)}"
+            membership = cache.get(cache_key)
+            if membership is None:
+                membership = load_workspace_membership(user_id, slug)
+                cache.set(cache_key, membership, settings.MEMBERSHIP_CACHE_TIMEOUT)
+        else:
+            membership = load_workspace_membership(user_id, slug)
+        memberships[slug] = membership
+
+    return memberships[slug]
+
+
+def get_workspace_role(request, slug):
+    """Return the active workspace role of the user, None when not a member"""
+    return get_workspace_membership(request, slug)["workspace_role"]
+
+
+def get_project_role(request, slug, project_id):
+    """Return the active project role of the user, None when not a member"""
+    return get_workspace_membership(request, slug)["projects"].get(str(project_id))
+
+
+def get_project_role_by_identifier(request, slug, identifier):
+    """Return the active project role of the user from the project identifier"""
+    return get_workspace_membership(request, slug)["identifiers"].get(identifier)
+
+
+def is_project_member_in_workspace(request, slug):
+    """Return whether the user is an active member of any project of the workspace"""
+    return bool(get_workspace_membership(request, slug)["projects"])
+
+
+def get_member_project_ids(request, slug):
+    """Return the ids of the workspace projects the user is an active member of"""
+    return list(get_workspace_membership(request, slug)["projects"])
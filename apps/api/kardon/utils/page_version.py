@@ -0,0 +1,166 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import json
+import struct
+import zlib
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import Page, PageVersion
+from kardon.utils.delta import apply_delta, create_delta
+from kardon.utils.html_processor import strip_tags
+
+# Versions kept per page, with the snapshots the kept deltas are built on
+MAX_PAGE_VERSIONS = 20
+
+# Marks a field without value in the delta
+NO_VALUE = -1
+
+
+def get_content_fields(description_html, description_binary, description_json):
+    """Return the versioned fields of a page as bytes, None for a missing binary"""
+    return [
+        (description_html or "").encode("utf-8"),
+        bytes(description_binary) if description_binary is not None else None,
+        json.dumps(description_json).encode("utf-8"),
+    ]
+
+
+def encode_page_delta(base, fields):
+    """Compress the fields as deltas from the fields of the base snapshot"""
+    base_fields = get_content_fields(base.description_html, base.description_binary, base.description_json)
+    sections = []
+    for source, target in zip(base_fields, fields):
+        if target is None:
+            sections.append(struct.pack(">i", NO_VALUE))
+        else:
+            delta = create_delta(source or b"", target)
+            sections.append(struct.pack(">i", len(delta)) + delta)
+    return zlib.compress(b"".join(sections))
+
+
+def rebuild_page_content(base_html, base_binary, base_json, delta):
+    """Apply a delta to the fields of its snapshot, returns the fields of the version"""
+    data = zlib.decompress(bytes(delta))
+    fields = []
+    position = 0
+    for source in get_content_fields(base_html, base_binary, base_json):
+        (length,) = struct.unpack_from(">i", data, position)
+        position += 4
+        if length == NO_VALUE:
+            fields.append(None)
+            continue
+        fields.append(apply_delta(source or b"", data[position : position + length]))
+        position += length
+
+    description_html, description_binary, description_json = fields
+    description_html = description_html.decode("utf-8")
+    return {
+        "description_html": description_html,
+        "description_binary": description_binary,
+        "description_json": json.loads(description_json),
+        # Same as a snapshot gets on save
+        "description_stripped": None if description_html == "" else strip_tags(description_html),
+    }
+
+
+def load_page_version(page_version):
+    """Fill the content of a delta version from its snapshot, snapshots are returned as they are"""
+    if page_version.delta is not None:
+        base = page_version.base
+        content = rebuild_page_content(
+            base.description_html, base.description_binary, base.description_json, page_version.delta
+        )
+        for field, value in content.items():
+            setattr(page_version, field, value)
+    return page_version
+
+
+def trim_page_versions(page_id):
+    """
+    Soft delete the versions past the latest MAX_PAGE_VERSIONS of the page in a
+    single statement, the snapshots of the kept versions are kept with them
+    """
+    table = PageVersion._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH kept AS (
+                SELECT id, base_id FROM {table}
+                WHERE page_id = %(page_id)s AND deleted_at IS NULL
+                ORDER BY created_at DESC
+                LIMIT %(limit)s
+            )
+            UPDATE {table} SET deleted_at = %(now)s
+            WHERE page_id = %(page_id)s
+                AND deleted_at IS NULL
+                AND id NOT IN (SELECT id FROM kept UNION SELECT base_id FROM kept WHERE base_id IS NOT NULL)
+            """,
+            {"page_id": page_id, "limit": MAX_PAGE_VERSIONS, "now": timezone.now()},
+        )
+
+
+def save_page_version(page, user_id):
+    """
+    Record the current content of the page as a version.
+
+    A save of the same user within the coalesce window replaces their latest
+    version. Versions are stored as a compressed delta from the latest full
+    snapshot, a new snapshot is taken every PAGE_VERSION_SNAPSHOT_INTERVAL
+    versions or when the delta is no longer worth it.
+    """
+    fields = get_content_fields(page.description_html, page.description_binary, page.description_json)
+
+    with transaction.atomic():
+        # Lock the page so the versions of concurrent saves are recorded one after the other
+        Page.objects.select_for_update().filter(pk=page.id).values_list("id", flat=True).first()
+
+        latest = PageVersion.objects.filter(page_id=page.id).select_related("base").order_by("-created_at").first()
+        coalesce = (
+            latest is not None
+            and str(latest.owned_by_id) == str(user_id)
+            and page.updated_at - latest.last_saved_at <= timedelta(seconds=settings.PAGE_VERSION_COALESCE_WINDOW)
+        )
+
+        if coalesce:
+            page_version = latest
+            base = latest.base
+        else:
+            page_version = PageVersion(page_id=page.id, workspace_id=page.workspace_id, owned_by_id=user_id)
+            base = (latest.base or latest) if latest is not None else None
+            if (
+                base is not None
+                and PageVersion.objects.filter(base=base).count() >= settings.PAGE_VERSION_SNAPSHOT_INTERVAL - 1
+            ):
+                base = None
+
+        delta = encode_page_delta(base, fields) if base is not None else None
+        # Deltas larger than half of the content are stored as a snapshot instead
+        if delta is not None and len(delta) * 2 < sum(len(field) for field in fields if field is not None):
+            page_version.base = base
+            page_version.delta = delta
+            page_version.description_html = ""
+            page_version.description_binary = None
+            page_version.description_json = {}
+        else:
+            page_version.base = None
+            page_version.delta = None
+            page_version.description_html = page.description_html
+            page_version.description_binary = page.description_binary
+            page_version.description_json = page.description_json
+
+        page_version.last_saved_at = page.updated_at
+        page_version.save()
+
+        if not coalesce:
+            trim_page_versions(page.id)
+
+    return page_version
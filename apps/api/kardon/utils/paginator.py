@@ -3,12 +3,20 @@
 # See the LICENSE file for details.
 
 # Python imports
+import base64
+import hashlib
+import json
 import math
 from collections import defaultdict
 from collections.abc import Sequence
+from functools import reduce
+from operator import and_, or_
 
 # Django imports
-from django.db.models import Count, F, Window
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Count, F, Q, Window
 from django.db.models.functions import RowNumber
 
 # Third party imports
@@ -18,22 +26,31 @@ from rest_framework.response import Response
 # Module imports
 
 
+# Query parameter value opting a request into keyset cursors
+KEYSET_CURSOR_MODE = "keyset"
+
+
 class Cursor:
     # The cursor value
-    def __init__(self, value, offset=0, is_prev=False, has_results=None):
+    def __init__(self, value, offset=0, is_prev=False, has_results=None, keyset=None):
         self.value = value
         self.offset = int(offset)
         self.is_prev = bool(is_prev)
         self.has_results = has_results
+        # Boundary rows of a keyset cursor, None for offset cursors
+        self.keyset = keyset
 
     # Return the cursor value in string format
     def __str__(self):
+        if self.keyset is not None:
+            return f"{self.value}:{self.offset}:{int(self.is_prev)}:{self.encode_keyset(self.keyset)}"
         return f"{self.value}:{self.offset}:{int(self.is_prev)}"
 
     # Return the cursor value
     def __eq__(self, other):
         return all(
-            getattr(self, attr) == getattr(other, attr) for attr in ("value", "offset", "is_prev", "has_results")
+            getattr(self, attr) == getattr(other, attr)
+            for attr in ("value", "offset", "is_prev", "has_results", "keyset")
         )
 
     # Return the representation of the cursor
@@ -44,16 +61,31 @@ class Cursor:
     def __bool__(self):
         return bool(self.has_results)
 
+    @staticmethod
+    def encode_keyset(keyset):
+        """Encode the keyset boundary rows into an url safe string"""
+        data = json.dumps(keyset, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    @staticmethod
+    def decode_keyset(value):
+        """Decode the keyset boundary rows from the url safe string"""
+        keyset = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+        if not isinstance(keyset, list) or not all(isinstance(entry, list) for entry in keyset):
+            raise ValueError("Keyset must be a list of rows")
+        return keyset
+
     @classmethod
     def from_string(cls, value):
         """Return the cursor value from string format"""
         try:
             bits = value.split(":")
-            if len(bits) != 3:
-                raise ValueError("Cursor must be in the format 'value:offset:is_prev'")
+            if len(bits) not in (3, 4):
+                raise ValueError("Cursor must be in the format 'value:offset:is_prev' or 'value:offset:is_prev:keyset'")
 
             value = float(bits[0]) if "." in bits[0] else int(bits[0])
-            return cls(value, int(bits[1]), bool(int(bits[2])))
+            keyset = cls.decode_keyset(bits[3]) if len(bits) == 4 else None
+            return cls(value, int(bits[1]), bool(int(bits[2])), keyset=keyset)
         except (TypeError, ValueError) as e:
             raise ValueError(f"Invalid cursor format: {e}")
 
@@ -90,6 +122,114 @@ class BadPaginationError(Exception):
     pass
 
 
+# Query parameter value asking for planner estimated totals
+ESTIMATE_COUNT_MODE = "estimate"
+# Below this many planned rows the exact count is cheap enough to run
+ESTIMATE_COUNT_THRESHOLD = 10000
+# Counts are reused by the following cursor requests of the same filter
+COUNT_CACHE_TIMEOUT = 30
+
+
+def get_queryset_fingerprint(queryset, *scope):
+    """Return a digest of the compiled query, identifying the normalized filter"""
+    sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    return hashlib.sha256(f"{scope}:{sql}:{params}".encode()).hexdigest()
+
+
+def cache_count(queryset, scope, compute):
+    """Return the counts computed for the queryset filter, reusing them for a short while"""
+    try:
+        key = f"paginator_count:{get_queryset_fingerprint(queryset, *scope)}"
+    except EmptyResultSet:
+        return compute()
+
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute()
+        cache.set(key, counts, COUNT_CACHE_TIMEOUT)
+    return counts
+
+
+def estimate_count(queryset):
+    """Return the number of rows the planner expects the queryset to return"""
+    try:
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    except EmptyResultSet:
+        return 0
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_largest_group_count(queryset, group_by_field_name, count_filter):
+    """Return the row count of the largest group"""
+
+    def compute():
+        largest_group = (
+            queryset.values(group_by_field_name)
+            .annotate(count=Count("id", filter=count_filter, distinct=True))
+            .order_by("-count")
+            .first()
+        )
+        return largest_group["count"] if largest_group else 0
+
+    return cache_count(queryset, ("largest_group", group_by_field_name, str(count_filter)), compute)
+
+
+def keyset_order(columns, reverse=False):
+    """Return the order by expressions walking the keyset columns"""
+    order = []
+    for field, desc, _ in columns:
+        # Walking backwards flips the direction and moves the nulls first
+        if desc != reverse:
+            order.append(F(field).desc(nulls_first=True) if reverse else F(field).desc(nulls_last=True))
+        else:
+            order.append(F(field).asc(nulls_first=True) if reverse else F(field).asc(nulls_last=True))
+    return order
+
+
+def keyset_filter(columns, values, after=True, inclusive=False):
+    """
+    Return the condition selecting the rows after (or before) the boundary row
+    in the order of the keyset columns, nulls being sorted last
+    """
+    conditions = []
+    equal = Q()
+    for (field, desc, nullable), value in zip(columns, values):
+        if after:
+            if value is not None:
+                condition = Q(**{f"{field}__lt" if desc else f"{field}__gt": value})
+                if nullable:
+                    condition |= Q(**{f"{field}__isnull": True})
+                conditions.append(equal & condition)
+        else:
+            if value is None:
+                conditions.append(equal & Q(**{f"{field}__isnull": False}))
+            else:
+                conditions.append(equal & Q(**{f"{field}__gt" if desc else f"{field}__lt": value}))
+        equal &= Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value})
+
+    if inclusive:
+        conditions.append(equal)
+    return reduce(or_, conditions) if conditions else Q(pk__in=[])
+
+
+def keyset_group_filter(group_aliases, values):
+    """Return the condition selecting the rows of a single group"""
+    return reduce(
+        and_,
+        [
+            Q(**{f"{alias}__isnull": True}) if value is None else Q(**{alias: value})
+            for alias, value in zip(group_aliases, values)
+        ],
+        Q(),
+    )
+
+
 class OffsetPaginator:
     """
     The Offset paginator using the offset and limit
@@ -98,6 +238,9 @@ class OffsetPaginator:
     cursor=limit,offset=page,
     """
 
+    # Reuse the total count of the same filter for COUNT_CACHE_TIMEOUT seconds
+    cache_counts = False
+
     def __init__(
         self,
         queryset,
@@ -106,6 +249,7 @@ class OffsetPaginator:
         max_offset=None,
         on_results=None,
         total_count_queryset=None,
+        count_mode=None,
     ):
         # Key tuple and remove `-` if descending order by
         self.key = (
@@ -120,6 +264,20 @@ class OffsetPaginator:
         self.max_offset = max_offset
         self.on_results = on_results
         self.total_count_queryset = total_count_queryset
+        self.count_mode = count_mode
+
+    def get_total_count(self, queryset):
+        """
+        Return the row count of the queryset, using the planner estimate
+        for very large sets when the estimate count mode is requested
+        """
+        if self.count_mode == ESTIMATE_COUNT_MODE:
+            estimate = estimate_count(queryset)
+            if estimate >= ESTIMATE_COUNT_THRESHOLD:
+                return estimate
+        if self.cache_counts:
+            return cache_count(queryset, ("count",), queryset.count)
+        return queryset.count()
 
     def get_result(self, limit=1000, cursor=None):
         # offset is page #
@@ -130,6 +288,22 @@ class OffsetPaginator:
         # Get the min from limit and max limit
         limit = min(limit, self.max_limit)
 
+        # Seek from the boundary row when a keyset cursor is passed
+        if cursor.keyset is not None:
+            results, next_cursor, prev_cursor = self.get_keyset_result(self.queryset, limit, cursor)
+            count = self.get_total_count(
+                self.total_count_queryset if self.total_count_queryset is not None else self.queryset
+            )
+            if self.on_results:
+                results = self.on_results(results)
+            return CursorResult(
+                results=results,
+                next=next_cursor,
+                prev=prev_cursor,
+                hits=count,
+                max_hits=math.ceil(count / limit),
+            )
+
         # queryset
         queryset = self.queryset
         if self.key:
@@ -156,7 +330,9 @@ class OffsetPaginator:
         if cursor.value != limit and cursor.is_prev:
             results = results[-(limit + 1) :]
 
-        total_count = self.total_count_queryset.count() if self.total_count_queryset else queryset.count()
+        total_count = self.get_total_count(
+            self.total_count_queryset if self.total_count_queryset is not None else queryset
+        )
 
         # Check if there are more results available after the current page
 
@@ -187,6 +363,151 @@ class OffsetPaginator:
             max_hits=max_hits,
         )
 
+    def get_keyset_columns(self):
+        """Return the (field, descending, nullable) columns giving every row a unique position"""
+        columns = [(self.key[0], self.desc, True)] if self.key else []
+        for field in ("created_at", "id"):
+            if field not in [column[0] for column in columns]:
+                columns.append((field, True, False))
+        return columns
+
+    def get_keyset_pages(self, queryset, group_aliases, columns, limit, condition=None, reverse=False):
+        """Return the first limit + 1 rows of every group matching the condition, walking the keyset order"""
+        if condition is not None:
+            queryset = queryset.filter(condition)
+
+        column_names = [field for field, _, _ in columns]
+        order = keyset_order(columns, reverse=reverse)
+        if group_aliases:
+            # Take the first limit + 1 rows of every group in a single query
+            rows = (
+                queryset.annotate(
+                    row_number=Window(
+                        expression=RowNumber(),
+                        partition_by=[F(alias) for alias in group_aliases],
+                        order_by=order,
+                    )
+                )
+                .filter(row_number__lte=limit + 1)
+                .order_by("row_number")
+                .values_list(*group_aliases, *column_names)
+            )
+        else:
+            rows = queryset.order_by(*order).values_list(*column_names)[: limit + 1]
+
+        pages = {}
+        for row in rows:
+            pages.setdefault(tuple(row[: len(group_aliases)]), []).append(list(row[len(group_aliases) :]))
+        return pages
+
+    def get_keyset_result(self, queryset, limit, cursor, group_by_field_names=()):
+        """
+        Seek the page following (or preceding) the cursor boundary rows of
+        every group instead of skipping rows with an offset.
+
+        The keyset holds a [*group, *boundary row] entry for every group still
+        walked, and a [*group, *first row of its last page, last page] entry
+        for every group whose rows ran out, so walking back brings the group
+        back on the page it ended on.
+        """
+        columns = self.get_keyset_columns()
+        group_aliases = [f"keyset_group_{index}" for index, _ in enumerate(group_by_field_names)]
+        group_size = len(group_aliases)
+        # Filter on aliases so the m2m group fields reuse the grouping join
+        queryset = queryset.annotate(**{alias: F(field) for alias, field in zip(group_aliases, group_by_field_names)})
+
+        entries = cursor.keyset or []
+        walked = [entry for entry in entries if len(entry) == group_size + len(columns)]
+        ended = [entry for entry in entries if len(entry) == group_size + len(columns) + 1]
+
+        if not entries:
+            # The first page starts every group from the top
+            pages = self.get_keyset_pages(queryset, group_aliases, columns, limit)
+        elif walked:
+            pages = self.get_keyset_pages(
+                queryset,
+                group_aliases,
+                columns,
+                limit,
+                condition=reduce(
+                    or_,
+                    [
+                        keyset_group_filter(group_aliases, entry[:group_size])
+                        & keyset_filter(columns, entry[group_size:], after=not cursor.is_prev)
+                        for entry in walked
+                    ],
+                ),
+                reverse=cursor.is_prev,
+            )
+        else:
+            pages = {}
+
+        # Walking forward, a group continues only when it has rows past this page
+        continued = {group for group, page in pages.items() if cursor.is_prev or len(page) > limit}
+        for group, page in pages.items():
+            pages[group] = page[:limit][::-1] if cursor.is_prev else page[:limit]
+
+        # Walking back onto the page a group ended on brings its last rows back
+        revived = [entry for entry in ended if cursor.is_prev and entry[-1] == cursor.offset]
+        if revived:
+            revived_pages = self.get_keyset_pages(
+                queryset,
+                group_aliases,
+                columns,
+                limit,
+                condition=reduce(
+                    or_,
+                    [
+                        keyset_group_filter(group_aliases, entry[:group_size])
+                        & keyset_filter(columns, entry[group_size:-1], after=True, inclusive=True)
+                        for entry in revived
+                    ],
+                ),
+            )
+            pages.update({group: page[:limit] for group, page in revived_pages.items()})
+        paged = {tuple(str(value) for value in group) for group in pages}
+        ended = [
+            entry
+            for entry in ended
+            if entry not in revived and tuple(str(value) for value in entry[:group_size]) not in paged
+        ]
+
+        # Select the rows lying between the first and the last row of every group page
+        if pages:
+            results = queryset.filter(
+                reduce(
+                    or_,
+                    [
+                        keyset_group_filter(group_aliases, group)
+                        & keyset_filter(columns, page[0], after=True, inclusive=True)
+                        & keyset_filter(columns, page[-1], after=False, inclusive=True)
+                        for group, page in pages.items()
+                    ],
+                )
+            ).order_by(*keyset_order(columns))
+        else:
+            results = queryset.none()
+
+        page = cursor.offset
+        next_keyset = [[*group, *group_page[-1]] for group, group_page in pages.items() if group in continued]
+        next_cursor = Cursor(
+            limit,
+            page + 1,
+            False,
+            bool(next_keyset),
+            keyset=next_keyset
+            + ended
+            + [[*group, *group_page[0], page] for group, group_page in pages.items() if group not in continued],
+        )
+        prev_cursor = Cursor(
+            limit,
+            page - 1,
+            True,
+            page > 0,
+            keyset=[[*group, *group_page[0]] for group, group_page in pages.items()] + ended,
+        )
+        return results, next_cursor, prev_cursor
+
     def process_results(self, results):
         raise NotImplementedError
 
@@ -199,6 +520,9 @@ class GroupedOffsetPaginator(OffsetPaginator):
         "issue_module__module_id": "module_ids",
     }
 
+    # The issue boards fetch the same totals for every cursor of a filter
+    cache_counts = True
+
     def __init__(
         self,
         queryset,
@@ -228,6 +552,23 @@ class GroupedOffsetPaginator(OffsetPaginator):
 
         limit = min(limit, self.max_limit)
 
+        # Seek every group from its boundary row when a keyset cursor is passed
+        if cursor.keyset is not None:
+            results, next_cursor, prev_cursor = self.get_keyset_result(
+                self.queryset, limit, cursor, group_by_field_names=(self.group_by_field_name,)
+            )
+            count = self.get_total_count(self.queryset)
+            max_hits = math.ceil(
+                get_largest_group_count(self.queryset, self.group_by_field_name, self.count_filter) / limit
+            )
+            return CursorResult(
+                results=results,
+                next=next_cursor,
+                prev=prev_cursor,
+                hits=count,
+                max_hits=max_hits,
+            )
+
         # Adjust the initial offset and stop based on the cursor and limit
         queryset = self.queryset
 
@@ -272,20 +613,13 @@ class GroupedOffsetPaginator(OffsetPaginator):
         # Add previous cursors
         prev_cursor = Cursor(limit, page - 1, True, page > 0)
 
-        # Count the queryset
-        count = queryset.count()
+        # Count the queryset, reusing the counts of the same filter
+        count = self.get_total_count(self.queryset)
 
-        # Optionally, calculate the total count and max_hits if needed
-        # This might require adjustments based on specific use cases
-        if results:
-            max_hits = math.ceil(
-                queryset.values(self.group_by_field_name)
-                .annotate(count=Count("id", filter=self.count_filter, distinct=True))
-                .order_by("-count")[0]["count"]
-                / limit
-            )
-        else:
-            max_hits = 0
+        # Calculate the max_hits from the largest group
+        max_hits = math.ceil(
+            get_largest_group_count(self.queryset, self.group_by_field_name, self.count_filter) / limit
+        )
         return CursorResult(
             results=results,
             next=next_cursor,
@@ -303,6 +637,14 @@ class GroupedOffsetPaginator(OffsetPaginator):
         )
 
     def __get_total_dict(self):
+        # Reuse the group totals computed for the same filter by the previous cursors
+        return cache_count(
+            self.queryset,
+            ("group_totals", self.group_by_field_name, str(self.count_filter)),
+            self.__compute_total_dict,
+        )
+
+    def __compute_total_dict(self):
         # Convert the total into dictionary of keys as group name and value as the total
         total_group_dict = {}
         for group in self.__get_total_queryset():
@@ -394,6 +736,9 @@ class SubGroupedOffsetPaginator(OffsetPaginator):
         "issue_module__module_id": "module_ids",
     }
 
+    # The issue boards fetch the same totals for every cursor of a filter
+    cache_counts = True
+
     def __init__(
         self,
         queryset,
@@ -430,6 +775,26 @@ class SubGroupedOffsetPaginator(OffsetPaginator):
         # get the minimum value
         limit = min(limit, self.max_limit)
 
+        # Seek every sub group from its boundary row when a keyset cursor is passed
+        if cursor.keyset is not None:
+            results, next_cursor, prev_cursor = self.get_keyset_result(
+                self.queryset,
+                limit,
+                cursor,
+                group_by_field_names=(self.group_by_field_name, self.sub_group_by_field_name),
+            )
+            count = self.get_total_count(self.queryset)
+            max_hits = math.ceil(
+                get_largest_group_count(self.queryset, self.group_by_field_name, self.count_filter) / limit
+            )
+            return CursorResult(
+                results=results,
+                next=next_cursor,
+                prev=prev_cursor,
+                hits=count,
+                max_hits=max_hits,
+            )
+
         # Adjust the initial offset and stop based on the cursor and limit
         queryset = self.queryset
 
@@ -477,20 +842,13 @@ class SubGroupedOffsetPaginator(OffsetPaginator):
         # Add previous cursors
         prev_cursor = Cursor(limit, page - 1, True, page > 0)
 
-        # Count the queryset
-        count = queryset.count()
+        # Count the queryset, reusing the counts of the same filter
+        count = self.get_total_count(self.queryset)
 
-        # Optionally, calculate the total count and max_hits if needed
-        # This might require adjustments based on specific use cases
-        if results:
-            max_hits = math.ceil(
-                queryset.values(self.group_by_field_name)
-                .annotate(count=Count("id", filter=self.count_filter, distinct=True))
-                .order_by("-count")[0]["count"]
-                / limit
-            )
-        else:
-            max_hits = 0
+        # Calculate the max_hits from the largest group
+        max_hits = math.ceil(
+            get_largest_group_count(self.queryset, self.group_by_field_name, self.count_filter) / limit
+        )
         return CursorResult(
             results=results,
             next=next_cursor,
@@ -518,6 +876,19 @@ class SubGroupedOffsetPaginator(OffsetPaginator):
         )
 
     def __get_total_dict(self):
+        # Reuse the group and sub group totals computed for the same filter by the previous cursors
+        return cache_count(
+            self.queryset,
+            (
+                "sub_group_totals",
+                self.group_by_field_name,
+                self.sub_group_by_field_name,
+                str(self.count_filter),
+            ),
+            self.__compute_total_dict,
+        )
+
+    def __compute_total_dict(self):
         # Use the above to convert to dictionary of 2D objects
         total_group_dict = {}
         total_sub_group_dict = {}
@@ -679,6 +1050,10 @@ class BasePaginator:
         except ValueError:
             raise ParseError(detail="Invalid cursor parameter.")
 
+        # Start walking with keyset cursors, which are then carried by the cursor itself
+        if request.GET.get("cursor_mode") == KEYSET_CURSOR_MODE and input_cursor.keyset is None:
+            input_cursor.keyset = []
+
         if not paginator:
             if group_by_field_name:
                 paginator_kwargs["group_by_field_name"] = group_by_field_name
@@ -690,6 +1065,7 @@ class BasePaginator:
                     paginator_kwargs["sub_group_by_fields"] = sub_group_by_fields
 
             paginator_kwargs["total_count_queryset"] = total_count_queryset
+            paginator_kwargs["count_mode"] = request.GET.get("count_mode")
 
             paginator = paginator_cls(**paginator_kwargs)
 
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
-from kardon.db.models import WorkspaceMember, ProjectMember
+from kardon.utils.membership import get_project_role, get_workspace_role
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
@@ -31,39 +31,15 @@ def allow_permission(allowed_roles, level="PROJECT", creator=False, model=None):
 
             # Check role permissions
             if level == "WORKSPACE":
-                if WorkspaceMember.objects.filter(
-                    member=request.user,
-                    workspace__slug=kwargs["slug"],
-                    role__in=allowed_role_values,
-                    is_active=True,
-                ).exists():
+                if get_workspace_role(request, kwargs["slug"]) in allowed_role_values:
                     return view_func(instance, request, *args, **kwargs)
             else:
-                is_user_has_allowed_role = ProjectMember.objects.filter(
-                    member=request.user,
-                    workspace__slug=kwargs["slug"],
-                    project_id=kwargs["project_id"],
-                    role__in=allowed_role_values,
-                    is_active=True,
-                ).exists()
+                project_role = get_project_role(request, kwargs["slug"], kwargs["project_id"])
 
                 # Return if the user has the allowed role else if they are workspace admin and part of the project regardless of the role # noqa: E501
-                if is_user_has_allowed_role:
+                if project_role in allowed_role_values:
                     return view_func(instance, request, *args, **kwargs)
-                elif (
-                    ProjectMember.objects.filter(
-                        member=request.user,
-                        workspace__slug=kwargs["slug"],
-                        project_id=kwargs["project_id"],
-                        is_active=True,
-                    ).exists()
-                    and WorkspaceMember.objects.filter(
-                        member=request.user,
-                        workspace__slug=kwargs["slug"],
-                        role=ROLE.ADMIN.value,
-                        is_active=True,
-                    ).exists()
-                ):
+                elif project_role is not None and get_workspace_role(request, kwargs["slug"]) == ROLE.ADMIN.value:
                     return view_func(instance, request, *args, **kwargs)
 
             # Return permission denied if no conditions are met
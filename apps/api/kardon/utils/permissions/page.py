@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
-from kardon.db.models import ProjectMember, Page
+from kardon.db.models import Page
 from kardon.app.permissions import ROLE
+from kardon.utils.membership import get_project_role
 
 
 from rest_framework.permissions import BasePermission, SAFE_METHODS
@@ -56,16 +57,7 @@ class ProjectPagePermission(BasePermission):
         """
         Check if the user is a project member.
         """
-        return (
-            ProjectMember.objects.filter(
-                member=request.user,
-                workspace__slug=slug,
-                is_active=True,
-                project_id=project_id,
-            )
-            .values_list("role", flat=True)
-            .first()
-        )
+        return get_project_role(request, slug, project_id)
 
     def _check_access_and_get_role(self, request, slug, project_id):
         """
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 # See the LICENSE file for details.
 
-from typing import Dict, List, Union
+from typing import IO, Dict, Iterator, List, Union
 from .formatters import BaseFormatter, CSVFormatter, JSONFormatter, XLSXFormatter
 
 
@@ -20,6 +20,9 @@ class DataExporter:
         csv_string = exporter.to_string(queryset, CSVFormatter())
     """
 
+    # Rows fetched per round trip of the server side cursor
+    CHUNK_SIZE = 500
+
     # Available formatters
     FORMATTERS = {
         "csv": CSVFormatter,
@@ -89,6 +92,38 @@ class DataExporter:
 
         return full_filename, content
 
+    def iter_serialized(self, queryset, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+        """QuerySet → dicts, fetched in chunks so only one chunk is held in memory"""
+        # A single serializer is bound once and reused for every row
+        serializer = self.serializer_class(**self.serializer_kwargs)
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield serializer.to_representation(instance)
+
+    def get_filename(self, filename: str) -> str:
+        """Base filename → filename with the extension of the configured format"""
+        if not self.formatter:
+            raise ValueError("format_type must be provided during initialization to get the filename")
+        return f"{filename}.{self.formatter.extension}"
+
+    def stream(self, queryset, output: IO[bytes], chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Export queryset into a writable binary stream with configured format.
+
+        Peak memory stays bounded by the chunk size whatever the row count.
+
+        Args:
+            queryset: Django QuerySet to export
+            output: Writable binary stream receiving the content
+            chunk_size: Rows fetched per database round trip
+
+        Raises:
+            ValueError: If format_type was not provided during initialization
+        """
+        if not self.formatter:
+            raise ValueError("format_type must be provided during initialization to use stream() method")
+
+        self.formatter.stream(self.iter_serialized(queryset, chunk_size=chunk_size), output)
+
     def to_string(self, queryset, formatter: BaseFormatter) -> Union[str, bytes]:
         """Export to formatted string (legacy interface)"""
         data = self.serialize(queryset)
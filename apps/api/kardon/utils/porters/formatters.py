@@ -12,8 +12,8 @@ Importer: File/String → Formatter → Serializer → Models
 import csv
 import json
 from abc import ABC, abstractmethod
-from io import BytesIO, StringIO
-from typing import Any, Dict, List, Union
+from io import BytesIO, StringIO, TextIOWrapper
+from typing import IO, Any, Dict, Iterable, List, Union
 
 from openpyxl import Workbook, load_workbook
 
@@ -29,6 +29,10 @@ class BaseFormatter(ABC):
         """Formatted string/bytes → data"""
         pass
 
+    def stream(self, rows: Iterable[Dict], output: IO[bytes]) -> None:
+        """Data → formatted bytes written to output one row at a time"""
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
+
     @property
     @abstractmethod
     def extension(self) -> str:
@@ -45,6 +49,15 @@ class JSONFormatter(BaseFormatter):
     def decode(self, content: str) -> List[Dict]:
         return json.loads(content)
 
+    def stream(self, rows: Iterable[Dict], output: IO[bytes]) -> None:
+        """Write the array one element at a time"""
+        separator = b"["
+        for row in rows:
+            output.write(separator)
+            output.write(json.dumps(row, indent=self.indent, default=str).encode("utf-8"))
+            separator = b",\n"
+        output.write(b"[]" if separator == b"[" else b"]")
+
     @property
     def extension(self) -> str:
         return "json"
@@ -155,6 +168,28 @@ class CSVFormatter(BaseFormatter):
 
         return rows
 
+    def stream(self, rows: Iterable[Dict], output: IO[bytes]) -> None:
+        """
+        Write the rows as they come, the header is taken from the first row
+        as the export serializers return the same fields for every row
+        """
+        text_output = TextIOWrapper(output, encoding="utf-8", newline="", write_through=True)
+        try:
+            writer = csv.writer(text_output, delimiter=self.delimiter)
+            fieldnames = None
+            for row in rows:
+                if self.flatten:
+                    row = self._flatten(row)
+                if fieldnames is None:
+                    fieldnames = list(row.keys())
+                    writer.writerow(
+                        [self._prettify_header(key) for key in fieldnames] if self.prettify_headers else fieldnames
+                    )
+                writer.writerow([row.get(key, "") for key in fieldnames])
+        finally:
+            # Leave the output open for the caller
+            text_output.detach()
+
     @property
     def extension(self) -> str:
         return "csv"
@@ -264,6 +299,20 @@ class XLSXFormatter(BaseFormatter):
 
         return result
 
+    def stream(self, rows: Iterable[Dict], output: IO[bytes]) -> None:
+        """Write the rows through a write only workbook which keeps them out of memory"""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+
+        fieldnames = None
+        for row in rows:
+            if fieldnames is None:
+                fieldnames = list(row.keys())
+                ws.append([self._prettify_header(key) for key in fieldnames] if self.prettify_headers else fieldnames)
+            ws.append([self._format_value(row.get(key, "")) for key in fieldnames])
+
+        wb.save(output)
+
     @property
     def extension(self) -> str:
         return "xlsx"
@@ -0,0 +1,109 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Django imports
+from django.db.models import Count, FloatField, Q, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+# Module imports
+from kardon.db.models import Cycle, CycleProgress, Issue, Module, ModuleProgress
+
+STATE_GROUPS = ["backlog", "unstarted", "started", "completed", "cancelled"]
+
+PROGRESS_FIELDS = (
+    [f"{group}_issues" for group in STATE_GROUPS]
+    + ["total_issues"]
+    + [f"{group}_estimate_points" for group in STATE_GROUPS]
+    + ["total_estimate_points"]
+)
+
+EMPTY_PROGRESS = {field: 0 for field in PROGRESS_FIELDS}
+
+
+def get_progress_aggregates():
+    """Return the aggregates counting the issues and summing the point estimates by state group"""
+    estimate = Cast("estimate_point__value", FloatField())
+    is_points = Q(estimate_point__estimate__type="points")
+
+    aggregates = {
+        "total_issues": Count("id"),
+        "total_estimate_points": Sum(estimate, filter=is_points, default=0.0),
+    }
+    for group in STATE_GROUPS:
+        aggregates[f"{group}_issues"] = Count("id", filter=Q(state__group=group))
+        aggregates[f"{group}_estimate_points"] = Sum(estimate, filter=is_points & Q(state__group=group), default=0.0)
+    return aggregates
+
+
+def refresh_progress(entity_model, progress_model, entity_field, relation, entity_ids):
+    """
+    Recalculate the progress of the cycles or modules in a single pass over
+    their issues and upsert the rows
+    """
+    entity_ids = {str(entity_id) for entity_id in entity_ids}
+    if not entity_ids:
+        return {}
+
+    # Skip the cycles or modules deleted since they were queued
+    entity_ids = {
+        str(entity_id) for entity_id in entity_model.objects.filter(id__in=entity_ids).values_list("id", flat=True)
+    }
+
+    group_key = f"{relation}__{entity_field}_id"
+    aggregates = {
+        str(row.pop(group_key)): row
+        for row in Issue.issue_objects.filter(
+            **{f"{group_key}__in": entity_ids, f"{relation}__deleted_at__isnull": True}
+        )
+        .order_by()
+        .values(group_key)
+        .annotate(**get_progress_aggregates())
+    }
+
+    calculated_at = timezone.now()
+    progress = {entity_id: aggregates.get(entity_id, dict(EMPTY_PROGRESS)) for entity_id in entity_ids}
+    progress_model.all_objects.bulk_create(
+        [
+            progress_model(**{f"{entity_field}_id": entity_id}, **values, calculated_at=calculated_at)
+            for entity_id, values in progress.items()
+        ],
+        update_conflicts=True,
+        unique_fields=[entity_field],
+        update_fields=PROGRESS_FIELDS + ["calculated_at", "updated_at", "deleted_at"],
+    )
+    return progress
+
+
+def refresh_cycle_progress(cycle_ids):
+    """Recalculate and store the progress of the cycles"""
+    return refresh_progress(Cycle, CycleProgress, "cycle", "issue_cycle", cycle_ids)
+
+
+def refresh_module_progress(module_ids):
+    """Recalculate and store the progress of the modules"""
+    return refresh_progress(Module, ModuleProgress, "module", "issue_module", module_ids)
+
+
+def get_cycle_progress(cycle_id):
+    """Return the stored progress of the cycle, calculating it when missing from the store"""
+    progress = CycleProgress.objects.filter(cycle_id=cycle_id).values(*PROGRESS_FIELDS).first()
+    if progress is None:
+        progress = refresh_cycle_progress([cycle_id]).get(str(cycle_id), dict(EMPTY_PROGRESS))
+    return progress
+
+
+def get_module_progress(module_id):
+    """Return the stored progress of the module, calculating it when missing from the store"""
+    progress = ModuleProgress.objects.filter(module_id=module_id).values(*PROGRESS_FIELDS).first()
+    if progress is None:
+        progress = refresh_module_progress([module_id]).get(str(module_id), dict(EMPTY_PROGRESS))
+    return progress
+
+
+def ensure_module_progress(project_id):
+    """Calculate the progress of the project modules missing from the store"""
+    module_ids = list(Module.objects.filter(project_id=project_id, progress__isnull=True).values_list("id", flat=True))
+    if module_ids:
+        refresh_module_progress(module_ids)
@@ -0,0 +1,98 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+from datetime import datetime, timezone as dt_timezone
+
+# Module imports
+from kardon.db.models import UserRecentVisit
+from kardon.settings.redis import redis_instance
+from kardon.utils.exception_logger import log_exception
+
+RECENT_VISITS_KEY = "recent_visits"
+
+# Visits kept per user and workspace
+MAX_RECENT_VISITS = 20
+
+# The sets of users who stop visiting a workspace expire, their visits stay in the database
+RECENT_VISITS_TTL = 60 * 60 * 24 * 30
+
+
+def get_recent_visits_key(slug, user_id):
+    """Return the key of the sorted set of the visits of the user in the workspace"""
+    return f"{RECENT_VISITS_KEY}:{slug}:{user_id}"
+
+
+def get_recent_visitors_key(slug, entity_name, entity_identifier):
+    """Return the key of the set of the users who visited the entity in the workspace"""
+    return f"{RECENT_VISITS_KEY}:visitors:{slug}:{entity_name}:{entity_identifier}"
+
+
+def get_recent_visit_member(entity_name, entity_identifier, project_id):
+    return f"{entity_name}:{entity_identifier}:{project_id or ''}"
+
+
+def parse_recent_visit_member(member):
+    """Return the entity name, entity identifier and project id of a member of the sorted set"""
+    entity_name, entity_identifier, project_id = member.decode().split(":")
+    return entity_name, entity_identifier, project_id or None
+
+
+def get_recent_visits(slug, user):
+    """
+    Return the latest visits of the user in the workspace, newest first. The
+    sorted set holds the visits not flushed yet, the database the visits of
+    before the set expired.
+    """
+    try:
+        members = redis_instance().zrevrange(get_recent_visits_key(slug, user.id), 0, -1, withscores=True)
+    except Exception as e:
+        log_exception(e)
+        members = []
+
+    visits = {
+        (visit.entity_name, str(visit.entity_identifier)): visit
+        for visit in UserRecentVisit.objects.filter(workspace__slug=slug, user=user).order_by("visited_at")
+    }
+    for member, score in members:
+        entity_name, entity_identifier, project_id = parse_recent_visit_member(member)
+        visit = visits.get((entity_name, entity_identifier))
+        if visit is None:
+            # Visits not flushed yet are returned unsaved
+            visit = visits[(entity_name, entity_identifier)] = UserRecentVisit(
+                entity_name=entity_name,
+                entity_identifier=entity_identifier,
+                project_id=project_id,
+                user=user,
+            )
+        visit.visited_at = max(
+            datetime.fromtimestamp(score, tz=dt_timezone.utc),
+            visit.visited_at or datetime.min.replace(tzinfo=dt_timezone.utc),
+        )
+
+    return sorted(visits.values(), key=lambda visit: visit.visited_at, reverse=True)
+
+
+def remove_recent_visits(slug, entity_name, entity_identifier, project_id):
+    """Drop the entity from the sorted sets of the users who visited it, flushed or not"""
+    user_ids = {
+        str(user_id)
+        for user_id in UserRecentVisit.objects.filter(
+            workspace__slug=slug, entity_name=entity_name, entity_identifier=entity_identifier
+        ).values_list("user_id", flat=True)
+    }
+    visitors_key = get_recent_visitors_key(slug, entity_name, entity_identifier)
+    member = get_recent_visit_member(entity_name, entity_identifier, project_id)
+
+    try:
+        ri = redis_instance()
+        # Visits not flushed yet are only known to the set of visitors
+        user_ids.update(user_id.decode() for user_id in ri.smembers(visitors_key))
+        pipe = ri.pipeline()
+        for user_id in user_ids:
+            pipe.zrem(get_recent_visits_key(slug, user_id), member)
+        pipe.delete(visitors_key)
+        pipe.execute()
+    except Exception as e:
+        log_exception(e)
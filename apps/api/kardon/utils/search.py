@@ -0,0 +1,81 @@
+# Copyright (c) 2023-present Kardon Software, Inc. and contributors
+# SPDX-License-Identifier: AGPL-3.0-only
+# See the LICENSE file for details.
+
+# Python imports
+import re
+
+# Django imports
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Cast, Upper
+
+# The simple configuration neither stems nor drops stop words, which suits
+# names and identifiers better than a language configuration
+SEARCH_CONFIG = "simple"
+
+# Trigram indexes can only narrow down patterns of at least three characters
+TRIGRAM_MIN_LENGTH = 3
+
+# Bound the size of the tsquery built from a pasted paragraph
+MAX_SEARCH_TERMS = 8
+
+
+def search_vector(field):
+    """Return the tsvector expression of the field, the one the GIN index is built on"""
+    return SearchVector(field, config=SEARCH_CONFIG)
+
+
+def search_text(field):
+    """Return the upper cased text of the field, the one icontains compares and the trigram index is built on"""
+    return Upper(Cast(field, output_field=TextField()))
+
+
+def search_indexes(field, prefix):
+    """Return the full text and trigram GIN indexes of the searchable field"""
+    return [
+        GinIndex(search_vector(field), name=f"{prefix}_search_vector_idx"),
+        GinIndex(OpClass(search_text(field), name="gin_trgm_ops"), name=f"{prefix}_search_trgm_idx"),
+    ]
+
+
+def build_search_query(query):
+    """Return the prefix tsquery matching every word of the query, None when it has no words"""
+    terms = re.findall(r"\w+", query.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    # The terms only hold word characters so they can not inject tsquery operators
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=SEARCH_CONFIG)
+
+
+def search_queryset(queryset, query, field="name", extra=None):
+    """
+    Filter the queryset to the rows whose field matches the query and order
+    them by relevance.
+
+    A row matches when the field contains the query, holds every word of the
+    query as a prefix or is a fuzzy trigram match of it. Every condition is
+    answered by the GIN indexes of the field so the rows are found without
+    scanning the workspace.
+    """
+    query = query.strip()
+    search_query = build_search_query(query)
+
+    match = Q(**{f"{field}__icontains": query})
+    rank = Value(0.0, output_field=FloatField())
+
+    if search_query is not None:
+        queryset = queryset.annotate(search_vector=search_vector(field))
+        match |= Q(search_vector=search_query)
+        rank = SearchRank(F("search_vector"), search_query)
+
+    if len(query) >= TRIGRAM_MIN_LENGTH:
+        queryset = queryset.annotate(search_text=search_text(field))
+        match |= Q(search_text__trigram_word_similar=query.upper())
+        rank = rank + TrigramWordSimilarity(query.upper(), F("search_text"))
+
+    if extra is not None:
+        match |= extra
+
+    return queryset.annotate(search_rank=rank).filter(match).order_by("-search_rank", "-created_at")
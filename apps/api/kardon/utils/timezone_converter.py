@@ -6,6 +6,8 @@
 import pytz
 from datetime import datetime, time
 from datetime import timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 
 # Django imports
 from django.utils import timezone
@@ -13,10 +15,26 @@ from django.utils import timezone
 # Module imports
 from kardon.db.models import Project
 
+# The database returns aware datetimes in UTC already
+UTC_TIMEZONES = {"UTC", "Etc/UTC", "Etc/UCT", "Etc/Zulu", "Zulu", "UCT"}
+
+
+@lru_cache(maxsize=None)
+def get_zoneinfo(user_timezone):
+    """Return the cached zoneinfo of the timezone name"""
+    return ZoneInfo(user_timezone)
+
 
 def user_timezone_converter(queryset, datetime_fields, user_timezone):
+    """
+    Convert the datetime fields of the values() rows to the user's timezone.
+
+    The conversion runs through the C implemented zoneinfo with the zone looked
+    up once per process, and is skipped entirely for UTC users as the database
+    already returns the datetimes in UTC.
+    """
     # Create a timezone object for the user's timezone
-    user_tz = pytz.timezone(user_timezone)
+    user_tz = get_zoneinfo(user_timezone or "UTC")
 
     # Check if queryset is a dictionary (single item) or a list of dictionaries
     if isinstance(queryset, dict):
@@ -24,13 +42,15 @@ def user_timezone_converter(queryset, datetime_fields, user_timezone):
     else:
         queryset_values = list(queryset)
 
-    # Iterate over the dictionaries in the list
-    for item in queryset_values:
-        # Iterate over the datetime fields
-        for field in datetime_fields:
-            # Convert the datetime field to the user's timezone
-            if field in item and item[field]:
-                item[field] = item[field].astimezone(user_tz)
+    if user_tz.key not in UTC_TIMEZONES:
+        # Iterate over the dictionaries in the list
+        for item in queryset_values:
+            # Iterate over the datetime fields
+            for field in datetime_fields:
+                # Convert the datetime field to the user's timezone
+                value = item.get(field)
+                if value:
+                    item[field] = value.astimezone(user_tz)
 
     # If queryset was a single item, return a single item
     if isinstance(queryset, dict):